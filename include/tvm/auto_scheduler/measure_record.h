@@ -137,6 +137,18 @@ void WriteMeasureRecords(std::ostream* os, const Array<MeasureInput>& inputs,
 void ReadMeasureRecord(const std::string& str, MeasureInputNode* inp, MeasureResultNode* res,
                        std::string* log_version);
 
+/*!
+ * \brief Read the measure records whose lines start within a byte range of a log file,
+ * parsing them with multiple threads.
+ * \param filename The name of the log file.
+ * \param begin The beginning of the byte range.
+ * \param end The end of the byte range (exclusive).
+ * \param num_threads The number of threads used to parse the lines.
+ * \return The MeasureInputs and MeasureResults loaded from the byte range.
+ */
+std::pair<Array<MeasureInput>, Array<MeasureResult>> ReadMeasureRecordsInRange(
+    const std::string& filename, int64_t begin, int64_t end, int num_threads);
+
 }  // namespace auto_scheduler
 }  // namespace tvm
 
@@ -53,6 +53,18 @@ class FeatureExtractorNode : public runtime::Object {
   virtual Array<tvm::runtime::NDArray> ExtractFrom(const TuneContext& context,
                                                    const Array<MeasureCandidate>& candidates) = 0;
 
+  /*!
+   * \brief Extract features from the given measure candidates into a single contiguous buffer,
+   * so that cost models do not need to convert and concatenate the features one by one.
+   * \param context The tuning context for feature extraction.
+   * \param candidates The measure candidates to extract features from.
+   * \return A pair of ndarrays: the float32 features of all the candidates concatenated along the
+   * first axis, of shape [n, m], and an int64 array of shape [n] holding the index of the
+   * candidate that each row belongs to.
+   */
+  Array<tvm::runtime::NDArray> ExtractFromBatched(const TuneContext& context,
+                                                  const Array<MeasureCandidate>& candidates);
+
   static constexpr const char* _type_key = "meta_schedule.FeatureExtractor";
   TVM_DECLARE_BASE_OBJECT_INFO(FeatureExtractorNode, Object);
 };
@@ -280,6 +280,21 @@ class TaskScheduler : public runtime::ObjectRef {
    */
   TVM_DLL static TaskScheduler GradientBased(PackedFunc logger, double alpha, int window_size,
                                              support::LinearCongruentialEngine::TRandState seed);
+  /*!
+   * \brief Create a task scheduler that fetches the task with the largest expected latency
+   * reduction per second of tuning, i.e. the gradient of the gradient based task scheduler
+   * divided by the measured wall-clock cost of a round of the task.
+   * \param logger The tuning task's logging function.
+   * \param alpha The parameter alpha to control gradient computation.
+   * \param window_size The parameter to control backward window size.
+   * \param decay The decay of the moving average of the wall-clock cost of a round.
+   * \param clock The function returning the current time in seconds, or null for the wall clock.
+   * \param seed The random seed.
+   * \return The task scheduler created.
+   */
+  TVM_DLL static TaskScheduler TimeAware(PackedFunc logger, double alpha, int window_size,
+                                         double decay, PackedFunc clock,
+                                         support::LinearCongruentialEngine::TRandState seed);
   /*!
    * \brief Create a task scheduler with customized methods on the python-side.
    * \param logger The tuning task's logging function.
@@ -49,6 +49,7 @@ from .measure import (
     LocalRunner,
     MeasureInput,
     MeasureResult,
+    RecordTelemetry,
     RPCRunner,
     register_task_input_check_func,
 )
@@ -57,10 +58,12 @@ from .measure_record import (
     RecordToFile,
     load_best_record,
     load_records,
+    load_records_parallel,
     save_records,
 )
 from .relay_integration import (
     extract_tasks,
+    extract_tasks_parallel,
     is_auto_scheduler_enabled,
     remove_index_check,
     rewrite_compute_body,
@@ -53,6 +53,7 @@ from tvm.target import Target
 from . import _ffi_api
 from .loop_state import StateObject
 from .utils import (
+    array_mean,
     call_func_with_timeout,
     check_remote,
     get_const_tuple,
@@ -115,6 +116,38 @@ class PythonBasedMeasureCallback(MeasureCallback):
         raise NotImplementedError
 
 
+class RecordTelemetry(PythonBasedMeasureCallback):
+    """A measure callback that records the total and the run time of each trial into a
+    telemetry sink.
+
+    Parameters
+    ----------
+    sink : tvm.contrib.tuning_telemetry.TelemetrySink
+        The sink to record to.
+    """
+
+    def __init__(self, sink):
+        super().__init__()
+        self.sink = sink
+        self.round_cts = {}  # workload_key -> the number of measured batches
+
+    def callback(self, policy, inputs, results):
+        if not inputs:
+            return
+        # a measured batch belongs to a single task
+        task = inputs[0].task
+        name = task.desc or task.workload_key
+        round_idx = self.round_cts.get(task.workload_key, 0)
+        self.round_cts[task.workload_key] = round_idx + 1
+        for trial, res in enumerate(results):
+            error_no = int(res.error_no)
+            run_secs = array_mean(res.costs) if error_no == 0 else float("nan")
+            self.sink.record(
+                "auto_scheduler", name, "measure", res.all_cost, round_idx, trial, error_no
+            )
+            self.sink.record("auto_scheduler", name, "run", run_secs, round_idx, trial, error_no)
+
+
 @tvm._ffi.register_object("auto_scheduler.MeasureInput")
 class MeasureInput(Object):
     """Store the input of a measurement.
@@ -313,6 +346,25 @@ class ProgramMeasurer(Object):
             _ffi_api.ProgramMeasurer, builder, runner, callbacks, verbose, max_continuous_error
         )
 
+    def measure(self, task, policy, inputs):
+        """Build and run a batch of programs, and call the measure callbacks on the results.
+
+        Parameters
+        ----------
+        task : SearchTask
+            The search task of the programs.
+        policy : SearchPolicy
+            The search policy that generated the programs.
+        inputs : List[MeasureInput]
+            The programs to measure.
+
+        Returns
+        -------
+        results : List[MeasureResult]
+            The results of the measurement, one per input.
+        """
+        return _ffi_api.ProgramMeasurerMeasure(self, task, policy, inputs)
+
 
 @tvm._ffi.register_object("auto_scheduler.LocalBuilder")
 class LocalBuilder(ProgramBuilder):
@@ -22,6 +22,7 @@
 """ Serialization and other I/O support for measurement records (tuning logs). """
 import argparse
 import logging
+import multiprocessing
 import os
 import itertools
 
@@ -197,6 +198,40 @@ def load_records(filename):
     return zip(*RecordReader(filename).read_lines())
 
 
+def load_records_parallel(filename, num_threads=None, chunk_bytes=64 * 1024 * 1024):
+    """
+    Generator: load measurement records from a file, parsing them with multiple threads.
+    The file is split into byte ranges of `chunk_bytes`, each of which is parsed in parallel
+    on the C++ side, and the records are yielded in the same order as in the file.
+
+    Parameters
+    ----------
+    filename : str
+        File name to load log from.
+    num_threads : Optional[int]
+        The number of threads used to parse a byte range. Defaults to the number of CPUs.
+    chunk_bytes : int
+        The size of byte ranges read at a time, which bounds the memory held by the reader.
+
+    Yields
+    ------
+    input : auto_scheduler.measure.MeasureInput
+    result : auto_scheduler.measure.MeasureResult
+
+    Notes
+    -----
+    As with :code:`load_records`, some expensive fields in the returned MeasureInput are not
+    deserialized, see :code:`recover_measure_input`.
+    """
+    num_threads = num_threads or multiprocessing.cpu_count()
+    file_size = os.path.getsize(filename)
+    for begin in range(0, file_size, chunk_bytes):
+        inputs, results = _ffi_api.ReadMeasureRecordsInRange(
+            filename, begin, min(begin + chunk_bytes, file_size), num_threads
+        )
+        yield from zip(inputs, results)
+
+
 def save_records(filename, inputs, results):
     """
     Append measure records to file.
@@ -25,6 +25,7 @@ Integrate auto_scheduler into relay. It implements the following items:
 2. Provide auto-scheduling for all TOPI compute functions
 """
 
+import functools
 import json
 import logging
 import threading
@@ -33,6 +34,7 @@ import traceback
 import tvm
 from tvm import autotvm, transform
 from tvm._ffi.base import TVMError
+from tvm.contrib.parallel_extraction import map_programs
 from tvm.ir.transform import PassContext
 from tvm.runtime import convert_to_object
 from tvm.target import Target
@@ -180,6 +182,79 @@ def extract_tasks(
     return tasks, weights
 
 
+def _extract_tasks_worker(mod, params, **kwargs):
+    return list(zip(*extract_tasks(mod, params, **kwargs)))
+
+
+def extract_tasks_parallel(
+    programs,
+    target,
+    target_host=None,
+    hardware_params=None,
+    include_simple_tasks=False,
+    opt_level=3,
+    other_targets=None,
+    n_parallel=None,
+    timeout=None,
+):
+    """Extract tuning tasks from many relay programs in parallel worker processes.
+
+    The tasks with the same workload key are merged across the programs, summing their weights,
+    so a layer shared by several models is tuned once, weighted by its total number of
+    appearances. The programs whose extraction fails are logged and skipped.
+
+    Parameters
+    ----------
+    programs: List[Union[Tuple[tvm.IRModule, dict], Callable[[], Tuple[tvm.IRModule, dict]]]]
+        The programs, each either a (mod, params) pair or a function returning the pair, which
+        is called in the worker process, e.g. to load the model there.
+    target: Union[tvm.target.Target, str]
+        The compilation target
+    target_host: Optional[Union[tvm.target.Target, str]]
+        The host compilation target
+    hardware_params : Optional[HardwareParams]
+        Hardware parameters used for the search tasks
+    include_simple_tasks: bool
+        Whether to extract simple tasks that do not include complicated ops.
+    opt_level : Optional[int]
+        The optimization level of the task extractions.
+    other_targets: Optional[List[tvm.target.Target]]
+        Other targets for call_all_topi_funcs, e.g., cutlass target.
+    n_parallel: Optional[int]
+        The number of worker processes. Defaults to the number of CPUs.
+    timeout: Optional[float]
+        The timeout of the extraction of each program, in seconds.
+
+    Returns
+    -------
+    tasks: List[SearchTask]
+        The tasks in all the programs
+    weights: List[int]
+        The total weight (i.e. the number of appearance) of the tasks in all the programs
+    """
+    target, target_host = Target.canon_target_and_host(target, target_host)
+    worker = functools.partial(
+        _extract_tasks_worker,
+        target=target,
+        hardware_params=hardware_params,
+        include_simple_tasks=include_simple_tasks,
+        opt_level=opt_level,
+        other_targets=other_targets,
+    )
+    tasks = []
+    weights = []
+    task_index = {}
+    for result in map_programs(worker, programs, n_parallel=n_parallel, timeout=timeout):
+        for task, weight in result or []:
+            if task.workload_key in task_index:
+                weights[task_index[task.workload_key]] += weight
+            else:
+                task_index[task.workload_key] = len(tasks)
+                tasks.append(task)
+                weights.append(weight)
+    return tasks, weights
+
+
 class TracingMode:
     """Two modes for tracing"""
 
@@ -222,6 +222,37 @@ class SketchPolicy(SearchPolicy):
             init_search_callbacks,
         )
 
+    def generate_one_round(self, num_measure):
+        """Search one round and pick the programs to measure in it, without measuring them.
+        Together with `update_one_round`, this splits `continue_search_one_round` in two, so
+        the programs of a round can be measured while the next round is searched.
+
+        Parameters
+        ----------
+        num_measure: int
+            The number of programs to pick in this round
+
+        Returns
+        -------
+        inputs: List[MeasureInput]
+            The programs to measure
+        """
+        return _ffi_api.SketchPolicyGenerateOneRound(self, num_measure)
+
+    def update_one_round(self, inputs, results):
+        """Learn from the measurement of the programs picked by `generate_one_round`, i.e.
+        update the measured states and train the cost model. The rounds must be updated in the
+        order they were generated in.
+
+        Parameters
+        ----------
+        inputs: List[MeasureInput]
+            The programs returned by `generate_one_round`
+        results: List[MeasureResult]
+            The measurement results of the programs
+        """
+        _ffi_api.SketchPolicyUpdateOneRound(self, inputs, results)
+
     def generate_sketches(self, print_for_debug=False):
         """Generate the sketches.
         This python interface is mainly used for debugging and testing.
@@ -29,6 +29,7 @@ import os
 import time
 import math
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
@@ -264,6 +265,11 @@ class TaskScheduler:
         self.num_measures_per_round = None
         self.dead_tasks = set()
 
+        # The time spent searching, measuring and learning from the measurements, and the time
+        # the measurer was idle, i.e. waiting for the search or the training, in seconds
+        self.search_secs = self.measure_secs = self.update_secs = 0.0
+        self.measure_idle_secs = 0.0
+
         # Build similarity groups
         self.task_tags = []  # task_id -> tag
         self.tag_to_group_id = {}  # tag -> group_id
@@ -288,6 +294,7 @@ class TaskScheduler:
         search_policy_params=None,
         adaptive_training=False,
         per_task_early_stopping=None,
+        overlap_measurement=False,
     ):
         """Tune a batch of tasks together.
 
@@ -308,6 +315,11 @@ class TaskScheduler:
             too many logs.
         per_task_early_stopping : Optional[int]
             Stop tuning a task early if getting no improvement after n measurements.
+        overlap_measurement : bool = False
+            Whether to search the next round while the current one is measured, so the
+            measurer does not wait for the evolutionary search. The task of the next round is
+            then picked before the measurement of the current round is over. Only the
+            SketchPolicy supports it, the tasks are tuned one round at a time otherwise.
         """
         # init members
         self.tune_option = tune_option
@@ -353,6 +365,29 @@ class TaskScheduler:
             adaptive_training,
         )
 
+        self.search_secs = self.measure_secs = self.update_secs = 0.0
+        tic = time.time()
+        if overlap_measurement and all(
+            isinstance(policy, SketchPolicy) for policy in self.search_policies
+        ):
+            self._tune_overlapped()
+        else:
+            self._tune_serial()
+        elapsed = time.time() - tic
+        self.measure_idle_secs = max(elapsed - self.measure_secs, 0.0)
+        logger.info(
+            "TaskScheduler: Search %.1f s, measurement %.1f s, training %.1f s, "
+            "measurer idle %.1f s (%.1f%%) of %.1f s",
+            self.search_secs,
+            self.measure_secs,
+            self.update_secs,
+            self.measure_idle_secs,
+            100 * self.measure_idle_secs / max(elapsed, 1e-9),
+            elapsed,
+        )
+
+    def _tune_serial(self):
+        """Tune the tasks one round at a time"""
         # do a round robin first to warm up
         for idx in range(len(self.tasks)):
             # skip warming up this task if it has been tuned before (restored from the log file)
@@ -363,87 +398,147 @@ class TaskScheduler:
 
         # use the specific strategy to choose workload to tune
         task_idx = -1
-        while self.ct < tune_option.num_measure_trials and len(self.dead_tasks) < len(self.tasks):
-            if self.strategy == "round-robin":
+        while self.ct < self.tune_option.num_measure_trials and len(self.dead_tasks) < len(
+            self.tasks
+        ):
+            task_idx = self._next_task(task_idx)
+            self._tune_task(task_idx)
+            self._adjust_similarity_group(task_idx)
+            if self._should_stop():
+                break
+
+    def _tune_overlapped(self):
+        """Tune the tasks with the search of a round overlapping the measurement of the previous
+        one. A worker thread measures the rounds in order, while the main thread picks the next
+        task, searches its round, and learns from the last measured round. So the choice of a
+        task sees the results of all the rounds but the one being measured."""
+        warm_up = [idx for idx in range(len(self.tasks)) if not self.task_cts[idx]]
+        self.best_ct = self.ct
+        self.best_score = None if warm_up else self.cur_score
+        task_idx = -1
+        # (task_idx, inputs, future) of the round being measured
+        running = None
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            while True:
+                # search the next round while the running one is measured
+                next_round = None
+                num_running = len(running[1]) if running else 0
+                if warm_up or (
+                    self.ct + num_running < self.tune_option.num_measure_trials
+                    and len(self.dead_tasks) < len(self.tasks)
+                ):
+                    task_idx = warm_up.pop(0) if warm_up else self._next_task(task_idx)
+                    for callback in self.callbacks:
+                        callback.pre_tune(self, task_idx)
+                    next_round = (task_idx, self._search_round(task_idx))
+
+                finished = running
+                running = None
+                if next_round is not None:
+                    running = next_round + (executor.submit(self._measure_round, *next_round),)
+                if finished is None:
+                    if running is None:
+                        break
+                    continue
+
+                # learn from the finished round while the next one is measured
+                self._finish_round(*finished)
+                if self.best_score is None:
+                    # the warm up is over once every task has been measured once
+                    if all(self.task_cts):
+                        self.best_ct = self.ct
+                        self.best_score = self.cur_score
+                    continue
+                self._adjust_similarity_group(finished[0])
+                if self._should_stop():
+                    break
+
+            # do not waste the round still being measured when stopping early
+            if running is not None:
+                self._finish_round(*running)
+
+    def _next_task(self, task_idx):
+        """Pick the task to tune in the next round with the scheduling strategy"""
+        if self.strategy == "round-robin":
+            task_idx = (task_idx + 1) % len(self.tasks)
+            while task_idx in self.dead_tasks:
                 task_idx = (task_idx + 1) % len(self.tasks)
-                while task_idx in self.dead_tasks:
-                    task_idx = (task_idx + 1) % len(self.tasks)
-            elif self.strategy == "gradient":
-                gradients = []
-                for i in range(len(self.tasks)):
-                    if i in self.dead_tasks:
-                        gradients.append(0)
-                        continue
-
-                    # compute gradient from chain rule : (delta f / delta g_i)
-                    delta = 1e-4
-                    new_costs = list(self.best_costs)
-                    new_costs[i] -= delta
-                    chain_grad = (
-                        self._compute_score(self.best_costs) - self._compute_score(new_costs)
-                    ) / delta
-
-                    # compute (g_i(t_i) - g(t_i - \Delta t)) / (\Delta t)
-                    if (
-                        self.task_cts[i] - 1 < len(self.task_costs_history[i])
-                        and self.task_cts[i] - 1 - self.backward_window_size >= 0
-                    ):
-                        backward_grad = (
-                            self.task_costs_history[i][self.task_cts[i] - 1]
-                            - self.task_costs_history[i][
-                                self.task_cts[i] - 1 - self.backward_window_size
-                            ]
-                        ) / self.backward_window_size
-                    else:
-                        backward_grad = 0
-
-                    # compute (g_i(t_i + \Delta t) - g(t_i)) / (\Delta t)
-                    g_next_1 = self.best_costs[i] - (self.best_costs[i] / self.task_cts[i])
-
-                    g_next_2 = self.beta * 1e30
-                    group_id = self.tag_to_group_id.get(self.task_tags[i], None)
-                    if group_id is not None and len(self.group_task_ids[group_id]) > 1:
-                        best_flops = max(
-                            [
-                                self.flop_cts[j] / self.best_costs[j]
-                                for j in self.group_task_ids[group_id]
-                            ]
-                        )
-                        g_next_2 = self.beta * self.flop_cts[i] / best_flops
-
-                    g_next = min(g_next_1, g_next_2)
-                    forward_grad = g_next - self.best_costs[i]
-
-                    # combine all grads
-                    grad = chain_grad * (
-                        self.alpha * backward_grad + (1 - self.alpha) * forward_grad
+        elif self.strategy == "gradient":
+            gradients = []
+            for i in range(len(self.tasks)):
+                # the tasks without results are still in their warm up round
+                if i in self.dead_tasks or not self.task_cts[i]:
+                    gradients.append(0)
+                    continue
+
+                # compute gradient from chain rule : (delta f / delta g_i)
+                delta = 1e-4
+                new_costs = list(self.best_costs)
+                new_costs[i] -= delta
+                chain_grad = (
+                    self._compute_score(self.best_costs) - self._compute_score(new_costs)
+                ) / delta
+
+                # compute (g_i(t_i) - g(t_i - \Delta t)) / (\Delta t)
+                if (
+                    self.task_cts[i] - 1 < len(self.task_costs_history[i])
+                    and self.task_cts[i] - 1 - self.backward_window_size >= 0
+                ):
+                    backward_grad = (
+                        self.task_costs_history[i][self.task_cts[i] - 1]
+                        - self.task_costs_history[i][
+                            self.task_cts[i] - 1 - self.backward_window_size
+                        ]
+                    ) / self.backward_window_size
+                else:
+                    backward_grad = 0
+
+                # compute (g_i(t_i + \Delta t) - g(t_i)) / (\Delta t)
+                g_next_1 = self.best_costs[i] - (self.best_costs[i] / self.task_cts[i])
+
+                g_next_2 = self.beta * 1e30
+                group_id = self.tag_to_group_id.get(self.task_tags[i], None)
+                if group_id is not None and len(self.group_task_ids[group_id]) > 1:
+                    best_flops = max(
+                        [
+                            self.flop_cts[j] / self.best_costs[j]
+                            for j in self.group_task_ids[group_id]
+                        ]
                     )
-                    assert grad <= 0
-                    gradients.append(grad)
+                    g_next_2 = self.beta * self.flop_cts[i] / best_flops
 
-                if max(gradients) == min(gradients):
-                    task_idx = np.random.choice(len(gradients))
-                else:
-                    task_idx = np.argmin(gradients)
-            else:
-                raise ValueError("Invalid strategy: " + self.strategy)
+                g_next = min(g_next_1, g_next_2)
+                forward_grad = g_next - self.best_costs[i]
 
-            self._tune_task(task_idx)
-            self._adjust_similarity_group(task_idx)
+                # combine all grads
+                grad = chain_grad * (self.alpha * backward_grad + (1 - self.alpha) * forward_grad)
+                assert grad <= 0
+                gradients.append(grad)
 
-            if self.cur_score < self.best_score:
-                self.best_score = self.cur_score
-                self.best_ct = self.ct
-            elif self.ct - self.best_ct >= self.early_stopping_all and all(
-                cost < 1e9 for cost in self.best_costs
-            ):
-                if self.tune_option.verbose >= 1:
-                    print(
-                        "Stop early since no performance improvement in the last "
-                        + str(self.early_stopping_all)
-                        + " measurement trials."
-                    )
-                break
+            if max(gradients) == min(gradients):
+                task_idx = np.random.choice(len(gradients))
+            else:
+                task_idx = np.argmin(gradients)
+        else:
+            raise ValueError("Invalid strategy: " + self.strategy)
+        return task_idx
+
+    def _should_stop(self):
+        """Record the best score, and check whether to stop early"""
+        if self.cur_score < self.best_score:
+            self.best_score = self.cur_score
+            self.best_ct = self.ct
+        elif self.ct - self.best_ct >= self.early_stopping_all and all(
+            cost < 1e9 for cost in self.best_costs
+        ):
+            if self.tune_option.verbose >= 1:
+                print(
+                    "Stop early since no performance improvement in the last "
+                    + str(self.early_stopping_all)
+                    + " measurement trials."
+                )
+            return True
+        return False
 
     def _tune_task(self, task_idx):
         """Tune the select task for one round"""
@@ -452,10 +547,55 @@ class TaskScheduler:
         for callback in self.callbacks:
             callback.pre_tune(self, task_idx)
 
-        measure_inputs, measure_results = self.search_policies[task_idx].continue_search_one_round(
-            self.num_measures_per_round, self.measurer
-        )
+        policy = self.search_policies[task_idx]
+        if isinstance(policy, SketchPolicy):
+            measure_inputs = self._search_round(task_idx)
+            measure_results, secs = self._measure_round(task_idx, measure_inputs)
+            self.measure_secs += secs
+            self._learn_round(task_idx, measure_inputs, measure_results)
+        else:
+            # the search and the training of other policies are counted as measurement
+            tic = time.time()
+            measure_inputs, measure_results = policy.continue_search_one_round(
+                self.num_measures_per_round, self.measurer
+            )
+            self.measure_secs += time.time() - tic
+
+        self._record_round(task_idx, measure_inputs, measure_results)
 
+    def _search_round(self, task_idx):
+        """Search one round of the selected task, and return the programs to measure"""
+        tic = time.time()
+        measure_inputs = self.search_policies[task_idx].generate_one_round(
+            self.num_measures_per_round
+        )
+        self.search_secs += time.time() - tic
+        return measure_inputs
+
+    def _measure_round(self, task_idx, measure_inputs):
+        """Measure the programs of one round, and return the results with the time it took.
+        Called in the measurement thread when the rounds overlap."""
+        tic = time.time()
+        measure_results = self.measurer.measure(
+            self.tasks[task_idx], self.search_policies[task_idx], measure_inputs
+        )
+        return measure_results, time.time() - tic
+
+    def _learn_round(self, task_idx, measure_inputs, measure_results):
+        """Update the search policy of the selected task with the results of one round"""
+        tic = time.time()
+        self.search_policies[task_idx].update_one_round(measure_inputs, measure_results)
+        self.update_secs += time.time() - tic
+
+    def _finish_round(self, task_idx, measure_inputs, future):
+        """Wait for the measurement of an overlapped round, and learn from its results"""
+        measure_results, secs = future.result()
+        self.measure_secs += secs
+        self._learn_round(task_idx, measure_inputs, measure_results)
+        self._record_round(task_idx, measure_inputs, measure_results)
+
+    def _record_round(self, task_idx, measure_inputs, measure_results):
+        """Update the statistics of the selected task with the results of one round"""
         self.task_cts[task_idx] += 1
 
         for res in measure_results:
@@ -653,3 +793,42 @@ class LogEstimatedLatency(TaskSchedulerCallback):
                 % (time.time() - task_scheduler.tic, total_latency_str, task_scheduler.ct)
             )
             filep.flush()
+
+
+class LogTelemetry(TaskSchedulerCallback):
+    """Record the time spent on each round into a telemetry sink: the search, measurement and
+    cost model training time, and the time the measurer was idle, waiting for the others.
+    The run time of each trial is recorded by the `RecordTelemetry` measure callback.
+
+    Parameters
+    ----------
+    sink: tvm.contrib.tuning_telemetry.TelemetrySink
+        The sink to record to.
+    """
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.last = None  # (time, search_secs, measure_secs, update_secs) at the last round
+
+    def post_tune(self, task_scheduler, task_id):
+        now = (
+            time.time(),
+            task_scheduler.search_secs,
+            task_scheduler.measure_secs,
+            task_scheduler.update_secs,
+        )
+        # the first round started with the tuning
+        last = self.last or (task_scheduler.tic, 0.0, 0.0, 0.0)
+        self.last = now
+        round_secs, search_secs, measure_secs, update_secs = [x - y for x, y in zip(now, last)]
+        task = task_scheduler.tasks[task_id]
+        name = task.desc or task.workload_key
+        round_idx = task_scheduler.task_cts[task_id] - 1
+        for event, secs in [
+            ("round", round_secs),
+            ("search", search_secs),
+            ("measure_batch", measure_secs),
+            ("train", update_secs),
+            ("queue", max(round_secs - measure_secs, 0.0)),
+        ]:
+            self.sink.record("auto_scheduler", name, event, secs, round_idx)
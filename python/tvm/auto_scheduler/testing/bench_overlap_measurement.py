@@ -0,0 +1,98 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=missing-docstring
+"""Benchmark the idle time of the measurer with and without overlapping the search of a round
+with the measurement of the previous one.
+
+Example:
+    python -m tvm.auto_scheduler.testing.bench_overlap_measurement \
+        --workloads C2D,GMM,DEP --target "llvm -num-cores=4" --num-trials 128
+"""
+import argparse
+import os
+import tempfile
+
+import tvm
+from tvm import auto_scheduler
+from tvm.meta_schedule.testing.te_workload import CONFIGS
+
+
+def _parse_args():
+    args = argparse.ArgumentParser()
+    args.add_argument("--workloads", type=str, default="C2D,GMM,DEP")
+    args.add_argument("--target", type=str, default="llvm -num-cores=4")
+    args.add_argument("--num-trials", type=int, default=128)
+    args.add_argument("--num-measures-per-round", type=int, default=16)
+    parsed = args.parse_args()
+    parsed.target = tvm.target.Target(parsed.target)
+    return parsed
+
+
+ARGS = _parse_args()
+
+
+def _create_tasks():
+    tasks = []
+    for workload in ARGS.workloads.split(","):
+        workload_func, params = CONFIGS[workload]
+        tasks.append(
+            auto_scheduler.SearchTask(
+                func=auto_scheduler.register_workload(workload_func, override=True),
+                args=params[0],  # type: ignore
+                target=ARGS.target,
+            )
+        )
+    return tasks
+
+
+def _tune(tasks, overlap_measurement, work_dir):
+    log_file = os.path.join(work_dir, f"overlap_{overlap_measurement}.json")
+    tune_option = auto_scheduler.TuningOptions(
+        num_measure_trials=ARGS.num_trials,
+        num_measures_per_round=ARGS.num_measures_per_round,
+        measure_callbacks=[auto_scheduler.RecordToFile(log_file)],
+        verbose=0,
+    )
+    task_scheduler = auto_scheduler.TaskScheduler(tasks, callbacks=[])
+    task_scheduler.tune(tune_option, overlap_measurement=overlap_measurement)
+    return task_scheduler
+
+
+def main():
+    tasks = _create_tasks()
+    print("| Mode       | Search (s) | Measure (s) | Training (s) | Idle (s) | Best total (ms) |")
+    with tempfile.TemporaryDirectory() as work_dir:
+        for overlap_measurement in [False, True]:
+            task_scheduler = _tune(tasks, overlap_measurement, work_dir)
+            print(
+                "| %-10s | %10.1f | %11.1f | %12.1f | %8.1f | %15.3f |"
+                % (
+                    "overlapped" if overlap_measurement else "serial",
+                    task_scheduler.search_secs,
+                    task_scheduler.measure_secs,
+                    task_scheduler.update_secs,
+                    task_scheduler.measure_idle_secs,
+                    task_scheduler.cur_score * 1e3,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
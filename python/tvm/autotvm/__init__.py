@@ -34,6 +34,7 @@ from . import database
 from . import feature
 from . import measure
 from . import record
+from . import record_store
 from . import task
 from . import tuner
 from . import utils
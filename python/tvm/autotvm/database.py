@@ -22,7 +22,9 @@
 Database of MeasureInput/MeasureResult pair.
 This can be used for replaying measurement.
 """
+import contextlib
 import os
+import sqlite3
 
 from .record import encode, decode, measure_str_key
 
@@ -205,3 +207,124 @@ class DummyDatabase(RedisDatabase):
 
     def flush(self):
         self.db = {}
+
+
+class SQLiteDatabase(Database):
+    """
+    Record database embedded in a local sqlite file.
+
+    Unlike RedisDatabase, it needs no external service: processes on the same machine
+    share results by opening the same file. The file is in write-ahead-log mode, so
+    readers are not blocked by a writer and see its results once they are committed.
+
+    Parameters
+    ----------
+    path: str
+        The path to the sqlite file. Created if it does not exist.
+    timeout: float
+        How many seconds to wait for another process holding the write lock.
+    """
+
+    def __init__(self, path, timeout=60.0):
+        self.path = path
+        self.db = sqlite3.connect(path, timeout=timeout)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        with self.db:
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS records ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " key TEXT NOT NULL,"
+                " timestamp REAL NOT NULL,"
+                " row TEXT NOT NULL)"
+            )
+            self.db.execute("CREATE INDEX IF NOT EXISTS records_by_key ON records (key)")
+        self._in_batch = False
+
+    def close(self):
+        """Close the connection to the database file."""
+        self.db.close()
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Group the saves in this scope into a single transaction, which is committed
+        at the end of the scope, or rolled back if an exception is raised.
+
+        Examples
+        --------
+        >>> with db.batch():
+        >>>     for inp, res in zip(inputs, results):
+        >>>         db.save(inp, res)
+        """
+        if self._in_batch:
+            yield self
+            return
+        self._in_batch = True
+        try:
+            with self.db:
+                yield self
+        finally:
+            self._in_batch = False
+
+    def _rows(self, key):
+        return [
+            row
+            for (row,) in self.db.execute(
+                "SELECT row FROM records WHERE key = ? ORDER BY id", (key,)
+            ).fetchall()
+        ]
+
+    def load(self, inp, get_all=False):
+        rows = self._rows(measure_str_key(inp))
+        if not rows:
+            return None
+        records = [decode(row) for row in rows]
+        results = [rec[1] for rec in records if rec is not None]
+        if get_all:
+            return results
+        if not results:
+            # Only rows of an unsupported log version
+            return None
+        return max(results, key=lambda result: result.timestamp)
+
+    def save(self, inp, res, extend=False):
+        key = measure_str_key(inp)
+        with self.batch():
+            if not extend:
+                self.db.execute("DELETE FROM records WHERE key = ?", (key,))
+            self.db.execute(
+                "INSERT INTO records (key, timestamp, row) VALUES (?, ?, ?)",
+                (key, res.timestamp, encode(inp, res)),
+            )
+
+    def filter(self, func):
+        """
+        Dump all of the records that match the given rule
+
+        Parameters
+        ----------
+        func: callable
+            The signature of the function is (MeasureInput, [MeasureResult]) -> bool
+
+        Returns
+        -------
+        list of records in tuple (MeasureInput, MeasureResult) matching the rule
+        """
+        matched_records = list()
+        grouped = {}
+        for key, row in self.db.execute("SELECT key, row FROM records ORDER BY id"):
+            grouped.setdefault(key, []).append(row)
+        for rows in grouped.values():
+            records = [rec for rec in (decode(row) for row in rows) if rec is not None]
+            if not records:
+                continue
+            inps, results = zip(*records)
+            if not func(inps[0], results):
+                continue
+            result = max(results, key=lambda res: res.timestamp)
+            matched_records.append((inps[0], result))
+        return matched_records
+
+    def flush(self):
+        with self.batch():
+            self.db.execute("DELETE FROM records")
@@ -25,4 +25,5 @@ from . import base_graph_tuner
 
 from .base_graph_tuner import BaseGraphTuner
 from .dynamic_programming_tuner import DPTuner
+from .layout_transform_cache import LayoutTransformCache
 from .pbqp_tuner import PBQPTuner
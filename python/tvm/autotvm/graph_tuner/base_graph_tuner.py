@@ -43,6 +43,7 @@ from .utils import (
     expr2graph,
 )
 from ._base import INVALID_LAYOUT_TIME
+from .layout_transform_cache import LayoutTransformCache
 
 from ._base import OPT_OUT_OP
 
@@ -347,23 +348,27 @@ class BaseGraphTuner(object):
 
     def _create_matrix_callback(self, from_node_idx, to_node_idx, from_sch_idx, to_sch_idx, args):
         """Create dictionary containing matrix format of layout transformation
-        between nodes."""
+        between nodes. Each matrix is a numpy array of shape
+        (number of schedules of from node, number of schedules of to node)."""
         in_layout, out_layout = args[1], args[2]
-        ltf_workload = autotvm.task.args_to_workload(args, "layout_transform")
         idx_pair_key = (from_node_idx, to_node_idx)
 
         if in_layout == out_layout:
             layout_transform_time = 0
         else:
+            ltf_workload = autotvm.task.args_to_workload(args, "layout_transform")
             layout_transform_time = self._layout_transform_perf_records[ltf_workload][1].costs[0]
 
         if idx_pair_key not in self._layout_transform_interlayer_cost:
-            self._layout_transform_interlayer_cost[idx_pair_key] = []
-        if len(self._layout_transform_interlayer_cost[idx_pair_key]) <= from_sch_idx:
-            self._layout_transform_interlayer_cost[idx_pair_key].append([])
-        self._layout_transform_interlayer_cost[idx_pair_key][from_sch_idx].append(
-            layout_transform_time
-        )
+            self._layout_transform_interlayer_cost[idx_pair_key] = np.zeros(
+                (
+                    len(self._node_list[from_node_idx]["record_candidates"]),
+                    len(self._node_list[to_node_idx]["record_candidates"]),
+                )
+            )
+        self._layout_transform_interlayer_cost[idx_pair_key][
+            from_sch_idx, to_sch_idx
+        ] = layout_transform_time
 
     def benchmark_layout_transform(
         self,
@@ -379,6 +384,7 @@ class BaseGraphTuner(object):
         target_host=None,
         infer_layout=False,
         runner=None,
+        layout_cache=None,
     ):
         """Benchmark all possible layout transformation in the graph,
         given a set of schedule candidates for each workload of target operator.
@@ -444,6 +450,12 @@ class BaseGraphTuner(object):
             This might bring performance loss comparing to benchmarking layout transformation.
         runner : Runner, optional
             Accept a user-supplied runner
+
+        layout_cache : str or LayoutTransformCache, optional
+            Persistent cache of layout_transform measurements, or the path of its log file.
+            The layout transformations found in the cache for the target are not benchmarked
+            again, and the new successful measurements are added to it, so that it can be
+            reused across models.
         """
         self._logger.info("Start to benchmark layout transformation...")
         self._target, target_host = Target.canon_target_and_host(self._target, target_host)
@@ -458,6 +470,8 @@ class BaseGraphTuner(object):
 
         if isinstance(layout_records, str):
             layout_records = load_from_file(layout_records)
+        if isinstance(layout_cache, str):
+            layout_cache = LayoutTransformCache(layout_cache)
         num_flops, total_time = 0, 0
         if layout_records is not None:
             for record in layout_records:
@@ -509,6 +523,11 @@ class BaseGraphTuner(object):
             ltf_workload = autotvm.task.args_to_workload(args, "layout_transform")
             if ltf_workload in self._layout_transform_perf_records:
                 continue
+            if layout_cache is not None:
+                cached_record = layout_cache.get(ltf_workload, self._target)
+                if cached_record is not None:
+                    self._layout_transform_perf_records[ltf_workload] = cached_record
+                    continue
 
             if infer_layout:
                 input_shape = ltf_workload[1][1]
@@ -540,6 +559,8 @@ class BaseGraphTuner(object):
             tuner.tune(n_trial=1, measure_option=measure_option, callbacks=[_log_to_list(records)])
             if not isinstance(records[0][1].costs[0], float):
                 records[0] = (records[0][0], records[0][1]._replace(costs=(INVALID_LAYOUT_TIME,)))
+            elif layout_cache is not None:
+                layout_cache.put(records[0])
             self._layout_transform_perf_records[ltf_workload] = records[0]
 
         self._iterate_layout_transform(self._create_matrix_callback)
@@ -125,11 +125,9 @@ class DPStage(object):
             input_stage = self._global_stage_dict[input_idx]
             input_dep = input_stage.dep
             input_states = input_stage.states
-            input_flatten_states = input_states.flatten()
             input_record_list = input_node_entry["record_candidates"]
             num_schedules = len(self._record_list)
             num_input_schedules = len(input_record_list)
-            num_input_states = input_flatten_states.shape[0]
 
             full_states_shape = tuple(
                 [num_schedules, num_input_schedules]
@@ -138,33 +136,26 @@ class DPStage(object):
                     for dep_idx in input_dep
                 ]
             )
-            self._full_states = np.zeros(full_states_shape).flatten().astype("float32")
             self._full_states_idx = [self._idx, input_idx] + input_dep
-            dep_multiplier = 1
-            for i in range(2, len(full_states_shape)):
-                dep_multiplier *= full_states_shape[i]
             input_node_time_counted = input_idx in self._global_counted_nodes_set
 
-            for i in range(num_schedules):
-                current_sch_time = float(self._record_list[i][1].costs[0])
-                for j in range(num_input_states):
-                    input_sch_idx = j // dep_multiplier
-                    layout_transform_time = self._global_layout_transform_interlayer_cost[
-                        (input_idx, self._idx)
-                    ][input_sch_idx][i]
-
-                    if input_node_time_counted:
-                        total_time = current_sch_time + layout_transform_time
-                    else:
-                        total_time = (
-                            current_sch_time + layout_transform_time + input_flatten_states[j]
-                        )
-                    current_state_idx = i * num_input_states + j
-                    self._full_states[current_state_idx] = total_time
+            # full_states[i, j, ...] = time of schedule i of current node
+            #                          + layout transformation time from schedule j of input node
+            #                          + input_states[j, ...] if it is not counted yet
+            dep_axes = (1,) * len(input_dep)
+            current_sch_time = np.array(
+                [float(record[1].costs[0]) for record in self._record_list]
+            ).reshape((num_schedules, 1) + dep_axes)
+            layout_transform_time = np.asarray(
+                self._global_layout_transform_interlayer_cost[(input_idx, self._idx)]
+            ).T.reshape((num_schedules, num_input_schedules) + dep_axes)
+            total_time = current_sch_time + layout_transform_time
+            if not input_node_time_counted:
+                total_time = total_time + input_states[np.newaxis]
+            self._full_states = np.broadcast_to(total_time, full_states_shape).astype("float32")
 
             if not input_node_time_counted:
                 self._global_counted_nodes_set.add(input_idx)
-            self._full_states = self._full_states.reshape(full_states_shape)
 
             # If out degree of input node is 1, we can remove the dimension of input node,
             # since the states of input node will not be needed any more. Otherwise, input
@@ -206,12 +197,11 @@ class DPStage(object):
         transformations between these three nodes. It is also possible some earlier states
         belong to other nodes(We name them as dependency) are required for dynamic programming.
         The final states array for this elemwise-sum can be with shape (e0, k0, k1, e1, k2).
-        To iterate through all states, we first align the shape of op0, op1 and op2 to be
+        To compute all states at once, we first align the shape of op0, op1 and op2 to be
         (e0, k0, k1, e1, k2) by broadcasting the original states. We also record the axis of
-        each input node in the states array, together with the multiplier. For example,
-        the axis index for op0 is 1, and multiplier is k1 * e1 * k2. If current iterating index
-        in the flatten array is i, the index of op0 can be computed as:
-        i % (k0 * k1 * e1 * k2) // (k1 * e1 * k2).
+        each input node in the states array, e.g. the axis index for op0 is 1. The layout
+        transformation matrix from op1 to op0, of shape (k1, k0), is then broadcast along
+        the axes of op1 and op0 and added to the states.
         """
         full_input_node_list = list(self._global_in_nodes_dict[self._idx])
         input_index_list = []
@@ -225,44 +215,37 @@ class DPStage(object):
         states_list, aligned_node_list = DPStage.align_states(
             input_index_list, self._global_stage_dict, self._global_node_list
         )
-        target_node_idx, target_major_axis, target_multiplier, target_states = states_list[0]
+        target_node_idx, target_major_axis, _, target_states = states_list[0]
         aligned_shape = target_states.shape
-        self._full_states = np.zeros(aligned_shape).astype("float32").flatten()
         self._full_states_idx = list(aligned_node_list)
-        num_states = self._full_states.shape[0]
         node_time_counted = [item[0] in self._global_counted_nodes_set for item in states_list]
-        target_states = target_states.flatten()
-        src_states_list = [states_list[i][3].flatten() for i in range(1, len(states_list))]
-
-        for i in range(num_states):
-            target_sch_idx = (
-                i % (target_multiplier * aligned_shape[target_major_axis])
-            ) // target_multiplier
-            if node_time_counted[0]:
-                new_state = 0
-            else:
-                new_state = target_states[i]
 
+        if len(states_list) > 1:
+            # full_states = target_states if it is not counted yet
+            #               + for each other input node: the layout transformation time from it
+            #                 to the target node, broadcast along both their axes,
+            #                 + its states if they are not counted yet
+            full_states = np.zeros(aligned_shape) if node_time_counted[0] else target_states
             for j in range(1, len(states_list)):
-                src_states = src_states_list[j - 1]
-                src_node_idx, src_major_axis, src_multiplier, _ = states_list[j]
-                src_sch_idx = (
-                    i % (src_multiplier * aligned_shape[src_major_axis])
-                ) // src_multiplier
-                layout_transform_time = self._global_layout_transform_interlayer_cost[
-                    (src_node_idx, target_node_idx)
-                ][src_sch_idx][target_sch_idx]
-
-                if node_time_counted[j]:
-                    new_state += layout_transform_time
-                else:
-                    new_state += layout_transform_time + src_states[i]
-                self._full_states[i] = new_state
+                src_node_idx, src_major_axis, _, src_states = states_list[j]
+                layout_transform_time = np.asarray(
+                    self._global_layout_transform_interlayer_cost[(src_node_idx, target_node_idx)]
+                )
+                if src_major_axis > target_major_axis:
+                    layout_transform_time = layout_transform_time.T
+                ltf_shape = [1] * len(aligned_shape)
+                ltf_shape[src_major_axis] = aligned_shape[src_major_axis]
+                ltf_shape[target_major_axis] = aligned_shape[target_major_axis]
+                full_states = full_states + layout_transform_time.reshape(ltf_shape)
+                if not node_time_counted[j]:
+                    full_states = full_states + src_states
+            self._full_states = np.broadcast_to(full_states, aligned_shape).astype("float32")
+        else:
+            self._full_states = np.zeros(aligned_shape).astype("float32")
 
         for i, node_counted in enumerate(node_time_counted):
             if not node_counted:
                 self._global_counted_nodes_set.add(states_list[i][0])
-        self._full_states = self._full_states.reshape(aligned_shape)
 
         # Remove dependency to reduce states
         reduced_states = np.array(self._full_states)
@@ -0,0 +1,93 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Persistent cache of layout transformation measurements."""
+import os
+
+from tvm.autotvm.record import encode, load_from_file
+from tvm.target import Target
+
+
+class LayoutTransformCache(object):
+    """A cache of layout transformation records, shared by the graph tuning of many models.
+
+    The records are keyed by their workload, i.e. the input shape and dtype together with the
+    source and destination layouts, and by the target they were measured on. The cache is backed
+    by an autotvm log file, to which new measurements are appended as soon as they are added, so
+    a measurement is never repeated for another model or after an interruption.
+    """
+
+    def __init__(self, path):
+        """Load a cache, or create an empty one if the file does not exist.
+
+        Parameters
+        ----------
+        path : str
+            The autotvm log file backing the cache.
+        """
+        self._path = path
+        self._records = {}
+        if os.path.isfile(path):
+            for record in load_from_file(path):
+                self._records[self._key(record[0].task.workload, record[0].target)] = record
+
+    @staticmethod
+    def _key(workload, target):
+        if not isinstance(target, Target):
+            target = Target(target)
+        return (workload, str(target))
+
+    @property
+    def path(self):
+        """Get the path of the log file backing the cache."""
+        return self._path
+
+    def __len__(self):
+        return len(self._records)
+
+    def get(self, workload, target):
+        """Look up the record of a layout transformation.
+
+        Parameters
+        ----------
+        workload : tuple
+            The workload of the layout_transform task.
+
+        target : tvm.target.Target
+            The target of the measurement.
+
+        Returns
+        -------
+        record : tuple of (MeasureInput, MeasureResult) or None
+            The cached record, or None on a cache miss.
+        """
+        return self._records.get(self._key(workload, target))
+
+    def put(self, record):
+        """Add the record of a successful layout transformation measurement.
+
+        Parameters
+        ----------
+        record : tuple of (MeasureInput, MeasureResult)
+            The record to add.
+        """
+        inp, res = record
+        self._records[self._key(inp.task.workload, inp.target)] = record
+        with open(self._path, "a") as out_file:
+            out_file.write(encode(inp, res) + "\n")
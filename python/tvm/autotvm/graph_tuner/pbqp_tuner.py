@@ -19,6 +19,8 @@
 # under the License.
 # pylint: disable=invalid-name, too-many-locals, unnecessary-list-index-lookup
 """Partitioned Boolean Quadratic Programming Tuner"""
+import numpy as np
+
 from ._base import INVALID_LAYOUT_TIME
 from .base_graph_tuner import BaseGraphTuner
 from .utils import is_boundary_node, has_multiple_inputs
@@ -55,9 +57,10 @@ class PBQPTuner(BaseGraphTuner):
 
         self._record_cost_dict = {}
         for key in self._in_nodes_dict:
-            self._record_cost_dict[key] = []
-            for record in self._node_list[key]["record_candidates"]:
-                self._record_cost_dict[key].append(record[1].costs[0])
+            self._record_cost_dict[key] = np.array(
+                [record[1].costs[0] for record in self._node_list[key]["record_candidates"]],
+                dtype="float64",
+            )
 
         self._max_degree = -1
         self._node_degree_dict = {}
@@ -98,11 +101,7 @@ class PBQPTuner(BaseGraphTuner):
     def _insert_edge(self, node_x, node_y, adj_cost_matrix):
         """Insert an edge between two nodes."""
         self._layout_transform_interlayer_cost[(node_x, node_y)] = adj_cost_matrix
-        self._layout_transform_interlayer_cost[(node_y, node_x)] = []
-        for i in range(len(adj_cost_matrix[0])):
-            self._layout_transform_interlayer_cost[(node_y, node_x)].append([])
-            for cost_vec in adj_cost_matrix:
-                self._layout_transform_interlayer_cost[(node_y, node_x)][i].append(cost_vec[i])
+        self._layout_transform_interlayer_cost[(node_y, node_x)] = adj_cost_matrix.T.copy()
 
         self._adj_dict[node_x].append(node_y)
         self._adj_dict[node_y].append(node_x)
@@ -116,11 +115,9 @@ class PBQPTuner(BaseGraphTuner):
         """Reduce nodes with degree 1."""
         adj_node = self._adj_dict[node_idx][0]
         ltf_matrix = self._layout_transform_interlayer_cost[(adj_node, node_idx)]
-        for i, cost_vec in enumerate(ltf_matrix):
-            min_cost = INVALID_LAYOUT_TIME
-            for j, cost in enumerate(cost_vec):
-                min_cost = min(min_cost, cost + self._record_cost_dict[node_idx][j])
-            self._record_cost_dict[adj_node][i] += min_cost
+        self._record_cost_dict[adj_node] += np.min(
+            ltf_matrix + self._record_cost_dict[node_idx], axis=1, initial=INVALID_LAYOUT_TIME
+        )
         self._remove_node(node_idx)
         self._reorder_adj_nodes(node_idx)
         self._stack.append(node_idx)
@@ -130,25 +127,20 @@ class PBQPTuner(BaseGraphTuner):
         adj_node_x, adj_node_y = self._adj_dict[node_idx]
         ltf_matrix_x = self._layout_transform_interlayer_cost[(adj_node_x, node_idx)]
         ltf_matrix_y = self._layout_transform_interlayer_cost[(adj_node_y, node_idx)]
-        delta_matrix = [[] for _ in range(len(ltf_matrix_x))]
-        for i, cost_vec_x in enumerate(ltf_matrix_x):
-            for j, cost_vec_y in enumerate(ltf_matrix_y):
-                min_cost = INVALID_LAYOUT_TIME
-                for k in range(len(self._record_cost_dict[node_idx])):
-                    min_cost = min(
-                        min_cost,
-                        cost_vec_x[k] + cost_vec_y[k] + self._record_cost_dict[node_idx][k],
-                    )
-                delta_matrix[i].append(min_cost)
+        # delta_matrix[i, j] = min_k(ltf_matrix_x[i, k] + ltf_matrix_y[j, k] + record_cost[k])
+        delta_matrix = np.min(
+            ltf_matrix_x[:, np.newaxis, :]
+            + ltf_matrix_y[np.newaxis, :, :]
+            + self._record_cost_dict[node_idx],
+            axis=2,
+            initial=INVALID_LAYOUT_TIME,
+        )
 
         if adj_node_x == adj_node_y:
-            for i, delta_row in enumerate(delta_matrix):
-                self._record_cost_dict[adj_node_x][i] += delta_row[i]
+            self._record_cost_dict[adj_node_x] += np.diagonal(delta_matrix)
         elif adj_node_x in self._adj_dict[adj_node_y]:
-            for i, _ in enumerate(delta_matrix):
-                for j, delta in enumerate(delta_matrix[i]):
-                    self._layout_transform_interlayer_cost[(adj_node_x, adj_node_y)][i][j] += delta
-                    self._layout_transform_interlayer_cost[(adj_node_y, adj_node_x)][j][i] += delta
+            self._layout_transform_interlayer_cost[(adj_node_x, adj_node_y)] += delta_matrix
+            self._layout_transform_interlayer_cost[(adj_node_y, adj_node_x)] += delta_matrix.T
         else:
             self._insert_edge(adj_node_x, adj_node_y, delta_matrix)
 
@@ -158,20 +150,13 @@ class PBQPTuner(BaseGraphTuner):
 
     def _RN_reduction(self, node_idx):
         """Reduce nodes with degree greater than 2."""
-        min_cost = INVALID_LAYOUT_TIME
-        record_idx = -1
-
-        for i, record_cost in enumerate(self._record_cost_dict[node_idx]):
-            current_cost = record_cost
-            for adj_node in self._adj_dict[node_idx]:
-                ltf_matrix = self._layout_transform_interlayer_cost[(node_idx, adj_node)]
-                adj_record_cost = list(self._record_cost_dict[adj_node])
-                for j, ltf_cost in enumerate(ltf_matrix[i]):
-                    adj_record_cost[j] += ltf_cost
-                current_cost += min(adj_record_cost)
-            if current_cost < min_cost:
-                min_cost = current_cost
-                record_idx = i
+        current_costs = np.array(self._record_cost_dict[node_idx])
+        for adj_node in self._adj_dict[node_idx]:
+            ltf_matrix = self._layout_transform_interlayer_cost[(node_idx, adj_node)]
+            current_costs += np.min(ltf_matrix + self._record_cost_dict[adj_node], axis=1)
+        record_idx = int(np.argmin(current_costs)) if current_costs.size else -1
+        if record_idx >= 0 and not current_costs[record_idx] < INVALID_LAYOUT_TIME:
+            record_idx = -1
 
         if record_idx < 0:
             raise RuntimeError(
@@ -182,8 +167,7 @@ class PBQPTuner(BaseGraphTuner):
 
         for adj_node in self._adj_dict[node_idx]:
             ltf_matrix = self._layout_transform_interlayer_cost[(node_idx, adj_node)]
-            for i, ltf_cost in enumerate(ltf_matrix[record_idx]):
-                self._record_cost_dict[adj_node][i] += ltf_cost
+            self._record_cost_dict[adj_node] += ltf_matrix[record_idx]
 
         self._remove_node(node_idx)
         self._reorder_adj_nodes(node_idx)
@@ -214,23 +198,19 @@ class PBQPTuner(BaseGraphTuner):
         """Backward pass in PBQP to generate optimal solution."""
         # Solve nodes left in the forward graph
         for node_idx in self._buckets[0]:
-            record_costs = self._record_cost_dict[node_idx]
-            min_cost = min(record_costs)
-            self._optimal_record_dict[node_idx] = record_costs.index(min_cost)
+            self._optimal_record_dict[node_idx] = int(np.argmin(self._record_cost_dict[node_idx]))
 
         # Solve nodes with one or two degrees
         for node_idx in reversed(self._stack):
             self._backward_insert_node(node_idx)
             if node_idx not in self._optimal_record_dict:
-                record_costs = list(self._record_cost_dict[node_idx])
+                record_costs = np.array(self._record_cost_dict[node_idx])
                 for adj_node in self._adj_dict[node_idx]:
                     adj_optimal_idx = self._optimal_record_dict[adj_node]
-                    for i, _ in enumerate(record_costs):
-                        record_costs[i] += self._layout_transform_interlayer_cost[
-                            (node_idx, adj_node)
-                        ][i][adj_optimal_idx]
-                min_cost = min(record_costs)
-                self._optimal_record_dict[node_idx] = record_costs.index(min_cost)
+                    record_costs += self._layout_transform_interlayer_cost[(node_idx, adj_node)][
+                        :, adj_optimal_idx
+                    ]
+                self._optimal_record_dict[node_idx] = int(np.argmin(record_costs))
 
     def run(self, **kwargs):
         """Run partitioned boolean quadratic programming tuner."""
@@ -254,14 +234,10 @@ class PBQPTuner(BaseGraphTuner):
                 if target_input_idx < 0:
                     continue
 
-                temp[(target_input_idx, key)] = []
-                record_candidates = self._node_list[target_input_idx]["record_candidates"]
-                for j in range(len(record_candidates)):
-                    temp[(target_input_idx, key)].append([])
-                    for k in range(len(record_candidates)):
-                        temp[(target_input_idx, key)][j].append(
-                            0 if j == k else INVALID_LAYOUT_TIME
-                        )
+                num_candidates = len(self._node_list[target_input_idx]["record_candidates"])
+                temp[(target_input_idx, key)] = np.where(
+                    np.eye(num_candidates, dtype=bool), 0.0, INVALID_LAYOUT_TIME
+                )
 
                 for j in range(target_input_pos + 1, len(val)):
                     input_idx = val[j]
@@ -277,11 +253,7 @@ class PBQPTuner(BaseGraphTuner):
         temp = {}
         for idx_pair, ltf_matrix in self._layout_transform_interlayer_cost.items():
             reverse_key = (idx_pair[1], idx_pair[0])
-            reverse_matrix = [[] for _ in range(len(ltf_matrix[0]))]
-            for i, _ in enumerate(ltf_matrix):
-                for j, ltf in enumerate(ltf_matrix[i]):
-                    reverse_matrix[j].append(ltf)
-            temp[reverse_key] = reverse_matrix
+            temp[reverse_key] = np.asarray(ltf_matrix).T.copy()
         self._layout_transform_interlayer_cost.update(temp)
 
         self._forward()
@@ -200,7 +200,7 @@ class Runner(object):
         raise NotImplementedError()
 
 
-def measure_option(builder, runner):
+def measure_option(builder, runner, pipeline=False):
     """
     Set options for measure. To measure a config, we will build it and run it.
     So we have to set options for these two steps.
@@ -212,6 +212,12 @@ def measure_option(builder, runner):
         Specify how to build programs
     runner: Runner
         Specify how to run programs
+    pipeline: bool
+        If True, start running each program as soon as it is built, while the rest of the batch
+        is still being built, and hand the results to the tuner in completion order.
+        This keeps the device busy when builds are slow, but measurements on the local CPU
+        then share it with the compiler, so only enable it when the runner measures on a
+        separate device or on cores not used by the builder.
 
     Examples
     --------
@@ -258,6 +264,7 @@ def measure_option(builder, runner):
     opt = {
         "builder": builder,
         "runner": runner,
+        "pipeline": pipeline,
     }
 
     return opt
@@ -289,11 +296,27 @@ def create_measure_batch(task, option):
     build_kwargs = runner.get_build_kwargs()
     builder.set_task(task, build_kwargs)
 
+    pipeline = (
+        option.get("pipeline", False)
+        and hasattr(builder, "build_iter")
+        and hasattr(runner, "run_iter")
+    )
+
+    def measure_stream(measure_inputs):
+        """Measure a batch of configs, yielding (index, result) pairs in completion order."""
+        if pipeline:
+            yield from runner.run_iter(measure_inputs, builder.build_iter(measure_inputs))
+        else:
+            build_results = builder.build(measure_inputs)
+            yield from enumerate(runner.run(measure_inputs, build_results))
+
     def measure_batch(measure_inputs):
-        build_results = builder.build(measure_inputs)
-        results = runner.run(measure_inputs, build_results)
+        results = [None] * len(measure_inputs)
+        for idx, res in measure_stream(measure_inputs):
+            results[idx] = res
         return results
 
+    measure_batch.stream = measure_stream
     measure_batch.n_parallel = builder.n_parallel
     measure_batch.attach_objects = attach_objects
     return measure_batch
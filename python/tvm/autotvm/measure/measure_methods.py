@@ -25,7 +25,9 @@ These functions are responsible for building the tvm module, uploading it to
 remote devices, recording the running time costs, and checking the correctness of the output.
 """
 
+import concurrent.futures
 import contextlib
+import functools
 import logging
 import os
 import shutil
@@ -38,12 +40,15 @@ import warnings
 from collections import namedtuple
 from random import getrandbits
 
+import numpy as np
+
 import tvm._ffi
 import tvm.ir.transform
 from tvm import nd
 from tvm import rpc as _rpc
 from tvm.autotvm.env import AutotvmGlobalScope, reset_global_scope
 from tvm.contrib import ndk, stackvm, tar
+from tvm.contrib.cpu_affinity import bind_to_cpus, bound_initializer
 from tvm.contrib.popen_pool import PopenPoolExecutor
 from tvm.driver import build
 from tvm.error import TVMError
@@ -95,6 +100,10 @@ class LocalBuilder(Builder):
         If False, do not fork when building. Requires n_parallel=1.
     runtime: Optional[Runtime]
         Specify the runtime to generate artifacts for
+    cpu_affinity: Optional[List[int]]
+        The CPUs to pin the build workers to, e.g. to keep them off the CPUs of the runner.
+        "n_parallel=None" then uses one worker per given CPU.
+        See `tvm.contrib.cpu_affinity.partition_cpus`.
     """
 
     def __init__(
@@ -105,7 +114,15 @@ class LocalBuilder(Builder):
         build_func="default",
         do_fork=False,
         runtime=None,
+        cpu_affinity=None,
     ):
+        if not do_fork:
+            assert n_parallel in (
+                None,
+                1,
+            ), f"if do_fork=False, need n_parallel=None or 1; got {n_parallel}"
+        if n_parallel is None and cpu_affinity:
+            n_parallel = len(cpu_affinity)
         super(LocalBuilder, self).__init__(timeout, n_parallel, build_kwargs)
 
         if isinstance(build_func, str):
@@ -118,81 +135,95 @@ class LocalBuilder(Builder):
             else:
                 raise ValueError("Invalid build_func" + build_func)
         self.build_func = _WrappedBuildFunc(build_func, runtime)
-        if not do_fork:
-            assert n_parallel in (
-                None,
-                1,
-            ), f"if do_fork=False, need n_parallel=None or 1; got {n_parallel}"
         self.executor = PopenPoolExecutor(
-            timeout=timeout, initializer=reset_global_scope, initargs=(AutotvmGlobalScope.current,)
+            max_workers=self.n_parallel,
+            timeout=timeout,
+            initializer=bound_initializer(cpu_affinity, reset_global_scope),
+            initargs=(AutotvmGlobalScope.current,),
         )
         self.tmp_dir = tempfile.mkdtemp()
 
     def build(self, measure_inputs):
-        results = []
+        results = [None] * len(measure_inputs)
+        for idx, res in self.build_iter(measure_inputs):
+            results[idx] = res
+        return results
+
+    def build_iter(self, measure_inputs):
+        """Build programs, yielding the results as soon as each build finishes.
 
+        All the builds are queued to the pool at once, so a slow build only occupies its own
+        worker instead of stalling a whole slice of `n_parallel` builds.
+
+        Parameters
+        ----------
+        measure_inputs: List[MeasureInput]
+            The measure input
+
+        Yields
+        ------
+        index: int
+            The index of the measure input that has been built.
+        build_result: BuildResult or MeasureResult
+            The build result, or a MeasureResult holding the error if the build failed.
+        """
         shutil.rmtree(self.tmp_dir, ignore_errors=True)
         self.tmp_dir = tempfile.mkdtemp()
 
-        for i in range(0, len(measure_inputs), self.n_parallel):
-            futures = []
-            for inp in measure_inputs[i : i + self.n_parallel]:
-                ret = self.executor.submit(self.build_func, inp, self.tmp_dir, **self.build_kwargs)
-                futures.append(ret)
+        futures = {}
+        for idx, inp in enumerate(measure_inputs):
+            future = self.executor.submit(self.build_func, inp, self.tmp_dir, **self.build_kwargs)
+            futures[future] = idx
+        for future in concurrent.futures.as_completed(futures):
+            yield futures[future], self._get_build_result(future)
 
-            for future in futures:
-                try:
-                    res = future.result()
-                    if res.error is not None:
-                        assert len(res.error) == 2, (
-                            f"BuildResult errors should be a 2-tuple, but it is a {len(res.error)}"
-                            "-tuple. This should not happen!"
-                        )
-                        tb, exception = res.error
-                        # instantiation error
-                        if isinstance(exception, InstantiationError):
-                            res = MeasureResult(
-                                (tb, exception),
-                                MeasureErrorNo.INSTANTIATION_ERROR,
-                                res.time_cost,
-                                time.time(),
-                            )
-
-                        else:
-                            if "InstantiationError" in str(exception):
-                                msg = str(exception)
-                                try:
-                                    msg = msg.split("\n")[-2].split(": ")[1]
-                                except Exception:  # pylint: disable=broad-except
-                                    pass
-                                res = MeasureResult(
-                                    (tb, InstantiationError(msg)),
-                                    MeasureErrorNo.INSTANTIATION_ERROR,
-                                    res.time_cost,
-                                    time.time(),
-                                )
-
-                            else:  # tvm error
-                                res = MeasureResult(
-                                    (tb, res.error),
-                                    MeasureErrorNo.COMPILE_HOST,
-                                    res.time_cost,
-                                    time.time(),
-                                )
-                except TimeoutError as ex:
-                    tb = traceback.format_exc()
-                    res = MeasureResult(
-                        (tb, ex), MeasureErrorNo.BUILD_TIMEOUT, self.timeout, time.time()
-                    )
-                except ChildProcessError as ex:
-                    tb = traceback.format_exc()
+    def _get_build_result(self, future):
+        """Get the result of a finished build, converting errors into MeasureResult."""
+        try:
+            res = future.result()
+            if res.error is not None:
+                assert len(res.error) == 2, (
+                    f"BuildResult errors should be a 2-tuple, but it is a {len(res.error)}"
+                    "-tuple. This should not happen!"
+                )
+                tb, exception = res.error
+                # instantiation error
+                if isinstance(exception, InstantiationError):
                     res = MeasureResult(
-                        (tb, ex), MeasureErrorNo.RUNTIME_DEVICE, self.timeout, time.time()
+                        (tb, exception),
+                        MeasureErrorNo.INSTANTIATION_ERROR,
+                        res.time_cost,
+                        time.time(),
                     )
 
-                results.append(res)
+                else:
+                    if "InstantiationError" in str(exception):
+                        msg = str(exception)
+                        try:
+                            msg = msg.split("\n")[-2].split(": ")[1]
+                        except Exception:  # pylint: disable=broad-except
+                            pass
+                        res = MeasureResult(
+                            (tb, InstantiationError(msg)),
+                            MeasureErrorNo.INSTANTIATION_ERROR,
+                            res.time_cost,
+                            time.time(),
+                        )
 
-        return results
+                    else:  # tvm error
+                        res = MeasureResult(
+                            (tb, res.error),
+                            MeasureErrorNo.COMPILE_HOST,
+                            res.time_cost,
+                            time.time(),
+                        )
+        except TimeoutError as ex:
+            tb = traceback.format_exc()
+            res = MeasureResult((tb, ex), MeasureErrorNo.BUILD_TIMEOUT, self.timeout, time.time())
+        except ChildProcessError as ex:
+            tb = traceback.format_exc()
+            res = MeasureResult((tb, ex), MeasureErrorNo.RUNTIME_DEVICE, self.timeout, time.time())
+        return res
 
 
 class RPCRunner(Runner):
@@ -335,7 +366,31 @@ class RPCRunner(Runner):
         return kwargs
 
     def run(self, measure_inputs, build_results):
-        results = []
+        results = [None] * len(measure_inputs)
+        for idx, res in self.run_iter(measure_inputs, enumerate(build_results)):
+            results[idx] = res
+        return results
+
+    def run_iter(self, measure_inputs, build_results):
+        """Run the built programs as soon as they are available, yielding the results in
+        completion order. At most `n_parallel` measurements are in flight at a time.
+
+        Parameters
+        ----------
+        measure_inputs: List[MeasureInput]
+            The measure input
+        build_results: Iterable[Tuple[int, BuildResult or MeasureResult]]
+            The index and build result of each measure input, in any order.
+            This can be a generator such as `LocalBuilder.build_iter`, so that the
+            measurements overlap with the builds that are still running.
+
+        Yields
+        ------
+        index: int
+            The index of the measure input that has been measured.
+        result: MeasureResult
+            The measure result.
+        """
         remote_kwargs = dict(
             device_key=self.key,
             host=self.host,
@@ -343,45 +398,67 @@ class RPCRunner(Runner):
             priority=self.priority,
             timeout=self.timeout,
         )
+        module_loader = (
+            self.module_loader if self.module_loader is not None else default_module_loader()
+        )
 
-        for i in range(0, len(measure_inputs), self.n_parallel):
-            futures = []
-            for measure_inp, build_res in zip(
-                measure_inputs[i : i + self.n_parallel], build_results[i : i + self.n_parallel]
-            ):
-                module_loader = (
-                    self.module_loader
-                    if self.module_loader is not None
-                    else default_module_loader()
-                )
-                ret = self.executor.submit(
-                    run_through_rpc,
-                    measure_inp,
-                    build_res,
-                    self.number,
-                    self.repeat,
-                    self.min_repeat_ms,
-                    self.cooldown_interval,
-                    remote_kwargs,
-                    self.ref_input,
-                    self.enable_cpu_cache_flush,
-                    module_loader,
+        pending = {}
+        variations = []
+
+        def _collect(idx, res):
+            if res.error_no == MeasureErrorNo.NO_ERROR and len(res.costs) > 1:
+                mean = np.mean(res.costs)
+                if mean > 0:
+                    variations.append(np.std(res.costs) / mean)
+            return idx, res
+
+        for idx, build_res in build_results:
+            if isinstance(build_res, MeasureResult):
+                # The build failed, there is nothing to run
+                yield idx, build_res
+                continue
+            while len(pending) >= self.n_parallel:
+                done, _ = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
                 )
-                futures.append(ret)
-
-            for future in futures:
-                try:
-                    res = future.result()
-                    results.append(res)
-                except Exception as ex:  # pylint: disable=broad-except
-                    tb = traceback.format_exc()
-                    results.append(
-                        MeasureResult(
-                            (tb, ex), MeasureErrorNo.RUN_TIMEOUT, self.timeout, time.time()
-                        )
-                    )
+                for future in done:
+                    yield _collect(pending.pop(future), self._get_run_result(future))
+            future = self.executor.submit(
+                run_through_rpc,
+                measure_inputs[idx],
+                build_res,
+                self.number,
+                self.repeat,
+                self.min_repeat_ms,
+                self.cooldown_interval,
+                remote_kwargs,
+                self.ref_input,
+                self.enable_cpu_cache_flush,
+                module_loader,
+            )
+            pending[future] = idx
+            for future in [f for f in pending if f.done()]:
+                yield _collect(pending.pop(future), self._get_run_result(future))
+        for future in concurrent.futures.as_completed(list(pending)):
+            yield _collect(pending.pop(future), self._get_run_result(future))
+        if variations:
+            # The spread of the repeated measurements of the same config, which grows when
+            # the measurements contend with other work, e.g. the builders
+            logger.debug(
+                "Coefficient of variation of the repeated measurements: "
+                "mean %.2f%%, max %.2f%% over %d configs",
+                100.0 * np.mean(variations),
+                100.0 * np.max(variations),
+                len(variations),
+            )
 
-        return results
+    def _get_run_result(self, future):
+        """Get the result of a finished measurement, converting errors into MeasureResult."""
+        try:
+            return future.result()
+        except Exception as ex:  # pylint: disable=broad-except
+            tb = traceback.format_exc()
+            return MeasureResult((tb, ex), MeasureErrorNo.RUN_TIMEOUT, self.timeout, time.time())
 
 
 class LocalRunner(RPCRunner):
@@ -415,6 +492,10 @@ class LocalRunner(RPCRunner):
         its actual latency during end-to-end inference.
         To make this option effective, the argument `number` should also be set to 1.
         This is only has effect on CPU task.
+    cpu_affinity: Optional[List[int]]
+        The CPUs to pin the local RPC server, and so the measured kernels, to,
+        e.g. to keep them off the CPUs of the builder.
+        See `tvm.contrib.cpu_affinity.partition_cpus`.
     Note
     ----
     This is a "fake" local mode. We start a silent rpc tracker and rpc server
@@ -430,6 +511,7 @@ class LocalRunner(RPCRunner):
         cooldown_interval=0.1,
         enable_cpu_cache_flush=False,
         module_loader=None,
+        cpu_affinity=None,
     ):
         super(LocalRunner, self).__init__(
             "",
@@ -447,6 +529,7 @@ class LocalRunner(RPCRunner):
         )
         self.tracker = None
         self.server = None
+        self.cpu_affinity = cpu_affinity
 
     def set_task(self, task):
         # pylint: disable=import-outside-toplevel
@@ -462,6 +545,10 @@ class LocalRunner(RPCRunner):
             key=device_key,
             silent=True,
             tracker_addr=("127.0.0.1", tracker.port),
+            # The sessions are forked from the server process and inherit its affinity
+            server_init_callback=functools.partial(bind_to_cpus, self.cpu_affinity)
+            if self.cpu_affinity
+            else None,
         )
         self.key = device_key
         self.host = "127.0.0.1"
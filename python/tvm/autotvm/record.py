@@ -23,6 +23,8 @@
 
 import argparse
 import base64
+from collections import deque
+import functools
 from io import TextIOBase
 import logging
 import pickle
@@ -127,6 +129,16 @@ def encode(inp, result, protocol="json"):
     raise RuntimeError("Invalid log protocol: " + protocol)
 
 
+@functools.lru_cache(maxsize=1024)
+def _parse_target(tgt):
+    """Parse the target string of a record. Logs only contain a handful of distinct
+    targets, so the parsed targets are cached instead of re-parsed for every row."""
+    if "-target" in tgt:
+        logger.warning('"-target" is deprecated, use "-mtriple" instead.')
+        tgt = tgt.replace("-target", "-mtriple")
+    return Target(tgt)
+
+
 def decode(row, protocol="json"):
     """Decode encoded record string to python object
 
@@ -155,11 +167,7 @@ def decode(row, protocol="json"):
             return None
 
         tgt, task_name, task_args, task_kwargs = row["input"]
-        tgt = str(tgt)
-        if "-target" in tgt:
-            logger.warning('"-target" is deprecated, use "-mtriple" instead.')
-            tgt = tgt.replace("-target", "-mtriple")
-        tgt = Target(str(tgt))
+        tgt = _parse_target(str(tgt))
 
         def clean_json_to_python(x):
             """1. Convert all list in x to tuple (hashable)
@@ -242,6 +250,87 @@ def load_from_file(filepath: Union[str, bytes, os.PathLike]):
                 yield ret
 
 
+def _read_rows_in_range(filepath, begin, end):
+    """Read the rows that start within the byte range [begin, end) of a file."""
+    with open(filepath, "rb") as f:
+        if begin > 0:
+            f.seek(begin - 1)
+            if f.read(1) != b"\n":
+                # the partial row belongs to the previous range
+                f.readline()
+        while f.tell() < end:
+            row = f.readline()
+            if not row:
+                break
+            yield row.decode()
+
+
+def _decode_range(filepath, begin, end):
+    """Decode the rows in a byte range of a file, in a worker process.
+    The target and the task are returned in their serialized form, which is much cheaper
+    to pickle, and are rebuilt by `load_from_file_parallel` in the main process."""
+    decoded = []
+    for row in _read_rows_in_range(filepath, begin, end):
+        if row and not row.startswith("#"):
+            ret = decode(row)
+            if ret is None:
+                continue
+            inp, res = ret
+            decoded.append((str(inp.target), inp.task.name, inp.task.args, inp.config, res))
+    return decoded
+
+
+def load_from_file_parallel(
+    filepath: Union[str, bytes, os.PathLike], n_parallel=None, chunk_bytes=4 * 1024 * 1024
+):
+    """Generator: load records from path, decoding them with multiple processes.
+    The file is split into byte ranges of `chunk_bytes` that are decoded in parallel,
+    and the records are yielded in the same order as in the file.
+
+    Parameters
+    ----------
+    filepath: str, bytes, or os.PathLike
+    n_parallel: int, optional
+        The number of worker processes. Defaults to the number of CPUs.
+    chunk_bytes: int
+        The size of a byte range decoded by a worker at a time.
+
+    Yields
+    ------
+    input: autotvm.measure.MeasureInput
+    result: autotvm.measure.MeasureResult
+    """
+    n_parallel = n_parallel or os.cpu_count()
+    file_size = os.path.getsize(filepath)
+    ranges = [
+        (begin, min(begin + chunk_bytes, file_size)) for begin in range(0, file_size, chunk_bytes)
+    ]
+    if len(ranges) <= 1:
+        yield from load_from_file(filepath)
+        return
+
+    pool = popen_pool.PopenPoolExecutor(max_workers=n_parallel)
+    pending = deque()
+    try:
+        for begin, end in ranges:
+            # bound the number of decoded ranges held in memory
+            if len(pending) >= 2 * n_parallel:
+                yield from _assemble_decoded(pending.popleft().result())
+            pending.append(pool.submit(_decode_range, filepath, begin, end))
+        while pending:
+            yield from _assemble_decoded(pending.popleft().result())
+    finally:
+        for future in pending:
+            future.cancel()
+        del pool
+
+
+def _assemble_decoded(decoded):
+    """Rebuild the records decoded by `_decode_range`."""
+    for tgt, task_name, task_args, config, result in decoded:
+        yield MeasureInput(_parse_target(tgt), task.Task(task_name, task_args), config), result
+
+
 def split_workload(in_file, clean=True):
     """Split a log file into separate files, each of which contains only a single workload
     This function can also delete duplicated records in log file
@@ -254,11 +343,8 @@ def split_workload(in_file, clean=True):
         whether delete duplicated items
     """
     tic = time.time()
-    lines = list(open(in_file).readlines())
-
     logger.info("start converting...")
-    pool = popen_pool.PopenPoolExecutor()
-    lines = [rec for rec in pool.map(decode, lines) if rec is not None]
+    lines = list(load_from_file_parallel(in_file))
     logger.info("map done %.2f", time.time() - tic)
 
     wkl_dict = OrderedDict()
@@ -307,7 +393,7 @@ def pick_best(in_file, out_file):
     out_file: str or file
         The filename of output
     """
-    context = load_from_file(in_file)
+    context = load_from_file_parallel(in_file)
     if os.path.isfile(out_file):
         out_context = load_from_file(out_file)
         context = itertools.chain(context, out_context)
@@ -330,6 +416,46 @@ def pick_best(in_file, out_file):
             best_set.remove(measure_str_key(inp))
 
 
+def compact_log(in_file, out_file=None, top_k=1):
+    """Compact a log file: keep the top k records of each workload and target, drop the failed
+    measurements and the duplicated configs, and rewrite the log atomically. Unlike
+    `pick_best`, which keeps the best record per target key, the records are ranked per full
+    target string, and the kept records stay in their order in the log.
+
+    Parameters
+    ----------
+    in_file: str
+        The log file, in the json protocol.
+    out_file: Optional[str]
+        The file to write the compacted log to. Defaults to the log itself.
+    top_k: int
+        The number of records kept per workload and target.
+
+    Returns
+    -------
+    report: tvm.contrib.tuning_log_compaction.CompactionReport
+        The report of the compaction.
+    """
+    # pylint: disable=import-outside-toplevel
+    from ..contrib.tuning_log_compaction import ParsedLine, compact_log_file
+
+    def _parse(row):
+        try:
+            decoded = decode(row)
+        except Exception:  # pylint: disable=broad-except
+            return None
+        if decoded is None:
+            return None
+        inp, res = decoded
+        return ParsedLine(
+            group=measure_str_key(inp, include_config=False),
+            candidate=measure_str_key(inp),
+            cost=float(np.mean(res.costs)) if res.error_no == 0 else None,
+        )
+
+    return compact_log_file(str(in_file), _parse, top_k=top_k, out_path=out_file)
+
+
 """
 Usage:
 This record executable module has three modes.
@@ -342,16 +468,20 @@ e.g. python -m tvm.autotvm.record --mode pick --i collect.log
 
 * Split a log file into separate files, each of which contains only a single wkl
 e.g. python -m tvm.autotvm.record --mode split --i collect.log
+
+* Convert a log file to an indexed record store, or add its new lines to an existing one
+e.g. python -m tvm.autotvm.record --mode index --i collect.log --o collect.db --top-k 4
 """
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("--mode", choices=["read", "pick", "split"], default="read")
+    parser.add_argument("--mode", choices=["read", "pick", "split", "index"], default="read")
     parser.add_argument("--i", type=str, help="input file")
     parser.add_argument("--o", type=str, default=None, help="output file")
     parser.add_argument("--begin", type=int, default=0)
     parser.add_argument("--end", type=int, default=5)
     parser.add_argument("--ir", action="store_true")
     parser.add_argument("--code", action="store_true")
+    parser.add_argument("--top-k", type=int, default=1, help="records kept per workload")
 
     args = parser.parse_args()
     logging.basicConfig(level=logging.INFO)
@@ -379,3 +509,8 @@ if __name__ == "__main__":
                         print(func.imported_modules[0].get_source())
     elif args.mode == "split":
         split_workload(args.i)
+    elif args.mode == "index":
+        from .record_store import convert_log_to_store  # pylint: disable=import-outside-toplevel
+
+        args.o = args.o or args.i + ".db"
+        convert_log_to_store(args.i, args.o, top_k=args.top_k).close()
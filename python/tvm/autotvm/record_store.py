@@ -0,0 +1,311 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name
+"""
+Indexed on-disk store of tuning records.
+
+Unlike a text log, which has to be decoded line by line by `load_from_file`
+and scanned as a whole by `ApplyHistoryBest`, a record store keeps only the
+top-k records of every (target key, workload) pair in an indexed sqlite table.
+The best config of a workload is then a single index lookup, and only the
+records that are actually queried get decoded.
+
+Usage:
+    store = RecordStore("tuning.db", top_k=4)
+    store.ingest("tuning.log")  # only reads the lines appended since last time
+    with autotvm.apply_history_best(store):
+        ...
+"""
+import functools
+import json
+import logging
+import os
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import numpy as np
+
+from ..target import Target
+from .measure import MeasureInput, MeasureResult
+from .record import decode, encode
+
+logger = logging.getLogger("autotvm")
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS records ("
+    " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+    " target_key TEXT NOT NULL,"
+    " workload TEXT NOT NULL,"
+    " cost REAL NOT NULL,"
+    " row TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS records_by_key ON records (target_key, workload, cost)",
+    "CREATE TABLE IF NOT EXISTS sources (path TEXT PRIMARY KEY, offset INTEGER NOT NULL)",
+]
+
+
+def _clean_json_to_python(x):
+    """Convert all lists in x to tuples, the same way `decode` builds a workload."""
+    if isinstance(x, list):
+        return tuple(_clean_json_to_python(a) for a in x)
+    return x
+
+
+@functools.lru_cache(maxsize=None)
+def _target_index_keys(target_str: str) -> Tuple[str, ...]:
+    """The keys under which ApplyHistoryBest indexes records of a target."""
+    if "-target" in target_str:
+        target_str = target_str.replace("-target", "-mtriple")
+    target = Target(target_str)
+    keys = ["key:" + k for k in target.keys]
+    if target.model != "unknown":
+        keys.append("model:" + target.model)
+    return tuple(keys)
+
+
+def workload_key(workload: tuple) -> str:
+    """Serialize the workload of a task, i.e. `task.workload`, as an index key."""
+    return repr(workload)
+
+
+class RecordStore(object):
+    """An indexed on-disk store that keeps the top-k tuning records per target and workload.
+
+    Parameters
+    ----------
+    path: str
+        The path of the sqlite file. Created if it does not exist.
+    top_k: int
+        The number of records kept for each (target key, workload) pair.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], top_k: int = 1):
+        if top_k < 1:
+            raise ValueError(f"top_k must be positive, got {top_k}")
+        self.path = str(path)
+        self.top_k = top_k
+        self._conn = sqlite3.connect(self.path)
+        with self._conn:
+            for stmt in _SCHEMA:
+                self._conn.execute(stmt)
+        self._cache: Dict[Tuple[str, str], Optional[Tuple[MeasureInput, MeasureResult]]] = {}
+
+    def close(self):
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, ptype, value, trace):
+        self.close()
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(DISTINCT row) FROM records").fetchone()[0]
+
+    def __bool__(self):
+        return True
+
+    def _insert_rows(self, rows: Iterable[str]) -> int:
+        """Index encoded json rows and prune every touched key to its top-k.
+        Must be called inside a transaction."""
+        touched: Set[Tuple[str, str]] = set()
+        num_rows = 0
+        for row in rows:
+            row = row.strip()
+            if not row or row.startswith("#"):
+                continue
+            parsed = json.loads(row)
+            if "v" in parsed and parsed["v"] == 0.1:
+                continue
+            costs, error_no = parsed["result"][0], parsed["result"][1]
+            if error_no != 0:
+                continue
+            target_str, task_name, task_args, _ = parsed["input"]
+            wkl = workload_key((task_name,) + _clean_json_to_python(task_args))
+            cost = float(np.mean(costs))
+            for key in _target_index_keys(str(target_str)):
+                self._conn.execute(
+                    "INSERT INTO records (target_key, workload, cost, row) VALUES (?, ?, ?, ?)",
+                    (key, wkl, cost, row),
+                )
+                touched.add((key, wkl))
+            num_rows += 1
+        for key, wkl in touched:
+            self._conn.execute(
+                "DELETE FROM records WHERE target_key = ? AND workload = ? AND id NOT IN ("
+                " SELECT id FROM records WHERE target_key = ? AND workload = ?"
+                " ORDER BY cost, id LIMIT ?)",
+                (key, wkl, key, wkl, self.top_k),
+            )
+            self._cache.pop((key, wkl), None)
+        return num_rows
+
+    def add(self, records: Iterable[Tuple[MeasureInput, MeasureResult]]) -> int:
+        """Add measured records to the store.
+
+        Parameters
+        ----------
+        records: Iterable of (autotvm.measure.MeasureInput, autotvm.measure.MeasureResult)
+            The records to add.
+
+        Returns
+        -------
+        num_records: int
+            The number of valid records added.
+        """
+        with self._conn:
+            return self._insert_rows(encode(inp, res) for inp, res in records)
+
+    def ingest(self, log_file: Union[str, os.PathLike]) -> int:
+        """Incrementally add the records of a text log to the store.
+        Only the complete lines appended since the last ingest of the same file are read,
+        so this can be called repeatedly on a log that is still being written.
+
+        Parameters
+        ----------
+        log_file: str or os.PathLike
+            The path of a log file written by `autotvm.callback.log_to_file`.
+
+        Returns
+        -------
+        num_records: int
+            The number of valid records added.
+        """
+        log_file = os.path.abspath(log_file)
+        found = self._conn.execute(
+            "SELECT offset FROM sources WHERE path = ?", (log_file,)
+        ).fetchone()
+        offset = found[0] if found else 0
+        if os.path.getsize(log_file) < offset:
+            logger.warning("%s has been truncated, ingesting it from the beginning", log_file)
+            offset = 0
+        with open(log_file, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1
+        with self._conn:
+            num_rows = self._insert_rows(data[:end].decode("utf-8").splitlines())
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sources (path, offset) VALUES (?, ?)",
+                (log_file, offset + end),
+            )
+        logger.debug("Ingested %d records from %s", num_rows, log_file)
+        return num_rows
+
+    def _query_key(
+        self, key: str, workload: str, top_k: int
+    ) -> List[Tuple[MeasureInput, MeasureResult]]:
+        rows = self._conn.execute(
+            "SELECT row FROM records WHERE target_key = ? AND workload = ?"
+            " ORDER BY cost, id LIMIT ?",
+            (key, workload, top_k),
+        ).fetchall()
+        return [rec for rec in (decode(row) for (row,) in rows) if rec is not None]
+
+    def _index_keys(self, target: Target) -> List[str]:
+        keys = []
+        if target.model != "unknown":
+            keys.append("model:" + target.model)
+        keys.extend("key:" + k for k in target.keys)
+        return keys
+
+    def query(
+        self, target: Target, workload: tuple
+    ) -> Optional[Tuple[MeasureInput, MeasureResult]]:
+        """Query the best record of a workload, matching by target model first and then
+        by target keys, the same way as `ApplyHistoryBest`.
+
+        Parameters
+        ----------
+        target: Target
+            The compilation target.
+        workload: tuple
+            The workload of the task, i.e. `task.workload`.
+
+        Returns
+        -------
+        record: Optional[Tuple[MeasureInput, MeasureResult]]
+            The best record, or None if the workload is not in the store.
+        """
+        wkl = workload_key(workload)
+        for key in self._index_keys(target):
+            if (key, wkl) not in self._cache:
+                found = self._query_key(key, wkl, 1)
+                self._cache[(key, wkl)] = found[0] if found else None
+            if self._cache[(key, wkl)] is not None:
+                return self._cache[(key, wkl)]
+        return None
+
+    def get_top_k(
+        self, target: Target, workload: tuple, top_k: Optional[int] = None
+    ) -> List[Tuple[MeasureInput, MeasureResult]]:
+        """Get the top-k records of a workload, sorted by mean cost.
+
+        Parameters
+        ----------
+        target: Target
+            The compilation target.
+        workload: tuple
+            The workload of the task, i.e. `task.workload`.
+        top_k: Optional[int]
+            The number of records to return, at most the `top_k` of the store. Defaults to it.
+
+        Returns
+        -------
+        records: List[Tuple[MeasureInput, MeasureResult]]
+            The records of the first matching target key.
+        """
+        top_k = self.top_k if top_k is None else top_k
+        wkl = workload_key(workload)
+        for key in self._index_keys(target):
+            found = self._query_key(key, wkl, top_k)
+            if found:
+                return found
+        return []
+
+
+def convert_log_to_store(
+    log_files: Union[str, os.PathLike, List[Union[str, os.PathLike]]],
+    path: Union[str, os.PathLike],
+    top_k: int = 1,
+) -> RecordStore:
+    """Convert text logs to an indexed record store.
+
+    Parameters
+    ----------
+    log_files: str, os.PathLike, or list of them
+        The text logs to convert.
+    path: str or os.PathLike
+        The path of the record store.
+    top_k: int
+        The number of records kept for each (target key, workload) pair.
+
+    Returns
+    -------
+    store: RecordStore
+        The record store.
+    """
+    if isinstance(log_files, (str, os.PathLike)):
+        log_files = [log_files]
+    store = RecordStore(path, top_k=top_k)
+    for log_file in log_files:
+        num_rows = store.ingest(log_file)
+        logger.info("Converted %d records from %s to %s", num_rows, log_file, path)
+    return store
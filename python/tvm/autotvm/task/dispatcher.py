@@ -249,10 +249,11 @@ class ApplyHistoryBest(DispatchContext):
     ----------
     records : None, Records, or iterator of Records objects, where a
               Records object is a path-like object, a file-like object,
-              or an iterator of (MeasureInput, MeasureResult).
+              an iterator of (MeasureInput, MeasureResult), or a RecordStore.
 
         Collection of tuning records. If multiple Records objects are passed, their
-        contents will be merged.
+        contents will be merged. A RecordStore is not loaded into memory, but queried
+        on demand when no loaded record matches.
     """
 
     def __init__(self, records: Union[None, Records, Iterable[Records]]):
@@ -261,6 +262,7 @@ class ApplyHistoryBest(DispatchContext):
         self.best_by_targetkey = {}
         self.best_by_model = {}
         self._best_user_defined = {}
+        self._record_stores = []
 
         if records:
             self.load(records)
@@ -278,6 +280,7 @@ class ApplyHistoryBest(DispatchContext):
         """
         # pylint: disable=import-outside-toplevel
         from ..record import load_from_file, load_from_buffer
+        from ..record_store import RecordStore
 
         def _unpack_records(
             records: Union[Records, Iterable[Records]]
@@ -289,6 +292,10 @@ class ApplyHistoryBest(DispatchContext):
             if isinstance(records, TextIOBase):
                 return load_from_buffer(records)
 
+            if isinstance(records, RecordStore):
+                self._record_stores.append(records)
+                return []
+
             joint_records = []
             for record in records:
                 if isinstance(record, Tuple) and isinstance(record[0], MeasureInput):
@@ -358,6 +365,12 @@ class ApplyHistoryBest(DispatchContext):
                 inp, _ = self.best_by_targetkey[key]
                 return inp.config
 
+        # finally look up the record stores
+        for store in self._record_stores:
+            found = store.query(target, workload)
+            if found is not None:
+                return found[0].config
+
         return None
 
     def update(self, target, workload, cfg):
@@ -23,11 +23,13 @@ Decorator and utilities for the integration with TOPI and Relay
 99.9% copy-paste of implementation by @MerryMercy
 
 """
+import functools
 import threading
 import logging
 
 import tvm
 from tvm.autotvm.task.dispatcher import DispatchContext, FallbackContext
+from tvm.contrib.parallel_extraction import map_programs
 from tvm.target import Target
 from .task import create
 from .topi_integration import TaskExtractEnv
@@ -156,3 +158,56 @@ def extract_from_multiple_program(mods, params, target, target_host=None, ops=No
             logger.warning("Invalid shape during AutoTVM task creation")
 
     return tasks
+
+
+def _extract_from_program_worker(mod, params, target, ops):
+    return extract_from_program(mod, params, target, ops=ops)
+
+
+def extract_from_multiple_program_parallel(
+    programs, target, target_host=None, ops=None, n_parallel=None, timeout=None
+):
+    """Extract tuning tasks from multiple relay programs in parallel worker processes.
+
+    This function is the parallel version of extract_from_multiple_program. The identical tasks,
+    i.e. with the same name and arguments, are merged across the programs. The programs whose
+    extraction fails are logged and skipped.
+
+    Parameters
+    ----------
+    programs: List[Union[Tuple[tvm.IRModule, dict], Callable[[], Tuple[tvm.IRModule, dict]]]]
+        The programs, each either a (mod, params) pair or a function returning the pair, which
+        is called in the worker process, e.g. to load the model there.
+    target: tvm.target.Target
+        The compilation target
+    target_host: tvm.target.Target
+        The host compilation target
+    ops: List[tvm.ir.Op] or None
+        List of relay ops to be tuned.  If not specified, all tunable ops will be extracted.
+    n_parallel: Optional[int]
+        The number of worker processes. Defaults to the number of CPUs.
+    timeout: Optional[float]
+        The timeout of the extraction of each program, in seconds.
+
+    Returns
+    -------
+    tasks: Array of autotvm.task.Task
+        collected tasks
+    weights: Array of int
+        the number of programs each task is extracted from
+    """
+    target, target_host = Target.canon_target_and_host(target, target_host)
+    worker = functools.partial(_extract_from_program_worker, target=target, ops=ops)
+    tasks = []
+    weights = []
+    task_index = {}
+    for result in map_programs(worker, programs, n_parallel=n_parallel, timeout=timeout):
+        for tsk in result or []:
+            key = tsk.workload
+            if key in task_index:
+                weights[task_index[key]] += 1
+            else:
+                task_index[key] = len(tasks)
+                tasks.append(tsk)
+                weights.append(1)
+    return tasks, weights
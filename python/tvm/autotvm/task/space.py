@@ -680,6 +680,7 @@ class ConfigSpace(object):
         self.is_fallback = False
         self._shared_filter = None
         self._shared_filter_cache = None
+        self._shared_filter_mask = None
 
     @staticmethod
     def axis(var):
@@ -1020,6 +1021,7 @@ class ConfigSpace(object):
         self._length = None
         self._range_length = None
         self._shared_filter_cache = None
+        self._shared_filter_mask = None
 
     def _make_shared_filter_cache(self):
         def apply(t):
@@ -1030,6 +1032,7 @@ class ConfigSpace(object):
             return bool(self._shared_filter(entities))
 
         self._shared_filter_cache = tuple(apply(i) for i in range(self.range_length))
+        self._shared_filter_mask = np.array(self._shared_filter_cache, dtype=bool)
         self._length = self._shared_filter_cache.count(True)
 
     def point2knob(self, point):
@@ -1065,10 +1068,77 @@ class ConfigSpace(object):
             point of the knob representation
         """
         point = 0
-        for j, k in enumerate(knob):
-            point += int(np.prod(self.dims[:j])) * k
+        for dim, k in zip(reversed(self.dims[: len(knob)]), reversed(knob)):
+            point = point * dim + k
         return point
 
+    @property
+    def index_dtype(self):
+        """The NumPy dtype of the arrays of indexes in the space. Python ints (object) are used
+        when the range of the space does not fit in int64."""
+        return np.int64 if self.range_length < 2**63 else object
+
+    def points2knobs(self, points):
+        """Convert an array of points to knobs. This is the batch version of `point2knob`,
+        decoding all the points at once in mixed radix.
+
+        Parameters
+        ----------
+        points: Array of int
+            points to convert
+
+        Returns
+        -------
+        knobs: np.ndarray
+            the [len(points), len(dims)] matrix of the knob representations of the points
+        """
+        rest = np.asarray(points, dtype=self.index_dtype).reshape(-1)
+        knobs = np.empty((len(rest), len(self.dims)), dtype=rest.dtype)
+        for j, dim in enumerate(self.dims):
+            rest, knobs[:, j] = np.divmod(rest, dim)
+        return knobs
+
+    def knobs2points(self, knobs):
+        """Convert a matrix of knobs to points. This is the batch version of `knob2point`.
+
+        Parameters
+        ----------
+        knobs: Array of Array of int
+            knobs to convert, one knob per row
+
+        Returns
+        -------
+        points: np.ndarray
+            the points of the knob representations
+        """
+        knobs = np.asarray(knobs, dtype=self.index_dtype).reshape(-1, len(self.dims))
+        points = np.zeros(len(knobs), dtype=knobs.dtype)
+        for j in reversed(range(len(self.dims))):
+            points = points * self.dims[j] + knobs[:, j]
+        return points
+
+    def are_indexes_valid(self, indexes):
+        """Checks if the indexes satisfy the multi_filter condition. This is the batch version
+        of `is_index_valid`.
+
+        Parameters
+        ----------
+        indexes: Array of int
+            indexes from the range of the space
+
+        Returns
+        -------
+        valid: np.ndarray
+            the boolean mask of the indexes that meet all the constraints
+        """
+        indexes = np.asarray(indexes, dtype=self.index_dtype).reshape(-1)
+        assert not len(indexes) or (0 <= indexes.min() and indexes.max() < self.range_length)
+        if self._shared_filter is None:
+            return np.ones(len(indexes), dtype=bool)
+        if self._shared_filter_cache is None:
+            self._make_shared_filter_cache()
+        return self._shared_filter_mask[indexes]
+
     def sample_ints(self, m):
         """
         Sample m different integer numbers from [0, self.range_length) without replacement
@@ -1085,12 +1155,23 @@ class ConfigSpace(object):
         ints: an numpy array of size m
         """
         assert m <= len(self)
-        vis = set()
+        if self.index_dtype is object:
+            vis = set()
+            while len(vis) < m:
+                new = randrange(0, self.range_length)
+                if self.is_index_valid(new):
+                    vis.add(new)
+            return np.fromiter(vis, object, len(vis))
+        if self.range_length <= 4 * m:
+            # Most of the space is sampled, so draw from the valid indexes directly
+            valid = np.flatnonzero(self.are_indexes_valid(np.arange(self.range_length)))
+            return np.random.choice(valid, m, replace=False)
+        vis = np.empty(0, dtype=np.int64)
         while len(vis) < m:
-            new = randrange(0, self.range_length)
-            if self.is_index_valid(new):
-                vis.add(new)
-        return np.fromiter(vis, int, len(vis))
+            new = np.random.randint(0, self.range_length, size=2 * (m - len(vis)), dtype=np.int64)
+            new = np.unique(np.concatenate([vis, new[self.are_indexes_valid(new)]]))
+            vis = np.random.permutation(new)[:m] if len(new) > m else new
+        return vis
 
     def random_walk(self, point):
         """random walk as local transition
@@ -1172,6 +1253,39 @@ class ConfigSpace(object):
         ret = ConfigEntity(index, self.code_hash, entities, self._constraints)
         return ret
 
+    def get_batch(self, indexes):
+        """Get the config entities of an array of indexes. This is the batch version of `get`.
+
+        Parameters
+        ----------
+        indexes: Array of int
+            indexes in the space
+
+        Returns
+        -------
+        configs: List[ConfigEntity]
+            configs correspond to the indexes
+        """
+        indexes = np.asarray(indexes, dtype=self.index_dtype).reshape(-1)
+        if not len(indexes):
+            return []
+        out_of_range = (indexes < 0) | (indexes >= self.range_length)
+        if out_of_range.any():
+            index = indexes[np.argmax(out_of_range)]
+            raise IndexError(f"Index out of range: size {self.range_length}, got index {index}")
+        invalid = ~self.are_indexes_valid(indexes)
+        if invalid.any():
+            raise IndexError(
+                "Index does not correspond to the multi-filter condition, got index "
+                f"{indexes[np.argmax(invalid)]}. Use is_index_valid to pre-check"
+            )
+        spaces = list(self.space_map.items())
+        ret = []
+        for index, knob in zip(indexes.tolist(), self.points2knobs(indexes).tolist()):
+            entities = OrderedDict((name, space[k]) for (name, space), k in zip(spaces, knob))
+            ret.append(ConfigEntity(index, self.code_hash, entities, self._constraints))
+        return ret
+
     def __iter__(self):
         return self._entity_map.__iter__()
 
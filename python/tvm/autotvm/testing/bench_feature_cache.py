@@ -0,0 +1,88 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=missing-docstring
+"""Benchmark the predict throughput of the AutoTVM XGBoostCostModel over a large config space,
+with the features extracted into the shared feature table (cold) and read back from it (warm).
+
+The default task is a CUDA conv2d with a config space of more than 10M points. No GPU is needed.
+
+Example:
+    python -m tvm.autotvm.testing.bench_feature_cache --num-points 65536 --batch-size 2048
+"""
+import argparse
+import time
+
+import numpy as np
+
+import tvm
+from tvm import autotvm, te, topi  # pylint: disable=unused-import
+from tvm.autotvm.tuner.xgboost_cost_model import XGBoostCostModel
+
+
+def _parse_args():
+    args = argparse.ArgumentParser()
+    args.add_argument("--feature-type", type=str, default="itervar")
+    args.add_argument("--num-points", type=int, default=16384)
+    args.add_argument("--batch-size", type=int, default=2048)
+    args.add_argument("--num-train", type=int, default=256)
+    args.add_argument("--num-threads", type=int, default=None)
+    return args.parse_args()
+
+
+ARGS = _parse_args()
+
+
+def _create_task():
+    data = te.placeholder((1, 64, 56, 56), name="data")
+    kernel = te.placeholder((64, 64, 3, 3), name="kernel")
+    return autotvm.task.create(
+        "conv2d_nchw.cuda",
+        args=(data, kernel, (1, 1), (1, 1), (1, 1), "float32"),
+        target=tvm.target.Target("cuda"),
+    )
+
+
+def _measure(name, model, points):
+    tic = time.time()
+    for i in range(0, len(points), ARGS.batch_size):
+        model.predict(points[i : i + ARGS.batch_size])
+    elapsed = time.time() - tic
+    print(
+        f"{name:>6s}: {len(points)} points in {elapsed:.2f} s, "
+        f"{len(points) / max(elapsed, 1e-9):.0f} points/s"
+    )
+
+
+def main():
+    task = _create_task()
+    space_size = len(task.config_space)
+    print(f"Task: {task.name}, config space size: {space_size}")
+    model = XGBoostCostModel(task, ARGS.feature_type, num_threads=ARGS.num_threads)
+    rng = np.random.default_rng(0)
+    train_points = rng.choice(space_size, size=ARGS.num_train, replace=False)
+    model.fit(train_points, rng.random(ARGS.num_train), plan_size=64)
+    points = rng.choice(space_size, size=ARGS.num_points, replace=False)
+    _measure("cold", model, points)
+    _measure("warm", model, points)
+    model._close_pool()  # pylint: disable=protected-access
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=missing-docstring
+"""Benchmark lock-step vs. pipelined build/run in AutoTVM, in tuning trials per minute.
+
+Example:
+    python -m tvm.autotvm.testing.bench_pipelined_measure --n-trial 128 --size 512
+"""
+import argparse
+import time
+
+from tvm import autotvm
+from tvm.testing.autotvm import get_sample_task
+
+
+def _parse_args():
+    args = argparse.ArgumentParser()
+    args.add_argument("--n-trial", type=int, default=64)
+    args.add_argument("--size", type=int, default=256, help="The size of the sample matmul task")
+    args.add_argument("--n-parallel", type=int, default=None, help="The number of builders")
+    args.add_argument("--number", type=int, default=4)
+    args.add_argument("--repeat", type=int, default=3)
+    return args.parse_args()
+
+
+ARGS = _parse_args()
+
+
+def _measure(name, pipeline):
+    task, _ = get_sample_task(ARGS.size)
+    measure_option = autotvm.measure_option(
+        builder=autotvm.LocalBuilder(n_parallel=ARGS.n_parallel, do_fork=True),
+        runner=autotvm.LocalRunner(number=ARGS.number, repeat=ARGS.repeat),
+        pipeline=pipeline,
+    )
+    tuner = autotvm.tuner.RandomTuner(task)
+    tic = time.time()
+    tuner.tune(n_trial=ARGS.n_trial, measure_option=measure_option)
+    elapsed = time.time() - tic
+    print(
+        f"{name:>12s}: {ARGS.n_trial} trials in {elapsed:.1f} s, "
+        f"{ARGS.n_trial * 60 / max(elapsed, 1e-9):.1f} trials/min, "
+        f"best {tuner.best_flops / 1e9:.2f} GFLOPS"
+    )
+
+
+def main():
+    _measure("lock-step", pipeline=False)
+    _measure("pipelined", pipeline=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=missing-docstring
+"""Benchmark serial vs. parallel loading of AutoTVM and auto_scheduler logs.
+
+Example:
+    python -m tvm.autotvm.testing.bench_record_loading --num-records 1000000
+    python -m tvm.autotvm.testing.bench_record_loading --auto-scheduler-log tune.json
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from tvm import auto_scheduler, autotvm
+from tvm.testing.autotvm import get_sample_records
+
+
+def _parse_args():
+    args = argparse.ArgumentParser()
+    args.add_argument(
+        "--autotvm-log",
+        type=str,
+        default=None,
+        help="The AutoTVM log to load. A synthetic log is generated if not given.",
+    )
+    args.add_argument(
+        "--num-records",
+        type=int,
+        default=200000,
+        help="The number of records in the synthetic AutoTVM log",
+    )
+    args.add_argument(
+        "--auto-scheduler-log",
+        type=str,
+        default=None,
+        help="The auto_scheduler log to load",
+    )
+    args.add_argument("--num-workers", type=int, default=None)
+    return args.parse_args()
+
+
+ARGS = _parse_args()
+
+
+def _measure(name, loader):
+    tic = time.time()
+    num_records = sum(1 for _ in loader())
+    elapsed = time.time() - tic
+    print(
+        f"{name:>40s}: {num_records} records in {elapsed:.2f} s, "
+        f"{num_records / max(elapsed, 1e-9):.0f} records/s"
+    )
+
+
+def _bench_autotvm(log_file):
+    size_mb = os.path.getsize(log_file) / 1024 / 1024
+    print(f"AutoTVM log: {log_file} ({size_mb:.1f} MB)")
+    _measure("autotvm.record.load_from_file", lambda: autotvm.record.load_from_file(log_file))
+    _measure(
+        "autotvm.record.load_from_file_parallel",
+        lambda: autotvm.record.load_from_file_parallel(log_file, n_parallel=ARGS.num_workers),
+    )
+
+
+def _bench_auto_scheduler(log_file):
+    size_mb = os.path.getsize(log_file) / 1024 / 1024
+    print(f"auto_scheduler log: {log_file} ({size_mb:.1f} MB)")
+    _measure("auto_scheduler.load_records", lambda: auto_scheduler.load_records(log_file))
+    _measure(
+        "auto_scheduler.load_records_parallel",
+        lambda: auto_scheduler.load_records_parallel(log_file, num_threads=ARGS.num_workers),
+    )
+
+
+def main():
+    if ARGS.autotvm_log is not None:
+        _bench_autotvm(ARGS.autotvm_log)
+    else:
+        with tempfile.TemporaryDirectory() as work_dir:
+            log_file = os.path.join(work_dir, "autotvm.log")
+            rows = [autotvm.record.encode(inp, res) for inp, res in get_sample_records(1000)]
+            with open(log_file, "w") as f:
+                for i in range(ARGS.num_records):
+                    f.write(rows[i % len(rows)] + "\n")
+            _bench_autotvm(log_file)
+    if ARGS.auto_scheduler_log is not None:
+        _bench_auto_scheduler(ARGS.auto_scheduler_log)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=missing-docstring
+"""Benchmark the overhead of the simulated annealing model optimizer on large config spaces.
+
+A cheap synthetic cost model is used, so the numbers show the time spent in the optimizer.
+The default task is a CUDA conv2d with a config space of more than 10M points. No GPU is needed.
+
+Example:
+    python -m tvm.autotvm.testing.bench_sa_optimizer --parallel-size 128 2048 --n-iter 500
+"""
+import argparse
+import time
+
+import numpy as np
+
+import tvm
+from tvm import autotvm, te, topi  # pylint: disable=unused-import
+from tvm.autotvm.tuner.model_based_tuner import CostModel
+from tvm.autotvm.tuner.sa_model_optimizer import SimulatedAnnealingOptimizer
+
+
+def _parse_args():
+    args = argparse.ArgumentParser()
+    args.add_argument("--parallel-size", type=int, nargs="+", default=[128, 1024])
+    args.add_argument("--n-iter", type=int, default=500)
+    args.add_argument("--num", type=int, default=64, help="The number of maximums to find")
+    args.add_argument("--num-visited", type=int, default=4096)
+    return args.parse_args()
+
+
+ARGS = _parse_args()
+
+
+class _SyntheticModel(CostModel):
+    def __init__(self):
+        super().__init__()
+        self.num_points = 0
+
+    def predict(self, xs, output_margin=False):
+        xs = np.asarray(xs, dtype="float64")
+        self.num_points += len(xs)
+        return np.abs(np.sin(xs * 1e-3) * np.cos(xs * 7e-7))
+
+
+def _create_task():
+    data = te.placeholder((1, 64, 56, 56), name="data")
+    kernel = te.placeholder((64, 64, 3, 3), name="kernel")
+    return autotvm.task.create(
+        "conv2d_nchw.cuda",
+        args=(data, kernel, (1, 1), (1, 1), (1, 1), "float32"),
+        target=tvm.target.Target("cuda"),
+    )
+
+
+def main():
+    task = _create_task()
+    space = task.config_space
+    print(f"Task: {task.name}, config space size: {len(space)}, knobs: {len(space.dims)}")
+    visited = set(space.sample_ints(ARGS.num_visited).tolist())
+    for parallel_size in ARGS.parallel_size:
+        optimizer = SimulatedAnnealingOptimizer(
+            task, n_iter=ARGS.n_iter, parallel_size=parallel_size, early_stop=None
+        )
+        model = _SyntheticModel()
+        tic = time.time()
+        maximums = optimizer.find_maximums(model, ARGS.num, visited)
+        elapsed = time.time() - tic
+        print(
+            f"parallel_size {parallel_size:>6d}: {elapsed:.2f} s, "
+            f"{model.num_points / max(elapsed, 1e-9):.0f} points/s, "
+            f"{len(maximums)} maximums"
+        )
+
+
+if __name__ == "__main__":
+    main()
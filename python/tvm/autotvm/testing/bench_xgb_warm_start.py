@@ -0,0 +1,82 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=missing-docstring
+"""Benchmark the per-round training time of the AutoTVM XGBoostCostModel, retraining from
+scratch vs. warm start.
+
+The labels are synthetic, so the numbers show the training overhead only, not the model quality.
+
+Example:
+    python -m tvm.autotvm.testing.bench_xgb_warm_start --num-rounds 40 --plan-size 64
+"""
+import argparse
+import time
+
+import numpy as np
+
+from tvm.autotvm.tuner.xgboost_cost_model import XGBoostCostModel
+from tvm.testing.autotvm import get_sample_task
+
+
+def _parse_args():
+    args = argparse.ArgumentParser()
+    args.add_argument("--num-rounds", type=int, default=32)
+    args.add_argument("--plan-size", type=int, default=64)
+    args.add_argument("--size", type=int, default=1024, help="The size of the sample matmul task")
+    args.add_argument("--feature-type", type=str, default="knob")
+    args.add_argument("--loss-type", type=str, default="rank-binary")
+    args.add_argument("--max-train-size", type=int, default=1024)
+    return args.parse_args()
+
+
+ARGS = _parse_args()
+
+
+def _curve(**kwargs):
+    task, _ = get_sample_task(ARGS.size)
+    model = XGBoostCostModel(task, ARGS.feature_type, loss_type=ARGS.loss_type, **kwargs)
+    indexes = np.random.permutation(len(task.config_space))
+    xs, ys, elapsed = [], [], []
+    for i in range(ARGS.num_rounds):
+        for index in indexes[i * ARGS.plan_size : (i + 1) * ARGS.plan_size]:
+            xs.append(int(index))
+            ys.append(float(np.random.rand()))
+        tic = time.time()
+        model.fit(xs, ys, ARGS.plan_size)
+        elapsed.append(time.time() - tic)
+    model._close_pool()  # pylint: disable=protected-access
+    return elapsed
+
+
+def main():
+    curves = {
+        "from scratch": _curve(),
+        "warm start": _curve(warm_start=True),
+        "warm start + bounded": _curve(warm_start=True, max_train_size=ARGS.max_train_size),
+    }
+    print("round\tsamples\t" + "\t".join(curves))
+    for i in range(ARGS.num_rounds):
+        row = "\t".join(f"{curve[i] * 1000:.1f}" for curve in curves.values())
+        print(f"{i}\t{(i + 1) * ARGS.plan_size}\t{row}")
+    print("total\t\t" + "\t".join(f"{sum(curve) * 1000:.1f}" for curve in curves.values()))
+
+
+if __name__ == "__main__":
+    main()
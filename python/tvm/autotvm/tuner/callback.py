@@ -84,6 +84,38 @@ def log_to_database(db):
     return _callback
 
 
+def log_telemetry(sink):
+    """Record the timings of the tuning into a telemetry sink: the total and the run time of
+    each trial, and the time spent picking, measuring and learning from each batch.
+
+    Parameters
+    ----------
+    sink: tvm.contrib.tuning_telemetry.TelemetrySink
+        The sink to record to.
+
+    Returns
+    -------
+    callback : callable
+        Callback function to do the recording.
+    """
+    ctx = {"round": 0}
+
+    def _callback(tuner, inputs, results):
+        """Callback implementation"""
+        task = tuner.task.name
+        round_idx = ctx["round"]
+        ctx["round"] += 1
+        for trial, res in enumerate(results):
+            run_secs = np.mean(res.costs) if res.error_no == 0 else float("nan")
+            sink.record("autotvm", task, "measure", res.all_cost, round_idx, trial, res.error_no)
+            sink.record("autotvm", task, "run", run_secs, round_idx, trial, res.error_no)
+        sink.record("autotvm", task, "search", tuner.search_secs, round_idx)
+        sink.record("autotvm", task, "measure_batch", tuner.measure_secs, round_idx)
+        sink.record("autotvm", task, "train", tuner.train_secs, round_idx)
+
+    return _callback
+
+
 class Monitor(object):
     """A monitor to collect statistic during tuning"""
 
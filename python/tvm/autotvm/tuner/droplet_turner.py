@@ -56,27 +56,25 @@ class DropletTuner(Tuner):
         self.pvalue, self.step = pvalue, 1
         self.next = [(self.space.knob2point(start_position), start_position)]
 
-    def num_to_bin(self, value, factor=1):
-        bin_format = str(0) * (len(self.dims) - len(bin(value)[2:])) + bin(value)[2:]
-        return [int(i) * factor for i in bin_format]
-
     def search_space(self, factor=1):
-        search_space = []
-        for i in range(2 ** len(self.dims) - 1, 0, -1):
-            search_space += [self.num_to_bin(i, factor)] + [self.num_to_bin(i, -factor)]
-        return search_space
+        # the non-zero binary vectors of len(dims) bits, in decreasing order, each scaled by
+        # factor and -factor
+        bits = np.arange(2 ** len(self.dims) - 1, 0, -1)[:, None]
+        bits = (bits >> np.arange(len(self.dims) - 1, -1, -1)) & 1
+        return np.stack([bits * factor, bits * -factor], axis=1).reshape(-1, len(self.dims))
 
     def next_pos(self, new_positions):
         "returns the neighbors of the best solution"
+        new_positions = np.asarray(new_positions).reshape(-1, len(self.dims)) + np.array(
+            self.best_choice[1]
+        )
+        new_positions = np.where(new_positions > 0, new_positions % np.array(self.dims), 0)
         next_set = []
-        for p in new_positions:
+        for idx_p, new_p in zip(
+            self.space.knobs2points(new_positions).tolist(), new_positions.tolist()
+        ):
             if len(next_set) > self.batch:
                 break
-            new_p = [
-                (x + y) % self.dims[i] if (x + y > 0) else 0
-                for i, (x, y) in enumerate(zip(p, self.best_choice[1]))
-            ]
-            idx_p = self.space.knob2point(new_p)
             if idx_p not in self.visited:
                 self.visited.add(idx_p)
                 next_set.append((idx_p, new_p))
@@ -88,13 +86,9 @@ class DropletTuner(Tuner):
         return stats.ttest_ind(np.array(elem_1), np.array(elem_2)).pvalue <= self.pvalue
 
     def next_batch(self, batch_size):
-        ret, self.batch = [], batch_size
-        for i in range(batch_size):
-            if i >= len(self.next):
-                break
-            if self.space.is_index_valid(self.next[i][0]):
-                ret.append(self.space.get(self.next[i][0]))
-        return ret
+        self.batch = batch_size
+        points = np.array([p for p, _ in self.next[:batch_size]], dtype=self.space.index_dtype)
+        return self.space.get_batch(points[self.space.are_indexes_valid(points)])
 
     def speculation(self):
         # Gradient descending direction prediction and search space filling
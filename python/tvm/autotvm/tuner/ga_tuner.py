@@ -54,22 +54,22 @@ class GATuner(Tuner):
         # random initialization
         self.pop_size = min(self.pop_size, len(self.space))
         self.elite_num = min(self.pop_size, self.elite_num)
-        self.visited = set(self.space.sample_ints(self.pop_size))
+        self.visited = set(self.space.sample_ints(self.pop_size).tolist())
 
-        # current generation
-        self.genes = [self.space.point2knob(idx) for idx in self.visited]
+        # current generation, one gene (the knobs of a config) per row
+        self.genes = self.space.points2knobs(list(self.visited))
         self.scores = []
-        self.elites = []
+        self.elites = self.genes[:0]
         self.elite_scores = []
         self.trial_pt = 0
 
     def next_batch(self, batch_size):
-        ret = []
-        while len(ret) < batch_size and self.has_next():
-            gene = self.genes[self.trial_pt % self.pop_size]
-            self.trial_pt += 1
-            ret.append(self.space.get(self.space.knob2point(gene)))
-        return ret
+        # the number of configs for which `has_next` holds
+        num = len(self.space) - len(self.visited) + len(self.genes) - self.trial_pt
+        num = max(0, min(batch_size, num))
+        positions = np.arange(self.trial_pt, self.trial_pt + num) % self.pop_size
+        self.trial_pt += num
+        return self.space.get_batch(self.space.knobs2points(self.genes[positions]))
 
     def update(self, inputs, results):
         for inp, res in zip(inputs, results):
@@ -80,43 +80,52 @@ class GATuner(Tuner):
                 self.scores.append(0.0)
 
         if len(self.scores) >= len(self.genes) and len(self.visited) < len(self.space):
-            next_genes = []
             # There is no reason to crossover or mutate since the size of the unvisited
             # is no larger than the size of the population.
             if len(self.space) - len(self.visited) <= self.pop_size:
-                for idx in range(self.space.range_length):
-                    if self.space.is_index_valid(idx) and idx not in self.visited:
-                        next_genes.append(self.space.point2knob(idx))
-                        self.visited.add(idx)
+                points = np.arange(self.space.range_length)
+                points = points[self.space.are_indexes_valid(points)]
+                points = points[~np.isin(points, list(self.visited))]
+                next_genes = self.space.points2knobs(points)
+                self.visited.update(points.tolist())
             else:
-                genes = self.genes + self.elites
+                genes = np.concatenate([self.genes, self.elites])
                 scores = np.array(self.scores[: len(self.genes)] + self.elite_scores)
 
                 # reserve elite
-                self.elites, self.elite_scores = [], []
                 elite_indexes = np.argpartition(scores, -self.elite_num)[-self.elite_num :]
-                for ind in elite_indexes:
-                    self.elites.append(genes[ind])
-                    self.elite_scores.append(scores[ind])
+                self.elites = genes[elite_indexes]
+                self.elite_scores = scores[elite_indexes].tolist()
 
                 indices = np.arange(len(genes))
                 scores += 1e-8
                 scores /= np.max(scores)
                 probs = scores / np.sum(scores)
-                while len(next_genes) < self.pop_size:
-                    # cross over
-                    p1, p2 = np.random.choice(indices, size=2, replace=False, p=probs)
-                    p1, p2 = genes[p1], genes[p2]
-                    point = np.random.randint(len(self.space.dims))
-                    tmp_gene = p1[:point] + p2[point:]
+                dims = np.array(self.space.dims)
+                next_genes = [genes[:0]]
+                num_next = 0
+                while num_next < self.pop_size:
+                    # cross over a batch of pairs of different parents
+                    num = self.pop_size - num_next
+                    p1 = np.random.choice(indices, size=num, p=probs)
+                    p2 = np.random.choice(indices, size=num, p=probs)
+                    same = p1 == p2
+                    while same.any():
+                        p2[same] = np.random.choice(indices, size=int(same.sum()), p=probs)
+                        same = p1 == p2
+                    point = np.random.randint(len(dims), size=(num, 1))
+                    children = np.where(np.arange(len(dims)) < point, genes[p1], genes[p2])
                     # mutation
-                    for j, dim in enumerate(self.space.dims):
-                        if np.random.random() < self.mutation_prob:
-                            tmp_gene[j] = np.random.randint(dim)
-
-                    if self.space.is_index_valid(self.space.knob2point(tmp_gene)):
-                        next_genes.append(tmp_gene)
-                        self.visited.add(self.space.knob2point(tmp_gene))
+                    mutate = np.random.random(children.shape) < self.mutation_prob
+                    children[mutate] = np.random.randint(dims, size=children.shape)[mutate]
+
+                    points = self.space.knobs2points(children)
+                    valid = self.space.are_indexes_valid(points)
+                    children, points = children[valid][:num], points[valid][:num]
+                    next_genes.append(children)
+                    self.visited.update(points.tolist())
+                    num_next += len(children)
+                next_genes = np.concatenate(next_genes)
             self.genes = next_genes
             self.trial_pt = 0
             self.scores = []
@@ -20,6 +20,8 @@
 # pylint: disable=abstract-method
 """Grid search tuner and random tuner"""
 
+import numpy as np
+
 from .tuner import Tuner
 
 
@@ -73,14 +75,14 @@ class GridSearchTuner(IndexBaseTuner):
             )
 
     def next_batch(self, batch_size):
-        ret = []
-        while len(ret) < batch_size and self.has_next():
+        indexes = []
+        while len(indexes) < batch_size and self.has_next():
             self.visited.append(self.index)
-            ret.append(self.space.get(self.index))
+            indexes.append(self.index)
             self.index = self.space.get_next_index(
                 self.index, start=self.begin_idx, end=self.end_idx
             )
-        return ret
+        return self.space.get_batch(indexes)
 
 
 class RandomTuner(IndexBaseTuner):
@@ -95,10 +97,35 @@ class RandomTuner(IndexBaseTuner):
         A tuple of index range to random
     """
 
+    def __init__(self, task, range_idx=None):
+        super(RandomTuner, self).__init__(task, range_idx)
+        self.visited = set()
+
     def next_batch(self, batch_size):
-        ret = []
-        while len(ret) < batch_size and self.has_next():
-            index = self.space.get_rand_index(self.begin_idx, self.end_idx, to_exclude=self.visited)
-            self.visited.append(index)
-            ret.append(self.space.get(index))
-        return ret
+        num = min(batch_size, self.visited_max - len(self.visited))
+        if num <= 0:
+            return []
+        if self.space.index_dtype is object:
+            indexes = []
+            while len(indexes) < num:
+                index = self.space.get_rand_index(
+                    self.begin_idx, self.end_idx, to_exclude=self.visited
+                )
+                self.visited.add(index)
+                indexes.append(index)
+        elif 4 * (self.visited_max - len(self.visited)) <= self.range_length:
+            # Most of the range is visited, so draw from the remaining indexes directly
+            indexes = np.arange(self.begin_idx, self.end_idx)
+            indexes = indexes[self.space.are_indexes_valid(indexes)]
+            indexes = indexes[~np.isin(indexes, list(self.visited))]
+            indexes = np.random.choice(indexes, num, replace=False).tolist()
+            self.visited.update(indexes)
+        else:
+            indexes = []
+            while len(indexes) < num:
+                new = np.random.randint(self.begin_idx, self.end_idx, size=2 * num, dtype=np.int64)
+                for index in new[self.space.are_indexes_valid(new)].tolist():
+                    if index not in self.visited and len(indexes) < num:
+                        self.visited.add(index)
+                        indexes.append(index)
+        return self.space.get_batch(indexes)
@@ -22,7 +22,9 @@
 This type of tuner will fit a cost model and use some optimization methods to
 find optimums points of cost model in space.
 """
-import gc
+import os
+import shutil
+import tempfile
 
 import numpy as np
 
@@ -30,55 +32,194 @@ from .tuner import Tuner
 from ..env import GLOBAL_SCOPE
 
 
+class SharedFeatureTable(object):
+    """Features of the configs of a task, stored in a float32 array backed by a memory-mapped
+    file, so that feature extraction workers can write into it directly instead of sending
+    the features back to the tuner. Rows are assigned to config indexes on demand, and each
+    feature is padded with zeros to the width of the array.
+
+    Parameters
+    ----------
+    capacity: int
+        The initial number of rows.
+    """
+
+    def __init__(self, capacity=1024):
+        shm_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+        self._dir = tempfile.mkdtemp(prefix="autotvm-features-", dir=shm_dir)
+        self._version = 0
+        self.rows = {}
+        self.lengths = np.zeros(0, dtype="int32")
+        self.array = None
+        self.path = None
+        self._reallocate(capacity, 1)
+
+    def _reallocate(self, capacity, width):
+        """Move the table to a new file of the given shape, keeping the features stored"""
+        path = os.path.join(self._dir, f"{self._version}.bin")
+        self._version += 1
+        array = np.memmap(path, dtype="float32", mode="w+", shape=(capacity, width))
+        lengths = np.zeros(capacity, dtype="int32")
+        if self.array is not None:
+            num_rows = len(self.rows)
+            old_width = min(self.array.shape[1], width)
+            array[:num_rows, :old_width] = self.array[:num_rows, :old_width]
+            lengths[:num_rows] = self.lengths[:num_rows]
+            del self.array
+            os.remove(self.path)
+        self.array, self.path, self.lengths = array, path, lengths
+
+    @property
+    def shape(self):
+        """The shape of the array, for the workers to map it"""
+        return self.array.shape
+
+    def size(self):
+        """The number of configs in the table"""
+        return len(self.rows)
+
+    def missing(self, indexes):
+        """Get the unique indexes whose features are not in the table
+
+        Parameters
+        ----------
+        indexes: np.ndarray
+            The config indexes.
+
+        Returns
+        -------
+        missing: List[int]
+        """
+        rows = self.rows
+        return [x for x in dict.fromkeys(indexes.tolist()) if x not in rows]
+
+    def reserve(self, indexes):
+        """Assign rows to new config indexes, growing the table if needed
+
+        Parameters
+        ----------
+        indexes: List[int]
+            The config indexes, which must not be in the table.
+
+        Returns
+        -------
+        rows: List[int]
+            The rows for the workers to write the features into.
+        """
+        num_rows = len(self.rows)
+        capacity = self.array.shape[0]
+        if num_rows + len(indexes) > capacity:
+            while num_rows + len(indexes) > capacity:
+                capacity *= 2
+            self._reallocate(capacity, self.array.shape[1])
+        rows = list(range(num_rows, num_rows + len(indexes)))
+        self.rows.update(zip(indexes, rows))
+        return rows
+
+    def store(self, row, feature):
+        """Store a feature that was not written by a worker, widening the table if needed
+
+        Parameters
+        ----------
+        row: int
+            The row of the config.
+        feature: Optional[np.ndarray]
+            The feature. None means the extraction failed, which yields zeros.
+        """
+        if feature is None:
+            self.lengths[row] = -1
+            return
+        feature = np.asarray(feature, dtype="float32").ravel()
+        if feature.shape[0] > self.array.shape[1]:
+            self._reallocate(self.array.shape[0], feature.shape[0])
+        self.array[row, : feature.shape[0]] = feature
+        self.lengths[row] = feature.shape[0]
+
+    def gather(self, indexes):
+        """Get the features of configs in the table
+
+        Parameters
+        ----------
+        indexes: np.ndarray
+            The config indexes.
+
+        Returns
+        -------
+        features: np.ndarray
+            The features, padded with zeros to the longest one among them.
+        """
+        rows = self.rows
+        row_ids = np.fromiter(
+            (rows[x] for x in indexes.tolist()), dtype="int64", count=len(indexes)
+        )
+        width = int(self.lengths[row_ids].max()) if len(row_ids) else 0
+        return np.array(self.array[row_ids, : max(width, 0)], dtype="float32")
+
+    def clear(self):
+        """Remove all the features"""
+        self.rows = {}
+        self._reallocate(self.array.shape[0], self.array.shape[1])
+
+    def close(self):
+        """Remove the backing file"""
+        if self.array is not None:
+            del self.array
+            self.array = None
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def __del__(self):
+        self.close()
+
+
 class FeatureCache(object):
     """Feature cache manager for cache sharing between different cost models"""
 
     def __init__(self):
-        self.feature_cache = {}
+        self.feature_tables = {}
 
-    def get(self, key):
-        """Get feature cache dictionary for a key
+    def get_table(self, key):
+        """Get the shared feature table for a key
 
         Parameters
         ----------
-        key: str
-            The key of a feature type
+        key: Tuple[str, str]
+            The key of a feature type and a task
 
         Returns
         -------
-        fea_cache: dict
-            cache dictionary
+        table: SharedFeatureTable
         """
-        if key not in self.feature_cache:
-            self.feature_cache[key] = {}
+        if key not in self.feature_tables:
+            self.feature_tables[key] = SharedFeatureTable()
 
-        return self.feature_cache[key]
+        return self.feature_tables[key]
 
     def size(self, key):
-        """ " Get the size of a feature cache dictionary
+        """Get the number of configs in the feature table of a key
 
         Parameters
         ----------
-        key: str
-            The key of a feature type
+        key: Tuple[str, str]
+            The key of a feature type and a task
 
         Returns
         -------
         n: int
         """
-        return len(self.feature_cache.get(key, tuple()))
+        if key in self.feature_tables:
+            return self.feature_tables[key].size()
+        return 0
 
     def clear(self, key):
-        """Clear feature cache for a key
+        """Clear the feature table of a key
 
         Parameters
         ----------
-        key: str
-            The key of a feature type
+        key: Tuple[str, str]
+            The key of a feature type and a task
         """
-        del self.feature_cache[key]
-        self.feature_cache[key] = {}
-        gc.collect()
+        if key in self.feature_tables:
+            self.feature_tables[key].clear()
 
 
 class CostModel(object):
@@ -274,7 +415,7 @@ class ModelBasedTuner(Tuner):
                     self.cost_model, self.plan_size * self.diversity_filter_ratio, self.visited
                 )
                 scores = self.cost_model.predict(candidate)
-                knobs = [self.space.point2knob(x) for x in candidate]
+                knobs = self.space.points2knobs(candidate).tolist()
                 pick_index = submodular_pick(0 * scores, knobs, self.plan_size, knob_weight=1)
                 maximums = np.array(candidate)[pick_index]
             else:
@@ -22,7 +22,6 @@
 Cost model optimizer based on simulated annealing
 """
 
-import heapq
 import logging
 import time
 
@@ -36,6 +35,10 @@ logger = logging.getLogger("autotvm")
 class SimulatedAnnealingOptimizer(ModelOptimizer):
     """parallel simulated annealing optimization algorithm
 
+    All the chains are advanced together: the points are mutated as integer arrays of knobs,
+    the whole population is scored with one call to the cost model per iteration, and the
+    best points found so far are kept with a vectorized top-k.
+
     Parameters
     ----------
     task: Task
@@ -79,25 +82,23 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
             self.early_stop,
             self.log_interval,
         )
+        space = self.task.config_space
+        dtype = space.index_dtype
 
         if self.persistent and self.points is not None:
             points = self.points
         else:
-            points = self.task.config_space.sample_ints(self.parallel_size)
+            points = np.asarray(space.sample_ints(self.parallel_size), dtype=dtype)
 
         scores = model.predict(points)
 
-        # build heap and insert initial points
-        heap_items = [(float("-inf"), -1 - i) for i in range(num)]
-        heapq.heapify(heap_items)
-        in_heap = set(exclusive)
-        in_heap.update([x[1] for x in heap_items])
-
-        for s, p in zip(scores, points):
-            if s > heap_items[0][0] and p not in in_heap:
-                pop = heapq.heapreplace(heap_items, (s, p))
-                in_heap.remove(pop[1])
-                in_heap.add(p)
+        # the sorted excluded points, and the best points found so far
+        excluded = np.sort(np.fromiter(exclusive, dtype=dtype, count=len(exclusive)))
+        top_points = np.empty(0, dtype=dtype)
+        top_scores = np.empty(0, dtype="float64")
+        top_points, top_scores, _ = _update_top(
+            top_points, top_scores, points, scores, excluded, num
+        )
 
         k = 0
         k_last_modify = 0
@@ -110,9 +111,7 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
             cool = 0
 
         while k < n_iter and k < k_last_modify + early_stop:
-            new_points = np.empty_like(points)
-            for i, p in enumerate(points):
-                new_points[i] = self.task.config_space.random_walk(p)
+            new_points = _random_walk(space, points)
 
             new_scores = model.predict(new_points)
 
@@ -122,12 +121,11 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
             points[ac_index] = new_points[ac_index]
             scores[ac_index] = new_scores[ac_index]
 
-            for s, p in zip(new_scores, new_points):
-                if s > heap_items[0][0] and p not in in_heap:
-                    pop = heapq.heapreplace(heap_items, (s, p))
-                    in_heap.remove(pop[1])
-                    in_heap.add(p)
-                    k_last_modify = k
+            top_points, top_scores, modified = _update_top(
+                top_points, top_scores, new_points, new_scores, excluded, num
+            )
+            if modified:
+                k_last_modify = k
 
             k += 1
             t -= cool
@@ -139,20 +137,63 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
                     "elapsed: %.2f",
                     k,
                     k_last_modify,
-                    heap_items[0][0],
-                    np.max([v for v, _ in heap_items]),
+                    top_scores.min() if len(top_points) == num else float("-inf"),
+                    top_scores.max() if len(top_points) else float("-inf"),
                     t_str,
                     time.time() - tic,
                 )
 
-        heap_items.sort(key=lambda item: -item[0])
-        heap_items = [x for x in heap_items if x[0] >= 0]
+        order = np.argsort(-top_scores, kind="stable")
+        order = order[top_scores[order] >= 0]
+        top_points, top_scores = top_points[order], top_scores[order]
         logger.debug(
             "SA iter: %d\tlast_update: %d\telapsed: %.2f", k, k_last_modify, time.time() - tic
         )
-        logger.debug("SA Maximums: %s", heap_items)
+        logger.debug("SA Maximums: %s", list(zip(top_scores.tolist(), top_points.tolist())))
 
         if self.persistent:
             self.points = points
 
-        return [x[1] for x in heap_items]
+        return [int(x) for x in top_points]
+
+
+def _random_walk(space, points):
+    """Move each point to a random neighbour by changing the value of one of its knobs"""
+    dims = np.array(space.dims)
+    mutable = np.flatnonzero(dims > 1)
+    new_points = points.copy()
+    if not len(mutable):
+        return new_points
+    knobs = space.points2knobs(points)
+    todo = np.arange(len(points))
+    while len(todo):
+        # change one knob of each point to a different value
+        which = mutable[np.random.randint(len(mutable), size=len(todo))]
+        offsets = np.random.randint(dims[which] - 1) + 1
+        knobs[todo, which] = (knobs[todo, which] + offsets) % dims[which]
+        walked = space.knobs2points(knobs[todo])
+        # keep mutating the points that violate the constraints of the space
+        valid = space.are_indexes_valid(walked) & (walked != points[todo])
+        new_points[todo[valid]] = walked[valid]
+        todo = todo[~valid]
+    return new_points
+
+
+def _update_top(top_points, top_scores, points, scores, excluded, num):
+    """Merge scored points into the `num` best ones, skipping the excluded points and the ones
+    already kept. Return the new top points and scores, and whether any point entered."""
+    keep = ~np.isin(points, top_points)
+    if len(excluded):
+        pos = np.minimum(np.searchsorted(excluded, points), len(excluded) - 1)
+        keep &= excluded[pos] != points
+    points, first = np.unique(points[keep], return_index=True)
+    scores = scores[keep][first]
+    if not len(points):
+        return top_points, top_scores, False
+    all_points = np.concatenate([top_points, points])
+    all_scores = np.concatenate([top_scores, scores])
+    if len(all_points) <= num:
+        return all_points, all_scores, True
+    selected = np.argpartition(-all_scores, num - 1)[:num]
+    modified = bool((selected >= len(top_points)).any())
+    return all_points[selected], all_scores[selected], modified
@@ -21,6 +21,7 @@
 """Base class of tuner"""
 import logging
 import tempfile
+import time
 
 import numpy as np
 
@@ -60,6 +61,9 @@ class Tuner(object):
         self.n_trial = None
         self.early_stopping = None
 
+        # the time spent picking, measuring and learning from the configs of the last batch
+        self.search_secs = self.measure_secs = self.train_secs = 0.0
+
     def has_next(self):
         """Whether has next untried config in the space
 
@@ -132,13 +136,22 @@ class Tuner(object):
             if not self.has_next():
                 break
 
+            tic = time.time()
             configs = self.next_batch(min(n_parallel, n_trial - i))
+            self.search_secs = time.time() - tic
 
             inputs = [MeasureInput(self.task.target, self.task, config) for config in configs]
-            results = measure_batch(inputs)
+            tic = time.time()
+            if hasattr(measure_batch, "stream"):
+                stream = measure_batch.stream(inputs)
+            else:
+                stream = enumerate(measure_batch(inputs))
+            results = [None] * len(inputs)
 
-            # keep best config
-            for k, (inp, res) in enumerate(zip(inputs, results)):
+            # keep best config, as the results come in
+            for k, res in stream:
+                inp = inputs[k]
+                results[k] = res
                 config = inp.config
                 if res.error_no == 0:
                     flops = inp.task.flop / np.mean(res.costs)
@@ -170,10 +183,13 @@ class Tuner(object):
                     config,
                 )
 
+            self.measure_secs = time.time() - tic
             i += len(results)
             self.ttl = min(early_stopping + self.best_iter, n_trial) - i
 
+            tic = time.time()
             self.update(inputs, results)
+            self.train_secs = time.time() - tic
             for callback in callbacks:
                 callback(self, inputs, results)
 
@@ -20,6 +20,7 @@
 # pylint: disable=invalid-name
 """XGBoost as cost model"""
 
+import functools
 import logging
 import time
 
@@ -82,6 +83,16 @@ class XGBoostCostModel(CostModel):
         If is not none, the cost model will print training log every `log_interval` iterations.
     upper_model: XGBoostCostModel, optional
         The upper model used in transfer learning
+    warm_start: bool, optional
+        If is True, continue boosting the previous model on the samples measured since the last
+        fit, instead of retraining from scratch on all the samples every time.
+        A full refit is still done every `full_refit_interval` fits, and whenever the labels of
+        the previous samples change, i.e. the best flops change under the 'reg' loss.
+    full_refit_interval: int, optional
+        The number of fits between two full refits when `warm_start` is True.
+    max_train_size: int, optional
+        If is not none, bound the number of samples to train on. The best quarter of them are
+        always kept, and the rest are the most recently measured ones.
     """
 
     def __init__(
@@ -92,6 +103,9 @@ class XGBoostCostModel(CostModel):
         num_threads=None,
         log_interval=25,
         upper_model=None,
+        warm_start=False,
+        full_refit_interval=5,
+        max_train_size=None,
     ):
         global xgb
         super(XGBoostCostModel, self).__init__()
@@ -159,6 +173,8 @@ class XGBoostCostModel(CostModel):
             self.feature_cache = upper_model.feature_cache
         else:
             self.feature_cache = FeatureCache()
+        # the features are cached per task, so a shared cache never mixes config indexes
+        self.feature_table_key = (feature_type, repr(task))
         self.upper_model = upper_model
         self.feature_extra_ct = 0
         self.pool = None
@@ -167,6 +183,13 @@ class XGBoostCostModel(CostModel):
         self._sample_size = 0
         self._reset_pool(self.space, self.target, self.task)
 
+        self.warm_start = warm_start
+        self.full_refit_interval = full_refit_interval
+        self.max_train_size = max_train_size
+        self._fitted_indexes = set()
+        self._fitted_y_max = None
+        self._num_warm_fits = 0
+
     def _reset_pool(self, space, target, task):
         """reset processing pool for feature extraction"""
 
@@ -194,19 +217,56 @@ class XGBoostCostModel(CostModel):
     def _base_model_discount(self):
         return 1.0 / (2 ** (self._sample_size / 64.0))
 
+    def _train_buffer(self, xs, ys):
+        """Deduplicate the samples, keeping the latest measurement of each config, and bound
+        their number to `max_train_size`."""
+        latest = {}
+        for i, x in enumerate(xs):
+            latest[x] = i
+        order = np.array(sorted(latest.values()), dtype="int64")
+        if self.max_train_size is not None and len(order) > self.max_train_size:
+            ys_np = np.asarray(ys)[order]
+            num_best = self.max_train_size // 4
+            best = order[np.argsort(-ys_np, kind="stable")[:num_best]]
+            best_set = set(best.tolist())
+            recent = [i for i in order[::-1] if i not in best_set]
+            recent = recent[: self.max_train_size - num_best]
+            order = np.sort(np.concatenate([best, np.array(recent, dtype="int64")]))
+        return [xs[i] for i in order], [ys[i] for i in order]
+
     def fit(self, xs, ys, plan_size):
         tic = time.time()
         self._reset_pool(self.space, self.target, self.task)
 
+        xs, ys = self._train_buffer(xs, ys)
         x_train = self._get_feature(xs)
         y_train = np.array(ys)
         y_max = np.max(y_train)
         y_train = y_train / max(y_max, 1e-8)
 
         valid_index = y_train > 1e-6
-        index = np.random.permutation(len(x_train))
+        new_index = np.array(
+            [i for i, x in enumerate(xs) if x not in self._fitted_indexes], dtype="int64"
+        )
+        warm_start = (
+            self.warm_start
+            and self.bst is not None
+            and self.base_model is None
+            and len(new_index) > 0
+            and self._num_warm_fits + 1 < self.full_refit_interval
+            and (self.loss_type != "reg" or y_max == self._fitted_y_max)
+        )
+        if warm_start:
+            # Continue boosting on the new samples only
+            index = np.random.permutation(new_index)
+            self._num_warm_fits += 1
+        else:
+            index = np.random.permutation(len(x_train))
+            self._num_warm_fits = 0
         dtrain = xgb.DMatrix(x_train[index], y_train[index])
         self._sample_size = len(x_train)
+        self._fitted_indexes = set(xs)
+        self._fitted_y_max = y_max
 
         if self.base_model:
             discount = self._base_model_discount()
@@ -216,10 +276,17 @@ class XGBoostCostModel(CostModel):
             else:
                 dtrain.set_base_margin(discount * self.base_model.predict(xs, output_margin=True))
 
+        base_bst = None
+        if warm_start:
+            # Early-stop on the new samples only
+            base_bst = self.bst.copy()
+            base_bst.set_attr(best_score=None, best_iteration=None, best_msg=None)
+
         self.bst = xgb.train(
             self.xgb_params,
             dtrain,
             num_boost_round=8000,
+            xgb_model=base_bst,
             callbacks=[
                 CustomCallback(
                     stopping_rounds=20,
@@ -234,11 +301,12 @@ class XGBoostCostModel(CostModel):
         )
 
         logger.debug(
-            "XGB train: %.2f\tobs: %d\terror: %d\tn_cache: %d",
+            "XGB train: %.2f\tobs: %d\terror: %d\tn_cache: %d\twarm: %d",
             time.time() - tic,
             len(xs),
             len(xs) - np.sum(valid_index),
-            self.feature_cache.size(self.fea_type),
+            self.feature_cache.size(self.feature_table_key),
+            len(index) if warm_start else 0,
         )
 
     def fit_log(self, records, plan_size, min_seed_records=500):
@@ -344,32 +412,34 @@ class XGBoostCostModel(CostModel):
     def _get_feature(self, indexes):
         """get features for indexes, run extraction if we do not have cache for them"""
         # free feature cache
-        if self.feature_cache.size(self.fea_type) >= 100000:
-            self.feature_cache.clear(self.fea_type)
+        if self.feature_cache.size(self.feature_table_key) >= 100000:
+            self.feature_cache.clear(self.feature_table_key)
 
-        fea_cache = self.feature_cache.get(self.fea_type)
+        table = self.feature_cache.get_table(self.feature_table_key)
 
-        indexes = np.array(indexes)
-        need_extract = [x for x in indexes if x not in fea_cache]
+        indexes = np.asarray(indexes, dtype="int64")
+        need_extract = table.missing(indexes)
 
         if need_extract:
+            rows = table.reserve(need_extract)
             pool = self._get_pool()
-            feas = pool.map_with_error_catching(self.feature_extract_func, need_extract)
-            for i, fea in zip(need_extract, feas):
-                fea_cache[i] = fea.value if fea.status == StatusKind.COMPLETE else None
-
-        feature_len = -1
-        for idx in indexes:
-            if fea_cache[idx] is not None:
-                feature_len = max(fea_cache[idx].shape[-1], feature_len)
-
-        ret = np.empty((len(indexes), feature_len), dtype=np.float32)
-        for i, ii in enumerate(indexes):
-            t = fea_cache[ii]
-            if t is not None and t.shape[0] < feature_len:
-                t = np.pad(t, (0, feature_len - t.shape[0]))
-            ret[i, :] = t if t is not None else 0
-        return ret
+            # The workers write the features into the table, and only send back the ones that
+            # do not fit in it
+            feas = list(
+                pool.map_with_error_catching(
+                    functools.partial(_extract_feature_to_table, self.feature_extract_func),
+                    [(i, row, table.path, table.shape) for i, row in zip(need_extract, rows)],
+                )
+            )
+            for row, fea in zip(rows, feas):
+                if fea.status != StatusKind.COMPLETE:
+                    table.store(row, None)
+                elif isinstance(fea.value, int):
+                    table.lengths[row] = fea.value
+                else:
+                    table.store(row, fea.value)
+
+        return table.gather(indexes)
 
     def __del__(self):
         self._close_pool()
@@ -388,6 +458,28 @@ def _extract_popen_initializer(space, target, task):
     _extract_task = task
 
 
+# The feature table mapped by an extraction worker, as (path, array)
+_extract_table = (None, None)
+
+
+def _extract_feature_to_table(feature_extract_func, args):
+    """extract the feature for an index in extract_space, and write it into the shared feature
+    table if it fits. Return the length of the feature if so, otherwise the feature itself."""
+    global _extract_table
+    index, row, path, shape = args
+    fea = feature_extract_func(index)
+    if fea is None:
+        return None
+    fea = np.asarray(fea, dtype="float32").ravel()
+    if fea.shape[0] > shape[1]:
+        return fea
+    if _extract_table[0] != path:
+        _extract_table = (None, None)
+        _extract_table = (path, np.memmap(path, dtype="float32", mode="r+", shape=shape))
+    _extract_table[1][row, : fea.shape[0]] = fea
+    return int(fea.shape[0])
+
+
 def _extract_itervar_feature_index(args):
     """extract iteration var feature for an index in extract_space"""
     config = _extract_space.get(args)
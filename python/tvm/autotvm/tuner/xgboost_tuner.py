@@ -75,6 +75,13 @@ class XGBTuner(ModelBasedTuner):
         The verbose level.
         If is 0, output nothing.
         Otherwise, output debug information every `verbose` iterations.
+
+    warm_start: bool, optional
+        If is True, the cost model continues boosting the previous model on the new samples
+        instead of retraining from scratch at every refit, with a periodic full refit.
+
+    max_train_size: int, optional
+        If is not None, bound the number of samples the cost model trains on.
     """
 
     def __init__(
@@ -87,6 +94,8 @@ class XGBTuner(ModelBasedTuner):
         optimizer="sa",
         diversity_filter_ratio=None,
         log_interval=50,
+        warm_start=False,
+        max_train_size=None,
     ):
         cost_model = XGBoostCostModel(
             task,
@@ -94,6 +103,8 @@ class XGBTuner(ModelBasedTuner):
             loss_type=loss_type,
             num_threads=num_threads,
             log_interval=log_interval // 2,
+            warm_start=warm_start,
+            max_train_size=max_train_size,
         )
         if optimizer == "sa":
             optimizer = SimulatedAnnealingOptimizer(task, log_interval=log_interval)
@@ -0,0 +1,193 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Partition the CPUs of the local machine between tuning builders and runners.
+
+When tuning on a single machine, the build workers and the measurements compete for the same
+cores, which makes the measured costs noisy. This module assigns disjoint sets of CPUs to the
+two kinds of worker processes, e.g.
+
+.. code-block:: python
+
+    partition = cpu_affinity.partition_cpus(num_runner_cpus=4)
+    builder = LocalBuilder(cpu_affinity=partition.builder_cpus)
+    runner = LocalRunner(cpu_affinity=partition.runner_cpus)
+
+The layout can also be given explicitly as a string, e.g. `CPUPartition.parse("0-11:12-15")`.
+"""
+import os
+from typing import Callable, List, NamedTuple, Optional, Sequence
+
+
+def available_cpus() -> List[int]:
+    """The CPUs the current process is allowed to run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def parse_cpu_list(spec: str) -> List[int]:
+    """Parse a list of CPUs in the format of `taskset -c`, e.g. "0-3,8,10-11".
+
+    Parameters
+    ----------
+    spec : str
+        The list of CPUs.
+
+    Returns
+    -------
+    cpus : List[int]
+        The sorted CPU ids.
+    """
+    cpus = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            begin, end = part.split("-")
+            if int(begin) > int(end):
+                raise ValueError(f"Invalid CPU range: {part}")
+            cpus.update(range(int(begin), int(end) + 1))
+        else:
+            cpus.add(int(part))
+    return sorted(cpus)
+
+
+class CPUPartition(NamedTuple):
+    """Disjoint sets of CPUs for the build workers and the measurement workers.
+
+    Parameters
+    ----------
+    builder_cpus : List[int]
+        The CPUs the build workers run on.
+    runner_cpus : List[int]
+        The CPUs the measurement workers, and the kernels they measure, run on.
+    """
+
+    builder_cpus: List[int]
+    runner_cpus: List[int]
+
+    @staticmethod
+    def parse(spec: str) -> "CPUPartition":
+        """Parse a partition written as "<builder cpus>:<runner cpus>", e.g. "0-11:12-15".
+
+        Parameters
+        ----------
+        spec : str
+            The partition.
+
+        Returns
+        -------
+        partition : CPUPartition
+            The parsed partition.
+        """
+        if spec.count(":") != 1:
+            raise ValueError(f"Expect '<builder cpus>:<runner cpus>', but got: {spec}")
+        builder_spec, runner_spec = spec.split(":")
+        partition = CPUPartition(parse_cpu_list(builder_spec), parse_cpu_list(runner_spec))
+        if set(partition.builder_cpus) & set(partition.runner_cpus):
+            raise ValueError(f"The builder and runner CPUs overlap: {spec}")
+        return partition
+
+    def __str__(self) -> str:
+        return (
+            f"{','.join(map(str, self.builder_cpus))}:{','.join(map(str, self.runner_cpus))}"
+        )
+
+
+def partition_cpus(
+    num_runner_cpus: int = 1,
+    cpus: Optional[Sequence[int]] = None,
+) -> CPUPartition:
+    """Split the CPUs into disjoint sets for the builders and the runners. The runners get the
+    CPUs with the highest ids, which on most machines keeps them away from CPU 0 where system
+    interrupts are usually served.
+
+    Parameters
+    ----------
+    num_runner_cpus : int
+        The number of CPUs reserved for the measurements.
+    cpus : Optional[Sequence[int]]
+        The CPUs to split. Defaults to the CPUs available to the current process.
+
+    Returns
+    -------
+    partition : CPUPartition
+        The partition. If there are not enough CPUs to split, both sets contain all of them.
+    """
+    cpus = sorted(cpus) if cpus is not None else available_cpus()
+    if num_runner_cpus < 1:
+        raise ValueError(f"num_runner_cpus must be positive, got {num_runner_cpus}")
+    if len(cpus) <= num_runner_cpus:
+        return CPUPartition(list(cpus), list(cpus))
+    return CPUPartition(cpus[:-num_runner_cpus], cpus[-num_runner_cpus:])
+
+
+def bind_to_cpus(cpus: Optional[Sequence[int]]) -> None:
+    """Pin the current process to the given CPUs.
+
+    The TVM runtime thread pool sets the affinity of its own threads, so it is also configured,
+    through the environment, to start one thread per given CPU and to leave their affinity to
+    the process mask. This has to happen before the thread pool is first used, e.g. in the
+    initializer of a popen worker, and it is inherited by the processes forked afterwards,
+    e.g. the sessions of an RPC server.
+
+    Parameters
+    ----------
+    cpus : Optional[Sequence[int]]
+        The ids of the CPUs to run on. None or empty means no pinning.
+    """
+    if not cpus:
+        return
+    if not hasattr(os, "sched_setaffinity"):
+        raise ValueError("Binding to CPUs is not supported on this platform")
+    os.sched_setaffinity(0, cpus)
+    os.environ["TVM_NUM_THREADS"] = str(len(cpus))
+    os.environ["TVM_BIND_THREADS"] = "0"
+
+
+def bound_initializer(
+    cpus: Optional[Sequence[int]],
+    initializer: Optional[Callable] = None,
+) -> Optional[Callable]:
+    """Wrap the initializer of a popen worker to pin the worker to the given CPUs first.
+
+    Parameters
+    ----------
+    cpus : Optional[Sequence[int]]
+        The ids of the CPUs to run on. None or empty means no pinning.
+    initializer : Optional[Callable]
+        The original initializer, called with the original initargs.
+
+    Returns
+    -------
+    initializer : Optional[Callable]
+        The wrapped initializer.
+    """
+    if not cpus:
+        return initializer
+    cpus = list(cpus)
+
+    def _initializer(*args) -> None:
+        bind_to_cpus(cpus)
+        if initializer is not None:
+            initializer(*args)
+
+    return _initializer
@@ -0,0 +1,97 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Run the task extraction of many programs in parallel worker processes.
+
+Lowering a model through the TE compiler runs on a single core, so the extraction of the tasks
+of a model zoo is spread over a pool of popen workers, one program at a time per worker. Each
+program is given either as a `(mod, params)` pair, or as a function without arguments returning
+the pair, which is then called in the worker, e.g. to load a model there instead of sending its
+parameters to the worker.
+
+This module is shared by the parallel extraction functions of auto_scheduler, autotvm and
+meta_schedule, which merge the tasks returned for each program.
+"""
+import functools
+import logging
+from typing import Any, Callable, List, Optional, Sequence
+
+from .popen_pool import PopenPoolExecutor, StatusKind
+
+logger = logging.getLogger(__name__)
+
+
+def _to_numpy(params):
+    """NDArrays cannot be pickled, so the parameters are sent to the workers as numpy arrays"""
+    if not params:
+        return params
+    return {name: p.numpy() if hasattr(p, "numpy") else p for name, p in params.items()}
+
+
+def _extract_program(extract_func, program):
+    mod, params = program() if callable(program) else program
+    return extract_func(mod, params)
+
+
+def map_programs(
+    extract_func: Callable[[Any, Optional[dict]], Any],
+    programs: Sequence[Any],
+    n_parallel: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> List[Optional[Any]]:
+    """Call the extraction function on each program in a pool of worker processes.
+
+    Parameters
+    ----------
+    extract_func : Callable[[Any, Optional[dict]], Any]
+        The function extracting the tasks of a program, called in a worker with the module and
+        the parameters of the program. Its result must be picklable.
+    programs : Sequence[Any]
+        The programs, each either a `(mod, params)` pair or a function returning the pair.
+    n_parallel : Optional[int]
+        The number of worker processes. Defaults to the number of CPUs.
+    timeout : Optional[float]
+        The timeout of the extraction of each program, in seconds.
+
+    Returns
+    -------
+    results : List[Optional[Any]]
+        The result of the extraction of each program, or None for the programs whose
+        extraction failed or timed out, which are logged.
+    """
+    programs = [
+        program if callable(program) else (program[0], _to_numpy(program[1]))
+        for program in programs
+    ]
+    executor = PopenPoolExecutor(max_workers=n_parallel, timeout=timeout)
+    results = []
+    worker = functools.partial(_extract_program, extract_func)
+    try:
+        for i, map_result in enumerate(executor.map_with_error_catching(worker, programs)):
+            if map_result.status == StatusKind.COMPLETE:
+                results.append(map_result.value)
+            elif map_result.status == StatusKind.TIMEOUT:
+                logger.warning("Task extraction of program #%d timed out after %s s", i, timeout)
+                results.append(None)
+            else:
+                logger.warning("Task extraction of program #%d failed: %s", i, map_result.value)
+                results.append(None)
+    finally:
+        executor.shutdown()
+    return results
@@ -374,12 +374,18 @@ class PopenPoolExecutor:
             raise TypeError("initializer must be callable for PopenPoolExecutor")
 
     def __del__(self):
+        self.shutdown()
+
+    def shutdown(self):
+        """Kill the worker processes and shut down the internal thread pool.
+        The executor cannot be used afterwards."""
         self._lock.acquire()
         for worker in self._worker_map.values():
             try:
                 worker.kill()
             except ImportError:
                 pass
+        self._worker_map = {}
         self._lock.release()
         self._threadpool.shutdown()
 
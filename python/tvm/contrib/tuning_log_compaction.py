@@ -0,0 +1,182 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Compact the line-based tuning logs of the tuners.
+
+A tuning log keeps every measured candidate, while only the best few of each workload are ever
+used, so loading it gets slower and slower. A compaction keeps the `top_k` fastest records of
+each workload and target, drops the failed measurements and the duplicated candidates, and
+rewrites the log atomically, i.e. a reader sees either the old or the new log.
+
+This module is format-agnostic: the autotvm logs and the meta_schedule JSON databases provide
+a function parsing a line of their format, see `autotvm.record.compact_log` and
+`meta_schedule.database.compact_json_database`.
+"""
+import heapq
+import logging
+import os
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ParsedLine(NamedTuple):
+    """The keys of a line of a tuning log.
+
+    Parameters
+    ----------
+    group : str
+        The key of the workload and the target of the record. The top k records of each group
+        are kept.
+    candidate : str
+        The key of the measured candidate, e.g. its config or its trace. Only the fastest record
+        of each candidate of a group is kept.
+    cost : Optional[float]
+        The mean run time of the record, or None if its measurement failed.
+    """
+
+    group: str
+    candidate: str
+    cost: Optional[float]
+
+
+class CompactionReport(NamedTuple):
+    """The report of a compaction.
+
+    Parameters
+    ----------
+    num_records : int
+        The number of records before the compaction.
+    num_kept : int
+        The number of records kept.
+    num_failed : int
+        The number of records dropped because their measurement failed, or they could not be
+        parsed.
+    num_duplicates : int
+        The number of records dropped because a faster record of the same candidate was kept.
+    bytes_before : int
+        The size of the log before the compaction.
+    bytes_after : int
+        The size of the log after the compaction.
+    """
+
+    num_records: int
+    num_kept: int
+    num_failed: int
+    num_duplicates: int
+    bytes_before: int
+    bytes_after: int
+
+
+def write_lines_atomically(path: str, lines: List[str]) -> None:
+    """Write lines to a file through a temporary file in the same directory, which is then
+    renamed over the file, so that a concurrent reader never sees a partial file.
+
+    Parameters
+    ----------
+    path : str
+        The file to write.
+    lines : List[str]
+        The lines, without their newlines.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            for line in lines:
+                f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def compact_log_file(
+    path: str,
+    parse: Callable[[str], Optional[ParsedLine]],
+    top_k: int = 1,
+    out_path: Optional[str] = None,
+) -> CompactionReport:
+    """Compact a tuning log with one record per line. The kept records stay in their order.
+
+    Parameters
+    ----------
+    path : str
+        The log to compact.
+    parse : Callable[[str], Optional[ParsedLine]]
+        The function parsing a line of the log, returning None if the line cannot be parsed.
+    top_k : int
+        The number of records kept per group.
+    out_path : Optional[str]
+        The file to write the compacted log to. Defaults to the log itself.
+
+    Returns
+    -------
+    report : CompactionReport
+        The report of the compaction.
+    """
+    if top_k < 1:
+        raise ValueError(f"top_k must be positive, got {top_k}")
+    bytes_before = os.path.getsize(path)
+    with open(path) as f:
+        lines = [line.rstrip("\n") for line in f if line.strip()]
+
+    # Step 1. Keep the fastest record of each candidate
+    best: Dict[Tuple[str, str], Tuple[float, int]] = {}
+    num_failed = 0
+    for idx, line in enumerate(lines):
+        parsed = parse(line)
+        if parsed is None or parsed.cost is None:
+            num_failed += 1
+            continue
+        key = (parsed.group, parsed.candidate)
+        if key not in best or parsed.cost < best[key][0]:
+            best[key] = (parsed.cost, idx)
+    # Step 2. Keep the top k candidates of each group, the earliest first on ties
+    heaps: Dict[str, List[Tuple[float, int]]] = {}
+    for (group, _), (cost, idx) in best.items():
+        heap = heaps.setdefault(group, [])
+        if len(heap) < top_k:
+            heapq.heappush(heap, (-cost, -idx))
+        else:
+            heapq.heappushpop(heap, (-cost, -idx))
+    kept = sorted(-neg_idx for heap in heaps.values() for _, neg_idx in heap)
+
+    out_path = out_path or path
+    write_lines_atomically(out_path, [lines[idx] for idx in kept])
+    report = CompactionReport(
+        num_records=len(lines),
+        num_kept=len(kept),
+        num_failed=num_failed,
+        num_duplicates=len(lines) - num_failed - len(best),
+        bytes_before=bytes_before,
+        bytes_after=os.path.getsize(out_path),
+    )
+    logger.info(
+        "Compacted %s: kept %d of %d records (%d failed, %d duplicated), %d -> %d bytes",
+        path,
+        report.num_kept,
+        report.num_records,
+        report.num_failed,
+        report.num_duplicates,
+        report.bytes_before,
+        report.bytes_after,
+    )
+    return report
@@ -0,0 +1,267 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""A common sink for the timing telemetry of the tuners.
+
+The callbacks of autotvm, auto_scheduler and meta_schedule report where the wall clock of a
+tuning job goes as rows of a single long-format table, one timing per row, e.g. the build and
+run time of each trial, or the search, measurement and cost model training time of each round.
+The table is appended to a CSV, JSON lines or Parquet file, so the files of many jobs can be
+concatenated and analyzed together, e.g. with pandas.
+
+Each row has the columns of `TelemetryRecord`. The events reported by the callbacks are:
+
+- "measure": the total time of a trial, including its build, upload and run.
+- "run": the mean run time of a trial. Failed trials are reported with a NaN run time.
+- "measure_batch": the time spent measuring all the trials of a round.
+- "round": the wall time between two measured rounds of a tuner.
+- "search", "train": the time spent searching a round, and training the cost model on it.
+- "queue": the time the measurer spent idle, waiting for the search or the training.
+- any profiler scope of meta_schedule, e.g. "EvoSearch/Evolve/PredictNormalizedScore".
+"""
+import csv
+import json
+import math
+import os
+import platform
+import threading
+import time
+from typing import List, NamedTuple, Optional
+
+
+FORMATS = ("csv", "jsonl", "parquet")
+
+
+class TelemetryRecord(NamedTuple):
+    """A row of tuning telemetry.
+
+    Parameters
+    ----------
+    timestamp : float
+        The time the row was recorded, in seconds since the epoch.
+    job : str
+        The name of the tuning job.
+    framework : str
+        The tuner that reported the row, i.e. "autotvm", "auto_scheduler" or "meta_schedule".
+    task : str
+        The name of the tuned task.
+    round : int
+        The index of the round of the task, or -1 if unknown.
+    trial : int
+        The index of the trial in its round, or -1 for the timings of a whole round.
+    event : str
+        What is timed.
+    seconds : float
+        The duration of the event, in seconds.
+    error_no : int
+        The error number of the trial, 0 if it succeeded or for the timings of a whole round.
+    """
+
+    timestamp: float
+    job: str
+    framework: str
+    task: str
+    round: int
+    trial: int
+    event: str
+    seconds: float
+    error_no: int
+
+
+def _file_format(path: str, file_format: Optional[str]) -> str:
+    if file_format is None:
+        file_format = os.path.splitext(path)[1].lstrip(".").lower()
+        file_format = "jsonl" if file_format == "json" else file_format
+    if file_format not in FORMATS:
+        raise ValueError(f"Unsupported telemetry format {file_format!r}, expect one of {FORMATS}")
+    return file_format
+
+
+class TelemetrySink:
+    """Append rows of tuning telemetry to a file. The rows are buffered, and written when the
+    buffer is full, on `flush` and on `close`. The sink is thread safe, so it can be shared by
+    the callbacks of several tuners.
+
+    Parameters
+    ----------
+    path : str
+        The file to append to.
+    file_format : Optional[str]
+        The format of the file, one of "csv", "jsonl" or "parquet". Defaults to the extension
+        of the path. Parquet requires pyarrow, and a Parquet file is overwritten instead of
+        appended to, as the format does not support appending.
+    job : Optional[str]
+        The name of the tuning job in the rows. Defaults to the host name and the process id.
+    buffer_size : int
+        The number of rows to buffer before writing them.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        file_format: Optional[str] = None,
+        job: Optional[str] = None,
+        buffer_size: int = 256,
+    ) -> None:
+        self.path = path
+        self.file_format = _file_format(path, file_format)
+        self.job = job or f"{platform.node()}-{os.getpid()}"
+        self.buffer_size = buffer_size
+        self._rows: List[TelemetryRecord] = []
+        self._lock = threading.Lock()
+        self._parquet_writer = None
+        dirname = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(dirname):
+            os.makedirs(dirname)
+
+    def record(
+        self,
+        framework: str,
+        task: str,
+        event: str,
+        seconds: float,
+        round_idx: int = -1,
+        trial: int = -1,
+        error_no: int = 0,
+    ) -> None:
+        """Record a timing.
+
+        Parameters
+        ----------
+        framework : str
+            The tuner that reports the timing.
+        task : str
+            The name of the tuned task.
+        event : str
+            What is timed.
+        seconds : float
+            The duration of the event, in seconds.
+        round_idx : int
+            The index of the round of the task, or -1 if unknown.
+        trial : int
+            The index of the trial in its round, or -1 for the timings of a whole round.
+        error_no : int
+            The error number of the trial.
+        """
+        row = TelemetryRecord(
+            time.time(),
+            self.job,
+            framework,
+            str(task),
+            int(round_idx),
+            int(trial),
+            event,
+            float(seconds),
+            int(error_no),
+        )
+        with self._lock:
+            self._rows.append(row)
+            if len(self._rows) >= self.buffer_size:
+                self._write()
+
+    def flush(self) -> None:
+        """Write the buffered rows"""
+        with self._lock:
+            self._write()
+
+    def close(self) -> None:
+        """Write the buffered rows and close the file"""
+        with self._lock:
+            self._write()
+            if self._parquet_writer is not None:
+                self._parquet_writer.close()
+                self._parquet_writer = None
+
+    def __enter__(self) -> "TelemetrySink":
+        return self
+
+    def __exit__(self, ptype, value, trace) -> None:
+        self.close()
+
+    def _write(self) -> None:
+        rows, self._rows = self._rows, []
+        if not rows:
+            return
+        if self.file_format == "csv":
+            write_header = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            with open(self.path, "a", newline="") as f:
+                writer = csv.writer(f)
+                if write_header:
+                    writer.writerow(TelemetryRecord._fields)
+                writer.writerows(rows)
+        elif self.file_format == "jsonl":
+            with open(self.path, "a") as f:
+                for row in rows:
+                    row = row._asdict()
+                    # NaN is not valid JSON, so the failed trials have a null run time instead
+                    if math.isnan(row["seconds"]):
+                        row["seconds"] = None
+                    f.write(json.dumps(row) + "\n")
+        else:
+            self._write_parquet(rows)
+
+    def _write_parquet(self, rows: List[TelemetryRecord]) -> None:
+        try:
+            import pyarrow as pa  # pylint: disable=import-outside-toplevel
+            import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+        except ImportError as err:
+            raise ImportError("The Parquet telemetry format requires pyarrow") from err
+        table = pa.Table.from_pydict(
+            {name: [getattr(row, name) for row in rows] for name in TelemetryRecord._fields}
+        )
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+        self._parquet_writer.write_table(table)
+
+
+def load_telemetry(path: str, file_format: Optional[str] = None) -> List[TelemetryRecord]:
+    """Load the rows of a telemetry file written by a `TelemetrySink`.
+
+    Parameters
+    ----------
+    path : str
+        The telemetry file.
+    file_format : Optional[str]
+        The format of the file. Defaults to the extension of the path.
+
+    Returns
+    -------
+    rows : List[TelemetryRecord]
+        The rows of the file.
+    """
+    file_format = _file_format(path, file_format)
+    if file_format == "csv":
+        types = [float, str, str, str, int, int, str, float, int]
+        with open(path, newline="") as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            return [TelemetryRecord(*[t(v) for t, v in zip(types, row)]) for row in reader if row]
+    if file_format == "jsonl":
+        rows = []
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    row = json.loads(line)
+                    if row["seconds"] is None:
+                        row["seconds"] = float("nan")
+                    rows.append(TelemetryRecord(**row))
+        return rows
+    import pyarrow.parquet as pq  # pylint: disable=import-outside-toplevel
+
+    return [TelemetryRecord(**row) for row in pq.read_table(path).to_pylist()]
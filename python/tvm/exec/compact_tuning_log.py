@@ -0,0 +1,105 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name
+"""Compact tuning logs: keep the top-k records of each workload and target, and drop the
+failed and duplicated ones.
+
+Usage:
+    # An autotvm log, rewritten in place
+    python -m tvm.exec.compact_tuning_log --format autotvm --i tuning.log --top-k 2
+
+    # The tuning record table of a meta_schedule JSON database, given its work directory,
+    # with the time to load the database before and after
+    python -m tvm.exec.compact_tuning_log --format meta_schedule --i work_dir --time-load
+"""
+import argparse
+import logging
+import os
+import time
+
+from ..autotvm.record import compact_log, load_from_file
+from ..meta_schedule.database import JSONDatabase, compact_json_database
+
+
+def _load_secs(args, path):
+    """The time to load a log, or the database of a tuning record table"""
+    tic = time.time()
+    if args.format == "autotvm":
+        for _ in load_from_file(path):
+            pass
+    else:
+        JSONDatabase(args.workload, path, allow_missing=False)
+    return time.time() - tic
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--format", choices=["autotvm", "meta_schedule"], required=True)
+    parser.add_argument(
+        "--i",
+        type=str,
+        required=True,
+        help="The autotvm log, or the tuning record table or work directory of a JSON database",
+    )
+    parser.add_argument("--o", type=str, help="The output file. Defaults to the input")
+    parser.add_argument(
+        "--workload",
+        type=str,
+        help="The workload table of a JSON database, only to time its loading. "
+        "Defaults to database_workload.json next to the tuning record table",
+    )
+    parser.add_argument("--top-k", type=int, default=1, help="Records kept per workload")
+    parser.add_argument("--time-load", action="store_true", help="Time the load before/after")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    path = args.i
+    if args.format == "meta_schedule" and os.path.isdir(path):
+        path = os.path.join(path, "database_tuning_record.json")
+    if not os.path.isfile(path):
+        raise ValueError("Invalid input file: " + path)
+    args.workload = args.workload or os.path.join(
+        os.path.dirname(os.path.abspath(path)), "database_workload.json"
+    )
+
+    load_before = _load_secs(args, path) if args.time_load else None
+    if args.format == "autotvm":
+        report = compact_log(path, out_file=args.o, top_k=args.top_k)
+    else:
+        report = compact_json_database(path, top_k=args.top_k, path_output=args.o)
+    print(
+        "Kept %d of %d records (%d failed, %d duplicated), %.1f -> %.1f KB"
+        % (
+            report.num_kept,
+            report.num_records,
+            report.num_failed,
+            report.num_duplicates,
+            report.bytes_before / 1024,
+            report.bytes_after / 1024,
+        )
+    )
+    if args.time_load:
+        load_after = _load_secs(args, args.o or path)
+        print("Load time: %.3f s -> %.3f s" % (load_before, load_after))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""A content-addressed on-disk cache of exported build artifacts"""
+import hashlib
+import json
+import os
+import os.path as osp
+import shutil
+import tempfile
+import uuid
+from typing import Optional
+
+import tvm
+from tvm.ir import IRModule
+from tvm.support import libinfo
+from tvm.target import Target
+
+from ..utils import shash2hex
+
+
+def _build_env() -> str:
+    """The version and the build options of TVM, e.g. its LLVM version, which the artifacts of a
+    persistent cache must not outlive."""
+    return json.dumps({"version": tvm.__version__, "libinfo": libinfo()}, sort_keys=True)
+
+
+class BuildCache:
+    """A content-addressed cache of build artifacts, shared by the builder worker processes.
+
+    Each artifact is stored under a key derived from the structural hash of the module to build,
+    the target and the version of TVM, so a candidate that is structurally identical to a
+    previously built one, even if it comes from a different trace or task, reuses the exported
+    artifact instead of compiling it again. Artifacts are published by atomic rename, so
+    concurrent workers never observe a partial file, and the least recently used ones are
+    evicted to bound the size.
+
+    Parameters
+    ----------
+    cache_dir : str
+        The directory to store the artifacts in.
+    max_bytes : Optional[int]
+        The maximum total size of the artifacts kept in the cache. None means unbounded.
+    """
+
+    cache_dir: str
+    max_bytes: Optional[int]
+
+    def __init__(self, cache_dir: str, max_bytes: Optional[int] = None) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(
+        mod: IRModule,
+        target: Target,
+        params: Optional[bytearray],
+        build_func: Optional[str],
+        export_func: Optional[str],
+        cache_tag: Optional[str] = None,
+    ) -> str:
+        """Compute the cache key of a build.
+
+        Parameters
+        ----------
+        mod : IRModule
+            The module to be built, after the transformations that do not change the kernel.
+        target : Target
+            The target to build for.
+        params : Optional[bytearray]
+            The serialized parameters to build with.
+        build_func : Optional[str]
+            The name of the build function.
+        export_func : Optional[str]
+            The name of the export function.
+        cache_tag : Optional[str]
+            The tag identifying the version of the build and export functions that are not
+            registered ones.
+
+        Returns
+        -------
+        key : str
+            The cache key.
+        """
+        hasher = hashlib.sha256()
+        for item in [
+            shash2hex(mod),
+            str(target.export()),
+            str(build_func),
+            str(export_func),
+            str(cache_tag),
+            _build_env(),
+        ]:
+            hasher.update(item.encode("utf-8"))
+            hasher.update(b"\0")
+        if params is not None:
+            hasher.update(bytes(params))
+        return hasher.hexdigest()
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Get a private copy of a cached artifact. The copy is made because the caller, e.g. the
+        `RemoveBuildArtifact` measure callback, may delete the artifact once it is measured.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+
+        Returns
+        -------
+        artifact_path : Optional[str]
+            The path to the copy of the artifact, or None if it is not cached.
+        """
+        entry = osp.join(self.cache_dir, key)
+        try:
+            (name,) = os.listdir(entry)
+        except (OSError, ValueError):
+            return None
+        artifact_path = osp.join(tempfile.mkdtemp(), name)
+        try:
+            shutil.copyfile(osp.join(entry, name), artifact_path)
+            os.utime(entry)  # Mark as recently used
+        except OSError:
+            # Evicted in between
+            shutil.rmtree(osp.dirname(artifact_path), ignore_errors=True)
+            return None
+        return artifact_path
+
+    def insert(self, key: str, artifact_path: str) -> None:
+        """Add an exported artifact to the cache. The artifact itself is left untouched.
+
+        Parameters
+        ----------
+        key : str
+            The cache key.
+        artifact_path : str
+            The path to the exported artifact.
+        """
+        tmp_entry = osp.join(self.cache_dir, "." + uuid.uuid4().hex)
+        try:
+            os.makedirs(tmp_entry)
+            shutil.copyfile(artifact_path, osp.join(tmp_entry, osp.basename(artifact_path)))
+            # Fails if another worker has published the same key in between, which is fine
+            os.rename(tmp_entry, osp.join(self.cache_dir, key))
+        except OSError:
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+
+    def evict(self) -> int:
+        """Remove the least recently used artifacts until the cache fits in `max_bytes`.
+
+        Returns
+        -------
+        num_evicted : int
+            The number of artifacts removed.
+        """
+        if self.max_bytes is None:
+            return 0
+        entries = []
+        total_bytes = 0
+        for key in os.listdir(self.cache_dir):
+            if key.startswith("."):
+                continue
+            entry = osp.join(self.cache_dir, key)
+            try:
+                size = sum(osp.getsize(osp.join(entry, name)) for name in os.listdir(entry))
+                entries.append((osp.getmtime(entry), size, entry))
+            except OSError:
+                continue
+            total_bytes += size
+        num_evicted = 0
+        for _, size, entry in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total_bytes -= size
+            num_evicted += 1
+        return num_evicted
@@ -20,16 +20,18 @@
 """Local builder that compile on the local host"""
 import os
 import tempfile
-from typing import Callable, Dict, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from tvm._ffi import register_func
 from tvm.ir import IRModule
 from tvm.runtime import Module, NDArray, load_param_dict, save_param_dict
 from tvm.target import Target
 
+from ...contrib.cpu_affinity import bound_initializer
 from ...contrib.popen_pool import MapResult, PopenPoolExecutor, StatusKind
 from ..logging import get_logger
 from ..utils import cpu_count, derived_object, get_global_func_with_default_on_worker
+from .build_cache import BuildCache
 from .builder import BuilderInput, BuilderResult, PyBuilder
 
 logger = get_logger(__name__)  # pylint: disable=invalid-name
@@ -73,6 +75,17 @@ class LocalBuilder(PyBuilder):
     f_export : Union[None, str, T_EXPORT]
         Name of the export function to be used.
         Defaults to `meta_schedule.builder.default_export`.
+    cache_dir : Optional[str]
+        The directory of the build cache, which can be shared across tasks and tuning runs.
+        None means no caching.
+    cache_max_bytes : int
+        The maximum size of the build cache in bytes.
+    cache_tag : Optional[str]
+        The tag identifying the version of `f_build` and `f_export` when they are functions
+        rather than registered names. Their name alone does not tell a lambda or an edited
+        function apart, so the build cache is disabled for them unless a tag is given.
+    cpu_affinity : Optional[List[int]]
+        The CPUs to pin the worker processes to, e.g. to keep them off the CPUs of the runner.
 
     Attributes
     ----------
@@ -109,6 +122,10 @@ class LocalBuilder(PyBuilder):
     initializer: Optional[Callable[[], None]]
     f_build: Union[None, str, T_BUILD]
     f_export: Union[None, str, T_EXPORT]
+    cache_dir: Optional[str]
+    cache_max_bytes: int
+    cache_tag: Optional[str]
+    cpu_affinity: Optional[List[int]]
 
     def __init__(
         self,
@@ -118,6 +135,10 @@ class LocalBuilder(PyBuilder):
         f_build: Union[None, str, T_BUILD] = None,
         f_export: Union[None, str, T_EXPORT] = None,
         initializer: Optional[Callable[[], None]] = None,
+        cache_dir: Optional[str] = None,
+        cache_max_bytes: int = 4 << 30,
+        cache_tag: Optional[str] = None,
+        cpu_affinity: Optional[List[int]] = None,
     ) -> None:
         """Constructor.
 
@@ -136,23 +157,52 @@ class LocalBuilder(PyBuilder):
             Defaults to `meta_schedule.builder.default_export`.
         initializer : Optional[Callable[[], None]]
             The initializer to be used for the worker processes.
+        cache_dir : Optional[str]
+            The directory of the build cache. None means no caching.
+        cache_max_bytes : int
+            The maximum size of the build cache in bytes.
+        cache_tag : Optional[str]
+            The tag identifying the version of `f_build` and `f_export` when they are functions.
+            The build cache is disabled for functions without a tag.
+        cpu_affinity : Optional[List[int]]
+            The CPUs to pin the worker processes to. None means no pinning.
+            See `tvm.contrib.cpu_affinity.partition_cpus`.
         """
         super().__init__()
 
         if max_workers is None:
-            max_workers = cpu_count(logical=True)
+            max_workers = len(cpu_affinity) if cpu_affinity else cpu_count(logical=True)
         logger.info("LocalBuilder: max_workers = %d", max_workers)
+        if cpu_affinity:
+            logger.info("LocalBuilder: cpu_affinity = %s", cpu_affinity)
 
         self.max_workers = max_workers
         self.timeout_sec = timeout_sec
         self.initializer = initializer
         self.f_build = f_build
         self.f_export = f_export
+        custom_funcs = callable(f_build) or callable(f_export)
+        if cache_dir is not None and cache_tag is None and custom_funcs:
+            logger.warning(
+                "LocalBuilder: The build cache is disabled, because f_build or f_export is a "
+                "function without cache_tag"
+            )
+            cache_dir = None
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+        self.cache_tag = cache_tag
+        self.cpu_affinity = cpu_affinity
+        self._cache_hits = 0
+        self._cache_lookups = 0
+        if cache_dir is not None:
+            BuildCache(cache_dir)
+            logger.info("LocalBuilder: cache_dir = %s", cache_dir)
         self._sanity_check()
 
     def build(self, build_inputs: List[BuilderInput]) -> List[BuilderResult]:
         results: List[BuilderResult] = []
         map_result: MapResult
+        num_hits = 0
 
         # Here we restart the PopenPool everytime because of a known memory leak issue with the
         # PopenPool workers after a couple times of usage. We don't apply the same to runners to
@@ -160,7 +210,7 @@ class LocalBuilder(PyBuilder):
         pool = PopenPoolExecutor(
             max_workers=self.max_workers,
             timeout=self.timeout_sec,
-            initializer=self.initializer,
+            initializer=bound_initializer(self.cpu_affinity, self.initializer),
         )
 
         # Dispatch the build inputs to the worker processes.
@@ -173,12 +223,16 @@ class LocalBuilder(PyBuilder):
                     build_input.mod,
                     build_input.target,
                     _serialize_params(build_input.params),
+                    self.cache_dir,
+                    self.cache_tag,
                 )
                 for build_input in build_inputs
             ],
         ):
             if map_result.status == StatusKind.COMPLETE:
-                results.append(BuilderResult(map_result.value, None))
+                artifact_path, cache_hit = map_result.value
+                num_hits += int(cache_hit)
+                results.append(BuilderResult(artifact_path, None))
             elif map_result.status == StatusKind.TIMEOUT:
                 results.append(
                     BuilderResult(
@@ -196,8 +250,23 @@ class LocalBuilder(PyBuilder):
             else:
                 raise ValueError("Unreachable: unexpected result: {map_result}")
         del pool
+        if self.cache_dir is not None:
+            self._log_cache_stats(num_hits, len(build_inputs))
         return results
 
+    def _log_cache_stats(self, num_hits: int, num_lookups: int) -> None:
+        self._cache_hits += num_hits
+        self._cache_lookups += num_lookups
+        num_evicted = BuildCache(self.cache_dir, self.cache_max_bytes).evict()
+        logger.info(
+            "LocalBuilder: Build cache hits %d/%d in this batch, hit rate %.2f%% overall, "
+            "%d artifacts evicted",
+            num_hits,
+            num_lookups,
+            100.0 * self._cache_hits / max(self._cache_lookups, 1),
+            num_evicted,
+        )
+
     def _sanity_check(self) -> None:
         def _check(f_build, f_export) -> None:
             get_global_func_with_default_on_worker(name=f_build, default=None)
@@ -207,7 +276,7 @@ class LocalBuilder(PyBuilder):
         pool = PopenPoolExecutor(
             max_workers=self.max_workers,
             timeout=self.timeout_sec,
-            initializer=self.initializer,
+            initializer=bound_initializer(self.cpu_affinity, self.initializer),
         )
         value = pool.submit(_check, self.f_build, self.f_export)
         value.result()
@@ -220,7 +289,9 @@ def _worker_func(
     mod: IRModule,
     target: Target,
     params: Optional[bytearray],
-) -> str:
+    cache_dir: Optional[str] = None,
+    cache_tag: Optional[str] = None,
+) -> Tuple[str, bool]:
     # Step 0. Get the registered functions
     f_build: T_BUILD = get_global_func_with_default_on_worker(
         _f_build,
@@ -230,11 +301,45 @@ def _worker_func(
         _f_export,
         default_export,
     )
-    # Step 1. Build the IRModule
+    # Step 1. Look up the build cache
+    cache: Optional[BuildCache] = None
+    if cache_dir is not None:
+        cache = BuildCache(cache_dir)
+        key = BuildCache.key(
+            _cache_key_mod(_f_build, mod),
+            target,
+            params,
+            _func_name(_f_build),
+            _func_name(_f_export),
+            cache_tag,
+        )
+        artifact_path = cache.lookup(key)
+        if artifact_path is not None:
+            return artifact_path, True
+    # Step 2. Build the IRModule
     rt_mod: Module = f_build(mod, target, _deserialize_params(params))
-    # Step 2. Export the Module
-    artifact_path: str = f_export(rt_mod)
-    return artifact_path
+    # Step 3. Export the Module
+    artifact_path = f_export(rt_mod)
+    if cache is not None:
+        cache.insert(key, artifact_path)
+    return artifact_path, False
+
+
+def _func_name(func: Union[None, str, Callable]) -> Optional[str]:
+    if func is None or isinstance(func, str):
+        return func
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def _cache_key_mod(f_build: Union[None, str, T_BUILD], mod: IRModule) -> IRModule:
+    """The module that identifies a build. The default build function strips the weight layout
+    rewrite blocks first, so candidates that differ only there produce the same kernel."""
+    if f_build in (None, "meta_schedule.builder.default_build"):
+        # pylint: disable=import-outside-toplevel
+        from tvm.tir.transform import RemoveWeightLayoutRewriteBlock
+
+        return RemoveWeightLayoutRewriteBlock(skip_ndarray_rewrite=True)(mod)
+    return mod
 
 
 @register_func("meta_schedule.builder.default_build")
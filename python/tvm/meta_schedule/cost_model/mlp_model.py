@@ -27,6 +27,7 @@ import os
 import random
 import tempfile
 from collections import OrderedDict
+from contextlib import contextmanager
 from itertools import chain as itertools_chain
 from typing import Dict, List, NamedTuple, Optional, Tuple
 
@@ -35,7 +36,6 @@ import torch  # type: ignore
 import tvm
 
 from ...contrib.tar import tar, untar
-from ...runtime import NDArray
 from ...target import Target
 from ..cost_model import PyCostModel
 from ..database import JSONDatabase
@@ -137,6 +137,40 @@ class TrainerConfig(NamedTuple):
         }
 
 
+class InferenceConfig(NamedTuple):
+    """Inference configuration
+
+    Parameters
+    ----------
+    num_threads : int
+        The number of threads used in prediction, 0 means the default of the backend.
+    max_rows : int
+        The maximum number of feature rows predicted at once.
+    backend : str
+        The backend of the prediction, "torch" or "tvm". With "tvm", the trained model is
+        compiled by TVM for `target` and re-compiled after each training.
+    target : str
+        The target of the compiled model when the backend is "tvm".
+    chunk_size : int
+        The number of rows of the inputs of the compiled model, which has static shapes.
+    """
+
+    num_threads: int = 0
+    max_rows: int = 65536
+    backend: str = "torch"
+    target: str = "llvm"
+    chunk_size: int = 1024
+
+    def to_dict(self):  # pylint: disable=missing-function-docstring
+        return {
+            "num_threads": self.num_threads,
+            "max_rows": self.max_rows,
+            "backend": self.backend,
+            "target": self.target,
+            "chunk_size": self.chunk_size,
+        }
+
+
 # pylint: disable=too-few-public-methods
 class FeatureGroup:
     """Feature group
@@ -416,6 +450,139 @@ class SegmentSumMLP(torch.nn.Module):
         return out
 
 
+def _relay_dense(data, linear: "torch.nn.Linear"):
+    from tvm import relay
+
+    weight = relay.const(linear.weight.detach().cpu().numpy())
+    bias = relay.const(linear.bias.detach().cpu().numpy())
+    return relay.nn.bias_add(relay.nn.dense(data, weight), bias)
+
+
+class CompiledSegmentSumMLP:
+    """A trained Segment Sum MLP model compiled by TVM, for prediction only.
+
+    The model is split into two functions with static shapes: the encoder, applied to chunks of
+    `chunk_size` feature rows, and the head, applied to chunks of `chunk_size` segment sums. The
+    segment sum between them is done with NumPy. The last chunk of each call is zero-padded.
+
+    Parameters
+    ----------
+    model : SegmentSumMLP
+        The trained model. Its weights are copied, so the compiled model does not follow its
+        further training.
+    target : str
+        The target to compile the model for.
+    chunk_size : int
+        The number of rows of the inputs of the compiled functions.
+    """
+
+    def __init__(self, model: SegmentSumMLP, target: str = "llvm", chunk_size: int = 1024):
+        from tvm import relay
+
+        linear = model.encoder[0]
+        input_dim, hidden_dim = linear.in_features, linear.out_features
+        self.chunk_size = chunk_size
+        self.device = tvm.device(Target(target).kind.name, 0)
+
+        features = relay.var("features", shape=(chunk_size, input_dim), dtype="float32")
+        encoded = relay.nn.relu(_relay_dense(features, model.encoder[0]))
+        encoded = relay.nn.relu(_relay_dense(encoded, model.encoder[2]))
+        self._encoder = self._build(relay.Function([features], encoded), target)
+
+        segment_sum = relay.var("segment_sum", shape=(chunk_size, hidden_dim), dtype="float32")
+        out = segment_sum
+        if isinstance(model.norm, torch.nn.BatchNorm1d):
+            norm = model.norm
+            out = relay.nn.batch_norm(
+                out,
+                relay.const(norm.weight.detach().cpu().numpy()),
+                relay.const(norm.bias.detach().cpu().numpy()),
+                relay.const(norm.running_mean.detach().cpu().numpy()),
+                relay.const(norm.running_var.detach().cpu().numpy()),
+                epsilon=norm.eps,
+            )[0]
+        out = relay.add(relay.nn.relu(_relay_dense(out, model.layer0[0])), out)
+        out = relay.add(relay.nn.relu(_relay_dense(out, model.layer1[0])), out)
+        out = _relay_dense(out, model.decoder)
+        if isinstance(model.sigmoid, torch.nn.Sigmoid):
+            out = relay.sigmoid(out)
+        self._head = self._build(relay.Function([segment_sum], out), target)
+
+    def _build(self, func, target: str):
+        from tvm import relay
+        from tvm.contrib import graph_executor
+
+        with tvm.transform.PassContext(opt_level=3):
+            lib = relay.build(tvm.IRModule.from_expr(func), target=target)
+        return graph_executor.GraphModule(lib["default"](self.device))
+
+    def _run(self, module, inputs: np.ndarray) -> np.ndarray:
+        outputs = []
+        padded = None
+        for begin in range(0, len(inputs), self.chunk_size):
+            chunk = inputs[begin : begin + self.chunk_size]
+            num_rows = len(chunk)
+            if num_rows < self.chunk_size:
+                padded = np.zeros((self.chunk_size, inputs.shape[1]), dtype="float32")
+                padded[:num_rows] = chunk
+                chunk = padded
+            module.set_input(0, tvm.nd.array(np.ascontiguousarray(chunk), self.device))
+            module.run()
+            outputs.append(module.get_output(0).numpy()[:num_rows])
+        return np.concatenate(outputs)
+
+    def __call__(self, segment_sizes: np.ndarray, features: np.ndarray) -> np.ndarray:
+        """Predict the scores of the segments.
+
+        Parameters
+        ----------
+        segment_sizes : np.ndarray
+            The number of feature rows of each segment.
+        features : np.ndarray
+            The normalized float32 feature rows of all the segments, concatenated.
+
+        Returns
+        -------
+        pred_results : np.ndarray
+            The predicted results, of shape (num_segments, output_dim).
+        """
+        encoded = self._run(self._encoder, features)
+        segment_sum = np.zeros((len(segment_sizes), encoded.shape[1]), dtype="float32")
+        nonempty = segment_sizes > 0
+        if nonempty.any():
+            starts = (np.cumsum(segment_sizes) - segment_sizes)[nonempty]
+            segment_sum[nonempty] = np.add.reduceat(encoded, starts, axis=0)
+        return self._run(self._head, segment_sum)
+
+
+def extract_packed_features(
+    context: TuneContext,
+    candidates: List[MeasureCandidate],
+    extractor: Optional[FeatureExtractor] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Extract the feature vectors of the candidates without splitting them per candidate.
+
+    Parameters
+    ----------
+    context: TuneContext
+        The tuning context.
+    candidates: List[MeasureCandidate]
+        The measure candidates.
+    extractor: Optional[FeatureExtractor]
+        The feature extractor.
+
+    Returns
+    -------
+    packed: np.ndarray
+        The feature rows of all the candidates, concatenated.
+    segment_sizes: np.ndarray
+        The number of feature rows of each candidate.
+    """
+    extractor = extractor or PerStoreFeature(extract_workload=True)
+    packed, ids = extractor.extract_from_batched(context, candidates)
+    return packed, np.bincount(ids, minlength=len(candidates))
+
+
 def extract_features(
     context: TuneContext,
     candidates: List[MeasureCandidate],
@@ -442,17 +609,14 @@ def extract_features(
     new_mean_costs: np.ndarray
         The mean costs.
     """
-    extractor = extractor or PerStoreFeature(extract_workload=True)
-
-    def _feature(feature: NDArray) -> np.ndarray:
-        return feature.numpy().astype("float32")
 
     def _mean_cost(res: RunnerResult) -> float:
         if not res.run_secs:
             return 1e10
         return float(np.median([float(s) for s in res.run_secs]))
 
-    new_features = [_feature(x) for x in extractor.extract_from(context, candidates)]
+    packed, counts = extract_packed_features(context, candidates, extractor)
+    new_features = np.split(packed, np.cumsum(counts)[:-1], axis=0) if len(candidates) else []
     new_mean_costs = (
         np.array([_mean_cost(x) for x in results]).astype("float32")
         if results is not None
@@ -936,6 +1100,158 @@ class SegmentSumMLPTrainer:
                 self.train_incremental(features, costs)
 
 
+@contextmanager
+def _torch_num_threads(num_threads: int):
+    if num_threads <= 0:
+        yield
+        return
+    prev_num_threads = torch.get_num_threads()
+    torch.set_num_threads(num_threads)
+    try:
+        yield
+    finally:
+        torch.set_num_threads(prev_num_threads)
+
+
+@contextmanager
+def _tvm_num_threads(num_threads: int):
+    """Use `num_threads` threads in the TVM thread pool of the calling thread, and restore its
+    previous number of threads afterwards. The previous affinity mode is not restored, so the
+    pool is left untouched when it already has `num_threads` threads."""
+    prev_num_threads = tvm.get_global_func("runtime.NumThreads")()
+    if num_threads <= 0 or num_threads == prev_num_threads:
+        yield
+        return
+    config_threadpool = tvm.get_global_func("runtime.config_threadpool")
+    config_threadpool(1, num_threads)
+    try:
+        yield
+    finally:
+        config_threadpool(1, prev_num_threads)
+
+
+def _segment_chunks(segment_sizes: np.ndarray, max_rows: int):
+    """Split the segments into consecutive chunks of at most `max_rows` feature rows. A segment
+    larger than `max_rows` makes a chunk on its own. Yield the segment and row ranges."""
+    ends = np.cumsum(segment_sizes)
+    seg_begin, row_begin = 0, 0
+    while seg_begin < len(segment_sizes):
+        seg_end = int(np.searchsorted(ends, row_begin + max_rows, side="right"))
+        seg_end = max(seg_end, seg_begin + 1)
+        row_end = int(ends[seg_end - 1])
+        yield seg_begin, seg_end, row_begin, row_end
+        seg_begin, row_begin = seg_end, row_end
+
+
+class SegmentSumMLPPredictor:
+    """The prediction path of the Segment Sum MLP model.
+
+    Unlike `SegmentSumMLPTrainer.predict_incremental`, which gathers mini-batches of segments
+    with a data loader, the features are normalized straight from the packed extractor output
+    into a preallocated buffer, pinned when predicting on GPU, and the segments are predicted
+    in large chunks under `torch.inference_mode`. The features of several tasks can be
+    predicted at once, each task being normalized on its own, as if predicted alone.
+
+    Parameters
+    ----------
+    state: State
+        The state of the trainer, whose model is used for prediction.
+    config: Optional[InferenceConfig]
+        The inference configuration.
+    """
+
+    state: State
+    config: InferenceConfig
+
+    def __init__(self, state: State, config: Optional[InferenceConfig] = None):
+        self.state = state
+        self.config = config or InferenceConfig()
+        if self.config.backend not in ("torch", "tvm"):
+            raise ValueError(f"Unknown inference backend: {self.config.backend}")
+        self.device = "cuda" if torch.cuda.device_count() else "cpu"
+        self._buffer: Optional["torch.Tensor"] = None
+        self._compiled: Optional[CompiledSegmentSumMLP] = None
+
+    def invalidate(self) -> None:
+        """Drop the compiled model, to be called whenever the model is trained or loaded."""
+        self._compiled = None
+
+    def _feature_buffer(self, num_rows: int, input_dim: int) -> "torch.Tensor":
+        buffer = self._buffer
+        if buffer is None or buffer.shape[0] < num_rows or buffer.shape[1] != input_dim:
+            capacity = max(num_rows, 2 * buffer.shape[0] if buffer is not None else 0)
+            buffer = torch.empty(
+                (capacity, input_dim), dtype=torch.float32, pin_memory=self.device == "cuda"
+            )
+            self._buffer = buffer
+        return buffer[:num_rows]
+
+    def _predict_torch(self, segment_sizes: np.ndarray, features: "torch.Tensor") -> np.ndarray:
+        model = self.state.model.to(self.device).eval()
+        pred_results = []
+        with torch.inference_mode(), _torch_num_threads(self.config.num_threads):
+            for seg_begin, seg_end, row_begin, row_end in _segment_chunks(
+                segment_sizes, self.config.max_rows
+            ):
+                pred = model(
+                    torch.from_numpy(segment_sizes[seg_begin:seg_end]).to(self.device),
+                    features[row_begin:row_end].to(self.device, non_blocking=True),
+                )
+                pred_results.append(pred.cpu().numpy().reshape(seg_end - seg_begin, -1))
+        return np.concatenate(pred_results)
+
+    def _predict_tvm(self, segment_sizes: np.ndarray, features: "torch.Tensor") -> np.ndarray:
+        if self._compiled is None:
+            self._compiled = CompiledSegmentSumMLP(
+                self.state.model.to("cpu").eval(), self.config.target, self.config.chunk_size
+            )
+        with _tvm_num_threads(self.config.num_threads):
+            return self._compiled(segment_sizes, features.numpy())
+
+    def predict(self, groups: List[Tuple[np.ndarray, np.ndarray]]) -> List[np.ndarray]:
+        """Predict the candidates of one or several tasks at once.
+
+        Parameters
+        ----------
+        groups: List[Tuple[np.ndarray, np.ndarray]]
+            The packed features and the segment sizes of the candidates of each task, as
+            returned by `extract_packed_features`.
+
+        Returns
+        -------
+        pred_results: List[np.ndarray]
+            The predicted results of the candidates of each task.
+        """
+        segment_sizes = np.concatenate(
+            [np.zeros(0, dtype="int64")] + [sizes.astype("int64") for _, sizes in groups]
+        )
+        num_rows = sum(len(packed) for packed, _ in groups)
+        if len(segment_sizes) == 0:
+            return [np.zeros(0, dtype="float32") for _ in groups]
+        features = self._feature_buffer(num_rows, self.state.model.encoder[0].in_features)
+        row = 0
+        for packed, _ in groups:
+            if len(packed) == 0:
+                continue
+            packed = np.asarray(packed, dtype="float32")
+            norm = packed.max(axis=0)
+            norm[norm == 0] = 1
+            torch.div(
+                torch.from_numpy(packed),
+                torch.from_numpy(norm),
+                out=features[row : row + len(packed)],
+            )
+            row += len(packed)
+        if self.config.backend == "tvm":
+            pred_results = self._predict_tvm(segment_sizes, features)
+        else:
+            pred_results = self._predict_torch(segment_sizes, features)
+        if pred_results.shape[1] == 1:
+            pred_results = pred_results[:, 0]
+        splits = np.cumsum([len(sizes) for _, sizes in groups])[:-1]
+        return np.split(pred_results, splits)
+
+
 @derived_object
 class MLPModel(PyCostModel):
     """Segment Sum MLP Model
@@ -944,17 +1260,22 @@ class MLPModel(PyCostModel):
     ----------
     trainer: SegmentSumMLPTrainer
         The trainer for the model, handling the training interface.
+    predictor: SegmentSumMLPPredictor
+        The predictor for the model, handling the prediction interface.
     """
 
     trainer: SegmentSumMLPTrainer
+    predictor: SegmentSumMLPPredictor
 
     def __init__(
         self,
         *,
         trainer: Optional[SegmentSumMLPTrainer] = None,
+        inference_config: Optional[InferenceConfig] = None,
     ):
         super().__init__()
         self.trainer = trainer or SegmentSumMLPTrainer()
+        self.predictor = SegmentSumMLPPredictor(self.trainer.state, inference_config)
 
     def load(self, path: str) -> None:
         """Load the cost model, cached data or raw data from given file location.
@@ -965,6 +1286,7 @@ class MLPModel(PyCostModel):
             The file path.
         """
         self.trainer.state.load(path)
+        self.predictor.invalidate()
 
     def save(self, path: str) -> None:
         """Save the cost model and data to given file location.
@@ -997,6 +1319,8 @@ class MLPModel(PyCostModel):
             context, candidates, results, self.trainer.state.extractor
         )
         self.trainer.update(features, mean_costs, shash2hex(context.mod))
+        if not self.trainer.frozen:
+            self.predictor.invalidate()
 
     def predict(self, context: TuneContext, candidates: List[MeasureCandidate]) -> np.ndarray:
         """Predict given the measure candidates.
@@ -1013,6 +1337,28 @@ class MLPModel(PyCostModel):
         result : np.ndarray
             The predicted normalized score.
         """
-        features, _ = extract_features(context, candidates, None, self.trainer.state.extractor)
-        pred_results = self.trainer.predict_incremental(features)
-        return pred_results
+        packed = extract_packed_features(context, candidates, self.trainer.state.extractor)
+        return self.predictor.predict([packed])[0]
+
+    def predict_tasks(
+        self, tasks: List[Tuple[TuneContext, List[MeasureCandidate]]]
+    ) -> List[np.ndarray]:
+        """Predict the measure candidates of several tasks at once.
+
+        Parameters
+        ----------
+        tasks : List[Tuple[TuneContext, List[MeasureCandidate]]]
+            The tuning context and the measure candidates of each task.
+
+        Return
+        ------
+        result : List[np.ndarray]
+            The predicted normalized scores of the candidates of each task.
+        """
+        extractor = self.trainer.state.extractor
+        return self.predictor.predict(
+            [
+                extract_packed_features(context, candidates, extractor)
+                for context, candidates in tasks
+            ]
+        )
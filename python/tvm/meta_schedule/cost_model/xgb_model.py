@@ -18,21 +18,37 @@
 # specific language governing permissions and limitations
 # under the License.
 """XGBoost-based cost model"""
+import glob
+import hashlib
 import os
 import tempfile
+import threading
+import time
 from collections import OrderedDict
 from itertools import chain as itertools_chain
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from typing_extensions import Literal
 
 import numpy as np  # type: ignore
 
 from ...contrib.tar import tar, untar
-from ...runtime import NDArray
+from ...target import Target
 from ..cost_model import PyCostModel
 from ..feature_extractor import FeatureExtractor
 from ..logging import get_logger
+from ..profiler import Profiler
 from ..runner import RunnerResult
 from ..search_strategy import MeasureCandidate
 from ..utils import cpu_count, derived_object, shash2hex
@@ -42,6 +58,7 @@ if TYPE_CHECKING:
     import xgboost as xgb  # type: ignore
     from xgboost.callback import TrainingCallback  # type: ignore
 
+    from ..database import Database, TuningRecord
     from ..tune_context import TuneContext
 
 
@@ -63,6 +80,22 @@ def make_metric_sorter(focused_metric):
     return sort_key
 
 
+class _TrainingJob(NamedTuple):
+    """The data to train a model on, and which model to publish it as."""
+
+    xs: List[np.ndarray]
+    ys: np.ndarray
+    base_booster: Optional["xgb.Booster"]
+    # None means the model shared by the tasks of the session
+    group_hash: Optional[str]
+
+
+def _mean_cost(run_secs: Optional[List[Any]]) -> float:
+    if not run_secs:
+        return 1e10
+    return float(np.median([float(s) for s in run_secs]))
+
+
 class PackSum:
     """The pack-sum format
 
@@ -79,30 +112,48 @@ class PackSum:
 
     dmatrix: "xgb.DMatrix"  # type: ignore # pylint: disable=invalid-name
     ids: np.ndarray
+    num_samples: int
 
     def __init__(
         self,
-        xs: List[np.ndarray],  # pylint: disable=invalid-name
+        xs: Union[List[np.ndarray], np.ndarray],  # pylint: disable=invalid-name
         ys: Optional[np.ndarray],  # pylint: disable=invalid-name
+        ids: Optional[np.ndarray] = None,
+        num_samples: Optional[int] = None,
     ):
         """Create PackSum format given a batch of samples
 
         Parameters
         ----------
-        xs : List[np.ndarray]
-            A batch of input samples
+        xs : Union[List[np.ndarray], np.ndarray]
+            A batch of input samples, or the samples already packed into one array, in which case
+            `ids` must be given.
         ys : Optional[List[float]]
             A batch of labels. None means no labels available.
+        ids : Optional[np.ndarray]
+            The index of the sample that each row of the packed `xs` belongs to.
+        num_samples : Optional[int]
+            The number of samples in the packed `xs`, including those without any block.
+            Defaults to the number of labels, or to the largest index in `ids` plus one.
         """
         import xgboost as xgb  # type: ignore # pylint: disable=import-outside-toplevel
 
-        repeats = [x.shape[0] for x in xs]
-        xs = np.concatenate(xs, axis=0)
-        self.ids = np.concatenate([[i] * repeat for i, repeat in enumerate(repeats)], axis=0)
+        if ids is None:
+            repeats = np.array([x.shape[0] for x in xs], dtype="int64")
+            num_samples = len(xs)
+            xs = np.concatenate(xs, axis=0)
+            ids = np.repeat(np.arange(num_samples, dtype="int64"), repeats)
+        elif num_samples is None:
+            if ys is not None:
+                num_samples = len(ys)
+            else:
+                num_samples = int(ids.max()) + 1 if ids.size else 0
+        self.ids = ids
+        self.num_samples = num_samples
         if ys is None:
             self.dmatrix = xgb.DMatrix(data=xs, label=None)
         else:
-            ys = np.concatenate([[y] * repeat for y, repeat in zip(ys, repeats)], axis=0)
+            ys = np.asarray(ys)[ids]
             self.dmatrix = xgb.DMatrix(data=xs, label=ys)
             self.dmatrix.set_weight(ys)
 
@@ -119,7 +170,7 @@ class PackSum:
         result : np.ndarray
             The predictions for each candidate.
         """
-        return np.bincount(self.ids, weights=pred)
+        return np.bincount(self.ids, weights=pred, minlength=self.num_samples)
 
     def obj_square_error(self, ys_pred: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
         """Implement square error loss on pack-sum format as
@@ -250,8 +301,12 @@ class XGBConfig(NamedTuple):
         }
 
 
+def _feature_key(feature: np.ndarray) -> bytes:
+    return hashlib.sha1(str(feature.shape).encode("utf-8") + feature.tobytes()).digest()
+
+
 class FeatureGroup:
-    """Feature group
+    """Feature group, in which samples with identical features are kept only once
 
     Parameters
     ----------
@@ -263,12 +318,15 @@ class FeatureGroup:
         The costs
     min_cost : float
         The minimum cost
+    keys : Set[bytes]
+        The hashes of the features
     """
 
     group_hash: str
     features: List[np.ndarray]
     costs: np.ndarray
     min_cost: float
+    keys: Set[bytes]
 
     def __init__(
         self,
@@ -277,18 +335,58 @@ class FeatureGroup:
         costs: np.ndarray,
     ) -> None:
         self.group_hash = group_hash
-        self.features = features
-        self.costs = costs
-        self.min_cost = np.min(costs)
+        self.features = []
+        self.costs = np.asarray(costs)[:0]
+        self.keys = set()
+        self.append(features, costs)
 
     def append(
         self,
         features: List[np.ndarray],
         costs: np.ndarray,
-    ) -> None:
+    ) -> Tuple[List[np.ndarray], np.ndarray]:
+        """Add samples to the group, skipping those whose features are already in it.
+
+        Returns
+        -------
+        features : List[np.ndarray]
+            The features of the added samples.
+        costs : np.ndarray
+            The costs of the added samples.
+        """
+        kept = []
+        for i, feature in enumerate(features):
+            key = _feature_key(feature)
+            if key not in self.keys:
+                self.keys.add(key)
+                kept.append(i)
+        features = [features[i] for i in kept]
+        costs = np.asarray(costs)[kept]
         self.features.extend(features)
         self.costs = np.append(self.costs, costs)
-        self.min_cost = np.min(self.costs)
+        self.min_cost = np.min(self.costs) if self.costs.size else float("inf")
+        return features, costs
+
+    def trim(self, max_size: int) -> int:
+        """Drop samples until at most `max_size` are left, keeping the best quarter of them and
+        the most recently added ones.
+
+        Returns
+        -------
+        num_dropped : int
+            The number of samples dropped.
+        """
+        num_samples = len(self.features)
+        if num_samples <= max_size:
+            return 0
+        num_best = max_size // 4
+        kept = np.zeros(num_samples, dtype=bool)
+        kept[np.argsort(self.costs, kind="stable")[:num_best]] = True
+        kept[np.flatnonzero(~kept)[-(max_size - num_best) :]] = True
+        self.features = [f for f, keep in zip(self.features, kept) if keep]
+        self.costs = self.costs[kept]
+        self.keys = {_feature_key(f) for f in self.features}
+        return num_samples - max_size
 
 
 @derived_object
@@ -303,7 +401,7 @@ class XGBModel(PyCostModel):
         The XGBoost model config.
     num_warmup_samples : int
         The number of samples that are used for warmup, i.e., the first few samples are predicted
-        with random results.
+        with random results, unless a global model is pre-trained.
     early_stopping_rounds : int
         The number of rounds for early stopping.
     verbose_eval : int
@@ -312,6 +410,26 @@ class XGBModel(PyCostModel):
         The number to calculate average peak score.
     adaptive_training : bool
         Whether use adaptive training to reduce tuning time.
+    fine_tune_per_task : bool
+        Whether to fine-tune a separate model for each task on top of the global model obtained by
+        `pretrain`, instead of a single model for all the tasks of the session. No effect without
+        a global model.
+    warm_start : bool
+        Whether to continue boosting the previous model on the samples added since it was
+        trained, instead of retraining from scratch on all the samples every time. A full refit
+        is still done every `full_refit_interval` trainings, and whenever the labels of the
+        previous samples change, i.e. a task finds a new best cost.
+    full_refit_interval : int
+        The number of trainings between two full refits when `warm_start` is enabled.
+    max_data_size : Optional[int]
+        The maximum number of samples to keep for training, split evenly among the tasks.
+        None means unbounded.
+    async_training : bool
+        Whether to train in a background thread, so that `update` returns as soon as the new
+        samples are added and the search continues with the last trained model meanwhile.
+    max_staleness : int
+        The maximum number of updates the model used for prediction may lag behind when training
+        asynchronously. `update` waits for the training once the bound is exceeded.
     """
 
     # feature extractor
@@ -331,6 +449,23 @@ class XGBModel(PyCostModel):
     # adaptive training
     adaptive_training: bool
     last_train_size: int
+    # transfer learning
+    fine_tune_per_task: bool
+    global_booster: Optional["xgb.Booster"]
+    task_boosters: Dict[str, "xgb.Booster"]
+    # incremental training
+    warm_start: bool
+    full_refit_interval: int
+    max_data_size: Optional[int]
+    num_added: int
+    num_warm_starts: int
+    pending: Dict[str, Tuple[List[np.ndarray], List[np.ndarray]]]
+    trained_min_costs: Dict[str, float]
+    # asynchronous training
+    async_training: bool
+    max_staleness: int
+    async_train_secs: float
+    async_wait_secs: float
 
     def __init__(
         self,
@@ -346,6 +481,12 @@ class XGBModel(PyCostModel):
         verbose_eval: int = 25,
         average_peak_n: int = 32,
         adaptive_training: bool = True,
+        fine_tune_per_task: bool = True,
+        warm_start: bool = False,
+        full_refit_interval: int = 5,
+        max_data_size: Optional[int] = None,
+        async_training: bool = False,
+        max_staleness: int = 1,
         num_tuning_cores: Optional[int] = None,
         tree_method: Optional[Literal["auto", "exact", "approx", "hist", "gpu_hist"]] = None,
     ):
@@ -379,6 +520,29 @@ class XGBModel(PyCostModel):
         # adaptive training
         self.adaptive_training = adaptive_training
         self.last_train_size = 0
+        # transfer learning
+        self.fine_tune_per_task = fine_tune_per_task
+        self.global_booster = None
+        self.task_boosters = {}
+        # incremental training
+        self.warm_start = warm_start
+        self.full_refit_interval = full_refit_interval
+        self.max_data_size = max_data_size
+        self.num_added = 0
+        self.num_warm_starts = 0
+        self.pending = {}
+        self.trained_min_costs = {}
+        # asynchronous training
+        self.async_training = async_training
+        self.max_staleness = max_staleness
+        self.async_train_secs = 0.0
+        self.async_wait_secs = 0.0
+        self._training_cond = threading.Condition()
+        self._training_thread = None
+        self._training_error: Optional[Exception] = None
+        self._requested_groups: Dict[str, None] = OrderedDict()
+        self._requested_seq = 0
+        self._trained_seq = 0
 
     def load(self, path: str) -> None:
         """Load the cost model from given file location.
@@ -396,8 +560,10 @@ class XGBModel(PyCostModel):
         """
         import xgboost as xgb  # pylint: disable=import-outside-toplevel
 
+        self.join_training()
         with tempfile.TemporaryDirectory() as tmp_dir:
             model_path = os.path.join(tmp_dir, "model.bin")
+            global_model_path = os.path.join(tmp_dir, "global.bin")
             data_path = os.path.join(tmp_dir, "data.npy")
             # Step 1. Untar
             untar(path, tmp_dir)
@@ -411,15 +577,30 @@ class XGBModel(PyCostModel):
                     costs=costs,
                 )
                 data_size += len(costs)
-            # Step 3. Load the model
+            # Step 3. Load the models
+            booster = None
             if os.path.exists(model_path):
                 booster = xgb.Booster()
                 booster.load_model(model_path)
-            else:
-                self.booster = None
+            global_booster = None
+            if os.path.exists(global_model_path):
+                global_booster = xgb.Booster()
+                global_booster.load_model(global_model_path)
+            task_boosters = {}
+            for task_model_path in sorted(glob.glob(os.path.join(tmp_dir, "task_*.bin"))):
+                group_hash = os.path.basename(task_model_path)[len("task_") : -len(".bin")]
+                task_boosters[group_hash] = xgb.Booster()
+                task_boosters[group_hash].load_model(task_model_path)
         self.data = data
         self.data_size = data_size
+        self.num_added = data_size
         self.booster = booster
+        self.global_booster = global_booster
+        self.task_boosters = task_boosters
+        # The loaded model may not match the loaded data, so the next training is a full refit
+        self.num_warm_starts = 0
+        self.pending = {}
+        self.trained_min_costs = {}
 
     def save(self, path: str) -> None:
         """Save the cost model to given file location.
@@ -435,15 +616,25 @@ class XGBModel(PyCostModel):
         previously cached feature vectors and results, so that the subsequent training process could
         use all the existing data being stored on disk.
         """
+        self.join_training()
         with tempfile.TemporaryDirectory() as tmp_dir:
             model_path = os.path.join(tmp_dir, "model.bin")
+            global_model_path = os.path.join(tmp_dir, "global.bin")
             data_path = os.path.join(tmp_dir, "data.npy")
-            # Step 1. Save the model
+            # Step 1. Save the models
             booster = self.booster
             if booster is not None:
                 booster.save_model(model_path)
             else:
                 model_path = None
+            if self.global_booster is not None:
+                self.global_booster.save_model(global_model_path)
+            else:
+                global_model_path = None
+            task_model_paths = []
+            for group_hash, task_booster in self.task_boosters.items():
+                task_model_paths.append(os.path.join(tmp_dir, f"task_{group_hash}.bin"))
+                task_booster.save_model(task_model_paths[-1])
             # Step 2. Save data
             data = [
                 (
@@ -458,9 +649,69 @@ class XGBModel(PyCostModel):
                 arr=np.array(data, dtype=object),
             )
             # Step 3. Tar it
-            tar(path, [x for x in [model_path, data_path] if x is not None])
+            tar(
+                path,
+                [x for x in [model_path, global_model_path, data_path] if x is not None]
+                + task_model_paths,
+            )
             logger.info("Saved XGBModel to %s", path)
 
+    def pretrain(self, database: "Database", target: Optional[Target] = None) -> int:
+        """Pre-train a global model on the tuning records of previously tuned workloads, so that
+        tuning new tasks starts from a model that already generalizes across workloads instead
+        of random predictions. The training data of the current session is left untouched, and
+        the models trained by `update` are fine-tuned on top of the global one.
+
+        Parameters
+        ----------
+        database : Database
+            The database to pre-train on.
+        target : Optional[Target]
+            Only use the records measured on this target. None means all the records.
+
+        Returns
+        -------
+        num_records : int
+            The number of tuning records the global model is trained on.
+        """
+        from ..tune_context import TuneContext  # pylint: disable=import-outside-toplevel
+
+        self.join_training()
+        workloads: Dict[str, List["TuningRecord"]] = OrderedDict()
+        for record in database.get_all_tuning_records():
+            if not record.run_secs or record.target is None:
+                continue
+            if target is not None and str(record.target) != str(target):
+                continue
+            workloads.setdefault(shash2hex(record.workload.mod), []).append(record)
+        features: List[np.ndarray] = []
+        scores: List[np.ndarray] = []
+        for records in workloads.values():
+            context = TuneContext(
+                mod=records[0].workload.mod,
+                target=records[0].target,
+                num_threads=self.config.nthread,
+            )
+            packed, ids = self.extractor.extract_from_batched(
+                context, [record.as_measure_candidate() for record in records]
+            )
+            new_features, has_feature = _split_features(packed, ids, len(records))
+            if not new_features:
+                continue
+            costs = np.array([_mean_cost(r.run_secs) for r in records], dtype="float32")
+            costs = costs[has_feature]
+            features.extend(new_features)
+            scores.append(costs.min() / costs)
+        if not features:
+            logger.warning("No tuning record to pre-train XGBModel on")
+            return 0
+        self.global_booster = self._train(xs=features, ys=np.concatenate(scores, axis=0))
+        self.task_boosters = {}
+        logger.info(
+            "Pre-trained XGBModel on %d records of %d workloads", len(features), len(workloads)
+        )
+        return len(features)
+
     def update(
         self,
         context: "TuneContext",
@@ -487,26 +738,15 @@ class XGBModel(PyCostModel):
         group = self.data.get(new_group_hash, None)
 
         # Step 2. Extract features
-        def _feature(x: NDArray) -> np.ndarray:
-            return x.numpy().astype("float32")
-
-        def _mean_cost(x: RunnerResult) -> float:
-            if not x.run_secs:
-                return 1e10
-            return float(np.median([float(s) for s in x.run_secs]))
-
-        new_features = [_feature(x) for x in self.extractor.extract_from(context, candidates)]
-        new_mean_costs = [_mean_cost(x) for x in results]
-
-        # Filter instances with no features
-        new_mean_costs = [c for i, c in enumerate(new_mean_costs) if len(new_features[i]) != 0]
-        new_mean_costs_np = np.array(new_mean_costs).astype("float32")
-        new_features = [f for f in new_features if len(f) != 0]
+        packed, ids = self.extractor.extract_from_batched(context, candidates)
+        new_features, has_feature = _split_features(packed, ids, len(candidates))
+        new_mean_costs_np = np.array([_mean_cost(x.run_secs) for x in results]).astype("float32")
+        new_mean_costs_np = new_mean_costs_np[has_feature]
         if not new_features:
             return
 
         # Steps 3. Run validation
-        if group is not None and self.booster is not None:
+        if group is not None and self._booster_for(new_group_hash) is not None:
             logger.debug(
                 "XGB validation: %s",
                 "\t".join(
@@ -514,39 +754,173 @@ class XGBModel(PyCostModel):
                     for key, score in self._validate(
                         xs=new_features,
                         ys=group.min_cost / new_mean_costs_np,
+                        booster=self._booster_for(new_group_hash),
                     )
                 ),
             )
 
         # Step 4. Add the features into the data points
-        if group is None:
-            group = FeatureGroup(
-                group_hash=new_group_hash,
-                features=new_features,
-                costs=new_mean_costs_np,
-            )
-        else:
-            group.append(new_features, new_mean_costs_np)
-        self.data[new_group_hash] = group
-        self.data_size += len(new_features)
+        with self._training_cond:
+            if group is None:
+                group = FeatureGroup(
+                    group_hash=new_group_hash,
+                    features=new_features,
+                    costs=new_mean_costs_np,
+                )
+                added_features, added_costs = group.features, group.costs
+            else:
+                added_features, added_costs = group.append(new_features, new_mean_costs_np)
+            self.data[new_group_hash] = group
+            self.data_size += len(added_features)
+            self.num_added += len(added_features)
+            if self.warm_start and added_features:
+                pending_features, pending_costs = self.pending.setdefault(new_group_hash, ([], []))
+                pending_features.extend(added_features)
+                pending_costs.append(added_costs)
+            if self.max_data_size is not None:
+                max_group_size = max(self.max_data_size // len(self.data), 1)
+                for g in self.data.values():
+                    self.data_size -= g.trim(max_group_size)
 
         if (
             self.adaptive_training
-            and self.data_size - self.last_train_size < self.last_train_size / 5
+            and self.num_added - self.last_train_size < self.last_train_size / 5
         ):
             # Set a training threshold related to `last_train_size` to reduce the training
             # overhead when there're too many results
             return
-        self.last_train_size = self.data_size
+        self.last_train_size = self.num_added
 
         # Step 5. Re-train the model
-        self._train(
-            xs=list(itertools_chain.from_iterable([g.features for g in self.data.values()])),
-            ys=np.concatenate(
-                [g.min_cost / g.costs for g in self.data.values()],
+        if not self.async_training:
+            job = self._make_training_job(new_group_hash)
+            if job is not None:
+                self._publish(job, self._train(xs=job.xs, ys=job.ys, base_booster=job.base_booster))
+            return
+        with self._training_cond:
+            self._requested_seq += 1
+            self._requested_groups[new_group_hash] = None
+            if self._training_thread is None:
+                self._training_thread = threading.Thread(
+                    target=self._training_loop,
+                    name="XGBModelTraining",
+                    daemon=True,
+                )
+                self._training_thread.start()
+            if self._requested_seq - self._trained_seq > self.max_staleness:
+                tic = time.time()
+                with Profiler.timeit("XGBModel/WaitTraining"):
+                    while self._requested_seq - self._trained_seq > self.max_staleness:
+                        self._training_cond.wait()
+                self.async_wait_secs += time.time() - tic
+
+    def join_training(self) -> None:
+        """Wait until the model has been trained on all the data, when training asynchronously.
+        Raise the last error of the background training since the previous call, if any."""
+        with self._training_cond:
+            while self._requested_seq != self._trained_seq:
+                self._training_cond.wait()
+            error, self._training_error = self._training_error, None
+        if error is not None:
+            raise RuntimeError("XGBModel failed to train in the background") from error
+
+    def _make_training_job(self, group_hash: str) -> Optional[_TrainingJob]:
+        """Collect the data to train on after an update of a group. Must hold the lock."""
+        if self.global_booster is not None and self.fine_tune_per_task:
+            # Fine-tune the global model on the data of this task only
+            groups = [self.data[group_hash]]
+            booster = self.task_boosters.get(group_hash, None)
+            target: Optional[str] = group_hash
+        else:
+            groups = list(self.data.values())
+            booster = self.booster
+            target = None
+        pending = [self.pending.pop(g.group_hash, ([], [])) for g in groups]
+        if (
+            self.warm_start
+            and booster is not None
+            and self.num_warm_starts + 1 < self.full_refit_interval
+            and all(
+                self.trained_min_costs.get(g.group_hash, g.min_cost) == g.min_cost for g in groups
+            )
+        ):
+            # Continue boosting the previous model on the samples added since it was trained
+            xs = list(itertools_chain.from_iterable([features for features, _ in pending]))
+            if not xs:
+                return None
+            ys = np.concatenate(
+                [
+                    g.min_cost / np.concatenate(costs)
+                    for g, (_, costs) in zip(groups, pending)
+                    if costs
+                ],
                 axis=0,
-            ),
-        )
+            )
+            base_booster = booster
+            self.num_warm_starts += 1
+        else:
+            xs = list(itertools_chain.from_iterable([g.features for g in groups]))
+            ys = np.concatenate([g.min_cost / g.costs for g in groups], axis=0)
+            base_booster = self.global_booster
+            self.num_warm_starts = 0
+        for g in groups:
+            self.trained_min_costs[g.group_hash] = g.min_cost
+        return _TrainingJob(xs=xs, ys=ys, base_booster=base_booster, group_hash=target)
+
+    def _publish(self, job: _TrainingJob, booster: "xgb.Booster") -> None:
+        if job.group_hash is not None:
+            self.task_boosters[job.group_hash] = booster
+        else:
+            self.booster = booster
+
+    def _training_loop(self) -> None:
+        """Train in the background on the latest data until no update is left, so that the search
+        keeps going with the last published model meanwhile."""
+        try:
+            while True:
+                with self._training_cond:
+                    if not self._requested_groups:
+                        self._training_thread = None
+                        return
+                    group_hashes = list(self._requested_groups)
+                    self._requested_groups.clear()
+                    if self.global_booster is None or not self.fine_tune_per_task:
+                        # A single model is trained on all the groups
+                        group_hashes = group_hashes[-1:]
+                    seq = self._requested_seq
+                tic = time.time()
+                trained = []
+                try:
+                    with self._training_cond:
+                        jobs = [self._make_training_job(h) for h in group_hashes]
+                    for job in jobs:
+                        if job is not None:
+                            trained.append((job, self._train(job.xs, job.ys, job.base_booster)))
+                except Exception as error:  # pylint: disable=broad-except
+                    logger.exception("XGBModel failed to train in the background")
+                    with self._training_cond:
+                        self._training_error = error
+                elapsed = time.time() - tic
+                with self._training_cond:
+                    for job, booster in trained:
+                        self._publish(job, booster)
+                    self.async_train_secs += elapsed
+                    self._trained_seq = seq
+                    self._training_cond.notify_all()
+                logger.debug(
+                    "XGB trained in the background in %.2f s, total %.2f s, waited %.2f s",
+                    elapsed,
+                    self.async_train_secs,
+                    self.async_wait_secs,
+                )
+        finally:
+            with self._training_cond:
+                # Unless the loop returned normally, release the threads waiting for the training,
+                # and let the next update start a new thread
+                if self._training_thread is threading.current_thread():
+                    self._training_thread = None
+                    self._trained_seq = self._requested_seq
+                    self._training_cond.notify_all()
 
     def predict(
         self,
@@ -567,16 +941,14 @@ class XGBModel(PyCostModel):
         result : np.ndarray
             The predicted normalized score.
         """
-        if self.data_size >= self.num_warmup_samples and self.booster is not None:
-            ret = self._predict(
-                xs=[
-                    x.numpy().astype("float32")
-                    for x in self.extractor.extract_from(
-                        context,
-                        candidates,
-                    )
-                ]
-            )
+        booster = self._booster_for(shash2hex(context.mod))
+        # With a pre-trained global model, every model is trained on top of it, so it is good
+        # enough to predict without warming up
+        if booster is not None and (
+            self.data_size >= self.num_warmup_samples or self.global_booster is not None
+        ):
+            packed, ids = self.extractor.extract_from_batched(context, candidates)
+            ret = self._predict(xs=packed, ids=ids, num_samples=len(candidates), booster=booster)
         else:
             ret = np.random.uniform(
                 low=0,
@@ -585,48 +957,69 @@ class XGBModel(PyCostModel):
             )
         return ret.astype("float64")
 
+    def _booster_for(self, group_hash: str) -> Optional["xgb.Booster"]:
+        """The most specific model available for a task."""
+        booster = self.task_boosters.get(group_hash, None)
+        if booster is None:
+            booster = self.booster
+        if booster is None:
+            booster = self.global_booster
+        return booster
+
     def _train(  # type: ignore # pylint: disable=invalid-name
         self,
         xs: List[np.ndarray],
         ys: np.ndarray,
-    ) -> None:
+        base_booster: Optional["xgb.Booster"] = None,
+    ) -> "xgb.Booster":
         import xgboost as xgb  # type: ignore # pylint: disable=import-outside-toplevel
 
-        self.d_train = PackSum(xs=xs, ys=ys)
+        d_train = PackSum(xs=xs, ys=ys)
+
+        def obj(ys_pred: np.ndarray, d_matrix: "xgb.DMatrix"):  # type: ignore # pylint: disable = unused-argument
+            return d_train.obj_square_error(ys_pred)
 
-        def obj(ys_pred: np.ndarray, d_train: "xgb.DMatrix"):  # type: ignore # pylint: disable = unused-argument
-            return self.d_train.obj_square_error(ys_pred)
+        def rmse(ys_pred: np.ndarray, d_matrix: "xgb.DMatrix"):  # type: ignore # pylint: disable = unused-argument
+            return d_train.rmse(ys_pred)
 
-        def rmse(ys_pred: np.ndarray, d_train: "xgb.DMatrix"):  # type: ignore # pylint: disable = unused-argument
-            return self.d_train.rmse(ys_pred)
+        def avg_peak_score(ys_pred: np.ndarray, d_matrix: "xgb.DMatrix"):  # type: ignore # pylint: disable = unused-argument
+            return d_train.average_peak_score(ys_pred, self.average_peak_n)
 
-        def avg_peak_score(ys_pred: np.ndarray, d_train: "xgb.DMatrix"):  # type: ignore # pylint: disable = unused-argument
-            return self.d_train.average_peak_score(ys_pred, self.average_peak_n)
+        if base_booster is not None:
+            # Continue boosting from a copy of the given model, early-stopped on the new data only
+            base_booster = base_booster.copy()
+            base_booster.set_attr(best_score=None, best_iteration=None, best_msg=None)
 
-        self.booster = xgb.train(
+        booster = xgb.train(
             self.config.to_dict(),
-            self.d_train.dmatrix,
+            d_train.dmatrix,
             num_boost_round=10000,
             obj=obj,
+            xgb_model=base_booster,
             callbacks=[
                 _get_custom_call_back(
                     early_stopping_rounds=self.early_stopping_rounds,
                     verbose_eval=self.verbose_eval,
                     fevals=[rmse, avg_peak_score],
-                    evals=[(self.d_train.dmatrix, "tr")],
+                    evals=[(d_train.dmatrix, "tr")],
                     cvfolds=None,
                 )
             ],
         )
 
-        del self.d_train
+        return booster
 
     def _predict(  # type: ignore # pylint: disable=invalid-name
         self,
-        xs: List[np.ndarray],
+        xs: Union[List[np.ndarray], np.ndarray],
+        ids: Optional[np.ndarray] = None,
+        num_samples: Optional[int] = None,
+        booster: Optional["xgb.Booster"] = None,
     ) -> np.ndarray:
-        d_test = PackSum(xs=xs, ys=None)
-        pred = self.booster.predict(d_test.dmatrix)
+        if booster is None:
+            booster = self.booster
+        d_test = PackSum(xs=xs, ys=None, ids=ids, num_samples=num_samples)
+        pred = booster.predict(d_test.dmatrix)
         ret = d_test.predict_with_score(pred)
         return ret
 
@@ -634,6 +1027,7 @@ class XGBModel(PyCostModel):
         self,
         xs: List[np.ndarray],
         ys: np.ndarray,
+        booster: Optional["xgb.Booster"] = None,
     ) -> List[Tuple[str, float]]:
         """Evaluate the score of inputs.
 
@@ -643,20 +1037,24 @@ class XGBModel(PyCostModel):
             A batch of input samples
         ys : List[float]
             A batch of labels
+        booster : Optional[xgb.Booster]
+            The model to evaluate. Defaults to the model of the session.
 
         Returns
         -------
         scores: np.ndarray
             The predicted result for all inputs.
         """
-        assert self.booster is not None
+        if booster is None:
+            booster = self.booster
+        assert booster is not None
 
         d_valid = PackSum(xs=xs, ys=ys)
 
         def average_peak_score(ys_pred: np.ndarray):
             return d_valid.average_peak_score(ys_pred, n=self.average_peak_n)
 
-        ys_pred = self.booster.predict(d_valid.dmatrix)
+        ys_pred = booster.predict(d_valid.dmatrix)
         eval_result: List[Tuple[str, float]] = [
             feval(ys_pred)
             for feval in (
@@ -668,6 +1066,27 @@ class XGBModel(PyCostModel):
         return eval_result
 
 
+def _split_features(
+    packed: np.ndarray,
+    ids: np.ndarray,
+    num_samples: int,
+) -> Tuple[List[np.ndarray], np.ndarray]:
+    """Split batched features into per-sample views without copying, dropping the samples that
+    have no feature.
+
+    Returns
+    -------
+    features : List[np.ndarray]
+        The features of the samples that have any.
+    has_feature : np.ndarray
+        The boolean mask of the samples that have any feature.
+    """
+    counts = np.bincount(ids, minlength=num_samples)
+    has_feature = counts != 0
+    features = np.split(packed, np.cumsum(counts)[:-1], axis=0)
+    return [f for f, keep in zip(features, has_feature) if keep], has_feature
+
+
 def _get_custom_call_back(
     early_stopping_rounds: int,
     verbose_eval: int,
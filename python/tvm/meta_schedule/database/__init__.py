@@ -22,8 +22,10 @@ The tvm.meta_schedule.database package.
 The database that stores serialized tuning records and workloads
 """
 from .database import Database, PyDatabase, TuningRecord, Workload, create
-from .json_database import JSONDatabase
+from .json_database import JSONDatabase, compact_json_database
 from .memory_database import MemoryDatabase
 from .ordered_union_database import OrderedUnionDatabase
 from .schedule_fn_database import ScheduleFnDatabase
+from .sharded_database import ShardedJSONDatabase
+from .similarity_index import SeedReport, SimilarWorkload, WorkloadSimilarityIndex
 from .union_database import UnionDatabase
@@ -167,7 +167,7 @@ class TuningRecord(Object):
 class Database(Object):
     """The abstract database interface."""
 
-    DatabaseType = Union["Database", Literal["json", "memory"]]
+    DatabaseType = Union["Database", Literal["json", "memory", "sharded"]]
 
     def has_workload(self, mod: IRModule) -> bool:
         """Check if the database has the given workload.
@@ -386,6 +386,7 @@ class Database(Object):
                 "memory",
                 "union",
                 "ordered_union",
+                "sharded",
             ],
             Callable[[Schedule], bool],
         ] = "json",
@@ -396,10 +397,10 @@ class Database(Object):
 
         Parameters
         ----------
-        kind : str = "json" | "memory" | "union" | "ordered_union" | Callable[[tvm.tir.Schedule],
-        bool]
+        kind : str = "json" | "memory" | "union" | "ordered_union" | "sharded" |
+        Callable[[tvm.tir.Schedule], bool]
             The kind of the database to be created. The following kinds are supported:
-            "json", "memory", "union", "ordered_union", and a custom schedule function.
+            "json", "memory", "union", "ordered_union", "sharded", and a custom schedule function.
 
         Returns
         -------
@@ -411,6 +412,7 @@ class Database(Object):
             MemoryDatabase,
             OrderedUnionDatabase,
             ScheduleFnDatabase,
+            ShardedJSONDatabase,
             UnionDatabase,
         )
 
@@ -424,6 +426,8 @@ class Database(Object):
             return UnionDatabase(*args, **kwargs)  # type: ignore
         if kind == "ordered_union":
             return OrderedUnionDatabase(*args, **kwargs)  # type: ignore
+        if kind == "sharded":
+            return ShardedJSONDatabase(*args, **kwargs)  # type: ignore
         raise ValueError(f"Unknown Database: {kind}")
 
 
@@ -18,10 +18,12 @@
 # specific language governing permissions and limitations
 # under the License.
 """The default database that uses a JSON File to store tuning records"""
+import json
 import os.path as osp
 from typing import Optional
 
 from tvm._ffi import register_object
+from tvm.contrib.tuning_log_compaction import CompactionReport, ParsedLine, compact_log_file
 
 from .. import _ffi_api
 from .database import Database
@@ -93,3 +95,63 @@ class JSONDatabase(Database):
             allow_missing,
             module_equality,
         )
+
+
+# The run time of the failed measurements, see `AddToDatabase`
+_MAX_MEAN_TIME = 1e10
+
+
+def _parse_tuning_record_line(line: str) -> Optional[ParsedLine]:
+    try:
+        workload_idx, (trace, run_secs, target, _) = json.loads(line)
+    except (ValueError, TypeError):
+        return None
+    cost = None
+    if run_secs and any(run_sec < _MAX_MEAN_TIME for run_sec in run_secs):
+        cost = sum(run_secs) / len(run_secs)
+    return ParsedLine(
+        group=f"{workload_idx}:{json.dumps(target, sort_keys=True)}",
+        candidate=json.dumps(trace, sort_keys=True),
+        cost=cost,
+    )
+
+
+def compact_json_database(
+    path_tuning_record: Optional[str] = None,
+    *,
+    work_dir: Optional[str] = None,
+    top_k: int = 1,
+    path_output: Optional[str] = None,
+) -> CompactionReport:
+    """Compact the tuning record table of a JSON database: keep the top k records of each
+    workload and target, drop the failed measurements and the records with the same trace as a
+    faster one, and rewrite the table atomically. The workload table is left as it is, as the
+    records refer to the workloads by their line in it.
+
+    The database must not be written to during the compaction, and a `JSONDatabase` opened
+    before it does not see it.
+
+    Parameters
+    ----------
+    path_tuning_record : Optional[str]
+        The path to the tuning record table. If not specified, will be generated from
+        `work_dir` as `$work_dir/database_tuning_record.json`.
+    work_dir : Optional[str]
+        The work directory of the database.
+    top_k : int
+        The number of records kept per workload and target.
+    path_output : Optional[str]
+        The path to write the compacted table to. Defaults to the table itself.
+
+    Returns
+    -------
+    report : CompactionReport
+        The report of the compaction.
+    """
+    if path_tuning_record is None and work_dir is not None:
+        path_tuning_record = osp.join(work_dir, "database_tuning_record.json")
+    if path_tuning_record is None:
+        raise ValueError("`path_tuning_record` is not specified.")
+    return compact_log_file(
+        path_tuning_record, _parse_tuning_record_line, top_k=top_k, out_path=path_output
+    )
@@ -0,0 +1,317 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""A database that shards tuning records into per-writer append-only JSON files"""
+import json
+import os
+import os.path as osp
+import shutil
+import socket
+import uuid
+from typing import Dict, List, Optional, Set, Tuple
+
+from tvm.ir.module import IRModule
+from tvm.target import Target
+from tvm.tir.schedule import Schedule
+
+from ..logging import get_logger
+from ..utils import derived_object
+from .database import PyDatabase, TuningRecord, Workload
+from .json_database import JSONDatabase
+from .memory_database import MemoryDatabase
+
+logger = get_logger(__name__)  # pylint: disable=invalid-name
+
+WORKLOAD_FILE = "database_workload.json"
+TUNING_RECORD_FILE = "database_tuning_record.json"
+SEALED_FILE = "SEALED"
+COMPACTED_FROM_FILE = "COMPACTED_FROM"
+
+
+def default_shard_name() -> str:
+    """The default shard name of the current process, unique per host and process."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class _ShardReader:
+    """Incrementally read the complete lines of a shard written by another process.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the shard.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.workload_offset = 0
+        self.record_offset = 0
+        self.workloads: List[Workload] = []
+
+    @staticmethod
+    def _read_complete_lines(path: str, offset: int) -> List[Tuple[int, str]]:
+        """Read the lines terminated by a newline after `offset`, with the offset after each."""
+        if not osp.exists(path):
+            return []
+        with open(path, "rb") as file:
+            file.seek(offset)
+            data = file.read()
+        lines = []
+        start = 0
+        while True:
+            end = data.find(b"\n", start)
+            if end == -1:
+                break
+            line = data[start:end].decode("utf-8").strip()
+            start = end + 1
+            if line:
+                lines.append((offset + start, line))
+        return lines
+
+    def read_into(self, view: MemoryDatabase) -> int:
+        """Commit the newly appended workloads and tuning records into the given view.
+
+        Parameters
+        ----------
+        view : MemoryDatabase
+            The merged in-memory view to commit into.
+
+        Returns
+        -------
+        num_records : int
+            The number of new tuning records read.
+        """
+        # Workloads are always appended before the tuning records that refer to them, so reading
+        # the workload table first guarantees every complete record line can be resolved, except
+        # when a writer appends both between the two reads. Such records are left for next time.
+        lines = self._read_complete_lines(osp.join(self.path, WORKLOAD_FILE), self.workload_offset)
+        for end, line in lines:
+            workload = Workload.from_json(json.loads(line))
+            self.workloads.append(view.commit_workload(workload.mod))
+            self.workload_offset = end
+        num_records = 0
+        lines = self._read_complete_lines(
+            osp.join(self.path, TUNING_RECORD_FILE),
+            self.record_offset,
+        )
+        for end, line in lines:
+            workload_idx, record_json = json.loads(line)
+            if workload_idx >= len(self.workloads):
+                break
+            view.commit_tuning_record(
+                TuningRecord.from_json(record_json, self.workloads[workload_idx])
+            )
+            self.record_offset = end
+            num_records += 1
+        return num_records
+
+
+@derived_object
+class ShardedJSONDatabase(PyDatabase):
+    """A database for concurrent tuning jobs sharing one directory, possibly on a network file
+    system. Each writer appends only to its own shard, which is a pair of JSON files in the same
+    format as JSONDatabase, so no locking is needed. Reads are served from an in-memory view that
+    merges all the shards under the directory, and `refresh` picks up the records appended by
+    other writers since the last read.
+
+    Parameters
+    ----------
+    work_dir : str
+        The directory that contains the shards, each as a sub-directory.
+    shard_name : Optional[str]
+        The name of the shard to write to. Defaults to `$hostname-$pid`.
+    module_equality : Optional[str]
+        A string to specify the module equality testing and hashing method.
+        It must be one of the followings:
+          - "structural": Use StructuralEqual/Hash
+          - "ignore-ndarray": Same as "structural", but ignore ndarray raw data during
+                              equality testing and hashing.
+          - "anchor-block": Apply equality testing and hashing on the anchor block extracted from a
+                            given module. The "ignore-ndarray" varint is used for the extracted
+                            blocks or in case no anchor block is found.
+                            For the definition of the anchor block, see tir/analysis/analysis.py.
+    """
+
+    work_dir: str
+    shard_name: str
+    module_equality: str
+
+    def __init__(
+        self,
+        work_dir: str,
+        *,
+        shard_name: Optional[str] = None,
+        module_equality: str = "structural",
+    ) -> None:
+        super().__init__()
+        if shard_name is None:
+            shard_name = default_shard_name()
+        if shard_name.startswith("."):
+            raise ValueError(f"Shard name cannot start with '.': {shard_name}")
+        self.work_dir = work_dir
+        self.shard_name = shard_name
+        self.module_equality = module_equality
+        os.makedirs(osp.join(work_dir, shard_name), exist_ok=True)
+        self._shard = JSONDatabase(
+            work_dir=osp.join(work_dir, shard_name),
+            module_equality=module_equality,
+        )
+        self._view: MemoryDatabase = None
+        self._readers: Dict[str, _ShardReader] = {}
+        self._reload()
+
+    def _list_shards(self) -> Set[str]:
+        """List the shards visible to readers, hiding those already merged by a compaction."""
+        shards = set()
+        for name in os.listdir(self.work_dir):
+            if not name.startswith(".") and osp.isdir(osp.join(self.work_dir, name)):
+                shards.add(name)
+        covered = set()
+        for name in shards:
+            manifest = osp.join(self.work_dir, name, COMPACTED_FROM_FILE)
+            if osp.exists(manifest):
+                with open(manifest, "r", encoding="utf-8") as file:
+                    covered.update(json.load(file))
+        return shards - covered
+
+    def _reload(self) -> None:
+        """Rebuild the merged view from scratch."""
+        self._view = MemoryDatabase(module_equality=self.module_equality)
+        self._readers = {}
+        self.refresh()
+
+    def refresh(self) -> int:
+        """Read the tuning records appended to all the shards since the last refresh. The view is
+        rebuilt from scratch if a shard has been removed by a compaction in between.
+
+        Returns
+        -------
+        num_records : int
+            The number of new tuning records read.
+        """
+        shards = self._list_shards()
+        if not set(self._readers).issubset(shards):
+            self._reload()
+            return len(self._view)
+        num_records = 0
+        for name in sorted(shards):
+            if name == self.shard_name and name in self._readers:
+                # Everything appended to our own shard is committed to the view directly
+                continue
+            if name not in self._readers:
+                self._readers[name] = _ShardReader(osp.join(self.work_dir, name))
+            num_records += self._readers[name].read_into(self._view)
+        return num_records
+
+    def seal(self) -> None:
+        """Mark the shard of this writer as finished, so that it can be merged by `compact`.
+        No tuning record should be committed to this database afterwards."""
+        with open(osp.join(self.work_dir, self.shard_name, SEALED_FILE), "w", encoding="utf-8"):
+            pass
+
+    def compact(self, include_unsealed: bool = False) -> Optional[str]:
+        """Merge the finished shards into a single new shard. The new shard is assembled in a
+        hidden directory and renamed into place atomically, and it records the shards it replaces
+        so that readers never see a record twice. The replaced shards are removed afterwards.
+
+        Parameters
+        ----------
+        include_unsealed : bool
+            Whether to merge the shards that are not sealed. Only set it when no other writer
+            is alive. The shard of this writer is never merged.
+
+        Returns
+        -------
+        shard_name : Optional[str]
+            The name of the compacted shard, or None if there is nothing to compact.
+        """
+        sources = []
+        for name in sorted(self._list_shards()):
+            if name == self.shard_name:
+                continue
+            if include_unsealed or osp.exists(osp.join(self.work_dir, name, SEALED_FILE)):
+                sources.append(name)
+        if len(sources) <= 1:
+            return None
+        # Inherit what the merged shards cover, in case some of them were not fully removed
+        covered = list(sources)
+        for name in sources:
+            manifest = osp.join(self.work_dir, name, COMPACTED_FROM_FILE)
+            if osp.exists(manifest):
+                with open(manifest, "r", encoding="utf-8") as file:
+                    covered.extend(json.load(file))
+        compacted_name = f"compacted-{uuid.uuid4().hex}"
+        tmp_dir = osp.join(self.work_dir, "." + compacted_name)
+        os.makedirs(tmp_dir)
+        compacted = MemoryDatabase(module_equality=self.module_equality)
+        for name in sources:
+            _ShardReader(osp.join(self.work_dir, name)).read_into(compacted)
+        destination = JSONDatabase(work_dir=tmp_dir, module_equality=self.module_equality)
+        for record in compacted.get_all_tuning_records():
+            destination.commit_workload(record.workload.mod)
+            destination.commit_tuning_record(record)
+        with open(osp.join(tmp_dir, COMPACTED_FROM_FILE), "w", encoding="utf-8") as file:
+            json.dump(covered, file)
+        open(osp.join(tmp_dir, SEALED_FILE), "w", encoding="utf-8").close()
+        os.rename(tmp_dir, osp.join(self.work_dir, compacted_name))
+        for name in sources:
+            shutil.rmtree(osp.join(self.work_dir, name), ignore_errors=True)
+        logger.info(
+            "Compacted %d shards into %s with %d tuning records",
+            len(sources),
+            compacted_name,
+            len(compacted),
+        )
+        return compacted_name
+
+    def has_workload(self, mod: IRModule) -> bool:
+        return self._view.has_workload(mod)
+
+    def commit_workload(self, mod: IRModule) -> Workload:
+        self._shard.commit_workload(mod)
+        return self._view.commit_workload(mod)
+
+    def commit_tuning_record(self, record: TuningRecord) -> None:
+        self._shard.commit_workload(record.workload.mod)
+        self._shard.commit_tuning_record(record)
+        self._view.commit_tuning_record(record)
+
+    def get_top_k(self, workload: Workload, top_k: int) -> List[TuningRecord]:
+        return self._view.get_top_k(workload, top_k)
+
+    def get_all_tuning_records(self) -> List[TuningRecord]:
+        return self._view.get_all_tuning_records()
+
+    def query_tuning_record(
+        self, mod: IRModule, target: Target, workload_name: Optional[str] = None
+    ) -> Optional[TuningRecord]:
+        return self._view.query_tuning_record(mod, target, workload_name)
+
+    def query_schedule(
+        self, mod: IRModule, target: Target, workload_name: Optional[str] = None
+    ) -> Optional[Schedule]:
+        return self._view.query_schedule(mod, target, workload_name)
+
+    def query_ir_module(
+        self, mod: IRModule, target: Target, workload_name: Optional[str] = None
+    ) -> Optional[IRModule]:
+        return self._view.query_ir_module(mod, target, workload_name)
+
+    def __len__(self) -> int:
+        return len(self._view)
@@ -0,0 +1,361 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""An index of the tuned workloads of a database, to seed new tasks from similar workloads"""
+import math
+import re
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np  # type: ignore
+
+from tvm.ir import IRModule
+from tvm.tir import IntImm, PrimFunc
+from tvm.tir.schedule import Schedule
+
+from ..arg_info import ArgInfo
+from ..logging import get_logger
+from ..utils import remove_build_dir, shash2hex
+from .database import Database, TuningRecord, Workload
+
+if TYPE_CHECKING:
+    from ..builder import Builder
+    from ..runner import Runner
+    from ..tune_context import TuneContext
+
+logger = get_logger(__name__)  # pylint: disable=invalid-name
+
+# The integer literals of a printed module, i.e. its shapes, extents and constants
+_INT_LITERAL = re.compile(r"\b\d+\b")
+
+
+class SimilarWorkload(NamedTuple):
+    """A tuned workload similar to a queried one.
+
+    Parameters
+    ----------
+    workload : Workload
+        The tuned workload.
+    distance : float
+        The distance between the log-scaled buffer shapes of the two workloads.
+    records : List[TuningRecord]
+        The best tuning records of the workload, the fastest first.
+    """
+
+    workload: Workload
+    distance: float
+    records: List[TuningRecord]
+
+
+class SeedReport(NamedTuple):
+    """The report of seeding a task from the records of similar workloads.
+
+    Parameters
+    ----------
+    task_name : str
+        The name of the seeded task.
+    neighbors : List[Tuple[str, float]]
+        The structural hashes of the similar workloads used, with their distances.
+    num_adapted : int
+        The number of schedules replayed successfully on the task.
+    num_measured : int
+        The number of adapted schedules measured without error, i.e. the trials spent.
+    best_run_sec : Optional[float]
+        The mean run time of the fastest seed, or None if no seed could be measured.
+    """
+
+    task_name: str
+    neighbors: List[Tuple[str, float]]
+    num_adapted: int
+    num_measured: int
+    best_run_sec: Optional[float]
+
+
+def _main_func(mod: IRModule) -> Optional[PrimFunc]:
+    funcs = [func for func in mod.functions.values() if isinstance(func, PrimFunc)]
+    return funcs[0] if len(funcs) == 1 else None
+
+
+def workload_signature(mod: IRModule) -> Optional[Tuple[str, np.ndarray]]:
+    """Compute the signature of a workload for the similarity lookup. Two workloads are
+    comparable if they are the same computation up to their shapes, i.e. if their TVMScript
+    are the same once the integer literals are masked, and their distance is then the one of
+    the log-scaled shapes of their buffers.
+
+    Parameters
+    ----------
+    mod : IRModule
+        The workload.
+
+    Returns
+    -------
+    signature : Optional[Tuple[str, np.ndarray]]
+        The masked TVMScript and the log-scaled buffer shapes, or None if the module does not
+        have a single PrimFunc.
+    """
+    func = _main_func(mod)
+    if func is None:
+        return None
+    skeleton = _INT_LITERAL.sub("?", func.script())
+    shapes = [
+        int(dim) if isinstance(dim, IntImm) else 1
+        for param in func.params
+        if param in func.buffer_map
+        for dim in func.buffer_map[param].shape
+    ]
+    return skeleton, np.log2(1 + np.array(shapes, dtype="float64"))
+
+
+def _adapt_perfect_tile(extent: int, factors: List[int]) -> List[int]:
+    """Rescale a perfect tiling to a new loop extent, keeping the inner factors as long as they
+    still divide the extent, and letting the outermost one absorb the rest."""
+    rest = extent
+    inner = []
+    for factor in reversed(factors[1:]):
+        factor = math.gcd(int(factor), rest)
+        inner.append(factor)
+        rest //= factor
+    return [rest] + inner[::-1]
+
+
+def adapt_trace(record: TuningRecord, mod: IRModule) -> Optional[Schedule]:
+    """Replay the trace of a tuning record on a similar workload. The tiling decisions that do
+    not fit the loop extents of the workload are rescaled.
+
+    Parameters
+    ----------
+    record : TuningRecord
+        The tuning record of a similar workload.
+    mod : IRModule
+        The workload to replay the trace on.
+
+    Returns
+    -------
+    sch : Optional[Schedule]
+        The schedule of the workload, without the postprocessing, or None if the trace does not
+        apply to the workload.
+    """
+    sch = Schedule(mod)
+
+    def decision_provider(inst, inputs, attrs, decision):  # pylint: disable=unused-argument
+        if inst.kind.name == "SamplePerfectTile" and decision is not None:
+            extent = sch.get(inputs[0]).extent
+            if isinstance(extent, IntImm):
+                return _adapt_perfect_tile(int(extent), [int(x) for x in decision])
+        return decision
+
+    try:
+        record.trace.apply_to_schedule(
+            sch, remove_postproc=True, decision_provider=decision_provider
+        )
+    except Exception:  # pylint: disable=broad-except
+        return None
+    return sch
+
+
+class WorkloadSimilarityIndex:
+    """An index of the tuned workloads of a database, to retrieve the ones most similar to a new
+    workload, e.g. the same convolution with a different batch size or number of channels, and
+    to seed the tuning of the new workload with their best schedules.
+
+    The workloads are bucketed by their signature, see `workload_signature`, so a lookup only
+    compares the shapes of the workloads of the same computation.
+
+    Parameters
+    ----------
+    database : Database
+        The database of the tuned workloads.
+    top_k : int
+        The number of best records kept per workload.
+    """
+
+    database: Database
+    top_k: int
+
+    def __init__(self, database: Database, top_k: int = 8) -> None:
+        self.database = database
+        self.top_k = top_k
+        # skeleton -> [(shash, shapes, workload)]
+        self._buckets: Dict[str, List[Tuple[str, np.ndarray, Workload]]] = {}
+        workloads: Dict[str, Workload] = {}
+        for record in database.get_all_tuning_records():
+            if record.run_secs:
+                workloads.setdefault(shash2hex(record.workload.mod), record.workload)
+        for shash, workload in workloads.items():
+            signature = workload_signature(workload.mod)
+            if signature is not None:
+                skeleton, shapes = signature
+                self._buckets.setdefault(skeleton, []).append((shash, shapes, workload))
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    def query(
+        self,
+        mod: IRModule,
+        num_neighbors: int = 3,
+        max_distance: Optional[float] = None,
+    ) -> List[SimilarWorkload]:
+        """Retrieve the tuned workloads most similar to a workload, excluding the workload itself.
+
+        Parameters
+        ----------
+        mod : IRModule
+            The workload to look up.
+        num_neighbors : int
+            The maximum number of similar workloads to return.
+        max_distance : Optional[float]
+            The maximum distance of the returned workloads. None means unbounded.
+
+        Returns
+        -------
+        neighbors : List[SimilarWorkload]
+            The similar workloads, the nearest first.
+        """
+        signature = workload_signature(mod)
+        if signature is None:
+            return []
+        skeleton, shapes = signature
+        shash = shash2hex(mod)
+        candidates = []
+        for other_shash, other_shapes, workload in self._buckets.get(skeleton, []):
+            if other_shash == shash or other_shapes.shape != shapes.shape:
+                continue
+            distance = float(np.linalg.norm(other_shapes - shapes))
+            if max_distance is None or distance <= max_distance:
+                candidates.append((distance, other_shash, workload))
+        candidates.sort(key=lambda x: (x[0], x[1]))
+        return [
+            SimilarWorkload(workload, distance, self.database.get_top_k(workload, self.top_k))
+            for distance, _, workload in candidates[:num_neighbors]
+        ]
+
+    def seed(
+        self,
+        context: "TuneContext",
+        database: Database,
+        builder: "Builder",
+        runner: "Runner",
+        num_neighbors: int = 3,
+        num_seeds: int = 8,
+        max_distance: Optional[float] = None,
+    ) -> SeedReport:
+        """Seed the tuning of a task with the best schedules of the most similar workloads.
+
+        The best records of the similar workloads are replayed on the task, postprocessed,
+        measured and committed to the database of the task, where the evolutionary search picks
+        them up as its initial population like any other measured record.
+
+        Parameters
+        ----------
+        context : TuneContext
+            The tuning context of the task.
+        database : Database
+            The database to commit the measured seeds to.
+        builder : Builder
+            The builder of the seeds.
+        runner : Runner
+            The runner of the seeds.
+        num_neighbors : int
+            The maximum number of similar workloads to seed from.
+        num_seeds : int
+            The maximum number of seeds to measure.
+        max_distance : Optional[float]
+            The maximum distance of the similar workloads. None means unbounded.
+
+        Returns
+        -------
+        report : SeedReport
+            The report of the seeding.
+        """
+        mod, target = context.mod, context.target
+        neighbors = self.query(mod, num_neighbors=num_neighbors, max_distance=max_distance)
+        # Round robin over the neighbors, so the nearest does not take all the seeds
+        records = [
+            record
+            for rank in range(self.top_k)
+            for neighbor in neighbors
+            if rank < len(neighbor.records)
+            for record in [neighbor.records[rank]]
+        ]
+        postprocs = context.space_generator.postprocs if context.space_generator else []
+        schedules: List[Schedule] = []
+        seen = set()
+        for record in records:
+            if len(schedules) >= num_seeds:
+                break
+            sch = adapt_trace(record, mod)
+            if sch is None or not all(postproc.apply(sch) for postproc in postprocs):
+                continue
+            shash = shash2hex(sch.mod)
+            if shash not in seen:
+                seen.add(shash)
+                schedules.append(sch)
+        best_run_sec: Optional[float] = None
+        num_measured = 0
+        if schedules:
+            # pylint: disable=import-outside-toplevel
+            from ..builder import BuilderInput
+            from ..runner import RunnerInput
+
+            # pylint: enable=import-outside-toplevel
+            workload = database.commit_workload(mod)
+            args_info = ArgInfo.from_prim_func(_main_func(mod))
+            builder_results = builder.build([BuilderInput(sch.mod, target) for sch in schedules])
+            runner_inputs, built = [], []
+            for sch, result in zip(schedules, builder_results):
+                if result.error_msg is None:
+                    runner_inputs.append(
+                        RunnerInput(result.artifact_path, target.kind.name, args_info)
+                    )
+                    built.append((sch, result.artifact_path))
+            futures = runner.run(runner_inputs) if runner_inputs else []
+            for (sch, artifact_path), future in zip(built, futures):
+                result = future.result()
+                remove_build_dir(artifact_path)
+                if result.error_msg is not None or not result.run_secs:
+                    continue
+                database.commit_tuning_record(
+                    TuningRecord(
+                        trace=sch.trace,
+                        workload=workload,
+                        run_secs=result.run_secs,
+                        target=target,
+                        args_info=args_info,
+                    )
+                )
+                num_measured += 1
+                run_sec = float(np.mean([float(s) for s in result.run_secs]))
+                if best_run_sec is None or run_sec < best_run_sec:
+                    best_run_sec = run_sec
+        report = SeedReport(
+            task_name=context.task_name or "main",
+            neighbors=[(shash2hex(n.workload.mod), n.distance) for n in neighbors],
+            num_adapted=len(schedules),
+            num_measured=num_measured,
+            best_run_sec=best_run_sec,
+        )
+        logger.info(
+            "Seeded task %s from %d similar workloads: %d adapted, %d measured, best %s",
+            report.task_name,
+            len(neighbors),
+            report.num_adapted,
+            report.num_measured,
+            "N/A" if best_run_sec is None else f"{best_run_sec * 1e6:.2f} us",
+        )
+        return report
@@ -18,13 +18,15 @@
 # specific language governing permissions and limitations
 # under the License.
 """Meta Schedule FeatureExtractor."""
-from typing import Callable, List, Union
+from typing import Callable, List, Tuple, Union
 
 # isort: off
 from typing_extensions import Literal
 
 # isort: on
 
+import numpy as np
+
 from tvm._ffi import register_object
 from tvm.runtime import Object
 from tvm.runtime.ndarray import NDArray
@@ -63,6 +65,32 @@ class FeatureExtractor(Object):
         )
         return result
 
+    def extract_from_batched(
+        self, context: TuneContext, candidates: List[MeasureCandidate]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Extract features from the given measure candidates into a single float32 array.
+        The per-candidate features are converted and packed in parallel on the C++ side, so
+        only one array crosses the FFI boundary regardless of the number of candidates.
+
+        Parameters
+        ----------
+        context : TuneContext
+            The tuning context for feature extraction.
+        candidates : List[MeasureCandidate]
+            The measure candidates to extract features from.
+
+        Returns
+        -------
+        features : np.ndarray
+            The float32 features of all the candidates concatenated along the first axis.
+        ids : np.ndarray
+            The int64 index of the candidate that each row of `features` belongs to.
+        """
+        features, ids = _ffi_api.FeatureExtractorExtractFromBatched(  # type: ignore # pylint: disable=no-member
+            self, context, candidates
+        )
+        return features.numpy(), ids.numpy()
+
     @staticmethod
     def create(
         kind: Literal["per-store-feature"],
@@ -20,5 +20,7 @@
 """The tvm.meta_schedule.measure_callback package."""
 from .add_to_database import AddToDatabase
 from .measure_callback import MeasureCallback, PyMeasureCallback
+from .record_telemetry import RecordTelemetry
 from .remove_build_artifact import RemoveBuildArtifact
+from .save_checkpoint import SaveCheckpoint, TuningCheckpoint, load_checkpoint
 from .update_cost_model import UpdateCostModel
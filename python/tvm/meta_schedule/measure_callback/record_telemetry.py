@@ -0,0 +1,99 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""A measure callback that records the timings of the tuning into a telemetry sink"""
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from ..builder import BuilderResult
+from ..profiler import Profiler
+from ..runner import RunnerResult
+from ..search_strategy import MeasureCandidate
+from ..utils import derived_object
+from .measure_callback import PyMeasureCallback
+
+if TYPE_CHECKING:
+    from tvm.contrib.tuning_telemetry import TelemetrySink
+
+    from ..task_scheduler import TaskScheduler
+
+# The error numbers of the failed trials, the same as the ones of autotvm and auto_scheduler
+BUILD_ERROR = 2
+RUN_ERROR = 4
+
+
+@derived_object
+class RecordTelemetry(PyMeasureCallback):
+    """A measure callback that records the run time of each trial into a telemetry sink, with
+    the wall time between two measured rounds and, if a profiler is active, the time spent in
+    each of its scopes during the round, e.g. the cost model training and prediction.
+
+    Parameters
+    ----------
+    sink : TelemetrySink
+        The sink to record to.
+    """
+
+    sink: "TelemetrySink"
+
+    def __init__(self, sink: "TelemetrySink") -> None:
+        super().__init__()
+        self.sink = sink
+        self._round_cts: Dict[int, int] = {}
+        self._last_time: Optional[float] = None
+        self._last_profile: Dict[str, float] = {}
+
+    def apply(
+        self,
+        task_scheduler: "TaskScheduler",
+        task_id: int,
+        measure_candidates: List[MeasureCandidate],
+        builder_results: List[BuilderResult],
+        runner_results: List[RunnerResult],
+    ) -> None:
+        task = str(task_scheduler.tasks_[task_id].ctx.task_name)
+        round_idx = self._round_cts.get(task_id, 0)
+        self._round_cts[task_id] = round_idx + 1
+        for trial, (builder_result, runner_result) in enumerate(
+            zip(builder_results, runner_results)
+        ):
+            run_secs = float("nan")
+            if builder_result.error_msg is not None:
+                error_no = BUILD_ERROR
+            elif runner_result.error_msg is not None or not runner_result.run_secs:
+                error_no = RUN_ERROR
+            else:
+                error_no = 0
+                run_secs = sum(float(s) for s in runner_result.run_secs) / len(
+                    runner_result.run_secs
+                )
+            self.sink.record("meta_schedule", task, "run", run_secs, round_idx, trial, error_no)
+
+        now = time.time()
+        if self._last_time is not None:
+            self.sink.record("meta_schedule", task, "round", now - self._last_time, round_idx)
+        self._last_time = now
+        profiler = Profiler.current()
+        if profiler is not None:
+            profile = {str(name): float(secs) for name, secs in profiler.get().items()}
+            for name, secs in sorted(profile.items()):
+                delta = secs - self._last_profile.get(name, 0.0)
+                if delta > 0:
+                    self.sink.record("meta_schedule", task, name, delta, round_idx)
+            self._last_profile = profile
@@ -0,0 +1,254 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""A measure callback that periodically checkpoints the state of a tuning session"""
+import json
+import os
+import time
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Tuple
+
+from ..builder import BuilderResult
+from ..logging import get_logger
+from ..runner import RunnerResult
+from ..search_strategy import MeasureCandidate
+from ..utils import derived_object, shash2hex
+from .measure_callback import PyMeasureCallback
+
+if TYPE_CHECKING:
+    from ..cost_model import CostModel
+    from ..task_scheduler import TaskScheduler
+    from ..tune_context import TuneContext
+
+logger = get_logger(__name__)  # pylint: disable=invalid-name
+
+STATE_FILE = "state.json"
+COST_MODEL_FILE = "cost_model.tar"
+
+
+class TaskProgress(NamedTuple):
+    """The progress of a task at a checkpoint.
+
+    Parameters
+    ----------
+    task_name : str
+        The name of the task.
+    num_trials : int
+        The number of trials measured.
+    is_terminated : bool
+        Whether the task scheduler terminated the task, e.g. because its space is exhausted.
+    """
+
+    task_name: str
+    num_trials: int
+    is_terminated: bool
+
+
+class TuningCheckpoint(NamedTuple):
+    """The state of a tuning session at a checkpoint. The tuning records themselves are in the
+    database of the session, so a resumed session finds its measured candidates and seeds its
+    search population there.
+
+    Parameters
+    ----------
+    tasks : Dict[str, TaskProgress]
+        The progress of the tasks, by the structural hash of their module.
+    elapsed_secs : float
+        The wall-clock time spent on the session so far, in seconds.
+    cost_model_path : Optional[str]
+        The path of the snapshot of the cost model, or None if it could not be saved.
+    """
+
+    tasks: Dict[str, TaskProgress]
+    elapsed_secs: float
+    cost_model_path: Optional[str]
+
+    @property
+    def num_trials(self) -> int:
+        """The number of trials measured in the session so far."""
+        return sum(task.num_trials for task in self.tasks.values())
+
+    def remaining(
+        self,
+        tasks: List["TuneContext"],
+        task_weights: List[float],
+        max_trials_global: int,
+        max_trials_per_task: int,
+    ) -> Tuple[List["TuneContext"], List[float], int, int]:
+        """Compute what remains to tune of a session.
+
+        The finished tasks are dropped and the global budget is reduced by the trials already
+        measured. The task scheduler has a single budget per task, which is reduced by the trials
+        of the least tuned task, so that no task gets fewer trials than it would have without
+        interruption.
+
+        Parameters
+        ----------
+        tasks : List[TuneContext]
+            The tasks of the session.
+        task_weights : List[float]
+            The weight of each task.
+        max_trials_global : int
+            The maximum number of trials of the session.
+        max_trials_per_task : int
+            The maximum number of trials of each task of the session.
+
+        Returns
+        -------
+        remaining : Tuple[List[TuneContext], List[float], int, int]
+            The tasks that remain to tune, their weights, and the remaining global and per task
+            budgets.
+        """
+        remaining_tasks, remaining_weights, done = [], [], []
+        for task, weight in zip(tasks, task_weights):
+            progress = self.tasks.get(shash2hex(task.mod))
+            num_trials = progress.num_trials if progress is not None else 0
+            if progress is not None and progress.is_terminated:
+                continue
+            if num_trials >= max_trials_per_task:
+                continue
+            remaining_tasks.append(task)
+            remaining_weights.append(weight)
+            done.append(num_trials)
+        return (
+            remaining_tasks,
+            remaining_weights,
+            max(0, max_trials_global - self.num_trials),
+            max_trials_per_task - min(done, default=0),
+        )
+
+
+def load_checkpoint(checkpoint_dir: str) -> Optional[TuningCheckpoint]:
+    """Load the last checkpoint of a tuning session.
+
+    Parameters
+    ----------
+    checkpoint_dir : str
+        The directory of the checkpoints of the session.
+
+    Returns
+    -------
+    checkpoint : Optional[TuningCheckpoint]
+        The checkpoint, or None if the session has none.
+    """
+    path = os.path.join(checkpoint_dir, STATE_FILE)
+    if not os.path.isfile(path):
+        return None
+    with open(path, "r", encoding="utf-8") as i_f:
+        state = json.load(i_f)
+    cost_model_path = os.path.join(checkpoint_dir, COST_MODEL_FILE)
+    return TuningCheckpoint(
+        tasks={
+            shash: TaskProgress(task["task_name"], task["num_trials"], task["is_terminated"])
+            for shash, task in state["tasks"].items()
+        },
+        elapsed_secs=state["elapsed_secs"],
+        cost_model_path=cost_model_path if state["has_cost_model"] else None,
+    )
+
+
+@derived_object
+class SaveCheckpoint(PyMeasureCallback):
+    """A measure callback that periodically saves the progress of the tasks and a snapshot of the
+    cost model of a tuning session, so that a session killed, e.g. by a preemption, resumes with
+    a trained cost model and without measuring its tasks again. It must come after the callbacks
+    committing to the database and updating the cost model.
+
+    Parameters
+    ----------
+    checkpoint_dir : str
+        The directory of the checkpoints.
+    interval_secs : float
+        The minimum wall-clock time between two checkpoints, in seconds.
+    resume_from : Optional[TuningCheckpoint]
+        The checkpoint the session resumes from, whose progress is carried on.
+    """
+
+    checkpoint_dir: str
+    interval_secs: float
+
+    def __init__(
+        self,
+        checkpoint_dir: str,
+        interval_secs: float = 600.0,
+        resume_from: Optional[TuningCheckpoint] = None,
+    ) -> None:
+        super().__init__()
+        self.checkpoint_dir = checkpoint_dir
+        self.interval_secs = interval_secs
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        self._tasks: Dict[str, TaskProgress] = dict(resume_from.tasks) if resume_from else {}
+        self._elapsed_secs = resume_from.elapsed_secs if resume_from else 0.0
+        self._task_keys: Dict[int, str] = {}
+        self._start = self._last_save = time.time()
+
+    def apply(
+        self,
+        task_scheduler: "TaskScheduler",
+        task_id: int,
+        measure_candidates: List[MeasureCandidate],
+        builder_results: List[BuilderResult],
+        runner_results: List[RunnerResult],
+    ) -> None:
+        if task_id not in self._task_keys:
+            self._task_keys[task_id] = shash2hex(task_scheduler.tasks_[task_id].ctx.mod)
+        key = self._task_keys[task_id]
+        task = task_scheduler.tasks_[task_id]
+        progress = self._tasks.get(key)
+        self._tasks[key] = TaskProgress(
+            task_name=str(task.ctx.task_name),
+            num_trials=(progress.num_trials if progress else 0) + len(runner_results),
+            is_terminated=bool(task.is_terminated),
+        )
+        if time.time() - self._last_save >= self.interval_secs:
+            self.save(task_scheduler.cost_model_)
+
+    def save(self, cost_model: Optional["CostModel"]) -> None:
+        """Save a checkpoint now.
+
+        Parameters
+        ----------
+        cost_model : Optional[CostModel]
+            The cost model of the session.
+        """
+        now = time.time()
+        has_cost_model = False
+        if cost_model is not None:
+            path = os.path.join(self.checkpoint_dir, COST_MODEL_FILE)
+            try:
+                cost_model.save(path + ".tmp")
+                os.replace(path + ".tmp", path)
+                has_cost_model = True
+            except Exception as err:  # pylint: disable=broad-except
+                logger.warning("Cannot save a snapshot of the cost model: %s", err)
+        state = {
+            "tasks": {key: task._asdict() for key, task in self._tasks.items()},
+            "elapsed_secs": self._elapsed_secs + now - self._start,
+            "has_cost_model": has_cost_model,
+        }
+        path = os.path.join(self.checkpoint_dir, STATE_FILE)
+        with open(path + ".tmp", "w", encoding="utf-8") as o_f:
+            json.dump(state, o_f)
+        # The rename is atomic, so a session killed while saving keeps its previous checkpoint
+        os.replace(path + ".tmp", path)
+        self._last_save = now
+        logger.info(
+            "Saved a checkpoint of %d trials to %s",
+            sum(task.num_trials for task in self._tasks.values()),
+            self.checkpoint_dir,
+        )
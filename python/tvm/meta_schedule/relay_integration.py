@@ -18,9 +18,22 @@
 # specific language governing permissions and limitations
 # under the License.
 """MetaSchedule-Relay integration"""
+import functools
 from contextlib import contextmanager
 from types import MappingProxyType
-from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Set, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 # isort: off
 from typing_extensions import Literal
@@ -30,7 +43,8 @@ import numpy as np  # type: ignore
 
 from tvm import nd
 from tvm._ffi import get_global_func
-from tvm.ir import IRModule, transform
+from tvm.contrib.parallel_extraction import map_programs
+from tvm.ir import IRModule, structural_equal, transform
 from tvm.ir.instrument import PassInstrument
 from tvm.runtime import NDArray
 from tvm.target import Target
@@ -48,7 +62,7 @@ from .space_generator import SpaceGenerator
 from .task_scheduler import TaskScheduler
 from .tune import tune_tasks
 from .tune_context import TuneContext
-from .utils import fork_seed
+from .utils import fork_seed, shash2hex
 
 if TYPE_CHECKING:
     from tvm import relay
@@ -201,6 +215,114 @@ def extract_tasks(
                 return list(_extract_task(mod, target, params, module_equality))
 
 
+def _extract_tasks_worker(
+    mod: IRModule,
+    params: Optional[Dict[str, NDArray]],
+    target: Target,
+    **kwargs: Any,
+) -> List[ExtractedTask]:
+    return extract_tasks(mod, target, params, **kwargs)
+
+
+def extract_tasks_parallel(
+    programs: Sequence[
+        Union[
+            Tuple[IRModule, Optional[Dict[str, NDArray]]],
+            Callable[[], Tuple[IRModule, Optional[Dict[str, NDArray]]]],
+        ]
+    ],
+    target: Union[Target, str],
+    *,
+    opt_level: int = 3,
+    pass_config: Mapping[str, Any] = MappingProxyType(
+        {
+            "relay.backend.use_meta_schedule": True,
+            "relay.backend.tir_converter": "default",
+        }
+    ),
+    executor: Optional["relay.backend.Executor"] = None,
+    runtime: Optional["relay.backend.Runtime"] = None,
+    module_equality: str = "structural",
+    disabled_pass: Optional[Union[List[str], Set[str], Tuple[str]]] = None,
+    n_parallel: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> List[ExtractedTask]:
+    """Extract tuning tasks from many relay programs in parallel worker processes.
+
+    The tasks of all the programs whose low-level IR is structurally equal are merged into one
+    task, whose weight is the sum of their weights. The names of the merged tasks are made unique
+    by suffixing them. The programs whose extraction fails are logged and skipped.
+
+    Parameters
+    ----------
+    programs : Sequence[Union[Tuple[IRModule, Optional[Dict[str, NDArray]]], Callable]]
+        The programs, each either a (mod, params) pair or a function returning the pair, which
+        is called in the worker process, e.g. to load the model there.
+    target : Union[Target, str]
+        The compilation target
+    opt_level : int
+        The optimization level of the compilation
+    pass_config : Mapping[str, Any]
+        The pass configuration
+    executor : Optional[relay.backend.Executor]
+        The executor to use
+    runtime : Optional[relay.backend.Runtime]
+        The runtime to use
+    module_equality : Optional[str]
+        The module equality testing and hashing method within each program, see `extract_tasks`.
+    disabled_pass : Optional[Union[List[str], Set[str], Tuple[str]]]
+        The list of disabled passes
+    n_parallel : Optional[int]
+        The number of worker processes. Defaults to the number of CPUs.
+    timeout : Optional[float]
+        The timeout of the extraction of each program, in seconds.
+
+    Returns
+    -------
+    tasks: List[ExtractedTask]
+        The merged tasks extracted from the programs
+    """
+    if not isinstance(target, Target):
+        target = Target(target)
+    worker = functools.partial(
+        _extract_tasks_worker,
+        target=target,
+        opt_level=opt_level,
+        pass_config=dict(pass_config),
+        executor=executor,
+        runtime=runtime,
+        module_equality=module_equality,
+        disabled_pass=disabled_pass,
+    )
+    # The merged tasks and weights, and the indices of the tasks by structural hash
+    merged: List[ExtractedTask] = []
+    weights: List[int] = []
+    buckets: Dict[str, List[int]] = {}
+    with Profiler.timeit("TaskExtraction"):
+        for result in map_programs(worker, programs, n_parallel=n_parallel, timeout=timeout):
+            for task in result or []:
+                bucket = buckets.setdefault(shash2hex(task.dispatched[0]), [])
+                for i in bucket:
+                    if structural_equal(merged[i].dispatched[0], task.dispatched[0]):
+                        weights[i] += int(task.weight)
+                        break
+                else:
+                    bucket.append(len(merged))
+                    merged.append(task)
+                    weights.append(int(task.weight))
+    tasks: List[ExtractedTask] = []
+    names: Set[str] = set()
+    for task, weight in zip(merged, weights):
+        name = task.task_name
+        suffix = 0
+        while name in names:
+            suffix += 1
+            name = f"{task.task_name}_{suffix}"
+        names.add(name)
+        tasks.append(ExtractedTask(name, task.mod, task.target, list(task.dispatched), weight))
+    return tasks
+
+
 def extracted_tasks_to_tune_contexts(
     extracted_tasks: List[ExtractedTask],
     work_dir: str,
@@ -278,6 +400,8 @@ def tune_relay(
     num_tuning_cores: Union[Literal["physical", "logical"], int] = "physical",
     disabled_pass: Optional[Union[List[str], Set[str], Tuple[str]]] = None,
     instruments: Optional[Sequence[PassInstrument]] = None,
+    checkpoint_interval: Optional[float] = None,
+    resume: bool = False,
 ) -> Database:
     """Tune a Relay program.
 
@@ -331,6 +455,10 @@ def tune_relay(
         The list of disabled passes during tasks extraction
     instruments : Optional[Sequence[PassInstrument]]
         The list of pass instrument implementations.
+    checkpoint_interval : Optional[float]
+        If not None, the minimum time between two checkpoints of the session, in seconds.
+    resume : bool
+        Whether to resume the session from its last checkpoint in the working directory.
 
     Returns
     -------
@@ -366,6 +494,8 @@ def tune_relay(
         measure_callbacks=measure_callbacks,
         task_scheduler=task_scheduler,
         module_equality=module_equality,
+        checkpoint_interval=checkpoint_interval,
+        resume=resume,
     )
 
 
@@ -24,6 +24,7 @@ Meta Schedule runners that runs an artifact either locally or through the RPC in
 from .config import EvaluatorConfig, RPCConfig
 from .local_runner import LocalRunner, LocalRunnerFuture
 from .rpc_runner import RPCRunner
+from .rpc_dispatcher import RPCDispatchRunner, RPCServerEndpoint, ServerHealth
 from .runner import (
     PyRunner,
     PyRunnerFuture,
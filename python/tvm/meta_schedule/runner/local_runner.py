@@ -19,12 +19,17 @@
 # under the License.
 """Local Runner"""
 import logging
+import time
+from collections import OrderedDict
 from contextlib import contextmanager
-from typing import Callable, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 import subprocess
 
+import numpy as np  # type: ignore
+
 import tvm
 
+from ...contrib.cpu_affinity import bound_initializer
 from ...contrib.popen_pool import PopenPoolExecutor
 from ...runtime import Device, Module
 from ..logging import get_logger
@@ -65,6 +70,11 @@ T_CLEANUP = Callable[  # pylint: disable=invalid-name
 ]
 
 
+# The argument lists kept alive in the worker process for reuse, keyed by device and ArgInfo
+_ARGUMENT_CACHE: "OrderedDict[str, List[T_ARGUMENT_LIST]]" = OrderedDict()
+_ARGUMENT_CACHE_SIZE = 4
+
+
 @derived_object
 class LocalRunnerFuture(PyRunnerFuture):
     """Local based runner future
@@ -127,7 +137,8 @@ def _worker_func(
     artifact_path: str,
     device_type: str,
     args_info: T_ARG_INFO_JSON_OBJ_LIST,
-) -> List[float]:
+    reuse_arguments: bool = False,
+) -> Tuple[List[float], Dict[str, float]]:
     f_alloc_argument: T_ALLOC_ARGUMENT = get_global_func_with_default_on_worker(
         _f_alloc_argument, default_alloc_argument
     )
@@ -135,6 +146,14 @@ def _worker_func(
         _f_run_evaluator, default_run_evaluator
     )
     f_cleanup: T_CLEANUP = get_global_func_with_default_on_worker(_f_cleanup, default_cleanup)
+    elapsed: Dict[str, float] = {}
+
+    @contextmanager
+    def timeit(name: str):
+        tic = time.perf_counter()
+        with Profiler.timeit("LocalRunner/" + name):
+            yield
+        elapsed[name] = time.perf_counter() - tic
 
     @contextmanager
     def resource_handler():
@@ -142,30 +161,39 @@ def _worker_func(
             yield
         finally:
             # Final step. Always clean up
-            with Profiler.timeit("LocalRunner/cleanup"):
+            with timeit("cleanup"):
                 f_cleanup()
 
     with resource_handler():
         # Step 1: create the local runtime module
-        with Profiler.timeit("LocalRunner/load_module"):
+        with timeit("load_module"):
             rt_mod = tvm.runtime.load_module(artifact_path)
-        # Step 2: Allocate input arguments
-        with Profiler.timeit("LocalRunner/alloc_argument"):
+        # Step 2: Allocate input arguments, or reuse those of a previous candidate
+        with timeit("alloc_argument"):
             device = tvm.runtime.device(dev_type=device_type, dev_id=0)
-            repeated_args: List[T_ARGUMENT_LIST] = f_alloc_argument(
-                device,
-                args_info,
-                alloc_repeat,
-            )
+            cache_key = str((_f_alloc_argument, device_type, alloc_repeat, args_info))
+            if reuse_arguments and cache_key in _ARGUMENT_CACHE:
+                _ARGUMENT_CACHE.move_to_end(cache_key)
+                repeated_args = _ARGUMENT_CACHE[cache_key]
+            else:
+                repeated_args = f_alloc_argument(
+                    device,
+                    args_info,
+                    alloc_repeat,
+                )
+                if reuse_arguments:
+                    _ARGUMENT_CACHE[cache_key] = repeated_args
+                    while len(_ARGUMENT_CACHE) > _ARGUMENT_CACHE_SIZE:
+                        _ARGUMENT_CACHE.popitem(last=False)
         # Step 3: Run time_evaluator
-        with Profiler.timeit("LocalRunner/run_evaluator"):
+        with timeit("run_evaluator"):
             costs: List[float] = f_run_evaluator(
                 rt_mod,
                 device,
                 evaluator_config,
                 repeated_args,
             )
-    return costs
+    return costs, elapsed
 
 
 @derived_object
@@ -186,6 +214,10 @@ class LocalRunner(PyRunner):
         The function name to run the evaluator or the function itself.
     f_cleanup: Optional[str, Callable]
         The function name to cleanup the session or the function itself.
+    cpu_affinity: Optional[List[int]]
+        The CPUs to pin the worker process and the kernels it measures to.
+    reuse_arguments: bool
+        Whether to reuse the argument buffers across candidates with identical ArgInfo.
     pool: PopenPoolExecutor
         The popen pool executor.
 
@@ -233,6 +265,8 @@ class LocalRunner(PyRunner):
     f_alloc_argument: Union[T_ALLOC_ARGUMENT, str, None]
     f_run_evaluator: Union[T_RUN_EVALUATOR, str, None]
     f_cleanup: Union[T_CLEANUP, str, None]
+    cpu_affinity: Optional[List[int]]
+    reuse_arguments: bool
 
     pool: PopenPoolExecutor
 
@@ -246,6 +280,8 @@ class LocalRunner(PyRunner):
         f_run_evaluator: Union[T_RUN_EVALUATOR, str, None] = None,
         f_cleanup: Union[T_CLEANUP, str, None] = None,
         initializer: Optional[Callable[[], None]] = None,
+        cpu_affinity: Optional[List[int]] = None,
+        reuse_arguments: bool = False,
     ) -> None:
         """Constructor
 
@@ -267,6 +303,13 @@ class LocalRunner(PyRunner):
             The function name to cleanup the session or the function itself.
         initializer: Optional[Callable[[], None]]
             The initializer function.
+        cpu_affinity: Optional[List[int]]
+            The CPUs to pin the worker process and the runtime thread pool to, so that the
+            measurements do not contend with the builders. None means no pinning.
+        reuse_arguments: bool
+            Whether to keep the allocated arguments alive in the worker and reuse them for the
+            following candidates with identical ArgInfo, instead of allocating and filling them
+            again. Kernels that write to their inputs may then see modified input data.
         """
         super().__init__()
         self.timeout_sec = timeout_sec
@@ -276,22 +319,30 @@ class LocalRunner(PyRunner):
         self.f_alloc_argument = f_alloc_argument
         self.f_run_evaluator = f_run_evaluator
         self.f_cleanup = f_cleanup
+        self.cpu_affinity = cpu_affinity
+        self.reuse_arguments = reuse_arguments
 
         err_path = subprocess.DEVNULL
         if logger.root.level <= logging.DEBUG:
             err_path = subprocess.STDOUT
 
         logger.info("LocalRunner: max_workers = 1")
+        if cpu_affinity:
+            logger.info("LocalRunner: cpu_affinity = %s", cpu_affinity)
         self.pool = PopenPoolExecutor(
             max_workers=1,  # one local worker
             timeout=timeout_sec,
-            initializer=initializer,
+            initializer=bound_initializer(cpu_affinity, initializer),
             stderr=err_path,  # suppress the stderr output
         )
         self._sanity_check()
 
     def run(self, runner_inputs: List[RunnerInput]) -> List[RunnerFuture]:
         results: List[RunnerFuture] = []
+        total_elapsed: Dict[str, float] = {}
+        total_kernel_sec = 0.0
+        num_success = 0
+        variations: List[float] = []
         for runner_input in runner_inputs:
             future = self.pool.submit(
                 _worker_func,
@@ -303,10 +354,19 @@ class LocalRunner(PyRunner):
                 str(runner_input.artifact_path),
                 str(runner_input.device_type),
                 tuple(arg_info.as_json() for arg_info in runner_input.args_info),
+                self.reuse_arguments,
             )
             try:
-                result: List[float] = future.result()
+                result: List[float]
+                elapsed: Dict[str, float]
+                result, elapsed = future.result()
                 error_message: str = None
+                num_success += 1
+                total_kernel_sec += sum(result) * self.evaluator_config.number
+                if len(result) > 1 and np.mean(result) > 0:
+                    variations.append(float(np.std(result) / np.mean(result)))
+                for name, sec in elapsed.items():
+                    total_elapsed[name] = total_elapsed.get(name, 0.0) + sec
             except TimeoutError:
                 result = None
                 error_message = f"LocalRunner: Timeout, killed after {self.timeout_sec} seconds\n"
@@ -315,8 +375,41 @@ class LocalRunner(PyRunner):
                 error_message = "LocalRunner: An exception occurred\n" + str(exception)
             local_future = LocalRunnerFuture(res=result, error_message=error_message)
             results.append(local_future)  # type: ignore
+        if num_success > 0:
+            self._log_overhead(total_elapsed, total_kernel_sec, num_success)
+        if variations:
+            # The spread of the repeated measurements of the same candidate, which grows when
+            # the measurements contend with other work, e.g. the builders
+            logger.debug(
+                "LocalRunner: Coefficient of variation of the repeated measurements: "
+                "mean %.2f%%, max %.2f%% over %d candidates",
+                100.0 * float(np.mean(variations)),
+                100.0 * max(variations),
+                len(variations),
+            )
         return results
 
+    def _log_overhead(
+        self,
+        total_elapsed: Dict[str, float],
+        total_kernel_sec: float,
+        num_success: int,
+    ) -> None:
+        """Report the average time spent per candidate outside of the measured kernel runs."""
+        total_sec = sum(total_elapsed.values())
+        logger.info(
+            "LocalRunner: %d candidates, per candidate %.2f ms in total, %.2f ms in kernels, "
+            "%.2f ms overhead (%s)",
+            num_success,
+            1000.0 * total_sec / num_success,
+            1000.0 * total_kernel_sec / num_success,
+            1000.0 * (total_sec - total_kernel_sec) / num_success,
+            ", ".join(
+                f"{name} {1000.0 * sec / num_success:.2f} ms"
+                for name, sec in total_elapsed.items()
+            ),
+        )
+
     def _sanity_check(self) -> None:
         def _check(
             f_alloc_argument,
@@ -0,0 +1,495 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""A fault-tolerant runner dispatching the candidates over a pool of RPC servers"""
+import collections
+import concurrent.futures
+import os.path as osp
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Set, Tuple, Union
+
+from tvm import rpc
+from tvm.contrib.popen_pool import PopenWorker
+from tvm.rpc import RPCSession
+
+from ..logging import get_logger
+from ..utils import derived_object, get_global_func_with_default_on_worker
+from .config import EvaluatorConfig
+from .rpc_runner import (
+    T_ALLOC_ARGUMENT,
+    T_RUN_EVALUATOR,
+    T_UPLOAD_MODULE,
+    RPCRunnerFuture,
+    default_alloc_argument,
+    default_run_evaluator,
+    default_upload_module,
+)
+from .runner import PyRunner, RunnerFuture, RunnerInput
+from .utils import T_ARG_INFO_JSON_OBJ_LIST
+
+logger = get_logger(__name__)  # pylint: disable=invalid-name
+
+# The status of a measurement returned by the worker
+_OK = 0
+_CANDIDATE_ERROR = 1
+_SERVER_ERROR = 2
+
+# The moving average weight of the past in the health statistics of a server
+_HEALTH_DECAY = 0.8
+
+
+class RPCServerEndpoint(NamedTuple):
+    """The address of an RPC server started without tracker, e.g. by
+    `python -m tvm.exec.rpc_server --host 0.0.0.0 --port 9090`.
+
+    Parameters
+    ----------
+    host : str
+        The host of the server.
+    port : int
+        The port of the server.
+    key : str
+        The key of the server.
+    """
+
+    host: str
+    port: int
+    key: str = ""
+
+    @staticmethod
+    def parse(endpoint: Union[str, "RPCServerEndpoint"]) -> "RPCServerEndpoint":
+        """Parse an endpoint given as "host:port" or "host:port:key".
+
+        Parameters
+        ----------
+        endpoint : Union[str, RPCServerEndpoint]
+            The endpoint.
+
+        Returns
+        -------
+        endpoint : RPCServerEndpoint
+            The parsed endpoint.
+        """
+        if isinstance(endpoint, RPCServerEndpoint):
+            return endpoint
+        host, port, *key = endpoint.split(":", 2)
+        return RPCServerEndpoint(host, int(port), key[0] if key else "")
+
+    def __str__(self) -> str:
+        return f"{self.host}:{self.port}"
+
+
+class ServerHealth:
+    """The health of an RPC server, as seen by the dispatcher.
+
+    Parameters
+    ----------
+    endpoint : RPCServerEndpoint
+        The server.
+    score : float
+        The moving average of the outcome of the measurements on the server, 1 for a success and
+        0 for a failure of the server, i.e. a timeout or a lost connection.
+    num_measured : int
+        The number of candidates measured on the server, including the ones that failed on their
+        own, e.g. with a runtime error of the kernel.
+    num_failed : int
+        The number of measurements that failed because of the server.
+    consecutive_failures : int
+        The number of failures of the server since its last success.
+    mean_secs : float
+        The moving average of the wall-clock seconds of a measurement on the server.
+    batch_size : int
+        The number of candidates the server takes from the queue at once.
+    quarantined_until : float
+        The `time.monotonic()` until which the server is given no candidate.
+    """
+
+    endpoint: RPCServerEndpoint
+    score: float
+    num_measured: int
+    num_failed: int
+    consecutive_failures: int
+    mean_secs: float
+    batch_size: int
+    quarantined_until: float
+
+    def __init__(self, endpoint: RPCServerEndpoint, batch_size: int) -> None:
+        self.endpoint = endpoint
+        self.score = 1.0
+        self.num_measured = 0
+        self.num_failed = 0
+        self.consecutive_failures = 0
+        self.mean_secs = 0.0
+        self.batch_size = batch_size
+        self.quarantined_until = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"ServerHealth({self.endpoint}, score={self.score:.2f}, "
+            f"measured={self.num_measured}, failed={self.num_failed}, "
+            f"mean_secs={self.mean_secs:.3f}, batch_size={self.batch_size})"
+        )
+
+
+class _Job:
+    """A candidate waiting for its measurement"""
+
+    def __init__(self, runner_input: RunnerInput, future: concurrent.futures.Future) -> None:
+        self.artifact_path = str(runner_input.artifact_path)
+        self.device_type = str(runner_input.device_type)
+        self.args_info = tuple(arg_info.as_json() for arg_info in runner_input.args_info)
+        self.future = future
+        self.attempts = 0
+        self.excluded: Set[int] = set()
+        self.errors: List[str] = []
+
+
+@derived_object
+class RPCDispatchRunner(PyRunner):
+    """A runner dispatching the candidates over a pool of RPC servers, tolerating their faults.
+
+    Each server is served by a thread owning a popen worker, which keeps one RPC session open
+    across the candidates and measures them one at a time, each with its own timeout. So when a
+    server dies in the middle of a batch, only the candidate being measured is lost: it is
+    retried on another server, up to `max_attempts` times, and the rest of the batch goes back
+    to the queue. A failing server is quarantined for `quarantine_sec` times its number of
+    consecutive failures before being probed again with a single candidate.
+
+    The servers pull the candidates from a shared queue, in batches sized so that a batch takes
+    about `target_batch_sec` on the server, scaled down by its health score. Fast and healthy
+    servers thus take more candidates, and a slow or flaky one does not hold the tail of a round.
+
+    The servers are addressed directly rather than through a tracker, which picks the server of
+    a session by itself and hides its address, so they must be started without tracker.
+
+    The serving threads and their popen workers start with the first call to `run`, and are only
+    released by `close`, which the owner of the runner must call once done with it.
+
+    Parameters
+    ----------
+    servers : List[Union[str, RPCServerEndpoint]]
+        The RPC servers, as "host:port[:key]" strings or endpoints.
+    evaluator_config : Optional[EvaluatorConfig]
+        The evaluator configuration.
+    timeout_sec : float
+        The timeout of the measurement of a candidate, session creation included, in seconds.
+    alloc_repeat : int
+        The number of times to random fill the allocation.
+    max_attempts : int
+        The maximum number of servers a candidate is tried on before it is reported as failed.
+    min_batch_size : int
+        The minimum number of candidates a server takes from the queue at once.
+    max_batch_size : int
+        The maximum number of candidates a server takes from the queue at once.
+    target_batch_sec : float
+        The wall-clock time a batch should take on a server, in seconds.
+    quarantine_sec : float
+        The time a server is given no candidate after a failure, in seconds.
+    f_upload_module : Union[T_UPLOAD_MODULE, str, None]
+        The function name to upload the module or the function itself.
+    f_alloc_argument : Union[T_ALLOC_ARGUMENT, str, None]
+        The function name to allocate the arguments or the function itself.
+    f_run_evaluator : Union[T_RUN_EVALUATOR, str, None]
+        The function name to run the evaluator or the function itself.
+    initializer : Optional[Callable[[], None]]
+        The initializer function of the popen workers.
+    health : List[ServerHealth]
+        The health of each server.
+    """
+
+    servers: List[RPCServerEndpoint]
+    evaluator_config: EvaluatorConfig
+    timeout_sec: float
+    alloc_repeat: int
+    max_attempts: int
+    min_batch_size: int
+    max_batch_size: int
+    target_batch_sec: float
+    quarantine_sec: float
+    health: List[ServerHealth]
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        servers: List[Union[str, RPCServerEndpoint]],
+        evaluator_config: Optional[EvaluatorConfig] = None,
+        timeout_sec: float = 30.0,
+        alloc_repeat: int = 1,
+        max_attempts: int = 3,
+        min_batch_size: int = 1,
+        max_batch_size: int = 32,
+        target_batch_sec: float = 10.0,
+        quarantine_sec: float = 30.0,
+        f_upload_module: Union[T_UPLOAD_MODULE, str, None] = None,
+        f_alloc_argument: Union[T_ALLOC_ARGUMENT, str, None] = None,
+        f_run_evaluator: Union[T_RUN_EVALUATOR, str, None] = None,
+        initializer: Optional[Callable[[], None]] = None,
+    ) -> None:
+        super().__init__()
+        if not servers:
+            raise ValueError("RPCDispatchRunner: No RPC server is given")
+        self.servers = [RPCServerEndpoint.parse(server) for server in servers]
+        self.evaluator_config = EvaluatorConfig._normalized(evaluator_config)
+        self.timeout_sec = timeout_sec
+        self.alloc_repeat = alloc_repeat
+        self.max_attempts = max_attempts
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.target_batch_sec = target_batch_sec
+        self.quarantine_sec = quarantine_sec
+        self.f_upload_module = f_upload_module
+        self.f_alloc_argument = f_alloc_argument
+        self.f_run_evaluator = f_run_evaluator
+        self.initializer = initializer
+        self.health = [ServerHealth(server, min_batch_size) for server in self.servers]
+        self._queue: Deque[_Job] = collections.deque()
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._shutdown = False
+        logger.info("RPCDispatchRunner: servers = %s", ", ".join(map(str, self.servers)))
+
+    def run(self, runner_inputs: List[RunnerInput]) -> List[RunnerFuture]:
+        results: List[RunnerFuture] = []
+        jobs = []
+        for runner_input in runner_inputs:
+            future: concurrent.futures.Future = concurrent.futures.Future()
+            jobs.append(_Job(runner_input, future))
+            results.append(RPCRunnerFuture(future, self.timeout_sec))  # type: ignore
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("RPCDispatchRunner: The runner is closed")
+            if not self._threads:
+                for server_idx in range(len(self.servers)):
+                    thread = threading.Thread(
+                        target=self._serve,
+                        args=(server_idx,),
+                        name=f"rpc-dispatch-{self.servers[server_idx]}",
+                        daemon=True,
+                    )
+                    thread.start()
+                    self._threads.append(thread)
+            self._queue.extend(jobs)
+            self._cond.notify_all()
+        return results
+
+    def close(self) -> None:
+        """Stop the threads serving the servers, once their current batches are measured. The
+        candidates still in the queue are reported as failed."""
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        with self._cond:
+            while self._queue:
+                job = self._queue.popleft()
+                job.future.set_exception(RuntimeError("The runner is closed"))
+
+    def _serve(self, server_idx: int) -> None:
+        worker = PopenWorker(initializer=self.initializer)
+        try:
+            while True:
+                batch = self._take_batch(server_idx)
+                if batch is None:
+                    break
+                self._run_batch(server_idx, worker, batch)
+        finally:
+            worker.kill()
+
+    def _take_batch(self, server_idx: int) -> Optional[List[_Job]]:
+        health = self.health[server_idx]
+        with self._cond:
+            while not self._shutdown:
+                wait_sec: Optional[float] = health.quarantined_until - time.monotonic()
+                if wait_sec <= 0:
+                    batch_size = max(self.min_batch_size, int(health.batch_size * health.score))
+                    batch: List[_Job] = []
+                    rest: Deque[_Job] = collections.deque()
+                    while self._queue:
+                        job = self._queue.popleft()
+                        if len(batch) < batch_size and server_idx not in job.excluded:
+                            batch.append(job)
+                        else:
+                            rest.append(job)
+                    self._queue = rest
+                    if batch:
+                        return batch
+                    wait_sec = None
+                self._cond.wait(wait_sec)
+        return None
+
+    def _run_batch(self, server_idx: int, worker: PopenWorker, batch: List[_Job]) -> None:
+        for i, job in enumerate(batch):
+            tic = time.monotonic()
+            try:
+                worker.send(
+                    _worker_func,
+                    (
+                        self.f_upload_module,
+                        self.f_alloc_argument,
+                        self.f_run_evaluator,
+                        self.servers[server_idx],
+                        self.evaluator_config,
+                        self.alloc_repeat,
+                        job.artifact_path,
+                        job.device_type,
+                        job.args_info,
+                    ),
+                    timeout=self.timeout_sec,
+                )
+                status, value = worker.recv()
+            except TimeoutError:
+                status, value = _SERVER_ERROR, f"Timeout, killed after {self.timeout_sec} seconds"
+            except ChildProcessError:
+                status, value = _SERVER_ERROR, "The popen worker died"
+            except Exception as exception:  # pylint: disable=broad-except
+                status, value = _SERVER_ERROR, str(exception)
+            secs = time.monotonic() - tic
+            if status == _SERVER_ERROR:
+                # Drop the session of the worker, and give the rest of the batch back
+                worker.kill()
+                self._on_failure(server_idx, job, value, batch[i + 1 :])
+                return
+            if status == _OK:
+                job.future.set_result(value)
+            else:
+                job.future.set_exception(RuntimeError(value))
+            self._on_success(server_idx, secs)
+
+    def _on_success(self, server_idx: int, secs: float) -> None:
+        health = self.health[server_idx]
+        with self._cond:
+            health.num_measured += 1
+            health.consecutive_failures = 0
+            health.score = _HEALTH_DECAY * health.score + (1 - _HEALTH_DECAY)
+            if health.mean_secs > 0:
+                health.mean_secs = _HEALTH_DECAY * health.mean_secs + (1 - _HEALTH_DECAY) * secs
+            else:
+                health.mean_secs = secs
+            health.batch_size = min(
+                self.max_batch_size,
+                max(self.min_batch_size, int(self.target_batch_sec / max(health.mean_secs, 1e-3))),
+            )
+
+    def _on_failure(self, server_idx: int, job: _Job, error: str, rest: List[_Job]) -> None:
+        health = self.health[server_idx]
+        with self._cond:
+            health.num_failed += 1
+            health.consecutive_failures += 1
+            health.score = _HEALTH_DECAY * health.score
+            health.batch_size = self.min_batch_size
+            quarantine_sec = self.quarantine_sec * health.consecutive_failures
+            health.quarantined_until = time.monotonic() + quarantine_sec
+            logger.warning(
+                "RPCDispatchRunner: Server %s failed, quarantined for %.1f seconds: %s",
+                health.endpoint,
+                quarantine_sec,
+                error,
+            )
+            job.attempts += 1
+            job.errors.append(f"{health.endpoint}: {error}")
+            if job.attempts >= self.max_attempts:
+                job.future.set_exception(
+                    RuntimeError(
+                        f"Failed on {job.attempts} attempts:\n" + "\n".join(job.errors),
+                    )
+                )
+            else:
+                job.excluded.add(server_idx)
+                if len(job.excluded) >= len(self.servers):
+                    # Every server failed it once, let them try again
+                    job.excluded.clear()
+                rest = [job] + rest
+            self._queue.extendleft(reversed(rest))
+            self._cond.notify_all()
+
+
+# The RPC session of the popen worker, kept open across the candidates
+_SESSION: Dict[str, Any] = {}
+
+
+def _is_alive(session: RPCSession, device_type: str) -> bool:
+    try:
+        return bool(session.device(dev_type=device_type, dev_id=0).exist)
+    except Exception:  # pylint: disable=broad-except
+        return False
+
+
+def _cleanup(session: RPCSession, remote_path: str) -> None:
+    # Unlike the cleanup of RPCRunner, the work directory of the session is not removed, the
+    # session being reused
+    try:
+        session.remove(remote_path)
+        session.remove(remote_path + ".so")
+    except Exception:  # pylint: disable=broad-except
+        pass
+
+
+def _worker_func(
+    _f_upload_module: Union[T_UPLOAD_MODULE, str, None],
+    _f_alloc_argument: Union[T_ALLOC_ARGUMENT, str, None],
+    _f_run_evaluator: Union[T_RUN_EVALUATOR, str, None],
+    endpoint: RPCServerEndpoint,
+    evaluator_config: EvaluatorConfig,
+    alloc_repeat: int,
+    artifact_path: str,
+    device_type: str,
+    args_info: T_ARG_INFO_JSON_OBJ_LIST,
+) -> Tuple[int, Any]:
+    # Step 0. Get the registered functions
+    f_upload_module: T_UPLOAD_MODULE = get_global_func_with_default_on_worker(
+        _f_upload_module, default_upload_module
+    )
+    f_alloc_argument: T_ALLOC_ARGUMENT = get_global_func_with_default_on_worker(
+        _f_alloc_argument, default_alloc_argument
+    )
+    f_run_evaluator: T_RUN_EVALUATOR = get_global_func_with_default_on_worker(
+        _f_run_evaluator, default_run_evaluator
+    )
+    # Step 1. Connect to the server, or reuse the session of the previous candidates
+    _, remote_path = osp.split(artifact_path)
+    try:
+        if endpoint != _SESSION.get("endpoint"):
+            _SESSION.clear()
+            _SESSION["session"] = rpc.connect(endpoint.host, endpoint.port, key=endpoint.key)
+            _SESSION["endpoint"] = endpoint
+        session: RPCSession = _SESSION["session"]
+        device = session.device(dev_type=device_type, dev_id=0)
+        # Step 2. Upload the module
+        rt_mod = f_upload_module(session, artifact_path, remote_path)
+    except Exception as exception:  # pylint: disable=broad-except
+        _SESSION.clear()
+        return _SERVER_ERROR, str(exception)
+    try:
+        # Step 3. Allocate input arguments
+        repeated_args = f_alloc_argument(session, device, args_info, alloc_repeat)
+        # Step 4. Run time_evaluator
+        costs: List[float] = f_run_evaluator(
+            session, rt_mod, device, evaluator_config, repeated_args
+        )
+    except Exception as exception:  # pylint: disable=broad-except
+        # Tell a candidate failing on its own from a server going away
+        if _is_alive(session, device_type):
+            return _CANDIDATE_ERROR, str(exception)
+        _SESSION.clear()
+        return _SERVER_ERROR, str(exception)
+    finally:
+        _cleanup(session, remote_path)
+    return _OK, costs
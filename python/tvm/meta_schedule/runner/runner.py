@@ -189,12 +189,16 @@ class Runner(Object):
 
     @staticmethod
     def create(  # pylint: disable=keyword-arg-before-vararg
-        kind: Literal["local", "rpc"] = "local",
+        kind: Literal["local", "rpc", "rpc-dispatch"] = "local",
         *args,
         **kwargs,
     ) -> "Runner":
         """Create a Runner."""
-        from . import LocalRunner, RPCRunner  # pylint: disable=import-outside-toplevel
+        from . import (  # pylint: disable=import-outside-toplevel
+            LocalRunner,
+            RPCDispatchRunner,
+            RPCRunner,
+        )
 
         if kind == "local":
             if "max_workers" in kwargs:
@@ -202,6 +206,10 @@ class Runner(Object):
             return LocalRunner(*args, **kwargs)  # type: ignore
         elif kind == "rpc":
             return RPCRunner(*args, **kwargs)  # type: ignore
+        elif kind == "rpc-dispatch":
+            if "max_workers" in kwargs:
+                kwargs.pop("max_workers")
+            return RPCDispatchRunner(*args, **kwargs)  # type: ignore
         raise ValueError(f"Unknown Runner: {kind}")
 
 
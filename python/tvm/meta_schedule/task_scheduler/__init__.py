@@ -26,3 +26,4 @@ records to the database.
 from .gradient_based import GradientBased
 from .round_robin import RoundRobin
 from .task_scheduler import PyTaskScheduler, TaskScheduler, create
+from .time_aware import TimeAware
@@ -66,7 +66,7 @@ class TaskScheduler(Object):
     cost_model_: Optional[CostModel]
     remaining_tasks_: int
 
-    TaskSchedulerType = Union["TaskScheduler", Literal["gradient", "round-robin"]]
+    TaskSchedulerType = Union["TaskScheduler", Literal["gradient", "round-robin", "time-aware"]]
 
     def next_task_id(self) -> int:
         """Fetch the next task id.
@@ -172,7 +172,7 @@ class TaskScheduler(Object):
 
     @staticmethod
     def create(  # pylint: disable=keyword-arg-before-vararg
-        kind: Literal["round-robin", "gradient"] = "gradient",
+        kind: Literal["round-robin", "gradient", "time-aware"] = "gradient",
         *args,
         **kwargs,
     ) -> "TaskScheduler":
@@ -180,12 +180,15 @@ class TaskScheduler(Object):
         from . import (  # pylint: disable=import-outside-toplevel
             GradientBased,
             RoundRobin,
+            TimeAware,
         )
 
         if kind == "round-robin":
             return RoundRobin(*args, **kwargs)  # type: ignore
         if kind == "gradient":
             return GradientBased(*args, **kwargs)
+        if kind == "time-aware":
+            return TimeAware(*args, **kwargs)
         raise ValueError(f"Unknown TaskScheduler name: {kind}")
 
 
@@ -0,0 +1,77 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Measurement-Time-Aware Task Scheduler"""
+from typing import Callable, Optional
+
+from tvm._ffi import register_object
+
+from .. import _ffi_api
+from ..logging import get_logger, get_logging_func
+from .task_scheduler import TaskScheduler
+
+logger = get_logger(__name__)  # pylint: disable=invalid-name
+
+
+@register_object("meta_schedule.TimeAware")
+class TimeAware(TaskScheduler):
+    """Measurement-Time-Aware Task Scheduler.
+
+    It estimates the latency reduction of the next round of each task like `GradientBased`, but
+    divides it by the wall-clock cost of a round of the task, i.e. the time spent on generating,
+    building and measuring its candidates, so that tasks with slow builds or measurements do not
+    starve the cheap ones, and the trials go where they reduce the end-to-end latency the most per
+    second of tuning.
+    """
+
+    def __init__(
+        self,
+        *,
+        alpha: float = 0.2,
+        window_size: int = 3,
+        decay: float = 0.5,
+        clock: Optional[Callable[[], float]] = None,
+        seed: int = -1,
+    ) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        alpha : float = 0.2
+            The parameter alpha in gradient computation.
+        window_size : int = 3
+            The parameter to control backward window size in gradient computation.
+        decay : float = 0.5
+            The decay of the moving average of the wall-clock cost of a round of a task, in
+            [0, 1). 0 only keeps the cost of the last round.
+        clock : Optional[Callable[[], float]] = None
+            The function returning the current time in seconds, which the cost of a round is
+            measured with. None means the wall clock.
+        seed : int = -1
+            The random seed.
+        """
+        self.__init_handle_by_constructor__(
+            _ffi_api.TaskSchedulerTimeAware,  # type: ignore # pylint: disable=no-member
+            get_logging_func(logger),
+            alpha,
+            window_size,
+            decay,
+            clock,
+            seed,
+        )
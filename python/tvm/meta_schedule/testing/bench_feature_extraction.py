@@ -0,0 +1,91 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=missing-docstring
+"""Benchmark per-candidate vs. batched feature extraction for the cost models.
+
+Example:
+    python -m tvm.meta_schedule.testing.bench_feature_extraction --num-candidates 4096
+"""
+import argparse
+import time
+
+import numpy as np
+
+import tvm
+from tvm import meta_schedule as ms
+from tvm.meta_schedule.testing.te_workload import create_te_workload
+
+
+def _parse_args():
+    args = argparse.ArgumentParser()
+    args.add_argument("--workload", type=str, default="GMM")
+    args.add_argument("--target", type=str, default="llvm -num-cores=4")
+    args.add_argument("--num-candidates", type=int, default=2048)
+    args.add_argument("--num-repeats", type=int, default=3)
+    args.add_argument("--num-threads", type=int, default=None)
+    return args.parse_args()
+
+
+ARGS = _parse_args()
+
+
+def _measure(name, extract):
+    extract()  # warm up
+    elapsed = []
+    for _ in range(ARGS.num_repeats):
+        tic = time.time()
+        num_rows = extract()
+        elapsed.append(time.time() - tic)
+    best = min(elapsed)
+    print(
+        f"{name:>40s}: {num_rows} rows in {best * 1000:.1f} ms, "
+        f"{ARGS.num_candidates / max(best, 1e-9):.0f} candidates/s"
+    )
+
+
+def main():
+    context = ms.TuneContext(
+        mod=tvm.IRModule({"main": create_te_workload(ARGS.workload, 0)}),
+        target=tvm.target.Target(ARGS.target),
+        space_generator="post-order-apply",
+        num_threads=ARGS.num_threads or "physical",
+    )
+    design_spaces = context.generate_design_space()
+    candidates = [
+        ms.MeasureCandidate(design_spaces[i % len(design_spaces)], [])
+        for i in range(ARGS.num_candidates)
+    ]
+    extractor = ms.feature_extractor.PerStoreFeature()
+
+    def per_candidate():
+        features = extractor.extract_from(context, candidates)
+        return np.concatenate([x.numpy().astype("float32") for x in features], axis=0).shape[0]
+
+    def batched():
+        features, _ = extractor.extract_from_batched(context, candidates)
+        return features.shape[0]
+
+    print(f"Workload: {ARGS.workload}, {len(design_spaces)} design spaces")
+    _measure("extract_from + per-candidate numpy", per_candidate)
+    _measure("extract_from_batched", batched)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=missing-docstring
+"""Benchmark the prediction paths of the Segment Sum MLP cost model on CPU.
+
+Random features shaped like the per-store features of a round of candidates are predicted by
+the data loader path of the trainer, by the predictor on PyTorch, and optionally by the
+predictor on the model compiled by TVM. The tasks are predicted one by one, then all at once.
+
+Example:
+    python -m tvm.meta_schedule.testing.bench_mlp_inference \
+        --num-tasks 8 --num-candidates 2048 --num-threads 4 --tvm
+"""
+import argparse
+import time
+
+import numpy as np
+import torch  # type: ignore
+
+from tvm.meta_schedule.cost_model.mlp_model import (
+    InferenceConfig,
+    SegmentSumMLPConfig,
+    SegmentSumMLPPredictor,
+    SegmentSumMLPTrainer,
+    State,
+)
+
+
+def _parse_args():
+    args = argparse.ArgumentParser()
+    args.add_argument("--num-tasks", type=int, default=8)
+    args.add_argument("--num-candidates", type=int, default=2048)
+    args.add_argument("--max-stores", type=int, default=8)
+    args.add_argument("--num-threads", type=int, default=0)
+    args.add_argument("--num-repeats", type=int, default=5)
+    args.add_argument("--tvm", action="store_true", help="Also benchmark the TVM backend")
+    args.add_argument("--target", type=str, default="llvm")
+    return args.parse_args()
+
+
+ARGS = _parse_args()
+
+
+def _random_task(rng, input_dim):
+    segment_sizes = rng.integers(1, ARGS.max_stores + 1, size=ARGS.num_candidates)
+    packed = rng.lognormal(size=(int(segment_sizes.sum()), input_dim)).astype("float32")
+    return packed, segment_sizes
+
+
+def _best_secs(func):
+    secs = []
+    for _ in range(ARGS.num_repeats):
+        tic = time.perf_counter()
+        func()
+        secs.append(time.perf_counter() - tic)
+    return min(secs)
+
+
+def main():
+    if ARGS.num_threads > 0:
+        torch.set_num_threads(ARGS.num_threads)
+    rng = np.random.default_rng(0)
+    config = SegmentSumMLPConfig()
+    state = State(model_config=config)
+    tasks = [_random_task(rng, config.input_dim) for _ in range(ARGS.num_tasks)]
+    trainer = SegmentSumMLPTrainer(state=state)
+    loader_inputs = [
+        np.split(packed, np.cumsum(segment_sizes)[:-1]) for packed, segment_sizes in tasks
+    ]
+
+    def _loader():
+        return [trainer.predict_incremental(features) for features in loader_inputs]
+
+    expected = _loader()
+    paths = [("loader", _loader)]
+    backends = ["torch"] + (["tvm"] if ARGS.tvm else [])
+    for backend in backends:
+        predictor = SegmentSumMLPPredictor(
+            state,
+            InferenceConfig(num_threads=ARGS.num_threads, backend=backend, target=ARGS.target),
+        )
+        for got, exp in zip(predictor.predict(tasks), expected):
+            np.testing.assert_allclose(got, exp, rtol=1e-4, atol=1e-4)
+        paths.append(
+            (f"{backend}, per task", lambda p=predictor: [p.predict([task]) for task in tasks])
+        )
+        paths.append((f"{backend}, batched", lambda p=predictor: p.predict(tasks)))
+
+    num_candidates = ARGS.num_tasks * ARGS.num_candidates
+    base_secs = None
+    for name, func in paths:
+        secs = _best_secs(func)
+        base_secs = base_secs or secs
+        print(
+            f"{name:>16}: {secs * 1e3:9.2f} ms, {num_candidates / secs:12.0f} candidates/s, "
+            f"speedup {base_secs / secs:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=missing-docstring
+"""Benchmark the trials saved by seeding a task from the records of a similar workload.
+
+A source workload is tuned first. A similar workload, i.e. the same te_workload with another
+shape, is then tuned cold and seeded from the records of the source one, and the number of
+cold trials needed to reach the latency of the seeds is compared to the trials spent on them.
+
+Example:
+    python -m tvm.meta_schedule.testing.bench_similarity_seeding \
+        --workload C2D --source-idx 0 --target-idx 1 --max-trials 256
+"""
+import argparse
+import os.path as osp
+import tempfile
+
+import numpy as np
+
+from tvm import meta_schedule as ms
+from tvm.meta_schedule.testing.te_workload import create_te_workload
+from tvm.meta_schedule.tune_context import _normalize_mod
+from tvm.target import Target
+
+
+def _parse_args():
+    args = argparse.ArgumentParser()
+    args.add_argument("--workload", type=str, default="C2D")
+    args.add_argument("--source-idx", type=int, default=0)
+    args.add_argument("--target-idx", type=int, default=1)
+    args.add_argument("--target", type=str, default="llvm -num-cores=4")
+    args.add_argument("--max-trials", type=int, default=256)
+    args.add_argument("--num-seeds", type=int, default=8)
+    args.add_argument("--tolerance", type=float, default=0.05)
+    return args.parse_args()
+
+
+ARGS = _parse_args()
+
+
+def _tune(mod, database, work_dir):
+    return ms.tune_tir(
+        mod=mod,
+        target=Target(ARGS.target),
+        work_dir=work_dir,
+        max_trials_global=ARGS.max_trials,
+        database=database,
+    )
+
+
+def _run_secs(database):
+    return [
+        float(np.mean([float(s) for s in record.run_secs]))
+        for record in database.get_all_tuning_records()
+        if record.run_secs
+    ]
+
+
+def _trials_to_reach(run_secs, goal):
+    for trial, run_sec in enumerate(run_secs):
+        if run_sec <= goal:
+            return trial + 1
+    return None
+
+
+def main():
+    source = _normalize_mod(create_te_workload(ARGS.workload, ARGS.source_idx))
+    target_mod = _normalize_mod(create_te_workload(ARGS.workload, ARGS.target_idx))
+    with tempfile.TemporaryDirectory() as work_dir:
+        source_db = _tune(source, ms.database.MemoryDatabase(), osp.join(work_dir, "source"))
+        cold_db = _tune(target_mod, ms.database.MemoryDatabase(), osp.join(work_dir, "cold"))
+
+        index = ms.database.WorkloadSimilarityIndex(source_db)
+        seeded_db = ms.database.MemoryDatabase()
+        report = index.seed(
+            ms.TuneContext(
+                mod=target_mod,
+                target=Target(ARGS.target),
+                space_generator="post-order-apply",
+                task_name="main",
+            ),
+            seeded_db,
+            ms.builder.LocalBuilder(),
+            ms.runner.LocalRunner(),
+            num_seeds=ARGS.num_seeds,
+        )
+        seeded_db = _tune(target_mod, seeded_db, osp.join(work_dir, "seeded"))
+
+    print(f"Seed report: {report}")
+    cold, seeded = _run_secs(cold_db), _run_secs(seeded_db)
+    print(f"Best latency: cold {min(cold) * 1e6:.2f} us, seeded {min(seeded) * 1e6:.2f} us")
+    if report.best_run_sec is None:
+        print("No seed could be measured")
+        return
+    goal = report.best_run_sec * (1 + ARGS.tolerance)
+    cold_trials = _trials_to_reach(cold, goal)
+    if cold_trials is None:
+        print(f"Cold tuning never reached the seeds in {len(cold)} trials")
+    else:
+        print(
+            f"Trials to reach the seeds: cold {cold_trials}, seeded {report.num_measured}, "
+            f"saved {cold_trials - report.num_measured}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=missing-docstring
+"""Simulate the task schedulers on recorded databases, to compare the end-to-end latency they
+reach for a given tuning time.
+
+Each workload of the databases is a task, whose trials are its recorded tuning records replayed
+in a random order. A round of a task measures `--trials-per-iter` of them, and costs the time to
+build them, which grows with the size of their TVMScript, plus the time to run them. The
+simulated schedulers mirror the round robin, gradient based and time aware ones of
+`tvm.meta_schedule.task_scheduler`, and the sum of the best latency of the tasks is
+reported at several fractions of the time budget.
+
+Example:
+    python -m tvm.meta_schedule.testing.bench_task_scheduler \
+        --work-dirs ./resnet ./bert --budget-secs 3600
+"""
+import argparse
+import os.path as osp
+from typing import Callable, Dict, List
+
+import numpy as np  # type: ignore
+
+from tvm import meta_schedule as ms
+from tvm.meta_schedule.utils import shash2hex
+
+
+def _parse_args():
+    args = argparse.ArgumentParser()
+    args.add_argument(
+        "--work-dirs",
+        type=str,
+        nargs="+",
+        required=True,
+        help="The work directories of the recorded JSON databases.",
+    )
+    args.add_argument("--budget-secs", type=float, default=3600.0)
+    args.add_argument("--trials-per-iter", type=int, default=64)
+    args.add_argument(
+        "--build-secs",
+        type=float,
+        default=1.0,
+        help="The build time of a candidate whose TVMScript has the median length.",
+    )
+    args.add_argument("--min-build-secs", type=float, default=0.2)
+    args.add_argument(
+        "--run-repeats",
+        type=int,
+        default=100,
+        help="The number of runs of a candidate per measurement, i.e. number * repeat.",
+    )
+    args.add_argument("--run-overhead-secs", type=float, default=0.05)
+    args.add_argument("--alpha", type=float, default=0.2)
+    args.add_argument("--window-size", type=int, default=3)
+    args.add_argument("--decay", type=float, default=0.5)
+    args.add_argument("--seed", type=int, default=0)
+    return args.parse_args()
+
+
+ARGS = _parse_args()
+
+
+class SimTask:
+    """A task replaying its recorded trials"""
+
+    def __init__(self, name: str, run_secs: np.ndarray, build_secs: float) -> None:
+        self.name = name
+        self.run_secs = run_secs
+        self.build_secs = build_secs
+        self.num_trials = 0
+        self.best_history: List[float] = []
+
+    @property
+    def is_terminated(self) -> bool:
+        return self.num_trials >= len(self.run_secs)
+
+    @property
+    def best(self) -> float:
+        return self.best_history[-1] if self.best_history else float(np.max(self.run_secs))
+
+    def tune_round(self) -> float:
+        """Measure the next round of trials, and return its wall-clock cost"""
+        trials = self.run_secs[self.num_trials : self.num_trials + ARGS.trials_per_iter]
+        self.num_trials += len(trials)
+        best = float(np.min(trials))
+        self.best_history.append(min(best, self.best) if self.best_history else best)
+        run_secs = trials * ARGS.run_repeats + ARGS.run_overhead_secs
+        return float(len(trials) * self.build_secs + np.sum(run_secs))
+
+
+def _load_tasks() -> List[SimTask]:
+    records: Dict[str, list] = {}
+    for work_dir in ARGS.work_dirs:
+        database = ms.database.JSONDatabase(work_dir=work_dir)
+        for record in database.get_all_tuning_records():
+            if record.run_secs:
+                records.setdefault(shash2hex(record.workload.mod), []).append(record)
+    rng = np.random.default_rng(ARGS.seed)
+    script_lens = {
+        shash: len(task_records[0].workload.mod.script()) for shash, task_records in records.items()
+    }
+    median_len = float(np.median(list(script_lens.values())))
+    tasks = []
+    for shash, task_records in sorted(records.items()):
+        run_secs = np.array([np.mean([float(s) for s in r.run_secs]) for r in task_records])
+        build_secs = max(ARGS.min_build_secs, ARGS.build_secs * script_lens[shash] / median_len)
+        tasks.append(SimTask(shash[:16], rng.permutation(run_secs), build_secs))
+    return tasks
+
+
+def _gradient(task: SimTask) -> float:
+    hist = task.best_history
+    n, w = len(hist), ARGS.window_size
+    if n == 0:
+        return float("inf")
+    g1 = (hist[n - 1 - w] - hist[-1]) / w if n >= 1 + w else 0.0
+    return ARGS.alpha * g1 + (1 - ARGS.alpha) * hist[-1] / n
+
+
+def _round_robin(tasks: List[SimTask], _: Dict[int, float]) -> Callable[[int], float]:
+    return lambda i: -tasks[i].num_trials
+
+
+def _gradient_based(tasks: List[SimTask], _: Dict[int, float]) -> Callable[[int], float]:
+    return lambda i: _gradient(tasks[i])
+
+
+def _time_aware(tasks: List[SimTask], round_secs: Dict[int, float]) -> Callable[[int], float]:
+    default_secs = float(np.mean(list(round_secs.values()))) if round_secs else 1.0
+    return lambda i: _gradient(tasks[i]) / max(round_secs.get(i, default_secs), 1e-3)
+
+
+POLICIES = {
+    "round-robin": _round_robin,
+    "gradient": _gradient_based,
+    "time-aware": _time_aware,
+}
+
+
+def simulate(policy: Callable, checkpoints: List[float]) -> List[float]:
+    """Tune the tasks with a policy, and return the end-to-end latency at each checkpoint"""
+    tasks = _load_tasks()
+    round_secs: Dict[int, float] = {}
+    elapsed = 0.0
+    results = []
+
+    def latency() -> float:
+        return sum(task.best for task in tasks)
+
+    while len(results) < len(checkpoints):
+        alive = [i for i, task in enumerate(tasks) if not task.is_terminated]
+        if not alive:
+            break
+        score = policy(tasks, round_secs)
+        task_id = max(alive, key=lambda i: (score(i), -i))
+        secs = tasks[task_id].tune_round()
+        while len(results) < len(checkpoints) and elapsed + secs > checkpoints[len(results)]:
+            results.append(latency())
+        elapsed += secs
+        last = round_secs.get(task_id)
+        round_secs[task_id] = secs if last is None else ARGS.decay * last + (1 - ARGS.decay) * secs
+    results += [latency()] * (len(checkpoints) - len(results))
+    return results
+
+
+def main():
+    tasks = _load_tasks()
+    print(f"Simulating {len(tasks)} tasks of {sum(len(t.run_secs) for t in tasks)} trials")
+    fractions = [0.1, 0.25, 0.5, 0.75, 1.0]
+    checkpoints = [ARGS.budget_secs * f for f in fractions]
+    print("Policy".ljust(12) + "".join(f"{f * 100:>10.0f}%" for f in fractions))
+    for name, policy in POLICIES.items():
+        results = simulate(policy, checkpoints)
+        print(name.ljust(12) + "".join(f"{r * 1e3:>10.3f}ms" for r in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=missing-docstring
+"""Benchmark the trials saved by pre-training the XGBModel on other models' tuning records.
+
+The input is a result directory of `distributed_measure_candidates.py`, i.e. one sub-directory
+per model with the measured candidates of each of its tasks. Each model is held out in turn:
+the global model is pre-trained on the records of all the other models, then tuning of each
+held-out task is replayed on its measured candidates, cold and pre-trained, counting the trials
+until a candidate within the tolerance of the best known latency is found.
+
+Example:
+    python -m tvm.meta_schedule.testing.bench_transfer_learning \
+        --result_cache_dir /path/to/results --target "nvidia/nvidia-v100"
+"""
+import argparse
+import glob
+import os
+import tempfile
+from typing import List
+
+import numpy as np  # type: ignore
+
+from tvm import meta_schedule as ms
+from tvm.target import Target
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--result_cache_dir", type=str, help="Please provide the full path to the result database."
+    )
+    parser.add_argument(
+        "--target",
+        type=str,
+        default="nvidia/nvidia-v100",
+        help="Please specify the target hardware the results are measured on.",
+    )
+    parser.add_argument(
+        "--batch_size",
+        type=int,
+        default=64,
+        help="The number of candidates measured in each round of the replayed tuning.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.05,
+        help="The relative slowdown over the best known latency that counts as reached.",
+    )
+    parser.add_argument(
+        "--num_warmup_samples",
+        type=int,
+        default=100,
+        help="The number of warmup samples of the cold model.",
+    )
+    return parser.parse_args()
+
+
+ARGS = _parse_args()
+
+
+def _load_records(model_dir: str) -> List[List[ms.database.TuningRecord]]:
+    tasks = []
+    for workload_path in sorted(glob.glob(os.path.join(model_dir, "*_workload.json"))):
+        database = ms.database.JSONDatabase(
+            path_workload=workload_path,
+            path_tuning_record=workload_path.replace("_workload.json", "_candidates.json"),
+        )
+        records = [r for r in database.get_all_tuning_records() if r.run_secs]
+        if records:
+            tasks.append(records)
+    return tasks
+
+
+def _trials_to_reach(model: ms.cost_model.XGBModel, records: List[ms.database.TuningRecord]):
+    costs = np.array([np.median([float(s) for s in r.run_secs]) for r in records])
+    goal = costs.min() * (1 + ARGS.tolerance)
+    context = ms.TuneContext(mod=records[0].workload.mod, target=Target(ARGS.target))
+    candidates = [r.as_measure_candidate() for r in records]
+    remaining = np.arange(len(records))
+    trials = 0
+    while remaining.size:
+        scores = model.predict(context, [candidates[i] for i in remaining])
+        picked = remaining[np.argsort(-scores, kind="stable")[: ARGS.batch_size]]
+        reached = np.flatnonzero(costs[picked] <= goal)
+        if reached.size:
+            return trials + int(reached[0]) + 1
+        model.update(
+            context,
+            [candidates[i] for i in picked],
+            [ms.runner.RunnerResult(run_secs=records[i].run_secs, error_msg=None) for i in picked],
+        )
+        trials += len(picked)
+        remaining = np.setdiff1d(remaining, picked)
+    return trials
+
+
+def main():
+    model_dirs = sorted(glob.glob(os.path.join(ARGS.result_cache_dir, "*")))
+    all_tasks = {model_dir: _load_records(model_dir) for model_dir in model_dirs}
+    cold_total, warm_total = 0, 0
+    with tempfile.TemporaryDirectory() as work_dir:
+        for model_dir, tasks in all_tasks.items():
+            model_name = os.path.basename(model_dir)
+            database = ms.database.MemoryDatabase()
+            for other_dir, other_tasks in all_tasks.items():
+                if other_dir == model_dir:
+                    continue
+                for records in other_tasks:
+                    workload = database.commit_workload(records[0].workload.mod)
+                    for record in records:
+                        database.commit_tuning_record(
+                            ms.database.TuningRecord(
+                                trace=record.trace,
+                                workload=workload,
+                                run_secs=record.run_secs,
+                                target=record.target,
+                            )
+                        )
+            pretrained = ms.cost_model.XGBModel()
+            num_records = pretrained.pretrain(database, target=Target(ARGS.target))
+            pretrained_path = os.path.join(work_dir, f"{model_name}.tar")
+            pretrained.save(pretrained_path)
+            cold, warm = 0, 0
+            for records in tasks:
+                cold += _trials_to_reach(
+                    ms.cost_model.XGBModel(num_warmup_samples=ARGS.num_warmup_samples), records
+                )
+                model = ms.cost_model.XGBModel()
+                model.load(pretrained_path)
+                warm += _trials_to_reach(model, records)
+            print(
+                f"{model_name}: {len(tasks)} tasks, pre-trained on {num_records} records, "
+                f"trials to reach best latency: cold {cold}, pre-trained {warm}, "
+                f"saved {cold - warm} ({(cold - warm) / max(cold, 1) * 100:.1f}%)"
+            )
+            cold_total += cold
+            warm_total += warm
+    print(
+        f"Total trials: cold {cold_total}, pre-trained {warm_total}, "
+        f"saved {(cold_total - warm_total) / max(cold_total, 1) * 100:.1f}%"
+    )
+
+
+if __name__ == "__main__":
+    main()
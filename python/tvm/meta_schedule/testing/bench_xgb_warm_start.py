@@ -0,0 +1,90 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=missing-docstring
+"""Benchmark the per-round training time of the XGBModel, retraining from scratch vs. warm start.
+
+The features are random, so the numbers show the training overhead only, not the model quality.
+
+Example:
+    python -m tvm.meta_schedule.testing.bench_xgb_warm_start --num-rounds 40 --batch-size 64
+"""
+import argparse
+import time
+
+import numpy as np
+
+import tvm
+from tvm import meta_schedule as ms
+from tvm.meta_schedule.testing.te_workload import create_te_workload
+from tvm.tir import Schedule
+
+
+def _parse_args():
+    args = argparse.ArgumentParser()
+    args.add_argument("--num-rounds", type=int, default=32)
+    args.add_argument("--batch-size", type=int, default=64)
+    args.add_argument("--feature-size", type=int, default=164)
+    args.add_argument("--full-refit-interval", type=int, default=5)
+    args.add_argument("--max-data-size", type=int, default=1024)
+    return args.parse_args()
+
+
+ARGS = _parse_args()
+
+
+def _curve(**kwargs):
+    model = ms.cost_model.XGBModel(
+        extractor=ms.feature_extractor.RandomFeatureExtractor(feature_size=ARGS.feature_size),
+        adaptive_training=False,
+        **kwargs,
+    )
+    context = ms.TuneContext(mod=tvm.IRModule({"main": create_te_workload("GMM", 0)}))
+    candidate = ms.MeasureCandidate(Schedule(context.mod), [])
+    elapsed = []
+    for _ in range(ARGS.num_rounds):
+        results = [
+            ms.runner.RunnerResult(list(np.random.rand(3) + 1e-6), None)
+            for _ in range(ARGS.batch_size)
+        ]
+        tic = time.time()
+        model.update(context, [candidate] * ARGS.batch_size, results)
+        elapsed.append(time.time() - tic)
+    return elapsed
+
+
+def main():
+    curves = {
+        "from scratch": _curve(),
+        "warm start": _curve(warm_start=True, full_refit_interval=ARGS.full_refit_interval),
+        "warm start + bounded": _curve(
+            warm_start=True,
+            full_refit_interval=ARGS.full_refit_interval,
+            max_data_size=ARGS.max_data_size,
+        ),
+    }
+    print("round\tsamples\t" + "\t".join(curves))
+    for i in range(ARGS.num_rounds):
+        row = "\t".join(f"{curve[i] * 1000:.1f}" for curve in curves.values())
+        print(f"{i}\t{(i + 1) * ARGS.batch_size}\t{row}")
+    print("total\t\t" + "\t".join(f"{sum(curve) * 1000:.1f}" for curve in curves.values()))
+
+
+if __name__ == "__main__":
+    main()
@@ -54,6 +54,13 @@ def _parse_args():
         default="p3.2xlarge",
         help="Please provide the key for the rpc servers.",
     )
+    parser.add_argument(
+        "--rpc_servers",
+        type=str,
+        default=None,
+        help="The comma separated host:port of RPC servers started without tracker. If given, "
+        "the candidates are dispatched over them with retries instead of through the tracker.",
+    )
     parser.add_argument(
         "--builder_timeout_sec",
         type=int,
@@ -158,21 +165,29 @@ args = _parse_args()  # pylint: disable=invalid-name
 
 def main():
     builder = ms.builder.LocalBuilder(timeout_sec=args.builder_timeout_sec)
-    runner = ms.runner.RPCRunner(
-        rpc_config=ms.runner.RPCConfig(
-            tracker_host=args.rpc_host,
-            tracker_port=args.rpc_port,
-            tracker_key=args.rpc_key,
-            session_timeout_sec=args.runner_timeout_sec,
-        ),
-        evaluator_config=ms.runner.EvaluatorConfig(
-            number=3,
-            repeat=1,
-            min_repeat_ms=args.min_repeat_ms,
-            enable_cpu_cache_flush=args.cpu_flush,
-        ),
-        max_workers=os.cpu_count(),
+    evaluator_config = ms.runner.EvaluatorConfig(
+        number=3,
+        repeat=1,
+        min_repeat_ms=args.min_repeat_ms,
+        enable_cpu_cache_flush=args.cpu_flush,
     )
+    if args.rpc_servers:
+        runner = ms.runner.RPCDispatchRunner(
+            servers=args.rpc_servers.split(","),
+            evaluator_config=evaluator_config,
+            timeout_sec=args.runner_timeout_sec,
+        )
+    else:
+        runner = ms.runner.RPCRunner(
+            rpc_config=ms.runner.RPCConfig(
+                tracker_host=args.rpc_host,
+                tracker_port=args.rpc_port,
+                tracker_key=args.rpc_key,
+                session_timeout_sec=args.runner_timeout_sec,
+            ),
+            evaluator_config=evaluator_config,
+            max_workers=os.cpu_count(),
+        )
     if not os.path.isdir(args.candidate_cache_dir):
         raise Exception("Please provide a correct candidate cache dir.")
     try:
@@ -180,21 +195,25 @@ def main():
     except OSError:
         print(f"Directory {args.result_cache_dir} cannot be created successfully.")
     model_dirs = glob.glob(os.path.join(args.candidate_cache_dir, "*"))
-    for model_dir in model_dirs:
-        model_name = model_dir.split("/")[-1]
-        os.makedirs(os.path.join(args.result_cache_dir, model_name), exist_ok=True)
-        all_tasks = glob.glob(os.path.join(model_dir, "*.json"))
-        workload_paths = []
-        for path in all_tasks:
-            if path.endswith("_workload.json"):
-                workload_paths.append(path)
-        for workload_path in tqdm(workload_paths):
-            candidate_path = workload_path.replace("_workload.json", "_candidates.json")
-            database = ms.database.JSONDatabase(
-                path_workload=workload_path,
-                path_tuning_record=candidate_path,
-            )
-            measure_candidates(database, builder, runner)
+    try:
+        for model_dir in model_dirs:
+            model_name = model_dir.split("/")[-1]
+            os.makedirs(os.path.join(args.result_cache_dir, model_name), exist_ok=True)
+            all_tasks = glob.glob(os.path.join(model_dir, "*.json"))
+            workload_paths = []
+            for path in all_tasks:
+                if path.endswith("_workload.json"):
+                    workload_paths.append(path)
+            for workload_path in tqdm(workload_paths):
+                candidate_path = workload_path.replace("_workload.json", "_candidates.json")
+                database = ms.database.JSONDatabase(
+                    path_workload=workload_path,
+                    path_tuning_record=candidate_path,
+                )
+                measure_candidates(database, builder, runner)
+    finally:
+        if isinstance(runner, ms.runner.RPCDispatchRunner):
+            runner.close()
 
 
 if __name__ == "__main__":
@@ -61,6 +61,8 @@ def tune_tir(  # pylint: disable=too-many-locals
     seed: Optional[int] = None,
     module_equality: str = "structural",
     special_space: Optional[Mapping[str, SpaceGenerator.SpaceGeneratorType]] = None,
+    checkpoint_interval: Optional[float] = None,
+    resume: bool = False,
 ) -> Database:
     """Tune a TIR function or an IRModule of TIR functions.
 
@@ -102,6 +104,10 @@ def tune_tir(  # pylint: disable=too-many-locals
         A string to specify the module equality testing and hashing method.
     special_space : Optional[Mapping[str, SpaceGenerator.SpaceGeneratorType]]
         A mapping from task name to a special space generator for that task.
+    checkpoint_interval : Optional[float]
+        If not None, the minimum time between two checkpoints of the session, in seconds.
+    resume : bool
+        Whether to resume the session from its last checkpoint in the working directory.
 
     Returns
     -------
@@ -157,6 +163,8 @@ def tune_tir(  # pylint: disable=too-many-locals
         measure_callbacks=measure_callbacks,
         task_scheduler=task_scheduler,
         module_equality=module_equality,
+        checkpoint_interval=checkpoint_interval,
+        resume=resume,
     )
 
 
@@ -18,16 +18,20 @@
 # specific language governing permissions and limitations
 # under the License.
 """The core tuning API"""
+import os
 from typing import List, Optional
 
 from .builder import Builder
 from .cost_model import CostModel
 from .database import Database
-from .measure_callback import MeasureCallback
+from .logging import get_logger
+from .measure_callback import MeasureCallback, SaveCheckpoint, load_checkpoint
 from .runner import Runner
 from .task_scheduler import TaskScheduler
 from .tune_context import TuneContext
 
+logger = get_logger(__name__)  # pylint: disable=invalid-name
+
 
 def tune_tasks(
     *,
@@ -44,6 +48,8 @@ def tune_tasks(
     measure_callbacks: MeasureCallback.CallbackListType = "default",
     task_scheduler: TaskScheduler.TaskSchedulerType = "gradient",
     module_equality: str = "structural",
+    checkpoint_interval: Optional[float] = None,
+    resume: bool = False,
 ) -> Database:
     """Tune a list of tasks. Using a task scheduler.
 
@@ -84,6 +90,14 @@ def tune_tasks(
                 a given module. The "ignore-ndarray" varint is used for the extracted blocks or in
                 case no anchor block is found. For the definition of the anchor block, see
                 tir/analysis/analysis.py.
+    checkpoint_interval : Optional[float]
+        If not None, the minimum time between two checkpoints of the session, in seconds. The
+        checkpoints are saved in the "checkpoint" subdirectory of the working directory, and a
+        last one when the session completes.
+    resume : bool
+        Whether to resume the session from its last checkpoint, if any: the finished tasks are
+        skipped, the budgets are reduced by the trials already measured, and the cost model is
+        restored from its snapshot. It requires a persistent database.
 
     Returns
     -------
@@ -98,16 +112,31 @@ def tune_tasks(
             f"Length of tasks ({len(tasks)}) and task_weights ({len(task_weights)}) do not match."
         )
 
+    checkpoint_dir = os.path.join(work_dir, "checkpoint")
+    checkpoint = load_checkpoint(checkpoint_dir) if resume else None
+    if resume and checkpoint is None:
+        logger.info("No checkpoint found in %s, starting from scratch", checkpoint_dir)
+
     num_cores = tasks[0].num_threads
 
     if max_trials_per_task is None:
         max_trials_per_task = max_trials_global
     if not isinstance(builder, Builder):
         builder = Builder.create(builder, max_workers=num_cores)
+    close_runner = None
     if not isinstance(runner, Runner):
         runner = Runner.create(runner, max_workers=num_cores)
+        # The resources of a runner created here, e.g. the serving threads of an
+        # RPCDispatchRunner, are released once the session is over
+        close_runner = getattr(runner, "close", None)
     if database == "json":
         database = Database.create(database, work_dir=work_dir, module_equality=module_equality)
+    elif database == "sharded":
+        database = Database.create(
+            database,
+            work_dir=os.path.join(work_dir, "database_shards"),
+            module_equality=module_equality,
+        )
     elif not isinstance(database, Database):
         database = Database.create(database, module_equality=module_equality)
     if not isinstance(cost_model, CostModel):
@@ -118,16 +147,42 @@ def tune_tasks(
         measure_callbacks = MeasureCallback.create(measure_callbacks)
     if not isinstance(task_scheduler, TaskScheduler):
         task_scheduler = TaskScheduler.create(task_scheduler)
-    task_scheduler.tune(
-        tasks=tasks,
-        task_weights=task_weights,
-        max_trials_global=max_trials_global,
-        max_trials_per_task=max_trials_per_task,
-        num_trials_per_iter=num_trials_per_iter,
-        builder=builder,
-        runner=runner,
-        measure_callbacks=measure_callbacks,
-        database=database,
-        cost_model=cost_model,
-    )
+    if checkpoint is not None:
+        tasks, task_weights, max_trials_global, max_trials_per_task = checkpoint.remaining(
+            tasks, task_weights, max_trials_global, max_trials_per_task
+        )
+        logger.info(
+            "Resuming from a checkpoint of %d trials, %d task(s) left",
+            checkpoint.num_trials,
+            len(tasks),
+        )
+        if checkpoint.cost_model_path is not None:
+            cost_model.load(checkpoint.cost_model_path)
+        if not tasks or max_trials_global <= 0:
+            return database
+    save_checkpoint = None
+    if checkpoint_interval is not None:
+        save_checkpoint = SaveCheckpoint(
+            checkpoint_dir, checkpoint_interval, resume_from=checkpoint
+        )
+        measure_callbacks = list(measure_callbacks) + [save_checkpoint]
+    try:
+        task_scheduler.tune(
+            tasks=tasks,
+            task_weights=task_weights,
+            max_trials_global=max_trials_global,
+            max_trials_per_task=max_trials_per_task,
+            num_trials_per_iter=num_trials_per_iter,
+            builder=builder,
+            runner=runner,
+            measure_callbacks=measure_callbacks,
+            database=database,
+            cost_model=cost_model,
+        )
+    finally:
+        if close_runner is not None:
+            close_runner()
+    if save_checkpoint is not None:
+        # The trials since the last periodic checkpoint would be measured again on resumption
+        save_checkpoint.save(cost_model)
     return database
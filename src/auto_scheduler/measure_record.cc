@@ -30,6 +30,7 @@
 #include <tvm/auto_scheduler/measure_record.h>
 #include <tvm/auto_scheduler/transform_step.h>
 #include <tvm/runtime/registry.h>
+#include <tvm/support/parallel_for.h>
 
 #include <fstream>
 #include <sstream>
@@ -382,6 +383,40 @@ bool RecordReaderNode::ReadNext(MeasureInputNode* inp, MeasureResultNode* res) {
   return false;
 }
 
+std::pair<Array<MeasureInput>, Array<MeasureResult>> ReadMeasureRecordsInRange(
+    const std::string& filename, int64_t begin, int64_t end, int num_threads) {
+  std::ifstream infile(filename, std::ifstream::in | std::ifstream::binary);
+  ICHECK(infile.good()) << "ValueError: Cannot open the file to read: " << filename;
+  // A range owns the lines that start inside it, so skip the tail of the line started before.
+  if (begin > 0) {
+    infile.seekg(begin - 1);
+    if (infile.get() != '\n') {
+      std::string partial;
+      std::getline(infile, partial);
+    }
+  }
+  std::vector<std::string> lines;
+  std::string line;
+  while (static_cast<int64_t>(infile.tellg()) < end && std::getline(infile, line)) {
+    if (!line.empty() && line[0] != '#' && line[0] != ' ') {
+      // skip empty lines and comment lines begin with '#' or ' '
+      lines.push_back(std::move(line));
+    }
+  }
+  int n = lines.size();
+  std::vector<MeasureInput> inputs(n, MeasureInput{nullptr});
+  std::vector<MeasureResult> results(n, MeasureResult{nullptr});
+  support::parallel_for_dynamic(0, n, num_threads, [&](int thread_id, int task_id) {
+    auto inp = make_object<MeasureInputNode>();
+    auto res = make_object<MeasureResultNode>();
+    std::string log_version;
+    ReadMeasureRecord(lines[task_id], inp.get(), res.get(), &log_version);
+    inputs[task_id] = MeasureInput(inp);
+    results[task_id] = MeasureResult(res);
+  });
+  return std::make_pair(Array<MeasureInput>(inputs), Array<MeasureResult>(results));
+}
+
 std::pair<Array<MeasureInput>, Array<MeasureResult>> RecordReaderNode::ReadLines(int max_size,
                                                                                  int skip_size) {
   auto inp = make_object<MeasureInputNode>();
@@ -430,6 +465,12 @@ TVM_REGISTER_GLOBAL("auto_scheduler.RecordReaderReadNext").set_body_typed([](Rec
   }
 });
 
+TVM_REGISTER_GLOBAL("auto_scheduler.ReadMeasureRecordsInRange")
+    .set_body_typed([](String filename, int64_t begin, int64_t end, int num_threads) {
+      const auto& res = ReadMeasureRecordsInRange(filename, begin, end, num_threads);
+      return Array<ObjectRef>{res.first, res.second};
+    });
+
 TVM_REGISTER_GLOBAL("auto_scheduler.ReadMeasureRecord").set_body_typed([](const std::string& str) {
   auto inp = make_object<MeasureInputNode>();
   auto res = make_object<MeasureResultNode>();
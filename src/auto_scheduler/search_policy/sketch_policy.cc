@@ -244,11 +244,21 @@ State SketchPolicyNode::Search(int n_trials, int early_stopping, int num_measure
 
 std::pair<Array<MeasureInput>, Array<MeasureResult>> SketchPolicyNode::ContinueSearchOneRound(
     int num_measure, ProgramMeasurer measurer) {
+  Array<MeasureInput> inputs = GenerateOneRound(num_measure);
+
+  // Measure candidate states
+  PrintTitle("Measure", verbose);
+  Array<MeasureResult> results = measurer->Measure(search_task, GetRef<SearchPolicy>(this), inputs);
+
+  UpdateOneRound(inputs, results);
+
+  return std::make_pair(std::move(inputs), std::move(results));
+}
+
+Array<MeasureInput> SketchPolicyNode::GenerateOneRound(int num_measure) {
   num_measure_per_iter_ = num_measure;
 
   Array<State> best_states, random_states;
-  Array<MeasureInput> inputs;
-  Array<MeasureResult> results;
   int num_random = static_cast<int>(GetDoubleParam(params, "eps_greedy") * num_measure);
 
   // Search one round to get promising states
@@ -261,12 +271,11 @@ std::pair<Array<MeasureInput>, Array<MeasureResult>> SketchPolicyNode::ContinueS
 
   // Pick `num_measure_per_iter` states to measure, check hash to remove already measured state
   // Also pick some random states to do eps-greedy
-  inputs = PickStatesWithEpsGreedy(best_states, random_states, num_measure);
-
-  // Measure candidate states
-  PrintTitle("Measure", verbose);
-  results = measurer->Measure(search_task, GetRef<SearchPolicy>(this), inputs);
+  return PickStatesWithEpsGreedy(best_states, random_states, num_measure);
+}
 
+void SketchPolicyNode::UpdateOneRound(const Array<MeasureInput>& inputs,
+                                      const Array<MeasureResult>& results) {
   // Update measured states throughputs. These states will join the EvolutionarySearch in later
   // search rounds.
   for (const auto& res : results) {
@@ -280,8 +289,6 @@ std::pair<Array<MeasureInput>, Array<MeasureResult>> SketchPolicyNode::ContinueS
   program_cost_model->Update(inputs, results);
 
   PrintTimeElapsed(t_begin, "training", verbose);
-
-  return std::make_pair(std::move(inputs), std::move(results));
 }
 
 Array<State> SketchPolicyNode::SearchOneRound(int num_random_states, Array<State>* random_states) {
@@ -701,6 +708,15 @@ TVM_REGISTER_GLOBAL("auto_scheduler.SketchPolicy")
       return SketchPolicy(task, program_cost_model, params, seed, verbose, init_search_callbacks);
     });
 
+TVM_REGISTER_GLOBAL("auto_scheduler.SketchPolicyGenerateOneRound")
+    .set_body_typed([](SketchPolicy policy, int num_measure) {
+      return policy->GenerateOneRound(num_measure);
+    });
+
+TVM_REGISTER_GLOBAL("auto_scheduler.SketchPolicyUpdateOneRound")
+    .set_body_typed([](SketchPolicy policy, Array<MeasureInput> inputs,
+                       Array<MeasureResult> results) { policy->UpdateOneRound(inputs, results); });
+
 TVM_REGISTER_GLOBAL("auto_scheduler.SketchPolicyGenerateSketches")
     .set_body_typed([](SketchPolicy policy) { return policy->GenerateSketches(); });
 
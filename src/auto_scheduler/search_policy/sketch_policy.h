@@ -120,6 +120,23 @@ class SketchPolicyNode : public SearchPolicyNode {
   std::pair<Array<MeasureInput>, Array<MeasureResult>> ContinueSearchOneRound(
       int num_measure, ProgramMeasurer measurer) final;
 
+  /*!
+   * \brief Search one round and pick the states to measure in it, without measuring them.
+   * The first half of `ContinueSearchOneRound`, so the caller can measure the picked states
+   * while the next round is searched, e.g. the one of another task.
+   * \param num_measure The number of states to pick.
+   * \return The measure inputs of the picked states.
+   */
+  Array<MeasureInput> GenerateOneRound(int num_measure);
+
+  /*!
+   * \brief Learn from the measurement of the states picked by a call to `GenerateOneRound`.
+   * The rounds must be updated in the order they were generated in.
+   * \param inputs The measure inputs returned by `GenerateOneRound`.
+   * \param results The measure results of the inputs.
+   */
+  void UpdateOneRound(const Array<MeasureInput>& inputs, const Array<MeasureResult>& results);
+
   /*!
    * \brief Generate sketches.
    * \return The generated sketches(states).
@@ -24,6 +24,55 @@
 namespace tvm {
 namespace meta_schedule {
 
+Array<tvm::runtime::NDArray> FeatureExtractorNode::ExtractFromBatched(
+    const TuneContext& context, const Array<MeasureCandidate>& candidates) {
+  using runtime::NDArray;
+  Array<NDArray> features = this->ExtractFrom(context, candidates);
+  int n = features.size();
+  ICHECK_EQ(n, candidates.size()) << "ValueError: Expect one feature ndarray per candidate";
+  // Step 1. Compute the offset of each candidate in the packed buffer
+  std::vector<int64_t> offsets(n + 1, 0);
+  int64_t dim = -1;
+  for (int i = 0; i < n; ++i) {
+    const NDArray& feature = features[i];
+    ICHECK_EQ(feature->ndim, 2) << "ValueError: Expect 2-dimensional features, but gets: "
+                                << feature->ndim;
+    ICHECK(feature->dtype.code == kDLFloat &&
+           (feature->dtype.bits == 32 || feature->dtype.bits == 64))
+        << "TypeError: Expect float32 or float64 features, but gets: " << feature.DataType();
+    ICHECK(feature.IsContiguous()) << "ValueError: Expect contiguous features";
+    if (dim == -1) {
+      dim = feature->shape[1];
+    } else {
+      ICHECK_EQ(dim, feature->shape[1]) << "ValueError: Inconsistent feature length";
+    }
+    offsets[i + 1] = offsets[i] + feature->shape[0];
+  }
+  // Step 2. Convert and copy the features of each candidate in parallel
+  DLDevice cpu{kDLCPU, 0};
+  NDArray packed = NDArray::Empty({offsets[n], std::max<int64_t>(dim, 0)},
+                                  DLDataType{kDLFloat, 32, 1}, cpu);
+  NDArray ids = NDArray::Empty({offsets[n]}, DLDataType{kDLInt, 64, 1}, cpu);
+  float* packed_data = static_cast<float*>(packed->data);
+  int64_t* ids_data = static_cast<int64_t*>(ids->data);
+  auto f_copy = [&](int thread_id, int task_id) -> void {
+    const NDArray& feature = features[task_id];
+    const char* src = static_cast<const char*>(feature->data) + feature->byte_offset;
+    int64_t size = (offsets[task_id + 1] - offsets[task_id]) * dim;
+    float* dst = packed_data + offsets[task_id] * dim;
+    if (feature->dtype.bits == 32) {
+      std::copy_n(reinterpret_cast<const float*>(src), size, dst);
+    } else {
+      std::transform(reinterpret_cast<const double*>(src),
+                     reinterpret_cast<const double*>(src) + size, dst,
+                     [](double x) { return static_cast<float>(x); });
+    }
+    std::fill(ids_data + offsets[task_id], ids_data + offsets[task_id + 1], task_id);
+  };
+  support::parallel_for_dynamic(0, n, std::max(context->num_threads, 1), f_copy);
+  return {packed, ids};
+}
+
 Array<tvm::runtime::NDArray> PyFeatureExtractorNode::ExtractFrom(
     const TuneContext& context, const Array<MeasureCandidate>& candidates) {
   ICHECK(f_extract_from != nullptr) << "PyFeatureExtractor's ExtractFrom method not implemented!";
@@ -53,6 +102,8 @@ TVM_REGISTER_NODE_TYPE(PyFeatureExtractorNode);
 
 TVM_REGISTER_GLOBAL("meta_schedule.FeatureExtractorExtractFrom")
     .set_body_method<FeatureExtractor>(&FeatureExtractorNode::ExtractFrom);
+TVM_REGISTER_GLOBAL("meta_schedule.FeatureExtractorExtractFromBatched")
+    .set_body_method<FeatureExtractor>(&FeatureExtractorNode::ExtractFromBatched);
 TVM_REGISTER_GLOBAL("meta_schedule.FeatureExtractorPyFeatureExtractor")
     .set_body_typed(FeatureExtractor::PyFeatureExtractor);
 
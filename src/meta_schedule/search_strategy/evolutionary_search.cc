@@ -266,9 +266,9 @@ class EvolutionarySearchNode : public SearchStrategyNode {
     /*! \brief Pre thread data including module to be tuned and random state. */
     std::vector<PerThreadData> per_thread_data_;
     /*!
-     * \brief The workloads that are already measured.
-     * TODO(junrushao1994): add records from the database to avoid re-measuring.
-     * */
+     * \brief The workloads that are already measured, including the ones of the records found in
+     * the database when the search starts, e.g. by a tuning session resumed from a checkpoint.
+     */
     IRModuleSet measured_workloads_;
     /*! \brief A Database for selecting useful candidates. */
     Database database_{nullptr};
@@ -300,6 +300,14 @@ class EvolutionarySearchNode : public SearchStrategyNode {
       this->database_ = database;
       this->cost_model_ = cost_model;
       this->token_ = database->CommitWorkload(mod);
+      // Do not measure again the schedules already in the database
+      for (const Schedule& sch : PickBestFromDatabase(max_trials)) {
+        IRModule measured = sch->mod();
+        size_t shash = ModuleHash(measured);
+        if (!measured_workloads_.Has(measured, shash)) {
+          measured_workloads_.Add(measured, shash);
+        }
+      }
     }
 
     /*!
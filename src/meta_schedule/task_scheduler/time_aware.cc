@@ -0,0 +1,225 @@
+// SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+//
+// SPDX-License-Identifier: Apache-2.0
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#include <chrono>
+
+#include "../utils.h"
+
+namespace tvm {
+namespace meta_schedule {
+
+/*!
+ * \brief The measurement-time-aware task scheduler. Like the gradient based one, it estimates
+ * the latency reduction of a round of each task from its history of best latencies, but divides
+ * it by the wall-clock cost of a round of the task, i.e. the time spent generating and building
+ * its candidates, plus the time spent waiting for their measurement, so that it picks the task
+ * with the largest expected latency reduction per second of tuning.
+ */
+class TimeAwareNode final : public TaskSchedulerNode {
+ public:
+  using Clock = std::chrono::high_resolution_clock;
+
+  double alpha;
+  int window_size;
+  double decay;
+  /*! \brief The function returning the current time in seconds, or null for the wall clock. */
+  PackedFunc clock;
+  support::LinearCongruentialEngine::TRandState rand_state;
+
+  int round_robin_rounds_;
+  std::vector<std::vector<double>> best_latency_history_;
+  /*! \brief The moving average of the wall-clock cost of a round of each task, in seconds. */
+  std::vector<double> round_secs_;
+  /*! \brief The wall-clock time spent so far on the running round of each task, in seconds. */
+  std::vector<double> pending_secs_;
+  /*! \brief The task returned by the last call to `NextTaskId`, or -1. */
+  int last_task_id_;
+  /*! \brief The time the last call to `NextTaskId` returned, in seconds. */
+  double last_pick_time_;
+
+  void VisitAttrs(tvm::AttrVisitor* v) {
+    TaskSchedulerNode::VisitAttrs(v);
+    v->Visit("alpha", &alpha);
+    v->Visit("window_size", &window_size);
+    v->Visit("decay", &decay);
+    // `clock` is not visited.
+    // `rand_state` is not visited.
+    // `round_robin_rounds_` is not visited.
+    // `best_latency_history_` is not visited.
+    // `round_secs_` is not visited.
+    // `pending_secs_` is not visited.
+    // `last_task_id_` is not visited.
+    // `last_pick_time_` is not visited.
+  }
+
+  static constexpr const char* _type_key = "meta_schedule.TimeAware";
+  TVM_DECLARE_FINAL_OBJECT_INFO(TimeAwareNode, TaskSchedulerNode);
+
+ public:
+  void Tune(Array<TuneContext> tasks, Array<FloatImm> task_weights, int max_trials_global,
+            int max_trials_per_task, int num_trials_per_iter, Builder builder, Runner runner,
+            Array<MeasureCallback> measure_callbacks, Optional<Database> database,
+            Optional<CostModel> cost_model) final {
+    int n_tasks = tasks.size();
+    round_robin_rounds_ = 0;
+    best_latency_history_.assign(n_tasks, std::vector<double>());
+    round_secs_.assign(n_tasks, 0.0);
+    pending_secs_.assign(n_tasks, 0.0);
+    last_task_id_ = -1;
+    TaskSchedulerNode::Tune(tasks, task_weights, max_trials_global, max_trials_per_task,
+                            num_trials_per_iter, builder, runner, measure_callbacks, database,
+                            cost_model);
+  }
+
+  int NextTaskId() final {
+    int n_tasks = this->tasks_.size();
+    // Step 0. The time since the last call is spent on generating and building the candidates
+    // of the task returned then.
+    if (last_task_id_ != -1) {
+      pending_secs_.at(last_task_id_) += Now() - last_pick_time_;
+    }
+    int task_id = PickTask(n_tasks);
+    last_task_id_ = task_id;
+    last_pick_time_ = Now();
+    return task_id;
+  }
+
+  Array<RunnerResult> JoinRunningTask(int task_id) final {
+    double tik = Now();
+    Array<RunnerResult> results = TaskSchedulerNode::JoinRunningTask(task_id);
+    TaskRecordNode* task = this->tasks_[task_id].get();
+    if (task->latency_ms.size() > 0) {
+      this->best_latency_history_.at(task_id).push_back(
+          *std::min_element(task->latency_ms.begin(),  //
+                            task->latency_ms.end()));
+    }
+    // The round is over: fold its cost into the moving average
+    double secs = pending_secs_.at(task_id) + Now() - tik;
+    double& avg = round_secs_.at(task_id);
+    avg = avg > 0 ? decay * avg + (1 - decay) * secs : secs;
+    pending_secs_.at(task_id) = 0.0;
+    return results;
+  }
+
+ private:
+  double Now() const {
+    if (clock != nullptr) {
+      return clock();
+    }
+    return std::chrono::duration<double>(Clock::now().time_since_epoch()).count();
+  }
+
+  int PickTask(int n_tasks) {
+    // Step 1. Check if it's in round robin mode.
+    if (round_robin_rounds_ == 0) {
+      TVM_PY_LOG_CLEAR_SCREEN(this->logger);
+      this->PrintTuningStatistics();
+    }
+    if (round_robin_rounds_ < n_tasks) {
+      return round_robin_rounds_++;
+    }
+    if (round_robin_rounds_ == n_tasks) {
+      for (int i = 0; i < n_tasks; ++i) {
+        if (this->tasks_[i]->runner_futures.defined()) {
+          this->JoinRunningTask(i);
+        }
+      }
+      ++round_robin_rounds_;
+    }
+    // Step 2. Collect the tasks that are not terminated yet
+    std::vector<int> tasks_alive;
+    {
+      tasks_alive.reserve(n_tasks);
+      for (int i = 0; i < n_tasks; ++i) {
+        this->TouchTask(i);
+        if (!this->tasks_[i]->is_terminated) {
+          tasks_alive.push_back(i);
+        }
+      }
+      if (tasks_alive.empty()) {
+        return -1;
+      }
+    }
+    // Step 3. The tasks whose cost is not known yet are assumed to cost as much as the average
+    double known_secs = 0.0;
+    int num_known = 0;
+    for (int task_id : tasks_alive) {
+      if (round_secs_.at(task_id) > 0) {
+        known_secs += round_secs_.at(task_id);
+        ++num_known;
+      }
+    }
+    double default_secs = num_known > 0 ? known_secs / num_known : 1.0;
+    // Step 4. Calculate the latency reduction per second of each task alive
+    std::vector<double> grad;
+    grad.reserve(n_tasks);
+    for (int task_id : tasks_alive) {
+      const std::vector<double>& best_latency = this->best_latency_history_.at(task_id);
+      int n = best_latency.size();
+      double task_weight = this->tasks_[task_id]->task_weight;
+      int w = this->window_size;
+      if (n > 0 && best_latency[n - 1] < 1e9) {
+        double best = best_latency[n - 1];
+        double g1 = (n >= 1 + w) ? (best_latency[n - 1 - w] - best) / w : 0.0;
+        double g2 = best / n;
+        double g = alpha * g1 + (1 - alpha) * g2;
+        double secs = round_secs_.at(task_id) > 0 ? round_secs_.at(task_id) : default_secs;
+        grad.push_back(g * task_weight / std::max(secs, 1e-3));
+      } else {
+        // If the best time cost is unavailable, it means some task is not valid. Skip it.
+        grad.push_back(-1e9);
+      }
+    }
+    // Step 5. Select the task with the largest latency reduction per second
+    auto max_grad = std::max_element(grad.begin(), grad.end());
+    auto min_grad = std::min_element(grad.begin(), grad.end());
+    int task_id = -1;
+    if (*max_grad == *min_grad) {
+      task_id = tasks_alive[tir::SampleInt(&this->rand_state, 0, tasks_alive.size())];
+    } else {
+      task_id = tasks_alive[std::distance(grad.begin(), max_grad)];
+    }
+    if (this->tasks_[task_id]->runner_futures.defined()) {
+      JoinRunningTask(task_id);
+    }
+    return task_id;
+  }
+};
+
+TaskScheduler TaskScheduler::TimeAware(PackedFunc logger, double alpha, int window_size,
+                                       double decay, PackedFunc clock,
+                                       support::LinearCongruentialEngine::TRandState seed) {
+  ObjectPtr<TimeAwareNode> n = make_object<TimeAwareNode>();
+  n->logger = logger;
+  n->alpha = alpha;
+  n->window_size = window_size;
+  n->decay = decay;
+  n->clock = clock;
+  n->rand_state = support::LinearCongruentialEngine::NormalizeSeed(seed);
+  return TaskScheduler(n);
+}
+
+TVM_REGISTER_NODE_TYPE(TimeAwareNode);
+TVM_REGISTER_GLOBAL("meta_schedule.TaskSchedulerTimeAware")
+    .set_body_typed(TaskScheduler::TimeAware);
+
+}  // namespace meta_schedule
+}  // namespace tvm
@@ -0,0 +1,65 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Test the CPU partition between tuning builders and runners."""
+import os
+
+import pytest
+from tvm.contrib import cpu_affinity
+from tvm.contrib.popen_pool import PopenPoolExecutor
+
+
+def test_parse_cpu_list():
+    assert cpu_affinity.parse_cpu_list("0-3,8, 10-11") == [0, 1, 2, 3, 8, 10, 11]
+    assert cpu_affinity.parse_cpu_list("2,2,1") == [1, 2]
+    with pytest.raises(ValueError):
+        cpu_affinity.parse_cpu_list("3-1")
+
+
+def test_cpu_partition():
+    partition = cpu_affinity.CPUPartition.parse("0-5:6-7")
+    assert partition.builder_cpus == [0, 1, 2, 3, 4, 5]
+    assert partition.runner_cpus == [6, 7]
+    assert cpu_affinity.CPUPartition.parse(str(partition)) == partition
+    with pytest.raises(ValueError):
+        cpu_affinity.CPUPartition.parse("0-5:5-7")
+
+    partition = cpu_affinity.partition_cpus(num_runner_cpus=2, cpus=range(8))
+    assert partition.builder_cpus == [0, 1, 2, 3, 4, 5]
+    assert partition.runner_cpus == [6, 7]
+    # Not enough CPUs to split
+    partition = cpu_affinity.partition_cpus(num_runner_cpus=2, cpus=[0, 1])
+    assert partition.builder_cpus == partition.runner_cpus == [0, 1]
+
+
+def _get_affinity():
+    return sorted(os.sched_getaffinity(0)), os.environ.get("TVM_NUM_THREADS")
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="Linux only")
+def test_bound_initializer():
+    cpus = cpu_affinity.available_cpus()[-1:]
+    pool = PopenPoolExecutor(max_workers=1, initializer=cpu_affinity.bound_initializer(cpus))
+    assert pool.submit(_get_affinity).result() == (cpus, "1")
+
+
+if __name__ == "__main__":
+    test_parse_cpu_list()
+    test_cpu_partition()
+    test_bound_initializer()
@@ -182,6 +182,15 @@ def test_popen_pool_executor_recycles():
     assert initial_pid != pool.submit(os.getpid).result()
 
 
+
+def test_popen_pool_executor_shutdown():
+    pool = PopenPoolExecutor(max_workers=2, timeout=None)
+    pids = {pool.submit(os.getpid).result() for _ in range(4)}
+    pool.shutdown()
+    for pid in pids:
+        assert not psutil.pid_exists(pid)
+
+
 if __name__ == "__main__":
     test_popen_worker()
     test_popen_worker_recycles()
@@ -191,3 +200,4 @@ if __name__ == "__main__":
     test_popen_ffi()
     test_popen_pool_executor_timeout()
     test_popen_pool_executor_recycles()
+    test_popen_pool_executor_shutdown()
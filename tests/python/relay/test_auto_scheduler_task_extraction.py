@@ -293,5 +293,20 @@ def test_custom_hash_func_extract_tasks():
     assert max(hash_values) == counting_unique_hash.i - 1
 
 
+def test_extract_tasks_parallel():
+    mobilenet, mobilenet_params = get_network("mobilenet", layout="NHWC")
+    resnet, resnet_params = get_network("resnet-18", layout="NHWC")
+    expected = {}
+    for mod, params in [(mobilenet, mobilenet_params), (resnet, resnet_params)]:
+        tasks, weights = auto_scheduler.extract_tasks(mod["main"], params, "llvm")
+        for task, weight in zip(tasks, weights):
+            expected[task.workload_key] = expected.get(task.workload_key, 0) + weight
+
+    tasks, weights = auto_scheduler.extract_tasks_parallel(
+        [(mobilenet, mobilenet_params), (resnet, resnet_params)], "llvm", n_parallel=2
+    )
+    assert {task.workload_key: weight for task, weight in zip(tasks, weights)} == expected
+
+
 if __name__ == "__main__":
     tvm.testing.main()
@@ -125,6 +125,39 @@ def test_task_extraction_for_dense_int8_cuda():
     assert len(tasks) == 1 and tasks[0].name == "dense_int8.cuda"
 
 
+def test_task_extraction_parallel():
+    target = "llvm"
+    conv2d = relay.op.get("nn.conv2d")
+
+    resnet, resnet_params, _ = get_network("resnet-18", batch_size=1)
+    mobilenet, mobilenet_params, _ = get_network("mobilenet", batch_size=1)
+    resnet_tasks = autotvm.task.extract_from_program(
+        resnet, target=target, params=resnet_params, ops=(conv2d,)
+    )
+    mobilenet_tasks = autotvm.task.extract_from_program(
+        mobilenet, target=target, params=mobilenet_params, ops=(conv2d,)
+    )
+    # Each task is weighted by the number of programs it is extracted from
+    expected = {}
+    for tsk in resnet_tasks + mobilenet_tasks + resnet_tasks:
+        expected[tsk.workload] = expected.get(tsk.workload, 0) + 1
+
+    tasks, weights = autotvm.task.extract_from_multiple_program_parallel(
+        [
+            (resnet, resnet_params),
+            (mobilenet, mobilenet_params),
+            # loaded in the worker process
+            lambda: relay.testing.resnet.get_workload(num_layers=18, batch_size=1),
+        ],
+        target=target,
+        ops=(conv2d,),
+        n_parallel=2,
+    )
+    assert len(tasks) == len(weights) == len(expected)
+    assert {t.workload: w for t, w in zip(tasks, weights)} == expected
+
+
 if __name__ == "__main__":
     test_task_extraction()
     test_task_extraction_for_dense_int8_cuda()
+    test_task_extraction_parallel()
@@ -206,6 +206,29 @@ def test_recover_measure_input():
         assert str(correct_inp.state) == str(inp.state)
 
 
+def test_load_records_parallel():
+    task = auto_scheduler.SearchTask(
+        func=matmul_auto_scheduler_test, args=(512, 512, 512), target="llvm"
+    )
+
+    inp = auto_scheduler.measure.MeasureInput(task, task.compute_dag.init_state)
+    results = [auto_scheduler.measure.MeasureResult([0.1 * i], 0, "", 0.2, 1) for i in range(20)]
+
+    with tempfile.NamedTemporaryFile() as fp:
+        auto_scheduler.save_records(fp.name, [inp] * len(results), results)
+
+        expected = [str(res) for _, res in auto_scheduler.load_records(fp.name)]
+        # Use small byte ranges so that most of them split a line
+        for chunk_bytes in [7, 100, 1 << 20]:
+            loaded = list(
+                auto_scheduler.load_records_parallel(
+                    fp.name, num_threads=4, chunk_bytes=chunk_bytes
+                )
+            )
+            assert [str(res) for _, res in loaded] == expected
+            assert all(i.task.workload_key == task.workload_key for i, _ in loaded)
+
+
 def test_workload_dis_factor():
     calc = auto_scheduler.utils.calc_workload_dis_factor
     decode = auto_scheduler.utils.decode_workload_key
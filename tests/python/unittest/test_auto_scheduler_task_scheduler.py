@@ -19,6 +19,7 @@
 # under the License.
 """ Test task scheduler """
 
+import os
 import tempfile
 
 import multiprocessing
@@ -27,6 +28,7 @@ import numpy as np
 import tvm
 import tvm.testing
 from tvm import auto_scheduler
+from tvm.contrib.tuning_telemetry import TelemetrySink, load_telemetry
 
 from tvm.testing.auto_scheduler import matmul_auto_scheduler_test
 
@@ -142,7 +144,97 @@ def test_task_scheduler_gradient():
         del measure_ctx
 
 
+@tvm.testing.requires_llvm
+def test_task_scheduler_overlap_measurement():
+    tasks = []
+    for n in [2, 4, 8]:
+        tasks.append(
+            auto_scheduler.SearchTask(
+                func=matmul_auto_scheduler_test, args=(n, n, n), target="llvm"
+            )
+        )
+
+    with tempfile.NamedTemporaryFile() as fp:
+        log_file = fp.name
+        num_trials_per_task = 2
+
+        measure_ctx = auto_scheduler.LocalRPCMeasureContext()
+        tune_option = auto_scheduler.TuningOptions(
+            num_measure_trials=num_trials_per_task * len(tasks),
+            runner=measure_ctx.runner,
+            num_measures_per_round=1,
+            measure_callbacks=[auto_scheduler.RecordToFile(log_file)],
+        )
+        task_scheduler = auto_scheduler.TaskScheduler(tasks, strategy="round-robin", callbacks=[])
+        task_scheduler.tune(tune_option, search_policy="sketch.random", overlap_measurement=True)
+
+        # The overlapped rounds keep to the budget and to the round robin order
+        counters = {}
+        for task in tasks:
+            counters[task.workload_key] = 0
+
+        for inp, _ in auto_scheduler.load_records(log_file):
+            counters[inp.task.workload_key] += 1
+
+        for task in tasks:
+            assert counters[task.workload_key] == num_trials_per_task
+        assert task_scheduler.ct == num_trials_per_task * len(tasks)
+        assert task_scheduler.search_secs > 0
+        assert task_scheduler.measure_secs > 0
+        assert task_scheduler.measure_idle_secs >= 0
+        del measure_ctx
+
+
+@tvm.testing.requires_llvm
+def test_task_scheduler_telemetry():
+    tasks = []
+    for n in [2, 4]:
+        tasks.append(
+            auto_scheduler.SearchTask(
+                func=matmul_auto_scheduler_test, args=(n, n, n), target="llvm"
+            )
+        )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "telemetry.jsonl")
+        num_trials_per_task = 2
+
+        measure_ctx = auto_scheduler.LocalRPCMeasureContext()
+        with TelemetrySink(path, job="test") as sink:
+            tune_option = auto_scheduler.TuningOptions(
+                num_measure_trials=num_trials_per_task * len(tasks),
+                runner=measure_ctx.runner,
+                num_measures_per_round=1,
+                measure_callbacks=[auto_scheduler.RecordTelemetry(sink)],
+            )
+            task_scheduler = auto_scheduler.TaskScheduler(
+                tasks,
+                strategy="round-robin",
+                callbacks=[auto_scheduler.task_scheduler.LogTelemetry(sink)],
+            )
+            task_scheduler.tune(tune_option, search_policy="sketch.random")
+        rows = load_telemetry(path)
+        del measure_ctx
+
+    assert all(row.job == "test" and row.framework == "auto_scheduler" for row in rows)
+    for task in tasks:
+        task_rows = [row for row in rows if row.task == task.workload_key]
+        # One trial per round, recorded by the measure callback
+        trials = [row for row in task_rows if row.trial >= 0]
+        events = sorted(row.event for row in trials)
+        assert events == ["measure"] * num_trials_per_task + ["run"] * num_trials_per_task
+        assert {row.round for row in trials} == set(range(num_trials_per_task))
+        assert all(row.trial == 0 for row in trials)
+        # The timings of each round, recorded by the task scheduler callback
+        for event in ["round", "search", "measure_batch", "train", "queue"]:
+            rounds = [row for row in task_rows if row.trial < 0 and row.event == event]
+            assert [row.round for row in rounds] == list(range(num_trials_per_task))
+            assert all(row.seconds >= 0 for row in rounds)
+
+
 if __name__ == "__main__":
     test_task_scheduler_round_robin()
     test_task_scheduler_round_robin_spawn()
     test_task_scheduler_gradient()
+    test_task_scheduler_overlap_measurement()
+    test_task_scheduler_telemetry()
@@ -22,7 +22,7 @@ import copy
 import logging
 
 from tvm.autotvm import database
-from tvm.autotvm.record import encode, MeasureResult
+from tvm.autotvm.record import encode, measure_str_key, MeasureResult
 
 from tvm.testing.autotvm import get_sample_records
 
@@ -119,6 +119,61 @@ def test_db_filter():
     assert len(records) == 2
 
 
+def test_sqlite_db(tmpdir):
+    logging.info("test sqlite db ...")
+    records = get_sample_records(5)
+    path = str(tmpdir / "records.db")
+    _db = database.SQLiteDatabase(path)
+    with _db.batch():
+        for inp, result in records:
+            _db.save(inp, result)
+    inp1, res1 = records[0]
+    assert _db.load(inp1) == res1
+
+    # A second connection sees the committed results
+    reader = database.SQLiteDatabase(path)
+    assert reader.load(inp1) == res1
+    assert len(reader.filter(lambda inp, ress: any(r.costs[0] <= 2 for r in ress))) == 2
+
+    lis2 = list(tuple(res1))
+    lis2[-1] = res1.timestamp + 1
+    res2 = MeasureResult(*lis2)
+    _db.save(inp1, res2, extend=True)
+    assert reader.load(inp1).timestamp == res2.timestamp
+    assert len(reader.load(inp1, get_all=True)) == 2
+    _db.save(inp1, res1)
+    assert len(reader.load(inp1, get_all=True)) == 1
+
+    # A failed batch is rolled back
+    try:
+        with _db.batch():
+            _db.flush()
+            raise ValueError()
+    except ValueError:
+        pass
+    assert reader.load(inp1) == res1
+    _db.flush()
+    assert reader.load(inp1) is None
+    reader.close()
+    _db.close()
+
+
+def test_sqlite_db_undecodable(tmpdir):
+    inp, _ = get_sample_records(1)[0]
+    _db = database.SQLiteDatabase(str(tmpdir / "records.db"))
+    # Rows of the unsupported 0.1 log version decode to None
+    with _db.batch():
+        for timestamp in range(2):
+            _db.db.execute(
+                "INSERT INTO records (key, timestamp, row) VALUES (?, ?, ?)",
+                (measure_str_key(inp), timestamp, '{"v": 0.1}'),
+            )
+    assert _db.load(inp) is None
+    assert _db.load(inp, get_all=True) == []
+    assert _db.filter(lambda inp, ress: True) == []
+    _db.close()
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     test_save_load()
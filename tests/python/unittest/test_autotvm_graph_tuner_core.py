@@ -25,6 +25,7 @@
 # TODO: restore the file name after this issue is resolved.
 import os
 import copy
+import tempfile
 import numpy as np
 import tvm
 from tvm import te
@@ -34,7 +35,7 @@ from tvm import autotvm
 from tvm import relay
 from tvm.autotvm.task import ConfigEntity
 from tvm.autotvm.measure import MeasureResult, MeasureInput
-from tvm.autotvm.graph_tuner import DPTuner, PBQPTuner
+from tvm.autotvm.graph_tuner import DPTuner, LayoutTransformCache, PBQPTuner
 
 
 def _create_args(dshape, kshape, strides, padding, dilation, layout, out_layout, dtype, out_dtype):
@@ -234,6 +235,46 @@ def test_graph_tuner_layout_transform_runner():
         )
 
 
+def test_graph_tuner_layout_transform_cache():
+    log_file = "%s/test_tuner.log" % (os.getcwd())
+    target = "llvm"
+    dshape = (1, 3, 8, 8)
+    dtype = "float32"
+    layout = "NCHW"
+    conv2d = relay.op.get("nn.conv2d")
+    target_ops = [conv2d]
+
+    g, records, _, _, _ = _create_data(target, dshape, dtype, layout)
+    ltf_args = [
+        [te.placeholder((1, 4, 8, 8, 4), dtype=dtype), "NCHW4c", "NCHW8c"],
+        [te.placeholder((1, 1, 8, 8, 32), dtype=dtype), "NCHW32c", "NCHW4c"],
+        [te.placeholder((1, 4, 8, 8, 8), dtype=dtype), "NCHW8c", "NCHW32c"],
+    ]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_file = os.path.join(tmp_dir, "layout_transform.log")
+        cache = LayoutTransformCache(cache_file)
+        for i, ltf_arg in enumerate(ltf_args):
+            ltf_task = autotvm.task.create("layout_transform", ltf_arg, target)
+            config = ltf_task.config_space.get(0)
+            ms_input = MeasureInput(target=tvm.target.Target(target), task=ltf_task, config=config)
+            ms_output = MeasureResult(costs=(1e-5 * (i + 1),), error_no=0, all_cost=-1, timestamp=0)
+            cache.put((ms_input, ms_output))
+
+        # The records are reloaded from the file, and nothing needs to be measured
+        cache = LayoutTransformCache(cache_file)
+        assert len(cache) == len(ltf_args)
+        executor = DPTuner(
+            g, {"data": dshape}, records, target_ops, target=target, log_file=log_file
+        )
+        executor.benchmark_layout_transform(layout_cache=cache_file)
+        out = executor._layout_transform_perf_records
+        assert out
+        for ltf_workload, record in out.items():
+            assert cache.get(ltf_workload, target)[1].costs == record[1].costs
+        executor.run()
+        assert len(executor.get_optimal_records()) == 3
+
+
 def test_DPTuner_run():
     log_file = "%s/test_tuner.log" % (os.getcwd())
     target = "llvm"
@@ -781,6 +822,7 @@ def test_triangle_block():
 
 if __name__ == "__main__":
     test_graph_tuner_layout_transform()
+    test_graph_tuner_layout_transform_cache()
     test_DPTuner_run()
     test_PBQPTuner_run()
     test_many_sub_graphs()
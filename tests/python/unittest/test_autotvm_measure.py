@@ -21,16 +21,21 @@
 import logging
 import multiprocessing
 import concurrent
+import os
+import tempfile
+import time
 
 import numpy as np
+import pytest
 
 import tvm
 from tvm import te
 from tvm.autotvm.measure import executor
 from tvm.testing.autotvm import DummyRunner, bad_matmul, get_sample_task
 from tvm import autotvm
-from tvm.autotvm.measure.measure import MeasureErrorNo, MeasureResult
+from tvm.autotvm.measure.measure import MeasureErrorNo, MeasureInput, MeasureResult
 from tvm.autotvm import measure
+from tvm.contrib.tuning_telemetry import TelemetrySink, load_telemetry
 from inspect import Signature
 
 
@@ -89,9 +94,77 @@ def test_task_runner_with_ref_input():
     assert runner.executor.ran_dummy_executor
 
 
+def test_task_tuner_pipelined_measurement():
+    """test that the pipelined build and run hand every result back to the tuner"""
+    task, _ = get_sample_task()
+
+    class StreamingDummyRunner(DummyRunner):
+        def run_iter(self, measure_inputs, build_results):
+            for idx, build_result in build_results:
+                assert not isinstance(build_result, MeasureResult)
+                yield idx, MeasureResult((np.random.random(),), 0, 0.2, time.time())
+
+    measure_option = autotvm.measure_option(
+        builder=autotvm.LocalBuilder(), runner=StreamingDummyRunner(), pipeline=True
+    )
+    measure_batch = measure.create_measure_batch(task, measure_option)
+    inputs = [MeasureInput(task.target, task, task.config_space.get(i)) for i in range(8)]
+    assert sorted(idx for idx, _ in measure_batch.stream(inputs)) == list(range(8))
+    assert all(res.error_no == 0 for res in measure_batch(inputs))
+
+    tuner = autotvm.tuner.RandomTuner(task)
+    tuner.tune(n_trial=10, measure_option=measure_option)
+    assert tuner.best_flops > 1
+
+
+def test_task_tuner_log_telemetry():
+    """test that the telemetry callback records every trial and the timings of every batch"""
+    task, _ = get_sample_task()
+    measure_option = autotvm.measure_option(builder=autotvm.LocalBuilder(), runner=DummyRunner())
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "telemetry.csv")
+        with TelemetrySink(path, job="test") as sink:
+            tuner = autotvm.tuner.RandomTuner(task)
+            tuner.tune(
+                n_trial=10,
+                measure_option=measure_option,
+                callbacks=[autotvm.callback.log_telemetry(sink)],
+            )
+        rows = load_telemetry(path)
+
+    trials = [row for row in rows if row.trial >= 0]
+    assert len([row for row in trials if row.event == "run"]) == 10
+    assert len([row for row in trials if row.event == "measure"]) == 10
+    num_rounds = len({row.round for row in rows})
+    for event in ["search", "measure_batch", "train"]:
+        assert len([row for row in rows if row.trial < 0 and row.event == event]) == num_rounds
+    assert all(row.job == "test" and row.framework == "autotvm" for row in rows)
+    assert all(row.task == task.name and row.seconds >= 0 for row in rows)
+
+
+def test_task_tuner_cpu_affinity():
+    """test building with the build workers pinned to a set of CPUs"""
+    if not hasattr(os, "sched_getaffinity"):
+        pytest.skip("CPU affinity is not supported on this platform")
+    cpus = sorted(os.sched_getaffinity(0))[:2]
+    if len(cpus) < 2:
+        pytest.skip("Needs at least 2 CPUs")
+    task, _ = get_sample_task()
+    builder = autotvm.LocalBuilder(cpu_affinity=cpus)
+    assert builder.n_parallel == 2
+    measure_option = autotvm.measure_option(builder=builder, runner=DummyRunner())
+    tuner = autotvm.tuner.RandomTuner(task)
+    tuner.tune(n_trial=4, measure_option=measure_option)
+    assert tuner.best_flops > 1
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
 
     test_task_tuner_without_measurement()
     test_task_tuner_without_measurement_spawn()
     test_task_runner_with_ref_input()
+    test_task_tuner_pipelined_measurement()
+    test_task_tuner_log_telemetry()
+    test_task_tuner_cpu_affinity()
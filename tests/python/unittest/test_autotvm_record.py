@@ -24,9 +24,11 @@ import time
 
 from tvm.contrib import utils
 
+import tvm.testing
 from tvm import autotvm
 from tvm.autotvm.measure import MeasureInput, MeasureResult, MeasureErrorNo
 from tvm.autotvm.record import encode, decode, ApplyHistoryBest, measure_str_key
+from tvm.autotvm.record_store import RecordStore
 
 from tvm.testing.autotvm import get_sample_task
 
@@ -81,6 +83,26 @@ def test_file_io():
     assert str(x) == str(inputs[0][2])
 
 
+def test_load_from_file_parallel(tmpdir):
+    file_path = tmpdir / "temp.log"
+
+    tsk, target = get_sample_task()
+    inputs = [MeasureInput(target, tsk, tsk.config_space.get(i)) for i in range(0, 10)]
+    results = [MeasureResult((i,), 0, 0, 0) for i in range(0, 10)]
+    with open(file_path, "w") as fo:
+        autotvm.callback.log_to_file(fo)(None, inputs, results)
+
+    # Use small byte ranges so that most of them split a line
+    for chunk_bytes in [13, 1000, 1 << 20]:
+        loaded = list(
+            autotvm.record.load_from_file_parallel(file_path, n_parallel=2, chunk_bytes=chunk_bytes)
+        )
+        assert len(loaded) == len(inputs)
+        for (inp, res), (inp_2, res_2) in zip(zip(inputs, results), loaded):
+            assert measure_str_key(inp) == measure_str_key(inp_2)
+            assert res == res_2
+
+
 def test_apply_history_best(tmpdir):
     tsk, target = get_sample_task()
     best = str(tsk.config_space.get(2))
@@ -160,7 +182,66 @@ def test_apply_history_best_multiple_batches(tmpdir):
     assert str(hist_best.query(target, tsk.workload)) == best
 
 
+def test_record_store(tmpdir):
+    tsk, target = get_sample_task()
+    log_file = tmpdir / "tuning.log"
+
+    inputs = [MeasureInput(target, tsk, tsk.config_space.get(i)) for i in range(4)]
+    results = [MeasureResult((3,), 0, 0, 0), MeasureResult((2,), 0, 0, 0)]
+    with open(log_file, "w") as file:
+        autotvm.callback.log_to_file(file)(None, inputs[:2], results)
+
+    store = RecordStore(tmpdir / "tuning.db", top_k=2)
+    assert store.ingest(log_file) == 2
+    # Nothing new to ingest
+    assert store.ingest(log_file) == 0
+    assert str(store.query(target, tsk.workload)[0].config) == str(inputs[1].config)
+
+    # Incrementally ingest appended lines, including a failed and a partially written record
+    results = [MeasureResult((1,), 0, 0, 0), MeasureResult((0.5,), 1, 0, 0)]
+    with open(log_file, "a") as file:
+        autotvm.callback.log_to_file(file)(None, inputs[2:], results)
+        file.write('{"input": ')
+    assert store.ingest(log_file) == 1
+    top_k = store.get_top_k(target, tsk.workload)
+    assert [str(inp.config) for inp, _ in top_k] == [str(inputs[2].config), str(inputs[1].config)]
+
+    hist_best = ApplyHistoryBest(store)
+    assert str(hist_best.query(target, tsk.workload)) == str(inputs[2].config)
+    store.close()
+
+    # The store persists across processes
+    with RecordStore(tmpdir / "tuning.db", top_k=2) as reopened:
+        assert len(reopened) == 2
+        assert str(reopened.query(target, tsk.workload)[0].config) == str(inputs[2].config)
+
+
+def test_compact_log(tmpdir):
+    tsk, target = get_sample_task()
+    log_file = tmpdir / "tuning.log"
+
+    inputs = [MeasureInput(target, tsk, tsk.config_space.get(i)) for i in [0, 1, 2, 0, 3]]
+    results = [
+        MeasureResult((3,), 0, 0, 0),
+        MeasureResult((2,), 0, 0, 0),
+        MeasureResult((1,), MeasureErrorNo.RUNTIME_DEVICE, 0, 0),
+        MeasureResult((1,), 0, 0, 0),
+        MeasureResult((4,), 0, 0, 0),
+    ]
+    with open(log_file, "w") as file:
+        autotvm.callback.log_to_file(file)(None, inputs, results)
+
+    report = autotvm.record.compact_log(log_file, top_k=2)
+    assert report.num_records == 5
+    assert report.num_failed == 1
+    assert report.num_duplicates == 1
+    assert report.num_kept == 2
+    assert report.bytes_after < report.bytes_before
+    # The faster duplicate of config 0 is kept, in its place in the log
+    compacted = list(autotvm.record.load_from_file(log_file))
+    assert [inp.config.index for inp, _ in compacted] == [1, 0]
+    assert [res.costs for _, res in compacted] == [(2,), (1,)]
+
+
 if __name__ == "__main__":
-    test_load_dump()
-    test_apply_history_best()
-    test_file_io()
+    tvm.testing.main()
@@ -0,0 +1,60 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Test the simulated annealing model optimizer"""
+
+import numpy as np
+
+import tvm.testing
+from tvm.autotvm.tuner.model_based_tuner import CostModel
+from tvm.autotvm.tuner.sa_model_optimizer import SimulatedAnnealingOptimizer, _random_walk
+from tvm.testing.autotvm import get_sample_task
+
+
+class IndexModel(CostModel):
+    """A cost model that scores a point by its index"""
+
+    def predict(self, xs, output_margin=False):
+        return np.asarray(xs, dtype="float64")
+
+
+def test_random_walk():
+    task, _ = get_sample_task()
+    space = task.config_space
+    points = np.arange(len(space), dtype="int64")
+    walked = _random_walk(space, points)
+    # exactly one knob changes
+    changed = space.points2knobs(walked) != space.points2knobs(points)
+    assert (changed.sum(axis=1) == 1).all()
+
+
+def test_find_maximums():
+    task, _ = get_sample_task()
+    space = task.config_space
+    optimizer = SimulatedAnnealingOptimizer(task, n_iter=50, parallel_size=16, log_interval=0)
+    exclusive = {len(space) - 1, len(space) - 2}
+    maximums = optimizer.find_maximums(IndexModel(), 8, exclusive)
+    assert len(maximums) == 8
+    assert len(set(maximums)) == 8
+    assert not set(maximums) & exclusive
+    assert maximums == sorted(maximums, reverse=True)
+
+
+if __name__ == "__main__":
+    tvm.testing.main()
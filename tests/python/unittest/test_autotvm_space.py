@@ -19,6 +19,8 @@
 # under the License.
 """Test space definition primitives"""
 
+import numpy as np
+
 from tvm import te
 from tvm.autotvm.task.space import ConfigSpace, FallbackConfigEntity
 
@@ -260,7 +262,38 @@ def test_filter_and_multi_filter():
     assert cfg.range_length == 48
 
 
+def test_batch_conversion():
+    cfg = ConfigSpace()
+    gemm_func(cfg, 128)
+    cfg.multi_filter(
+        filter=lambda entity: 32 <= (entity["tile_x"].size[1] * entity["tile_y"].size[1]) < 1024
+    )
+    points = np.arange(cfg.range_length)
+    # points2knobs / knobs2points agree with point2knob / knob2point
+    knobs = cfg.points2knobs(points)
+    assert knobs.shape == (cfg.range_length, len(cfg.dims))
+    assert knobs.tolist() == [cfg.point2knob(i) for i in range(cfg.range_length)]
+    assert cfg.knobs2points(knobs).tolist() == points.tolist()
+    assert cfg.knobs2points([[4, 1]]).tolist() == [cfg.knob2point([4, 1])]
+    # are_indexes_valid agrees with is_index_valid
+    valid = cfg.are_indexes_valid(points)
+    assert valid.tolist() == [cfg.is_index_valid(i) for i in range(cfg.range_length)]
+    # get_batch agrees with get
+    valid_points = points[valid]
+    configs = cfg.get_batch(valid_points)
+    assert [str(c) for c in configs] == [str(cfg.get(int(i))) for i in valid_points]
+    assert _raises_exception(lambda: cfg.get_batch([0]))
+    assert _raises_exception(lambda: cfg.get_batch([cfg.range_length]))
+    assert cfg.get_batch([]) == []
+    # sample_ints in a sparse and a dense setting
+    for m in [5, len(cfg)]:
+        ints = cfg.sample_ints(m)
+        assert len(ints) == len(set(ints.tolist())) == m
+        assert set(ints.tolist()).issubset(valid_points.tolist())
+
+
 if __name__ == "__main__":
     test_split()
     test_multi_filter()
     test_filter_and_multi_filter()
+    test_batch_conversion()
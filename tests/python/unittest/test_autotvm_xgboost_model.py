@@ -26,6 +26,7 @@ import tvm
 from tvm import te
 from tvm import autotvm
 from tvm.autotvm import MeasureInput, MeasureResult
+from tvm.autotvm.tuner.model_based_tuner import SharedFeatureTable
 from tvm.autotvm.tuner.xgboost_cost_model import XGBoostCostModel
 
 from tvm.testing.autotvm import get_sample_task, get_sample_records
@@ -94,8 +95,71 @@ def test_update():
     assert all(x in tuner.visited for x in tuner.xs)
 
 
+def test_fit_warm_start():
+    task, target = get_sample_task()
+    model = XGBoostCostModel(
+        task,
+        feature_type="knob",
+        loss_type="rank-binary",
+        warm_start=True,
+        full_refit_interval=3,
+        max_train_size=24,
+    )
+
+    xs, ys = [], []
+    for i in range(4):
+        xs.extend(range(i * 10, (i + 1) * 10))
+        ys.extend(np.random.rand(10))
+        model.fit(xs, ys, plan_size=8)
+    # A full refit, two warm starts, then a full refit again
+    assert model._num_warm_fits == 0
+    assert len(model._fitted_indexes) == 24
+
+    # Only the latest measurement of a config is kept
+    xs, ys = model._train_buffer([1, 2, 1], [0.1, 0.2, 0.3])
+    assert xs == [2, 1]
+    assert ys == [0.2, 0.3]
+
+    model.predict(np.arange(8))
+
+
+def test_shared_feature_table():
+    table = SharedFeatureTable(capacity=2)
+    indexes = np.array([7, 3, 7, 5])
+    assert table.missing(indexes) == [7, 3, 5]
+    rows = table.reserve([7, 3, 5])
+    assert table.shape[0] >= 3
+    table.store(rows[0], np.array([1.0, 2.0]))
+    table.store(rows[1], None)
+    table.store(rows[2], np.array([3.0]))
+    assert table.missing(indexes) == []
+    features = table.gather(indexes)
+    np.testing.assert_equal(features, [[1, 2], [0, 0], [1, 2], [3, 0]])
+
+    table.clear()
+    assert table.size() == 0
+    table.close()
+
+
+def test_get_feature_shared_table():
+    task, target = get_sample_task()
+    model = XGBoostCostModel(task, feature_type="knob", loss_type="reg")
+    indexes = np.arange(16)
+    features = model._get_feature(indexes)
+    # Read back from the table without extracting again
+    np.testing.assert_equal(model._get_feature(indexes[::-1]), features[::-1])
+    assert model.feature_cache.size(model.feature_table_key) == 16
+    for i in indexes:
+        expected = task.config_space.get(int(i)).get_flatten_feature()
+        np.testing.assert_allclose(features[i, : len(expected)], expected)
+    model._close_pool()
+
+
 if __name__ == "__main__":
     test_fit()
     test_fit_spawn()
     test_tuner()
     test_update()
+    test_fit_warm_start()
+    test_shared_feature_table()
+    test_get_feature_shared_table()
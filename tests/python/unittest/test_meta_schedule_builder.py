@@ -30,11 +30,13 @@ import tvm.testing
 from tvm import script
 from tvm._ffi import register_func
 from tvm.meta_schedule.builder import (
+    BuildCache,
     BuilderInput,
     BuilderResult,
     LocalBuilder,
     PyBuilder,
 )
+from tvm.meta_schedule.builder.local_builder import default_build
 from tvm.runtime import Module
 from tvm.script import tir as T
 from tvm.target import Target
@@ -228,5 +230,42 @@ def test_meta_schedule_missing_build_func():
         LocalBuilder(f_build="wrong-name")
 
 
+def test_meta_schedule_build_cache(tmpdir):
+    """Test that structurally identical modules are built once with the build cache"""
+    cache_dir = os.path.join(str(tmpdir), "build_cache")
+    builder = LocalBuilder(cache_dir=cache_dir)
+    builder_inputs = [BuilderInput(MatmulModule, Target("llvm"))]
+    (first,) = builder.build(builder_inputs)
+    assert builder._cache_hits == 0  # pylint: disable=protected-access
+    assert len(os.listdir(cache_dir)) == 1
+    (second,) = builder.build(builder_inputs)
+    assert builder._cache_hits == 1  # pylint: disable=protected-access
+    assert first.artifact_path != second.artifact_path
+    with open(first.artifact_path, "rb") as f_first, open(second.artifact_path, "rb") as f_second:
+        assert f_first.read() == f_second.read()
+    _check_build_results([first, second])
+    # The cached artifact outlives the copies handed out
+    (third,) = builder.build([BuilderInput(MatmulModule, Target("llvm"))])
+    assert builder._cache_hits == 2  # pylint: disable=protected-access
+    _check_build_results([third])
+
+
+def test_meta_schedule_build_cache_custom_build_func(tmpdir):
+    """Test that functions without a cache tag are not cached, and that the tag is in the key"""
+    cache_dir = os.path.join(str(tmpdir), "build_cache")
+
+    def f_build(mod, target, params):
+        return default_build(mod, target, params)
+
+    assert LocalBuilder(cache_dir=cache_dir, f_build=f_build).cache_dir is None
+    builder = LocalBuilder(cache_dir=cache_dir, f_build=f_build, cache_tag="v1")
+    assert builder.cache_dir == cache_dir
+    keys = {
+        BuildCache.key(MatmulModule, Target("llvm"), None, "f_build", None, cache_tag)
+        for cache_tag in [None, "v1", "v2"]
+    }
+    assert len(keys) == 3
+
+
 if __name__ == "__main__":
     tvm.testing.main()
@@ -27,10 +27,12 @@ from functools import partial
 from typing import List
 
 import numpy as np
+import pytest
 import tvm
 import tvm.testing
+from tvm import meta_schedule as ms
 from tvm.meta_schedule.cost_model import PyCostModel, RandomModel, XGBModel
-from tvm.meta_schedule.cost_model.xgb_model import PackSum, _get_custom_call_back
+from tvm.meta_schedule.cost_model.xgb_model import FeatureGroup, PackSum, _get_custom_call_back
 from tvm.meta_schedule.feature_extractor import RandomFeatureExtractor
 from tvm.meta_schedule.runner import RunnerResult
 from tvm.meta_schedule.search_strategy import MeasureCandidate
@@ -260,6 +262,170 @@ def test_meta_schedule_xgb_model_reupdate():
     model.predict(TuneContext(), [_dummy_candidate() for i in range(predict_sample_count)])
 
 
+def test_meta_schedule_xgb_model_pretrain():
+    extractor = RandomFeatureExtractor()
+    database = ms.database.MemoryDatabase()
+    workload = database.commit_workload(Matmul)
+    for _ in range(30):
+        database.commit_tuning_record(
+            ms.database.TuningRecord(
+                trace=Schedule(Matmul).trace,
+                workload=workload,
+                run_secs=list(np.random.rand(4) + 1e-6),
+                target=tvm.target.Target("llvm"),
+            )
+        )
+    model = XGBModel(extractor=extractor, num_warmup_samples=100)
+    assert model.pretrain(database, target=tvm.target.Target("cuda")) == 0
+    assert model.global_booster is None
+    assert model.pretrain(database, target=tvm.target.Target("llvm")) == 30
+    assert model.global_booster is not None
+    context = TuneContext(mod=Matmul, target="llvm")
+    # The global model predicts before any sample of the session is seen
+    model.predict(context, [_dummy_candidate() for _ in range(10)])
+    model.update(
+        context,
+        [_dummy_candidate() for _ in range(10)],
+        [_dummy_result() for _ in range(10)],
+    )
+    assert model.booster is None
+    assert len(model.task_boosters) == 1
+    # The task model is fine-tuned from the global one, so it predicts while still warming up
+    random_state = extractor.random_state
+    res1 = model.predict(context, [_dummy_candidate() for _ in range(10)])
+    extractor.random_state = random_state
+    assert (model.predict(context, [_dummy_candidate() for _ in range(10)]) == res1).all()
+    with tempfile.NamedTemporaryFile() as path:
+        model.save(path.name)
+        new_model = XGBModel(extractor=extractor, num_warmup_samples=100)
+        new_model.load(path.name)
+    assert new_model.global_booster is not None
+    assert new_model.data_size == 10
+    # The task models are restored along with the global one
+    assert list(new_model.task_boosters) == list(model.task_boosters)
+    extractor.random_state = random_state
+    assert (new_model.predict(context, [_dummy_candidate() for _ in range(10)]) == res1).all()
+
+
+def test_meta_schedule_xgb_model_warm_start():
+    extractor = RandomFeatureExtractor()
+    model = XGBModel(
+        extractor=extractor,
+        num_warmup_samples=2,
+        adaptive_training=False,
+        warm_start=True,
+        full_refit_interval=3,
+        max_data_size=50,
+    )
+    context = TuneContext()
+    num_warm_starts, num_rounds = [], []
+    for i in range(4):
+        results = [_dummy_result() for _ in range(20)]
+        if i == 0:
+            # The best sample comes first, so that the labels of the group never change
+            results[0] = RunnerResult([1e-7] * 4, None)
+        model.update(context, [_dummy_candidate() for _ in range(20)], results)
+        num_warm_starts.append(model.num_warm_starts)
+        num_rounds.append(model.booster.num_boosted_rounds())
+    # A full refit, two warm starts, then a full refit every `full_refit_interval` trainings
+    assert num_warm_starts == [0, 1, 2, 0]
+    # Warm starts keep boosting the previous trees
+    assert num_rounds[1] > num_rounds[0]
+    assert num_rounds[2] > num_rounds[1]
+    assert model.data_size == 50
+    assert model.num_added == 80
+    assert not model.pending
+    model.predict(context, [_dummy_candidate() for _ in range(10)])
+
+
+def test_meta_schedule_xgb_model_async_training():
+    extractor = RandomFeatureExtractor()
+    model = XGBModel(
+        extractor=extractor,
+        num_warmup_samples=2,
+        adaptive_training=False,
+        async_training=True,
+        max_staleness=1,
+    )
+    context = TuneContext()
+    for _ in range(4):
+        model.update(
+            context,
+            [_dummy_candidate() for _ in range(20)],
+            [_dummy_result() for _ in range(20)],
+        )
+        # The search continues with the last trained model, if any
+        model.predict(context, [_dummy_candidate() for _ in range(10)])
+    model.join_training()
+    assert model.booster is not None
+    assert model.async_train_secs > 0
+    with tempfile.NamedTemporaryFile() as path:
+        model.save(path.name)
+
+
+def test_meta_schedule_xgb_model_async_training_error():
+    extractor = RandomFeatureExtractor()
+    model = XGBModel(
+        extractor=extractor,
+        num_warmup_samples=2,
+        adaptive_training=False,
+        async_training=True,
+    )
+    make_training_job = model._make_training_job  # pylint: disable=protected-access
+    num_calls = []
+
+    def _fail_once(group_hash):
+        num_calls.append(group_hash)
+        if len(num_calls) == 1:
+            raise ValueError("Cannot collect the training data")
+        return make_training_job(group_hash)
+
+    model._make_training_job = _fail_once  # pylint: disable=protected-access
+    context = TuneContext()
+    model.update(
+        context,
+        [_dummy_candidate() for _ in range(20)],
+        [_dummy_result() for _ in range(20)],
+    )
+    # The error is reported instead of blocking forever
+    with pytest.raises(RuntimeError, match="failed to train in the background"):
+        model.join_training()
+    assert model.booster is None
+    # The next update trains again
+    model.update(
+        context,
+        [_dummy_candidate() for _ in range(20)],
+        [_dummy_result() for _ in range(20)],
+    )
+    model.join_training()
+    assert model.booster is not None
+    assert len(num_calls) == 2
+
+
+def test_meta_schedule_xgb_model_dedup():
+    group = FeatureGroup(
+        group_hash="group",
+        features=[np.ones((2, 3)), np.zeros((2, 3)), np.ones((2, 3))],
+        costs=np.array([3.0, 2.0, 1.0]),
+    )
+    assert len(group.features) == 2
+    features, costs = group.append([np.zeros((2, 3)), np.full((1, 3), 2.0)], np.array([4.0, 5.0]))
+    assert len(features) == 1
+    assert list(costs) == [5.0]
+    assert list(group.costs) == [3.0, 2.0, 5.0]
+    assert group.min_cost == 2.0
+
+    group = FeatureGroup(
+        group_hash="group",
+        features=[np.full((1, 3), float(i)) for i in range(5)],
+        costs=np.array([1.0, 4.0, 3.0, 2.0, 5.0]),
+    )
+    assert group.trim(4) == 1
+    # The best sample and the most recent ones are kept
+    assert list(group.costs) == [1.0, 3.0, 2.0, 5.0]
+    assert len(group.keys) == 4
+
+
 def xgb_version_check():
 
     # pylint: disable=import-outside-toplevel
@@ -358,5 +524,75 @@ def test_meta_schedule_xgb_model_callback_as_function():
     assert np.allclose(pred1, pred2, rtol=1e-3, atol=1e-3)
 
 
+def test_meta_schedule_mlp_model_batched_predict():
+    pytest.importorskip("torch")
+    # pylint: disable=import-outside-toplevel
+    from tvm.meta_schedule.cost_model.mlp_model import (
+        InferenceConfig,
+        SegmentSumMLPPredictor,
+        SegmentSumMLPTrainer,
+        State,
+    )
+
+    # pylint: enable=import-outside-toplevel
+    rng = np.random.default_rng(0)
+    state = State()
+    trainer = SegmentSumMLPTrainer(state=state)
+    input_dim = state.model.encoder[0].in_features
+    # Segments larger than a chunk, segments without rows, and a task without candidates
+    all_segment_sizes = [
+        np.array([3, 0, 9, 1, 5, 0, 2]),
+        np.array([4, 4, 0, 6]),
+        np.zeros(0, dtype="int64"),
+    ]
+    groups = [
+        (rng.uniform(0, 10, (sizes.sum(), input_dim)).astype("float32"), sizes)
+        for sizes in all_segment_sizes
+    ]
+    for max_rows in [4, 65536]:
+        predictor = SegmentSumMLPPredictor(state, InferenceConfig(max_rows=max_rows))
+        pred_results = predictor.predict(groups)
+        assert len(pred_results) == len(groups)
+        for (packed, sizes), pred in zip(groups, pred_results):
+            assert pred.shape == (len(sizes),)
+            if len(sizes) == 0:
+                continue
+            expected = trainer.predict_incremental(np.split(packed, np.cumsum(sizes)[:-1]))
+            np.testing.assert_allclose(pred, expected, rtol=1e-4, atol=1e-4)
+
+
+@tvm.testing.requires_llvm
+def test_meta_schedule_mlp_model_tvm_predict():
+    pytest.importorskip("torch")
+    # pylint: disable=import-outside-toplevel
+    from tvm.meta_schedule.cost_model.mlp_model import (
+        InferenceConfig,
+        SegmentSumMLPPredictor,
+        State,
+    )
+
+    # pylint: enable=import-outside-toplevel
+    rng = np.random.default_rng(0)
+    state = State()
+    input_dim = state.model.encoder[0].in_features
+    groups = [
+        (rng.uniform(0, 10, (sizes.sum(), input_dim)).astype("float32"), sizes)
+        for sizes in [np.array([3, 0, 9, 1, 5, 0, 2]), np.zeros(0, dtype="int64")]
+    ]
+    expected = SegmentSumMLPPredictor(state, InferenceConfig()).predict(groups)
+    # A thread count different from the current one, so the thread pool is resized and restored
+    num_threads_func = tvm.get_global_func("runtime.NumThreads")
+    prev_num_threads = num_threads_func()
+    num_threads = 2 if prev_num_threads == 1 else 1
+    # Chunks smaller than the groups, so the compiled model is run on padded chunks
+    config = InferenceConfig(num_threads=num_threads, backend="tvm", target="llvm", chunk_size=4)
+    pred_results = SegmentSumMLPPredictor(state, config).predict(groups)
+    assert num_threads_func() == prev_num_threads
+    assert len(pred_results) == len(expected)
+    for pred, expect in zip(pred_results, expected):
+        assert pred.shape == expect.shape
+        np.testing.assert_allclose(pred, expect, rtol=1e-4, atol=1e-4)
+
+
 if __name__ == "__main__":
     tvm.testing.main()
@@ -615,5 +615,104 @@ def test_memory_database_commit_workload(f_mod, mod_eq):
     database.commit_workload(mod)
 
 
+def _commit_matmul_record(database: ms.database.Database, run_secs: List[float]) -> TuningRecord:
+    mod: IRModule = Matmul
+    workload = database.commit_workload(mod)
+    record = ms.database.TuningRecord(
+        _create_schedule(mod, _schedule_matmul).trace,
+        workload,
+        run_secs,
+        tvm.target.Target("llvm"),
+        ms.arg_info.ArgInfo.from_prim_func(func=mod["main"]),
+    )
+    database.commit_tuning_record(record)
+    return record
+
+
+def test_sharded_database_merged_view():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_1 = ms.database.ShardedJSONDatabase(tmpdir, shard_name="worker-1")
+        db_2 = ms.database.ShardedJSONDatabase(tmpdir, shard_name="worker-2")
+        _commit_matmul_record(db_1, [3.0])
+        best = _commit_matmul_record(db_2, [1.0])
+        assert osp.exists(osp.join(tmpdir, "worker-1", "database_tuning_record.json"))
+        assert osp.exists(osp.join(tmpdir, "worker-2", "database_tuning_record.json"))
+        assert len(db_1) == 1
+        assert db_1.refresh() == 1
+        assert db_1.refresh() == 0
+        assert len(db_1) == 2
+        (ret,) = db_1.get_top_k(db_1.commit_workload(Matmul), 1)
+        _equal_record(ret, best)
+        _equal_record(db_1.query_tuning_record(Matmul, tvm.target.Target("llvm"), "main"), best)
+        # A fresh reader sees all the shards
+        assert len(ms.database.ShardedJSONDatabase(tmpdir, shard_name="reader")) == 2
+
+
+def test_sharded_database_partial_line():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        writer = ms.database.ShardedJSONDatabase(tmpdir, shard_name="writer")
+        _commit_matmul_record(writer, [1.0])
+        with open(osp.join(tmpdir, "writer", "database_tuning_record.json"), "a") as file:
+            file.write('[0, ["partially written')
+        reader = ms.database.ShardedJSONDatabase(tmpdir, shard_name="reader")
+        assert len(reader) == 1
+
+
+def test_sharded_database_compact():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for i in range(3):
+            db = ms.database.ShardedJSONDatabase(tmpdir, shard_name=f"worker-{i}")
+            _commit_matmul_record(db, [float(i + 1)])
+            if i < 2:
+                db.seal()
+        reader = ms.database.ShardedJSONDatabase(tmpdir, shard_name="reader")
+        assert len(reader) == 3
+        compacted = reader.compact()
+        assert compacted is not None
+        assert not osp.exists(osp.join(tmpdir, "worker-0"))
+        assert not osp.exists(osp.join(tmpdir, "worker-1"))
+        assert osp.exists(osp.join(tmpdir, "worker-2"))
+        reader.refresh()
+        assert len(reader) == 3
+        assert len(ms.database.ShardedJSONDatabase(tmpdir, shard_name="reader")) == 3
+
+
+def test_json_database_compact():
+    def _record(database, sch_fn, run_secs):
+        workload = database.commit_workload(Matmul)
+        record = ms.database.TuningRecord(
+            _create_schedule(Matmul, sch_fn).trace,
+            workload,
+            run_secs,
+            tvm.target.Target("llvm"),
+            ms.arg_info.ArgInfo.from_prim_func(func=Matmul["main"]),
+        )
+        database.commit_tuning_record(record)
+        return record
+
+    def _split_i(sch: Schedule):
+        sch.split(sch.get_loops(sch.get_block("matmul"))[0], factors=[2, 512])
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database = _create_tmp_database(tmpdir)
+        _record(database, _schedule_matmul, [3.0])
+        best = _record(database, _schedule_matmul, [1.0])
+        second = _record(database, _split_i, [2.0])
+        _record(database, _split_i, [1e10])
+        report = ms.database.compact_json_database(database.path_tuning_record, top_k=2)
+        assert report.num_records == 4
+        assert (report.num_kept, report.num_failed, report.num_duplicates) == (2, 1, 1)
+        compacted = ms.database.JSONDatabase(database.path_workload, database.path_tuning_record)
+        assert len(compacted) == 2
+        ret = compacted.get_top_k(compacted.commit_workload(Matmul), 2)
+        _equal_record(ret[0], best)
+        _equal_record(ret[1], second)
+        # Only the best record is left with top_k=1
+        ms.database.compact_json_database(database.path_tuning_record, top_k=1)
+        compacted = ms.database.JSONDatabase(database.path_workload, database.path_tuning_record)
+        (ret,) = compacted.get_all_tuning_records()
+        _equal_record(ret, best)
+
+
 if __name__ == "__main__":
     tvm.testing.main()
@@ -22,11 +22,14 @@ import re
 from typing import List
 
 import numpy as np
+from tvm import te
 from tvm.meta_schedule import TuneContext
 from tvm.meta_schedule.feature_extractor import PyFeatureExtractor
 from tvm.meta_schedule.search_strategy import MeasureCandidate
+from tvm.meta_schedule.testing.te_workload import matmul
 from tvm.meta_schedule.utils import derived_object
 from tvm.runtime.ndarray import array
+from tvm.tir import Schedule
 
 
 def test_meta_schedule_feature_extractor():
@@ -60,6 +63,29 @@ def test_meta_schedule_feature_extractor_as_string():
     assert pattern.match(str(feature_extractor))
 
 
+def test_meta_schedule_feature_extractor_batched():
+    rows = [3, 0, 1, 4]
+    expected = [np.random.rand(num_rows, 5) for num_rows in rows]
+
+    @derived_object
+    class FancyFeatureExtractor(PyFeatureExtractor):
+        def extract_from(
+            self,
+            context: TuneContext,  # pylint: disable = unused-argument
+            candidates: List[MeasureCandidate],  # pylint: disable = unused-argument
+        ) -> List[np.ndarray]:
+            return [array(x) for x in expected]
+
+    sch = Schedule(te.create_prim_func(matmul(16, 16, 16)))
+    candidates = [MeasureCandidate(sch, []) for _ in rows]
+    features, ids = FancyFeatureExtractor().extract_from_batched(TuneContext(), candidates)
+    assert features.dtype == "float32"
+    assert ids.dtype == "int64"
+    np.testing.assert_allclose(features, np.concatenate(expected, axis=0), rtol=1e-6)
+    np.testing.assert_equal(ids, np.repeat(np.arange(len(rows)), rows))
+
+
 if __name__ == "__main__":
     test_meta_schedule_feature_extractor()
     test_meta_schedule_feature_extractor_as_string()
+    test_meta_schedule_feature_extractor_batched()
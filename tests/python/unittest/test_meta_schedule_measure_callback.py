@@ -25,6 +25,7 @@ from typing import List
 import pytest
 import tvm
 from tvm import meta_schedule as ms
+from tvm.contrib.tuning_telemetry import TelemetrySink, load_telemetry
 from tvm.script import tir as T
 from tvm.tir.schedule import Schedule
 
@@ -176,9 +177,102 @@ def test_meta_schedule_measure_callback_update_cost_model_with_runtime_error():
         )
 
 
+def test_meta_schedule_measure_callback_save_checkpoint():
+    @ms.derived_object
+    class OneSecRunnerFuture(ms.runner.PyRunnerFuture):
+        def done(self) -> bool:
+            return True
+
+        def result(self) -> ms.runner.RunnerResult:
+            return ms.runner.RunnerResult([1.0], None)
+
+    @ms.derived_object
+    class OneSecRunner(ms.runner.PyRunner):
+        def run(self, runner_inputs: List[ms.runner.RunnerInput]) -> List[ms.runner.RunnerResult]:
+            return [OneSecRunnerFuture() for _ in runner_inputs]
+
+    def _tune(work_dir, max_trials_global, resume, checkpoint_interval=0.0):
+        return ms.tune_tir(
+            mod=Matmul,
+            target="llvm -num-cores=1",
+            work_dir=work_dir,
+            max_trials_global=max_trials_global,
+            num_trials_per_iter=5,
+            runner=OneSecRunner(),
+            cost_model="random",
+            checkpoint_interval=checkpoint_interval,
+            resume=resume,
+        )
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        database = _tune(work_dir, 10, resume=False)
+        assert len(database) == 10
+        checkpoint = ms.measure_callback.load_checkpoint(f"{work_dir}/checkpoint")
+        assert checkpoint is not None and checkpoint.num_trials == 10
+        (progress,) = checkpoint.tasks.values()
+        assert progress.task_name == "main"
+        # Nothing is left to tune within the same budget
+        assert len(_tune(work_dir, 10, resume=True)) == 10
+        # A larger budget only measures the trials left
+        database = _tune(work_dir, 20, resume=True)
+        assert len(database) == 20
+        assert ms.measure_callback.load_checkpoint(f"{work_dir}/checkpoint").num_trials == 20
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        # No periodic checkpoint is due within the session, but a completed one is saved anyway
+        assert len(_tune(work_dir, 10, resume=False, checkpoint_interval=3600.0)) == 10
+        checkpoint = ms.measure_callback.load_checkpoint(f"{work_dir}/checkpoint")
+        assert checkpoint is not None and checkpoint.num_trials == 10
+        assert len(_tune(work_dir, 10, resume=True, checkpoint_interval=3600.0)) == 10
+        database = _tune(work_dir, 15, resume=True, checkpoint_interval=3600.0)
+        assert len(database) == 15
+        assert ms.measure_callback.load_checkpoint(f"{work_dir}/checkpoint").num_trials == 15
+
+
+def test_meta_schedule_measure_callback_record_telemetry():
+    @ms.derived_object
+    class FailEveryOtherRunner(ms.runner.PyRunner):
+        def run(self, runner_inputs: List[ms.runner.RunnerInput]) -> List[ms.runner.RunnerFuture]:
+            return [
+                ms.runner.LocalRunnerFuture(
+                    [1.0] if i % 2 == 0 else None, None if i % 2 == 0 else "error"
+                )
+                for i, _ in enumerate(runner_inputs)
+            ]
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = f"{work_dir}/telemetry.jsonl"
+        with TelemetrySink(path) as sink:
+            with ms.Profiler():
+                ms.tune_tir(
+                    mod=Matmul,
+                    target="llvm -num-cores=1",
+                    work_dir=work_dir,
+                    max_trials_global=10,
+                    num_trials_per_iter=5,
+                    runner=FailEveryOtherRunner(),
+                    cost_model="random",
+                    measure_callbacks=list(ms.MeasureCallback.create("default"))
+                    + [ms.measure_callback.RecordTelemetry(sink)],
+                )
+        rows = load_telemetry(path)
+
+    runs = [row for row in rows if row.event == "run"]
+    assert len(runs) == 10
+    assert {row.round for row in runs} == {0, 1}
+    assert all(row.task == "main" and row.framework == "meta_schedule" for row in rows)
+    assert all(row.seconds == 1.0 for row in runs if row.trial % 2 == 0)
+    assert all(row.error_no == 4 for row in runs if row.trial % 2 == 1)
+    # The second round reports the time since the first one, and the profiled scopes
+    assert [row.round for row in rows if row.event == "round"] == [1]
+    assert any(row.trial < 0 and row.event != "round" for row in rows)
+
+
 if __name__ == "__main__":
     test_meta_schedule_measure_callback()
     test_meta_schedule_measure_callback_fail()
     test_meta_schedule_measure_callback_as_string()
     test_meta_schedule_measure_callback_update_cost_model_with_zero()
     test_meta_schedule_measure_callback_update_cost_model_with_runtime_error()
+    test_meta_schedule_measure_callback_save_checkpoint()
+    test_meta_schedule_measure_callback_record_telemetry()
@@ -109,6 +109,19 @@ def test_meta_schedule_integration_extract_from_resnet():
         assert t.task_name in expected_task_names, t.task_name
 
 
+def test_meta_schedule_integration_extract_parallel():
+    mod, params, _ = get_network(name="resnet_18", input_shape=[1, 3, 224, 224])
+    expected = ms.relay_integration.extract_tasks(mod, target="llvm", params=params)
+    extracted_tasks = ms.relay_integration.extract_tasks_parallel(
+        [(mod, params), (mod, params)], target="llvm", n_parallel=2
+    )
+    # The tasks of the two copies are merged, with their weights summed
+    assert sorted(t.task_name for t in extracted_tasks) == sorted(t.task_name for t in expected)
+    weights = {t.task_name: int(t.weight) for t in expected}
+    for t in extracted_tasks:
+        assert int(t.weight) == 2 * weights[t.task_name], t.task_name
+
+
 @pytest.mark.skip("Integration tests")
 @pytest.mark.skipif(
     platform.machine() == "aarch64",
@@ -21,6 +21,7 @@
 
 import itertools
 import sys
+import threading
 import time
 from typing import Any, List
 
@@ -36,7 +37,9 @@ from tvm.meta_schedule.runner import (
     LocalRunner,
     PyRunner,
     RPCConfig,
+    RPCDispatchRunner,
     RPCRunner,
+    RPCServerEndpoint,
     RunnerFuture,
     RunnerInput,
 )
@@ -56,6 +59,7 @@ from tvm.meta_schedule.utils import (
     get_global_func_with_default_on_worker,
 )
 from tvm.rpc import RPCSession
+from tvm.rpc.server import Server
 from tvm.runtime import Device, Module
 from tvm.script import tir as T
 from tvm.target import Target
@@ -905,5 +909,91 @@ def test_meta_schedule_local_runner_add_test():
     _clean_build(builder_result.artifact_path)
 
 
+def test_meta_schedule_local_runner_pinned_reuse_arguments():
+    """Test meta schedule local runner pinned to a CPU, reusing the arguments across runs"""
+    builder = LocalBuilder()
+    builder_results = builder.build([BuilderInput(MatmulModule, Target("llvm"))] * 2)
+    args_info = [TensorInfo("float32", (MATMUL_N, MATMUL_N)) for _ in range(3)]
+    runner_inputs = []
+    for builder_result in builder_results:
+        assert builder_result.error_msg is None
+        runner_inputs.append(RunnerInput(builder_result.artifact_path, "llvm", args_info))
+
+    evaluator_config = EvaluatorConfig(
+        number=1,
+        repeat=1,
+        min_repeat_ms=0,
+        enable_cpu_cache_flush=False,
+    )
+    runner = LocalRunner(
+        timeout_sec=100,
+        evaluator_config=evaluator_config,
+        cpu_affinity=[0],
+        reuse_arguments=True,
+    )
+    for runner_future in runner.run(runner_inputs):
+        runner_result = runner_future.result()
+        assert runner_result.error_msg is None
+        for result in runner_result.run_secs:
+            if isinstance(result, FloatImm):
+                result = result.value
+            assert result >= 0.0
+    for builder_result in builder_results:
+        _clean_build(builder_result.artifact_path)
+
+
+def test_meta_schedule_rpc_dispatch_runner_server_failure():
+    """Test meta schedule RPC dispatch runner retrying the candidates of a dead server"""
+    endpoint = RPCServerEndpoint.parse("localhost:9090:key")
+    assert endpoint == RPCServerEndpoint("localhost", 9090, "key")
+    builder = LocalBuilder()
+    builder_results = builder.build([BuilderInput(MatmulModule, Target("llvm"))] * 4)
+    args_info = [
+        TensorInfo("float32", (MATMUL_N, MATMUL_N)),
+        TensorInfo("float32", (MATMUL_N, MATMUL_N)),
+        TensorInfo("float32", (MATMUL_N, MATMUL_N)),
+    ]
+    runner_inputs = [
+        RunnerInput(builder_result.artifact_path, "llvm", args_info)
+        for builder_result in builder_results
+    ]
+    live_server = Server(host="127.0.0.1", port=9190, port_end=12345)
+    dead_server = Server(host="127.0.0.1", port=9190, port_end=12345)
+    dead_server.terminate()
+    evaluator_config = EvaluatorConfig(
+        number=1,
+        repeat=1,
+        min_repeat_ms=0,
+        enable_cpu_cache_flush=False,
+    )
+    runner = RPCDispatchRunner(
+        servers=[f"127.0.0.1:{dead_server.port}", f"127.0.0.1:{live_server.port}"],
+        evaluator_config=evaluator_config,
+        timeout_sec=100,
+        quarantine_sec=100,
+    )
+    for runner_future in runner.run(runner_inputs):
+        runner_result = runner_future.result()
+        assert runner_result.error_msg is None
+        for result in runner_result.run_secs:
+            if isinstance(result, FloatImm):
+                result = result.value
+            assert result >= 0.0
+    runner.close()
+    live_server.terminate()
+    # The serving threads are gone, and a closed runner takes no more candidates
+    assert not any(thread.name.startswith("rpc-dispatch") for thread in threading.enumerate())
+    with pytest.raises(RuntimeError):
+        runner.run(runner_inputs)
+    dead_health, live_health = runner.health
+    # The dead server fails at most the first candidate it takes, then is quarantined
+    assert dead_health.num_measured == 0
+    assert dead_health.num_failed <= 1
+    assert live_health.num_measured == 4
+    assert live_health.num_failed == 0
+    for builder_result in builder_results:
+        _clean_build(builder_result.artifact_path)
+
+
 if __name__ == "__main__":
     tvm.testing.main()
@@ -0,0 +1,164 @@
+# SPDX-FileCopyrightText: © 2019-2023 The Apache Software Foundation
+#
+# SPDX-License-Identifier: Apache-2.0
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring
+"""Test the workload similarity index of Meta Schedule"""
+import os
+import tempfile
+from typing import List
+
+import tvm
+import tvm.testing
+from tvm import meta_schedule as ms
+from tvm import te
+from tvm.ir.module import IRModule
+from tvm.meta_schedule.builder import BuilderInput, BuilderResult, PyBuilder
+from tvm.meta_schedule.database.similarity_index import _adapt_perfect_tile, adapt_trace
+from tvm.meta_schedule.runner import (
+    PyRunner,
+    PyRunnerFuture,
+    RunnerFuture,
+    RunnerInput,
+    RunnerResult,
+)
+from tvm.meta_schedule.utils import derived_object
+from tvm.target import Target
+from tvm.tir import Schedule
+
+
+def _matmul(n: int) -> IRModule:
+    a = te.placeholder((n, n), name="A")
+    b = te.placeholder((n, n), name="B")
+    k = te.reduce_axis((0, n), name="k")
+    c = te.compute((n, n), lambda i, j: te.sum(a[i, k] * b[k, j], axis=k), name="C")
+    return IRModule({"main": te.create_prim_func([a, b, c])})
+
+
+def _add(n: int) -> IRModule:
+    a = te.placeholder((n, n), name="A")
+    b = te.placeholder((n, n), name="B")
+    c = te.compute((n, n), lambda i, j: a[i, j] + b[i, j], name="C")
+    return IRModule({"main": te.create_prim_func([a, b, c])})
+
+
+@derived_object
+class TempDirBuilder(PyBuilder):
+    def __init__(self):
+        super().__init__()
+        self.artifact_paths: List[str] = []
+
+    def build(self, build_inputs: List[BuilderInput]) -> List[BuilderResult]:
+        results = [
+            BuilderResult(os.path.join(tempfile.mkdtemp(), "tvm_tmp_mod.tar"), None)
+            for _ in build_inputs
+        ]
+        self.artifact_paths.extend(result.artifact_path for result in results)
+        return results
+
+
+@derived_object
+class ConstRunnerFuture(PyRunnerFuture):
+    def done(self) -> bool:
+        return True
+
+    def result(self) -> RunnerResult:
+        return RunnerResult([0.5, 0.25], None)
+
+
+@derived_object
+class ConstRunner(PyRunner):
+    def run(self, runner_inputs: List[RunnerInput]) -> List[RunnerFuture]:
+        return [ConstRunnerFuture() for _ in runner_inputs]  # type: ignore
+
+
+def _tuned_database(mods) -> ms.database.Database:
+    database = ms.database.MemoryDatabase()
+    for mod in mods:
+        sch = Schedule(mod)
+        i = sch.get_loops(sch.get_block("C"))[0]
+        sch.split(i, sch.sample_perfect_tile(i, n=3, decision=[2, 4, 16]))
+        database.commit_tuning_record(
+            ms.database.TuningRecord(
+                trace=sch.trace,
+                workload=database.commit_workload(mod),
+                run_secs=[1.0],
+                target=Target("llvm"),
+                args_info=ms.arg_info.ArgInfo.from_prim_func(mod["main"]),
+            )
+        )
+    return database
+
+
+def test_adapt_perfect_tile():
+    assert _adapt_perfect_tile(128, [2, 4, 16]) == [2, 4, 16]
+    assert _adapt_perfect_tile(96, [2, 4, 16]) == [3, 2, 16]
+    assert _adapt_perfect_tile(7, [2, 4, 16]) == [7, 1, 1]
+
+
+def test_query():
+    index = ms.database.WorkloadSimilarityIndex(_tuned_database([_matmul(128), _add(128)]))
+    assert len(index) == 2
+    (neighbor,) = index.query(_matmul(96))
+    assert tvm.ir.structural_equal(neighbor.workload.mod, _matmul(128))
+    assert neighbor.distance > 0
+    assert len(neighbor.records) == 1
+    # The workload itself is excluded, and far workloads are filtered out
+    assert not index.query(_matmul(128))
+    assert not index.query(_matmul(96), max_distance=neighbor.distance / 2)
+
+
+def test_adapt_trace():
+    (record,) = _tuned_database([_matmul(128)]).get_all_tuning_records()
+    sch = adapt_trace(record, _matmul(96))
+    assert sch is not None
+    loops = sch.get_loops(sch.get_block("C"))
+    assert [int(sch.get(loop).extent) for loop in loops[:3]] == [3, 2, 16]
+
+
+def test_seed():
+    index = ms.database.WorkloadSimilarityIndex(_tuned_database([_matmul(128), _add(128)]))
+    database = ms.database.MemoryDatabase()
+    builder = TempDirBuilder()
+    report = index.seed(
+        ms.TuneContext(_matmul(96), target=Target("llvm"), task_name="matmul_96"),
+        database,
+        builder,
+        ConstRunner(),
+    )
+    assert report.task_name == "matmul_96"
+    assert len(report.neighbors) == 1
+    assert report.num_adapted == 1
+    assert report.num_measured == 1
+    assert report.best_run_sec == 0.375
+    # The seed is committed to the database of the task, with the rescaled tiling
+    (record,) = database.get_all_tuning_records()
+    assert tvm.ir.structural_equal(record.workload.mod, _matmul(96))
+    assert [float(sec) for sec in record.run_secs] == [0.5, 0.25]
+    assert str(record.target) == str(Target("llvm"))
+    sch = Schedule(_matmul(96))
+    record.trace.apply_to_schedule(sch, remove_postproc=False)
+    loops = sch.get_loops(sch.get_block("C"))
+    assert [int(sch.get(loop).extent) for loop in loops[:3]] == [3, 2, 16]
+    # The build directories are cleaned up
+    (artifact_path,) = builder.artifact_paths
+    assert not os.path.exists(os.path.dirname(artifact_path))
+
+
+if __name__ == "__main__":
+    tvm.testing.main()
@@ -356,6 +356,123 @@ def test_meta_schedule_task_scheduler_multiple_gradient_based():
         )
 
 
+def test_meta_schedule_task_scheduler_multiple_time_aware():
+    max_trials_per_task = 101
+    tasks = [
+        ms.TuneContext(
+            MatmulModule,
+            target=tvm.target.Target("llvm"),
+            space_generator=_schedule_matmul,
+            search_strategy=ms.search_strategy.ReplayTrace(),
+            task_name="Matmul",
+            rand_state=42,
+        ),
+        ms.TuneContext(
+            BatchMatmulModule,
+            target=tvm.target.Target("llvm"),
+            space_generator=_schedule_batch_matmul,
+            search_strategy=ms.search_strategy.ReplayTrace(),
+            task_name="BatchMatmul",
+            rand_state=0x114514,
+        ),
+    ]
+    database = ms.database.MemoryDatabase()
+    time_aware = ms.task_scheduler.create("time-aware", decay=0.3)
+    assert isinstance(time_aware, ms.task_scheduler.TimeAware)
+    time_aware.tune(
+        tasks,
+        task_weights=[1.0, 2.0],
+        builder=DummyBuilder(),
+        runner=DummyRunner(),
+        database=database,
+        measure_callbacks=[ms.measure_callback.AddToDatabase()],
+        max_trials_global=max_trials_per_task * len(tasks),
+        max_trials_per_task=max_trials_per_task,
+        num_trials_per_iter=6,
+        cost_model=None,
+    )
+    assert len(database) == max_trials_per_task * len(tasks)
+    for task in tasks:
+        assert (
+            len(database.get_top_k(database.commit_workload(task.mod), 10000))
+            == max_trials_per_task
+        )
+
+
+def test_meta_schedule_task_scheduler_time_aware_slow_task():
+    """
+    When the measurement of one task is much slower than the other one, and both tasks improve
+    equally, the time-aware scheduler should spend fewer trials on the slow task than the
+    gradient based one
+    """
+    # A fake clock, advanced by the runner by the measurement time of each round
+    now = [0.0]
+
+    @ms.derived_object
+    class ConstRunnerFuture(ms.runner.PyRunnerFuture):
+        def done(self) -> bool:
+            return True
+
+        def result(self) -> ms.runner.RunnerResult:
+            return ms.runner.RunnerResult([1e-3], None)
+
+    @ms.derived_object
+    class SlowBatchMatmulRunner(ms.runner.PyRunner):
+        def run(self, runner_inputs):
+            # Only BatchMatmul takes 3-dimensional inputs
+            if any(len(arg.shape) == 3 for arg in runner_inputs[0].args_info):
+                now[0] += 0.3
+            else:
+                now[0] += 0.01
+            return [ConstRunnerFuture() for _ in runner_inputs]
+
+    def _num_trials_of_batch_matmul(scheduler: ms.task_scheduler.TaskScheduler) -> int:
+        tasks = [
+            ms.TuneContext(
+                MatmulModule,
+                target=tvm.target.Target("llvm"),
+                space_generator=_schedule_matmul,
+                search_strategy=ms.search_strategy.ReplayTrace(),
+                task_name="Matmul",
+                rand_state=42,
+            ),
+            ms.TuneContext(
+                BatchMatmulModule,
+                target=tvm.target.Target("llvm"),
+                space_generator=_schedule_batch_matmul,
+                search_strategy=ms.search_strategy.ReplayTrace(),
+                task_name="BatchMatmul",
+                rand_state=0x114514,
+            ),
+        ]
+        database = ms.database.MemoryDatabase()
+        scheduler.tune(
+            tasks,
+            task_weights=[1.0, 1.0],
+            builder=DummyBuilder(),
+            runner=SlowBatchMatmulRunner(),
+            database=database,
+            measure_callbacks=[ms.measure_callback.AddToDatabase()],
+            max_trials_global=60,
+            max_trials_per_task=60,
+            num_trials_per_iter=6,
+            cost_model=None,
+        )
+        assert len(database) == 60
+        return len(database.get_top_k(database.commit_workload(BatchMatmulModule), 10000))
+
+    # Both tasks report the same latency, so the gradient based scheduler splits the budget
+    # roughly evenly, up to a round of difference on each side
+    gradient_trials = _num_trials_of_batch_matmul(ms.task_scheduler.GradientBased(seed=0))
+    assert 24 <= gradient_trials <= 36
+    # A round of the slow task costs far more than one of Matmul, so beyond its round robin
+    # round, it only gets picked once Matmul has converged much further
+    time_aware_trials = _num_trials_of_batch_matmul(
+        ms.task_scheduler.TimeAware(clock=lambda: now[0], seed=0)
+    )
+    assert 6 <= time_aware_trials < gradient_trials
+
+
 def test_meta_schedule_task_scheduler_gradient_based_with_null_search_strategy():
     """
     When search strategy of one task returns empty list of candidates or None,
@@ -446,4 +563,6 @@ if __name__ == "__main__":
     test_meta_schedule_task_scheduler_avoid_cyclic()
     test_meta_schedule_task_scheduler_override_next_task_id_only()
     test_meta_schedule_task_scheduler_multiple_gradient_based()
+    test_meta_schedule_task_scheduler_multiple_time_aware()
+    test_meta_schedule_task_scheduler_time_aware_slow_task()
     test_meta_schedule_task_scheduler_gradient_based_with_null_search_strategy()